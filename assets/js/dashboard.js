@@ -1,3 +1,50 @@
+// Dashboard data manifest and bundle
+// Published files have immutable content-hashed copies, and a short-TTL manifest
+// maps each file's fixed key to its current copy (scripts/storage.py). First-paint
+// chart data is also published as one bundle (scripts/32_publish_dashboard_bundle.py).
+// dashboardJson(url) resolves S3 data URLs from the bundle, then from the file's
+// current versioned key, and falls back to d3.json(url) when neither is available
+// (or the versioned fetch fails).
+const DATA_HOST = 'https://redsox-data.s3.amazonaws.com/';
+const MANIFEST_URL = `${DATA_HOST}redsox/data/manifest.json`;
+const BUNDLE_NAME = 'redsox/data/bundles/dashboard.json';
+let dashboardDataPromise = null;
+
+function loadDashboardData() {
+  if (!dashboardDataPromise) {
+    dashboardDataPromise = fetch(MANIFEST_URL, { cache: 'no-cache' })
+      .then((response) => (response.ok ? response.json() : {}))
+      .then(async (manifest) => {
+        const artifacts = (manifest && manifest.artifacts) || {};
+        const bundle = artifacts[BUNDLE_NAME] ? await d3.json(`${DATA_HOST}${artifacts[BUNDLE_NAME].key}`) : null;
+        return { artifacts, files: (bundle && bundle.files) || {} };
+      })
+      .catch((error) => {
+        console.warn('Dashboard manifest unavailable, loading files individually:', error);
+        return { artifacts: {}, files: {} };
+      });
+  }
+  return dashboardDataPromise;
+}
+
+async function dashboardJson(url) {
+  if (url.startsWith(DATA_HOST)) {
+    const key = url.slice(DATA_HOST.length).split('?')[0];
+    const { artifacts, files } = await loadDashboardData();
+    if (Object.prototype.hasOwnProperty.call(files, key)) {
+      return files[key];
+    }
+    if (artifacts[key]) {
+      // A cached manifest can name a version that has since been collected
+      return d3.json(`${DATA_HOST}${artifacts[key].key}`).catch((error) => {
+        console.warn(`Versioned ${key} unavailable, loading the fixed key:`, error);
+        return d3.json(url);
+      });
+    }
+  }
+  return d3.json(url);
+}
+
 // Games back line chart
 
 // Helper function to get the effective current year (handles off-season)
@@ -227,7 +274,7 @@ fetchData();
 
 async function fetchGameData() {
   try {
-    const response = await d3.json('https://redsox-data.s3.amazonaws.com/redsox/data/standings/redsox_wins_losses_current.json');
+    const response = await dashboardJson('https://redsox-data.s3.amazonaws.com/redsox/data/standings/redsox_wins_losses_current.json');
     response.reverse(); // Reverse the array to start from the beginning of the season
     renderRunDiffChart(response);
   } catch (error) {
@@ -332,7 +379,7 @@ document.addEventListener('DOMContentLoaded', function() {
 
   async function fetchCumulativeWinsData() {
       try {
-          const response = await d3.json('https://redsox-data.s3.amazonaws.com/redsox/data/standings/redsox_standings_1901_present.json');
+          const response = await dashboardJson('https://redsox-data.s3.amazonaws.com/redsox/data/standings/redsox_standings_1901_present.json');
           // Group data by year
           groupedByYear = d3.group(response, (d) => d.year);
           populateYearSelect(Array.from(groupedByYear.keys()));
@@ -579,7 +626,7 @@ document.addEventListener('DOMContentLoaded', function() {
     
       async function fetchData() {
         try {
-          const response = await d3.json(
+          const response = await dashboardJson(
             'https://redsox-data.s3.amazonaws.com/redsox/data/batting/archive/redsox_historic_batting_gamelogs.json'
           );
           const groupedData = d3.group(response, (d) => d.year.toString());
@@ -758,7 +805,7 @@ document.addEventListener('DOMContentLoaded', function() {
 
   async function fetchData() {
     try {
-      const response = await d3.json(
+      const response = await dashboardJson(
         'https://redsox-data.s3.amazonaws.com/redsox/data/pitching/redsox_historic_pitching_gamelogs_1901-present.json'
       );
       const groupedData = d3.group(response, (d) => d.year.toString());
@@ -921,7 +968,7 @@ document.addEventListener('DOMContentLoaded', function() {
 document.addEventListener('DOMContentLoaded', function() {
   async function fetchCumulativeERAData() {
     try {
-      const response = await d3.json(
+      const response = await dashboardJson(
         'https://redsox-data.s3.amazonaws.com/redsox/data/pitching/redsox_historic_pitching_gamelogs_1901-present.json'
       );
       // Group data by year
@@ -1109,8 +1156,7 @@ document.addEventListener('DOMContentLoaded', function () {
 
   const fetchDataAndRenderTables = async () => {
     try {
-      const response = await fetch('https://redsox-data.s3.amazonaws.com/redsox/data/standings/redsox_schedule.json');
-      const games = await response.json();
+      const games = await dashboardJson('https://redsox-data.s3.amazonaws.com/redsox/data/standings/redsox_schedule.json');
 
       const lastGames = games.filter(game => game.placement === 'last');
       const nextGames = games.filter(game => game.placement === 'next');
@@ -1132,8 +1178,7 @@ document.addEventListener('DOMContentLoaded', function () {
 
   const fetchDataAndRenderBattingTables = async () => {
       try {
-          const response = await fetch(url);
-          const data = await response.json();
+          const data = await dashboardJson(url);
           const limitedData = data.slice(0, 10); // Limit to the first 10 objects
           // const limitedData = data; // Limit to the first 10 objects
 
@@ -1348,8 +1393,7 @@ document.addEventListener('DOMContentLoaded', function () {
 
   const fetchDataAndRenderTables = async () => {
     try {
-      const response = await fetch('https://redsox-data.s3.amazonaws.com/redsox/data/standings/redsox_schedule.json');
-      const games = await response.json();
+      const games = await dashboardJson('https://redsox-data.s3.amazonaws.com/redsox/data/standings/redsox_schedule.json');
 
       const lastGames = games.filter(game => game.placement === 'last');
       const nextGames = games.filter(game => game.placement === 'next');
@@ -1371,8 +1415,7 @@ document.addEventListener('DOMContentLoaded', function () {
 
   const fetchDataAndRenderBattingTables = async () => {
       try {
-          const response = await fetch(url);
-          const data = await response.json();
+          const data = await dashboardJson(url);
           const limitedData = data.slice(0, 10); // Limit to the first 10 objects
           // const limitedData = data; // Limit to the first 10 objects
 
@@ -1587,8 +1630,7 @@ document.addEventListener('DOMContentLoaded', function () {
 
   const fetchDataAndRenderTables = async () => {
     try {
-      const response = await fetch('https://redsox-data.s3.amazonaws.com/redsox/data/standings/redsox_schedule.json');
-      const games = await response.json();
+      const games = await dashboardJson('https://redsox-data.s3.amazonaws.com/redsox/data/standings/redsox_schedule.json');
 
       const lastGames = games.filter(game => game.placement === 'last');
       const nextGames = games.filter(game => game.placement === 'next');
@@ -1610,8 +1652,7 @@ document.addEventListener('DOMContentLoaded', function () {
 
   const fetchDataAndRenderBattingTables = async () => {
       try {
-          const response = await fetch(url);
-          const data = await response.json();
+          const data = await dashboardJson(url);
           const limitedData = data.slice(0, 10); // Limit to the first 10 objects
           // const limitedData = data; // Limit to the first 10 objects
 
@@ -1826,8 +1867,7 @@ document.addEventListener('DOMContentLoaded', function () {
 
   const fetchDataAndRenderTables = async () => {
     try {
-      const response = await fetch('https://redsox-data.s3.amazonaws.com/redsox/data/standings/redsox_schedule.json');
-      const games = await response.json();
+      const games = await dashboardJson('https://redsox-data.s3.amazonaws.com/redsox/data/standings/redsox_schedule.json');
 
       const lastGames = games.filter(game => game.placement === 'last');
       const nextGames = games.filter(game => game.placement === 'next');
@@ -1849,8 +1889,7 @@ document.addEventListener('DOMContentLoaded', function () {
 
   const fetchDataAndRenderBattingTables = async () => {
       try {
-          const response = await fetch(url);
-          const data = await response.json();
+          const data = await dashboardJson(url);
           const limitedData = data.slice(0, 10); // Limit to the first 10 objects
           // const limitedData = data; // Limit to the first 10 objects
 
@@ -2065,8 +2104,7 @@ document.addEventListener('DOMContentLoaded', function () {
 
   const fetchDataAndRenderTables = async () => {
     try {
-      const response = await fetch('https://redsox-data.s3.amazonaws.com/redsox/data/standings/redsox_schedule.json');
-      const games = await response.json();
+      const games = await dashboardJson('https://redsox-data.s3.amazonaws.com/redsox/data/standings/redsox_schedule.json');
 
       const lastGames = games.filter(game => game.placement === 'last');
       const nextGames = games.filter(game => game.placement === 'next');
@@ -2088,8 +2126,7 @@ document.addEventListener('DOMContentLoaded', function () {
 
   const fetchDataAndRenderBattingTables = async () => {
       try {
-          const response = await fetch(url);
-          const data = await response.json();
+          const data = await dashboardJson(url);
           const limitedData = data.slice(0, 10); // Limit to the first 10 objects
           // const limitedData = data; // Limit to the first 10 objects
 
@@ -2277,7 +2314,7 @@ document.addEventListener('DOMContentLoaded', function () {
 document.addEventListener('DOMContentLoaded', function () {
   async function fetchTableData() {
     try {
-      const response = await d3.json('https://redsox-data.s3.amazonaws.com/redsox/data/standings/mlb_team_attendance.json');
+      const response = await dashboardJson('https://redsox-data.s3.amazonaws.com/redsox/data/standings/mlb_team_attendance.json');
       renderTables(response);
       renderMaxAttendanceInfo(response);
     } catch (error) {
@@ -2366,7 +2403,7 @@ document.addEventListener('DOMContentLoaded', function () {
 // xwOBA charts
 async function fetchAndRenderXwoba() {
   try {
-    const data = await d3.json('https://redsox-data.s3.amazonaws.com/redsox/data/batting/redsox_xwoba_current.json');
+    const data = await dashboardJson('https://redsox-data.s3.amazonaws.com/redsox/data/batting/redsox_xwoba_current.json');
     
     const playerGroups = d3.group(data, d => d.player_name);
     const players = Array.from(playerGroups.keys()).sort();
@@ -2963,7 +3000,7 @@ document.addEventListener('DOMContentLoaded', function () {
 async function fetchWinsProjectionDataWithCI() {
   try {
     // Fetch data from the new single endpoint that includes timeseries data
-    const response = await d3.json('https://redsox-data.s3.amazonaws.com/redsox/data/standings/redsox_wins_projection_timeseries.json');
+    const response = await dashboardJson('https://redsox-data.s3.amazonaws.com/redsox/data/standings/redsox_wins_projection_timeseries.json');
 
     if (!response || !response.timeseries) {
         console.error('Invalid data structure received for wins projection CI chart.');
@@ -3234,7 +3271,7 @@ if (document.readyState === 'loading') {
 (function () {
   async function fetchUmpireData() {
     try {
-      const response = await d3.json('https://redsox-data.s3.amazonaws.com/redsox/data/summary/umpire_summary.json');
+      const response = await dashboardJson('https://redsox-data.s3.amazonaws.com/redsox/data/summary/umpire_summary.json');
       renderUmpireScorecard(response);
       } catch (error) {
       console.error('Failed to fetch umpire scorecard data:', error);
@@ -3390,7 +3427,7 @@ if (document.readyState === 'loading') {
 (function () {
   async function fetchUmpireDataPitching() {
     try {
-      const response = await d3.json('https://redsox-data.s3.amazonaws.com/redsox/data/summary/umpire_summary.json');
+      const response = await dashboardJson('https://redsox-data.s3.amazonaws.com/redsox/data/summary/umpire_summary.json');
       renderUmpireScorecardPitching(response);
     } catch (error) {
       console.error('Failed to fetch umpire scorecard pitching data:', error);
@@ -3505,6 +3542,110 @@ if (document.readyState === 'loading') {
   }
 })();
 
+// Pitch location heatmap
+// Reads precomputed location grids (scripts/pitch_grids.py) instead of every pitch:
+// each grid is {n, i: [cells], c: [counts]} with cell = iz * nx + ix from the bottom left.
+(function () {
+  function sumGrids(byName, nCells) {
+    const totals = new Array(nCells).fill(0);
+    Object.values(byName || {}).forEach(byType => {
+      Object.values(byType).forEach(byBucket => {
+        Object.values(byBucket).forEach(grid => {
+          grid.i.forEach((cell, k) => { totals[cell] += grid.c[k]; });
+        });
+      });
+    });
+    return totals;
+  }
+
+  async function fetchPitchGrids() {
+    const currentYear = new Date().getFullYear();
+    // Fall back to last season's grids in the off-season
+    for (let yearOffset = 0; yearOffset <= 1; yearOffset++) {
+      try {
+        return await dashboardJson(`https://redsox-data.s3.amazonaws.com/redsox/data/pitches/pitch_grids_${currentYear - yearOffset}.json`);
+      } catch (error) {
+        if (yearOffset === 1) {
+          console.error('Failed to fetch pitch grids:', error);
+        }
+      }
+    }
+    return null;
+  }
+
+  function renderPitchHeatmap(store) {
+    const container = d3.select('#pitch-location-heatmap');
+    container.html('');
+    const spec = store.grid;
+    const totals = sumGrids(store.pitchers, spec.nx * spec.nz);
+    const maxCount = d3.max(totals);
+    if (!maxCount) {
+      container.append('p').attr('class', 'note').text('No pitch locations available yet.');
+      return;
+    }
+
+    const svgSize = 350;
+    const svg = container.append('svg')
+      .attr('viewBox', `0 0 ${svgSize} ${svgSize}`)
+      .attr('width', '100%');
+
+    // Same scales as the other pitch location charts: x [-2.5, 2.5], z [0.5, 4.5]
+    const xScale = d3.scaleLinear().domain([spec.x_min, spec.x_max]).range([0, svgSize]);
+    const yScale = d3.scaleLinear().domain([spec.z_min, spec.z_max]).range([315, 35]);
+    const color = d3.scaleSequential(d3.interpolateReds).domain([0, maxCount]);
+    const cellWidth = xScale(spec.cell_feet) - xScale(0);
+    const cellHeight = yScale(0) - yScale(spec.cell_feet);
+
+    const cells = totals
+      .map((count, cell) => ({ count, ix: cell % spec.nx, iz: Math.floor(cell / spec.nx) }))
+      .filter(d => d.count > 0);
+
+    svg.selectAll('.pitch-cell')
+      .data(cells)
+      .enter()
+      .append('rect')
+      .attr('class', 'pitch-cell')
+      .attr('x', d => xScale(spec.x_min + d.ix * spec.cell_feet))
+      .attr('y', d => yScale(spec.z_min + (d.iz + 1) * spec.cell_feet))
+      .attr('width', cellWidth)
+      .attr('height', cellHeight)
+      .attr('fill', d => color(d.count));
+
+    // Average strike zone of the same pitches
+    const zone = (store.zone || {}).thrown_by_redsox;
+    const szTop = zone && zone.n ? zone.sz_top_sum / zone.n : 3.5;
+    const szBot = zone && zone.n ? zone.sz_bot_sum / zone.n : 1.5;
+    svg.append('rect')
+      .attr('x', xScale(-0.71))
+      .attr('y', yScale(szTop))
+      .attr('width', xScale(0.71) - xScale(-0.71))
+      .attr('height', yScale(szBot) - yScale(szTop))
+      .attr('fill', 'none')
+      .attr('stroke', '#666')
+      .attr('stroke-width', 2)
+      .attr('stroke-dasharray', '4,4');
+
+    svg.append('text')
+      .attr('x', svgSize / 2)
+      .attr('y', 340)
+      .attr('text-anchor', 'middle')
+      .style('font-family', 'Roboto, sans-serif')
+      .style('font-size', '12px')
+      .style('fill', '#666')
+      .text(`${d3.sum(totals).toLocaleString()} pitches over ${store.games.length} games`);
+  }
+
+  document.addEventListener('DOMContentLoaded', async function () {
+    if (!document.getElementById('pitch-location-heatmap')) {
+      return;
+    }
+    const store = await fetchPitchGrids();
+    if (store) {
+      renderPitchHeatmap(store);
+    }
+  });
+})();
+
 // Shohei Ohtani Pitching Visualization
 document.addEventListener('DOMContentLoaded', function () {
   if (!document.getElementById('shohei-pitching-container')) {
@@ -3514,8 +3655,8 @@ document.addEventListener('DOMContentLoaded', function () {
   async function fetchOhtaniPitchData() {
     try {
       const cacheBuster = `?v=${Date.now()}`;
-      const mixResponse = await d3.json(`https://redsox-data.s3.amazonaws.com/redsox/data/pitching/shohei_ohtani_pitch_mix.json${cacheBuster}`);
-      const pitchesResponse = await d3.json(`https://redsox-data.s3.amazonaws.com/redsox/data/pitching/shohei_ohtani_pitches.json${cacheBuster}`);
+      const mixResponse = await dashboardJson(`https://redsox-data.s3.amazonaws.com/redsox/data/pitching/shohei_ohtani_pitch_mix.json${cacheBuster}`);
+      const pitchesResponse = await dashboardJson(`https://redsox-data.s3.amazonaws.com/redsox/data/pitching/shohei_ohtani_pitches.json${cacheBuster}`);
       
       // Calculate total pitches and games
       const totalPitches = pitchesResponse.length;
@@ -3691,17 +3832,8 @@ async function fetchPlayoffBracketData() {
   for (let yearOffset = 0; yearOffset <= 1; yearOffset++) {
     try {
       const yearToFetch = currentYear - yearOffset;
-      const response = await fetch(`https://redsox-data.s3.amazonaws.com/redsox/data/standings/all_teams_standings_metrics_${yearToFetch}.json`);
-
-      if (!response.ok) {
-        if (yearOffset === 0) {
-          // Try previous year
-          continue;
-        }
-        throw new Error(`HTTP error! status: ${response.status}`);
-      }
-
-      const data = await response.json();
+      // Rejects on a missing file, which falls through to the previous year below
+      const data = await dashboardJson(`https://redsox-data.s3.amazonaws.com/redsox/data/standings/all_teams_standings_metrics_${yearToFetch}.json`);
 
       // Handle both old format (array) and new format (object with metadata)
       if (Array.isArray(data)) {
@@ -0,0 +1,140 @@
+"""
+Helpers for benchmarking pipeline functions against recorded payloads.
+
+Most numbered scripts run their whole stage (network, S3, file writes) at import
+time, so they cannot simply be imported. load_stage() executes only a script's
+imports, function/class definitions and literal constants, which yields the same
+functions the pipeline runs without any of its side effects.
+"""
+
+import ast
+import gzip
+import json
+import logging
+import os
+import statistics
+import time
+from typing import Any, Callable, Dict, Optional
+
+import requests
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCRIPTS_DIR = os.path.join(REPO_ROOT, "scripts")
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+def _is_literal(node: ast.AST) -> bool:
+    """True when an assignment value can be evaluated without calling anything."""
+    return not any(isinstance(child, (ast.Call, ast.Await, ast.Yield, ast.YieldFrom)) for child in ast.walk(node))
+
+
+def load_stage(script_name: str, overrides: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Load the definitions from scripts/<script_name> without running the stage.
+
+    Keeps imports, def/class statements and assignments of literal values.
+    Imports that are unavailable locally (e.g. atproto) are skipped; anything that
+    depends on them will fail only if it is called. ``overrides`` replace globals
+    after loading, which is how network helpers get swapped for recorded payloads.
+    """
+    path = os.path.join(SCRIPTS_DIR, script_name)
+    with open(path, "r", encoding="utf-8") as f:
+        tree = ast.parse(f.read(), filename=path)
+
+    namespace: Dict[str, Any] = {"__name__": f"bench_{os.path.splitext(script_name)[0]}", "__file__": path}
+    for node in tree.body:
+        if isinstance(node, (ast.Import, ast.ImportFrom, ast.FunctionDef, ast.ClassDef)):
+            pass
+        elif isinstance(node, (ast.Assign, ast.AnnAssign)) and node.value is not None and _is_literal(node.value):
+            pass
+        else:
+            continue
+        code = compile(ast.Module(body=[node], type_ignores=[]), path, "exec")
+        try:
+            exec(code, namespace)
+        except ImportError as e:
+            logging.debug(f"{script_name}: skipping unavailable import ({e})")
+        except NameError as e:
+            logging.debug(f"{script_name}: skipping statement at line {node.lineno} ({e})")
+
+    namespace.update(overrides or {})
+    return namespace
+
+
+def fixture_path(name: str) -> str:
+    return os.path.join(FIXTURES_DIR, name)
+
+
+def read_fixture(name: str) -> bytes:
+    """Read a fixture, transparently decompressing .gz files."""
+    path = fixture_path(name)
+    opener = gzip.open if name.endswith(".gz") else open
+    with opener(path, "rb") as f:
+        return f.read()
+
+
+def read_json_fixture(name: str) -> Any:
+    return json.loads(read_fixture(name))
+
+
+class RecordedResponse:
+    """Minimal stand-in for requests.Response backed by a fixture payload."""
+
+    def __init__(self, content: bytes, status_code: int = 200):
+        self.content = content
+        self.status_code = status_code
+
+    @property
+    def text(self) -> str:
+        return self.content.decode("utf-8")
+
+    def json(self) -> Any:
+        return json.loads(self.content)
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise requests.exceptions.HTTPError(f"{self.status_code} for recorded response")
+
+
+class RecordedRequests:
+    """Replaces the ``requests`` module inside a loaded stage.
+
+    ``routes`` maps a URL substring to a fixture name; the first match wins.
+    """
+
+    exceptions = requests.exceptions
+
+    def __init__(self, routes: Dict[str, str]):
+        self.routes = routes
+
+    def get(self, url: str, *args, **kwargs) -> RecordedResponse:
+        for fragment, name in self.routes.items():
+            if fragment in url:
+                return RecordedResponse(read_fixture(name))
+        return RecordedResponse(b"{}", status_code=404)
+
+
+def calibrate(rounds: int = 5) -> float:
+    """Time a fixed pure-Python workload so results can be compared across machines."""
+    def workload():
+        total = 0
+        for i in range(200_000):
+            total += (i * i) % 7
+        return total
+
+    samples = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        workload()
+        samples.append(time.perf_counter() - started)
+    return min(samples)
+
+
+def time_call(func: Callable[[], Any], number: int, repeat: int) -> Dict[str, float]:
+    """Run func ``number`` times per sample, ``repeat`` samples; return per-call ms."""
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(number):
+            func()
+        samples.append((time.perf_counter() - started) / number * 1000)
+    return {"best_ms": min(samples), "median_ms": statistics.median(samples)}
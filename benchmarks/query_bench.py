@@ -0,0 +1,343 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+"""
+DuckDB query layer (scripts/query_layer.py) vs the pandas paths it replaces.
+
+Writes synthetic parquet datasets in the pipeline's layouts, then runs each
+summary both ways:
+- the pandas path: load the dataset, then filter/group
+- the SQL path: the same summary as a query over the QueryLayer views
+
+Each path runs in a fresh subprocess, so the reported peak RSS belongs to that
+path alone. It is measured above the process's RSS before the first run, from
+/proc on Linux. tracemalloc would miss the memory that pyarrow and DuckDB
+allocate outside Python. Both paths must return the same rows.
+
+Usage:
+    python -m benchmarks.query_bench
+    python -m benchmarks.query_bench --games 4860 --pitches 300 --repeat 5
+    python -m benchmarks.query_bench --cases rollup_counts,best_start
+"""
+
+import argparse
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+import time
+from collections import Counter
+from contextlib import nullcontext
+from typing import Callable, Dict, List, NamedTuple, Tuple
+
+import numpy as np
+import pandas as pd
+
+from scripts import franchise_warehouse
+from scripts import query_layer
+from scripts import teams
+from scripts import umpire_scorecards
+from scripts import writers
+
+PITCH_NAMES = ["4-Seam Fastball", "Sinker", "Slider", "Changeup", "Curveball", "Cutter", "Sweeper", "Splitter"]
+CALLS = ["called_strike", "ball", "swinging_strike", "foul", "hit_into_play"]
+CALL_WEIGHTS = [0.17, 0.35, 0.11, 0.18, 0.19]
+
+
+class QueryCase(NamedTuple):
+    name: str
+    description: str
+    pandas: Callable[[str], pd.DataFrame]
+    sql: Callable[[str], pd.DataFrame]
+
+
+# --- Synthetic datasets --------------------------------------------------------
+
+
+def write_pitches(root: str, games: int, pitches: int, rng: np.random.Generator) -> int:
+    """One season file of 20's pitch rows (pitches/redsox_pitches_{year}.parquet)."""
+    n = games * pitches
+    game_pk = np.repeat(np.arange(700_000, 700_000 + games), pitches)
+    dates = pd.date_range("2025-03-27", periods=games).strftime("%Y-%m-%d").to_numpy()
+    df = pd.DataFrame({
+        "game_pk": game_pk,
+        "game_date": np.repeat(dates, pitches),
+        "inning": rng.integers(1, 10, n),
+        "ab_number": rng.integers(1, 80, n),
+        "pitch_number": rng.integers(1, 8, n),
+        "batter": rng.integers(0, 400, n).astype(str),
+        "pitcher": rng.integers(0, 400, n).astype(str),
+        "pitch_name": rng.choice(PITCH_NAMES, n),
+        "pitch_call": rng.choice(CALLS, n, p=CALL_WEIGHTS),
+        "pitch_velocity": rng.normal(92, 4, n).round(1),
+        "px": rng.normal(0, 0.9, n),
+        "pz": rng.normal(2.4, 0.9, n),
+        "sz_top": rng.normal(3.4, 0.1, n),
+        "sz_bot": rng.normal(1.6, 0.1, n),
+        "pitch_id": [f"p{i}" for i in range(n)],
+        "team_role": "thrown_to_redsox",
+    })
+    writers.write_parquet(df, os.path.join(root, "pitches", "redsox_pitches_2025.parquet"))
+    return n
+
+
+def write_umpire_calls(root: str, games: int, pitches: int, rng: np.random.Generator) -> int:
+    """League-wide called pitches, one partition per game (umpire_scorecards layout)."""
+    called = max(1, pitches // 2)
+    dates = pd.date_range("2025-03-27", periods=max(1, games // 15)).strftime("%Y-%m-%d")
+    abbrs = np.array([t.abbr for t in teams.TEAMS])
+    total = 0
+    for g in range(games):
+        home, away = rng.choice(abbrs, 2, replace=False)
+        top = rng.random(called) < 0.5
+        df = pd.DataFrame({
+            "game_pk": 800_000 + g,
+            "game_date": dates[g % len(dates)],
+            "umpire_id": int(rng.integers(0, 90)),
+            "umpire_name": "",
+            "home_team": home,
+            "away_team": away,
+            "pitch_call": rng.choice(["called_strike", "ball"], called, p=[0.33, 0.67]),
+            "batting_team": np.where(top, away, home),
+            "fielding_team": np.where(top, home, away),
+            "pitch_in_zone": rng.random(called) < 0.35,
+            "dist_from_sz_edge_inches": rng.normal(0, 4, called),
+        })
+        df["umpire_name"] = "Umpire " + df["umpire_id"].astype(str)
+        path = umpire_scorecards.partition_path(2025, df["game_date"].iloc[0], 800_000 + g,
+                                                os.path.join(root, "umpires", "calls"))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        df.to_parquet(path, index=False)
+        total += len(df)
+    return total
+
+
+def write_franchise_games(root: str, seasons: int, rng: np.random.Generator) -> int:
+    """The all-franchise warehouse: one partition per season, every club's games."""
+    out_dir = os.path.join(root, "franchises", "games")
+    os.makedirs(out_dir, exist_ok=True)
+    total = 0
+    last = 2025
+    for year in range(last - seasons + 1, last + 1):
+        frames = []
+        for franchise, _, code in franchise_warehouse.team_seasons([t.abbr for t in teams.TEAMS], [year]):
+            n = 154 if year < 1961 else 162
+            frames.append(pd.DataFrame({
+                "franchise": franchise, "bbref_code": code, "year": year, "gm": np.arange(1, n + 1),
+                "game_date": pd.date_range(f"{year}-04-01", periods=n).strftime("%Y-%m-%d"),
+                "home_away": rng.choice(["home", "away"], n), "opp": code, "opp_franchise": franchise,
+                "result": rng.choice(["W", "L"], n), "r": rng.integers(0, 12, n), "ra": rng.integers(0, 12, n),
+                "attendance": rng.integers(5_000, 50_000, n),
+            }).reindex(columns=list(franchise_warehouse.COLUMNS)).astype(franchise_warehouse.COLUMNS))
+        df = pd.concat(frames, ignore_index=True)
+        df.to_parquet(franchise_warehouse.partition_path(year, out_dir), index=False)
+        total += len(df)
+    return total
+
+
+# --- Cases ---------------------------------------------------------------------
+
+
+def _pitch_file(root: str) -> str:
+    return os.path.join(root, "pitches", "redsox_pitches_2025.parquet")
+
+
+def rollup_counts_pandas(root: str) -> pd.DataFrame:
+    # 21 before the query layer: load every pitch, count per game, keep the newest game's rows
+    pitches = pd.read_parquet(_pitch_file(root))
+    counts = Counter(pitches["game_pk"].astype(str))
+    newest = max(counts, key=int)
+    return pitches[pitches["game_pk"].astype(str) == newest].reset_index(drop=True)
+
+
+def rollup_counts_sql(root: str) -> pd.DataFrame:
+    with query_layer.QueryLayer(root) as q:
+        counts = dict(q.conn.execute("SELECT CAST(game_pk AS VARCHAR), COUNT(*) FROM pitches GROUP BY game_pk").fetchall())
+        newest = max(counts, key=int)
+        return q.sql("SELECT * FROM pitches WHERE CAST(game_pk AS VARCHAR) IN (SELECT UNNEST(?::VARCHAR[]))",
+                     [[newest]])
+
+
+def umpire_accuracy_pandas(root: str) -> pd.DataFrame:
+    calls = umpire_scorecards.load_calls(2025, os.path.join(root, "umpires", "calls"))
+    correct = (calls["pitch_call"] == "called_strike") == calls["pitch_in_zone"]
+    out = calls.assign(correct=correct).groupby("umpire_id").agg(
+        called_pitches=("correct", "size"), correct_calls=("correct", "sum"))
+    out["accuracy_pct"] = out["correct_calls"] / out["called_pitches"] * 100
+    return out.reset_index().sort_values("umpire_id", ignore_index=True)
+
+
+def umpire_accuracy_sql(root: str) -> pd.DataFrame:
+    with query_layer.QueryLayer(root) as q:
+        return q.sql("""
+            SELECT umpire_id,
+                   COUNT(*) AS called_pitches,
+                   SUM(CAST((pitch_call = 'called_strike') = pitch_in_zone AS INTEGER)) AS correct_calls,
+                   100.0 * correct_calls / called_pitches AS accuracy_pct
+            FROM umpire_calls GROUP BY umpire_id ORDER BY umpire_id
+        """)
+
+
+def best_start_pandas(root: str) -> pd.DataFrame:
+    games = franchise_warehouse.FranchiseGames.load(os.path.join(root, "franchises", "games"))
+    return games.best_starts(60, top=10)[["franchise", "year", "wins", "losses", "run_diff"]]
+
+
+def best_start_sql(root: str) -> pd.DataFrame:
+    with query_layer.QueryLayer(root) as q:
+        return q.sql("""
+            SELECT franchise, year,
+                   SUM(CAST(result LIKE 'W%' AS INTEGER)) AS wins,
+                   SUM(CAST(result LIKE 'L%' AS INTEGER)) AS losses,
+                   SUM(r) - SUM(ra) AS run_diff
+            FROM franchise_games WHERE gm <= 60
+            GROUP BY franchise, year HAVING MAX(gm) = 60
+            -- same order as FranchiseGames.best_starts: win% to 3 places, run differential, then index order
+            ORDER BY ROUND(SUM(CAST(result LIKE 'W%' AS INTEGER)) / NULLIF(SUM(CAST(result SIMILAR TO '[WL].*' AS INTEGER)), 0), 3) DESC,
+                     SUM(r) - SUM(ra) DESC, franchise, year
+            LIMIT 10
+        """)
+
+
+def team_history_pandas(root: str) -> pd.DataFrame:
+    # 07's "win% at this point of the season" over a decade, from a full history load
+    history = franchise_warehouse.load_partitions(os.path.join(root, "franchises", "games"))
+    rows = history[(history["franchise"] == "BOS") & (history["gm"] <= 100) & (history["year"] >= 2015)]
+    return (rows.groupby("year").agg(wins=("result", lambda r: int(r.str.startswith("W").sum())))
+            .reset_index().sort_values("year", ignore_index=True))
+
+
+def team_history_sql(root: str) -> pd.DataFrame:
+    with query_layer.QueryLayer(root) as q:
+        return q.sql("""
+            SELECT year, SUM(CAST(result LIKE 'W%' AS INTEGER)) AS wins FROM franchise_games
+            WHERE franchise = ? AND gm <= ? AND year >= ? GROUP BY year ORDER BY year
+        """, ["BOS", 100, 2015])
+
+
+CASES = [
+    QueryCase("rollup_counts", "21: per-game pitch counts + rows of the game to roll up",
+              rollup_counts_pandas, rollup_counts_sql),
+    QueryCase("umpire_accuracy", "33: called-pitch accuracy per umpire, league season",
+              umpire_accuracy_pandas, umpire_accuracy_sql),
+    QueryCase("best_start", "warehouse: best 60-game start, all franchises and seasons",
+              best_start_pandas, best_start_sql),
+    QueryCase("team_history", "07-style: one team's wins through game 100, last decade",
+              team_history_pandas, team_history_sql),
+]
+
+
+# --- Runner --------------------------------------------------------------------
+
+
+def _status_mib(field: str) -> float:
+    """A memory field (VmRSS, VmHWM) of /proc/self/status in MiB; 0 when unavailable."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith(field + ":"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return 0.0
+
+
+def _reset_peak_rss() -> bool:
+    """Reset the process's RSS high-water mark (Linux); False where that isn't possible."""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def _run(case_name: str, path: str, root: str, repeat: int) -> Tuple[float, float, pd.DataFrame]:
+    """In a fresh process: (best seconds, peak RSS MiB above the RSS before the runs, result)."""
+    case = next(c for c in CASES if c.name == case_name)
+    func = case.pandas if path == "pandas" else case.sql
+    before = _status_mib("VmRSS")
+    if not _reset_peak_rss():
+        # Without /proc only the lifetime peak is known, which includes the imports
+        before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func(root)
+        best = min(best, time.perf_counter() - started)
+    peak = _status_mib("VmHWM") or resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return best, max(0.0, peak - before), result
+
+
+def _same_rows(a: pd.DataFrame, b: pd.DataFrame) -> bool:
+    if a.shape != b.shape:
+        return False
+    a, b = a.reset_index(drop=True), b.reset_index(drop=True)
+    for col in a.columns:
+        x = pd.to_numeric(a[col], errors="coerce")
+        y = pd.to_numeric(b[col], errors="coerce")
+        if x.notna().all() and y.notna().all():
+            if not np.allclose(x.astype(float), y.astype(float)):
+                return False
+        elif not (a[col].astype(str).to_numpy() == b[col].astype(str).to_numpy()).all():
+            return False
+    return True
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(description="Benchmark the DuckDB query layer against the pandas paths")
+    parser.add_argument("--games", type=int, default=2430, help="Games in the pitch and umpire datasets (default: 2430)")
+    parser.add_argument("--pitches", type=int, default=300, help="Pitches per game (default: 300)")
+    parser.add_argument("--seasons", type=int, default=125, help="Seasons in the franchise warehouse (default: 125)")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per path, best time reported (default: 3)")
+    parser.add_argument("--cases", default=",".join(c.name for c in CASES), help="Comma-separated cases to run")
+    parser.add_argument("--workdir", help="Directory for the datasets (default: a temporary directory)")
+    parser.add_argument("--seed", type=int, default=0)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_arguments()
+    if not query_layer.available():
+        sys.exit("duckdb is not installed (pip install duckdb)")
+    selected = [c for c in CASES if c.name in {s.strip() for s in args.cases.split(",")}]
+    workdir_ctx = nullcontext(args.workdir) if args.workdir else tempfile.TemporaryDirectory(prefix="redsox-query-")
+    with workdir_ctx as root:
+        os.makedirs(root, exist_ok=True)
+        rng = np.random.default_rng(args.seed)
+        started = time.perf_counter()
+        sizes: Dict[str, int] = {}
+        needed = {c.name for c in selected}
+        if "rollup_counts" in needed:
+            sizes["pitches"] = write_pitches(root, args.games, args.pitches, rng)
+        if "umpire_accuracy" in needed:
+            sizes["umpire_calls"] = write_umpire_calls(root, args.games, args.pitches, rng)
+        if needed & {"best_start", "team_history"}:
+            sizes["franchise_games"] = write_franchise_games(root, args.seasons, rng)
+        print(f"Datasets ({time.perf_counter() - started:.1f}s): "
+              + ", ".join(f"{name} {rows:,} rows" for name, rows in sizes.items()) + "\n")
+
+        ctx = multiprocessing.get_context("spawn")
+        lines: List[str] = []
+        for case in selected:
+            results = {}
+            for path in ("pandas", "sql"):
+                with ctx.Pool(1) as pool:
+                    results[path] = pool.apply(_run, (case.name, path, root, args.repeat))
+            same = _same_rows(results["pandas"][2], results["sql"][2])
+            (pd_s, pd_mib, pd_df), (sql_s, sql_mib, _) = results["pandas"], results["sql"]
+            lines.append(f"{case.name:<16} {pd_s:>9.3f} {sql_s:>9.3f} {pd_s / sql_s:>7.1f}x "
+                         f"{pd_mib:>10.1f} {sql_mib:>10.1f} {len(pd_df):>7,} {'yes' if same else 'NO':>5}  "
+                         f"{case.description}")
+            if not same:
+                print(f"  {case.name}: results differ between the pandas and SQL paths")
+
+        print(f"{'case':<16} {'pandas s':>9} {'sql s':>9} {'speedup':>8} {'pandas MiB':>10} {'sql MiB':>10} "
+              f"{'rows':>7} {'same':>5}")
+        print("\n".join(lines))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+"""
+Refresh the benchmark fixtures from the live endpoints.
+
+Payloads are stored under the fixture names run_benchmarks.py expects, whatever
+game or date is recorded. Re-record the baseline afterwards, since a different
+payload size changes every timing:
+
+    python -m benchmarks.record_fixtures --game-pk 776512 --lineup-date 2025-09-12
+    python -m benchmarks.run_benchmarks --update-baseline
+"""
+
+import argparse
+import gzip
+import json
+import logging
+import os
+import time
+
+import requests
+
+from benchmarks.harness import FIXTURES_DIR
+from benchmarks.run_benchmarks import (
+    BBREF_FIXTURE,
+    BBREF_YEAR,
+    GAMEFEED_FIXTURE,
+    GAMELOGS_FIXTURE,
+    LINEUP_FIXTURE,
+    SCHEDULE_FIXTURE,
+    STANDINGS_FIXTURE,
+)
+from scripts import config
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/137.0.0.0 Safari/537.36"
+}
+
+
+def fetch(url: str) -> bytes:
+    logging.info(f"Recording {url}")
+    response = requests.get(url, headers=HEADERS, timeout=30)
+    response.raise_for_status()
+    return response.content
+
+
+def write_fixture(name: str, content: bytes) -> None:
+    path = os.path.join(FIXTURES_DIR, name)
+    if name.endswith(".gz"):
+        with gzip.open(path, "wb") as f:
+            f.write(content)
+    else:
+        with open(path, "wb") as f:
+            f.write(content)
+    logging.info(f"Wrote {path} ({len(content):,} bytes)")
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(description="Re-record benchmark fixtures from live endpoints")
+    parser.add_argument("--game-pk", type=int, default=776512, help="Savant gamefeed to record (stored under the fixture name)")
+    parser.add_argument("--lineup-date", default="2025-09-12", help="Date of the MLB.com starting-lineups page")
+    parser.add_argument("--schedule-start", default="2025-09-08", help="First date of the statsapi team schedule window")
+    parser.add_argument("--schedule-end", default="2025-09-18", help="Last date of the statsapi team schedule window")
+    parser.add_argument("--season", type=int, default=2025, help="Season for the Savant gamelogs page")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_arguments()
+    os.makedirs(FIXTURES_DIR, exist_ok=True)
+
+    gamefeed = fetch(f"https://baseballsavant.mlb.com/gf?game_pk={args.game_pk}")
+    write_fixture(GAMEFEED_FIXTURE, gamefeed)
+
+    write_fixture(
+        SCHEDULE_FIXTURE,
+        fetch(
+            f"https://statsapi.mlb.com/api/v1/schedule?sportId=1&teamId={config.TEAM_ID}"
+            f"&startDate={args.schedule_start}&endDate={args.schedule_end}&hydrate=team,linescore,venue"
+        ),
+    )
+    write_fixture(
+        GAMELOGS_FIXTURE,
+        fetch(f"https://baseballsavant.mlb.com/team/{config.TEAM_ID}?view=gamelogs&nav=hitting&season={args.season}"),
+    )
+    write_fixture(
+        LINEUP_FIXTURE,
+        fetch(f"https://www.mlb.com/{config.TEAM_NAME.lower().replace(' ', '')}/roster/starting-lineups/{args.lineup_date}"),
+    )
+
+    # Be respectful to Baseball Reference
+    time.sleep(3)
+    write_fixture(
+        BBREF_FIXTURE,
+        fetch(f"https://www.baseball-reference.com/teams/{config.TEAM_ID_BBREF}/{BBREF_YEAR}-schedule-scores.shtml"),
+    )
+
+    standings = fetch(f"https://redsox-data.s3.amazonaws.com/redsox/data/standings/all_teams_standings_metrics_{args.season}.json")
+    json.loads(standings)
+    write_fixture(STANDINGS_FIXTURE, standings)
+
+    logging.info("Fixtures recorded. Boxscore rows (redsox_boxscores_sample.json) come from 02's archive and are not re-recorded.")
+
+
+if __name__ == "__main__":
+    main()
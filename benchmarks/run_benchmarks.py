@@ -0,0 +1,290 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+"""
+Micro-benchmarks for the pipeline's hot parsers and transforms.
+
+Every case runs a real function from scripts/ against a stored payload in
+benchmarks/fixtures/, so no network or S3 access is needed. Each case's best
+time (the minimum over its repeats) is compared with its best_ms in
+benchmarks/baseline.json. A case fails the run only when it is slower by more
+than the tolerance AND by more than an absolute floor in milliseconds, so
+sub-millisecond cases do not trip on scheduler noise. The calibration loop is
+still timed and printed, to tell a slow machine apart from a slow change, but
+it does not feed the gate: a pure-Python loop does not scale the way the
+numpy/pandas cases do. Baselines are per machine; re-record them on a new one.
+
+Usage:
+    python -m benchmarks.run_benchmarks
+    python -m benchmarks.run_benchmarks --only 07 --tolerance 0.5
+    python -m benchmarks.run_benchmarks --update-baseline
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import sys
+import tempfile
+from datetime import datetime
+from typing import Any, Callable, Dict, List, NamedTuple
+
+import pandas as pd
+
+from benchmarks.harness import (
+    RecordedRequests,
+    calibrate,
+    load_stage,
+    read_fixture,
+    read_json_fixture,
+    time_call,
+)
+from scripts import config
+from scripts import game_pitches
+from scripts import projection
+from scripts import writers
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+DEFAULT_TOLERANCE = 0.30
+DEFAULT_MIN_DELTA_MS = 1.0
+
+GAMEFEED_FIXTURE = "savant_gf_776512.json.gz"
+SCHEDULE_FIXTURE = f"statsapi_schedule_{config.TEAM_ID}.json"
+GAMELOGS_FIXTURE = f"savant_gamelogs_{config.TEAM_ID}.html"
+BBREF_YEAR = 2024
+BBREF_FIXTURE = f"bbref_schedule_{config.TEAM_ID_BBREF}_{BBREF_YEAR}.html.gz"
+LINEUP_FIXTURE = "mlb_starting_lineups_2025-09-12.html"
+BOXSCORES_FIXTURE = "redsox_boxscores_sample.json"
+STANDINGS_FIXTURE = "all_teams_standings_metrics_2025.json"
+
+
+class Case(NamedTuple):
+    name: str
+    setup: Callable[[], Callable[[], Any]]
+    number: int
+
+
+def _live_standings() -> pd.DataFrame:
+    return pd.DataFrame(read_json_fixture(STANDINGS_FIXTURE)["teams"])
+
+
+def setup_build_boxscore_row():
+    stage = load_stage("02_update_boxscores_archive.py")
+    gamefeed = read_json_fixture(GAMEFEED_FIXTURE)
+    assert stage["build_boxscore_row"](gamefeed) is not None
+    return lambda: stage["build_boxscore_row"](gamefeed)
+
+
+def setup_parse_game_log_rows():
+    stage = load_stage("02_update_boxscores_archive.py")
+    table = stage["find_gamelog_table"](read_fixture(GAMELOGS_FIXTURE).decode("utf-8"))
+    assert not stage["parse_game_log_rows"](table).empty
+    return lambda: stage["parse_game_log_rows"](table)
+
+
+def setup_analyze_pitches():
+    gamefeed = read_json_fixture(GAMEFEED_FIXTURE)
+    stage = load_stage("20_fetch_game_pitches.py", {"fetch_game_pitches": lambda game_pk: gamefeed})
+    game_info = {"gamePk": gamefeed["scoreboard"]["gamePk"], "team_side": "home_batters", "game_date": gamefeed["game_date"]}
+
+    def run():
+        to_team = stage["analyze_pitches"](game_info, team_role="thrown_to_redsox")
+        by_team = stage["analyze_pitches"](game_info, batting_side_override="away_batters", team_role="thrown_by_redsox")
+        return to_team, by_team
+
+    assert all(run())
+    return run
+
+
+def setup_write_pitch_json():
+    gamefeed = read_json_fixture(GAMEFEED_FIXTURE)
+    rows = game_pitches.pitch_rows(gamefeed, "home_batters", gamefeed["scoreboard"]["gamePk"], gamefeed["game_date"])
+    # About a season's worth of pitches seen by one team
+    df = pd.DataFrame(rows * max(1, 24000 // max(1, len(rows))))
+    path = os.path.join(tempfile.mkdtemp(prefix="bench_writers_"), "pitches.json")
+    writers.write_json_array(df, path)
+    assert os.path.getsize(path) > 0
+    return lambda: writers.write_json_array(df, path)
+
+
+def setup_parse_year_data():
+    stage = load_stage("29_fetch_historical_standings.py")
+    html = read_fixture(BBREF_FIXTURE)
+    df = stage["parse_year_data"](html, BBREF_YEAR)
+    assert df is not None and not df.empty
+    return lambda: stage["parse_year_data"](html, BBREF_YEAR)
+
+
+def setup_build_wins_losses():
+    stage = load_stage("09_build_wins_losses_from_boxscores.py")
+    boxscores = pd.DataFrame(read_json_fixture(BOXSCORES_FIXTURE))
+    assert not stage["build_wins_losses"](boxscores).empty
+    return lambda: stage["build_wins_losses"](boxscores)
+
+
+def setup_projection():
+    stage = load_stage("09_build_wins_losses_from_boxscores.py")
+    games = stage["build_wins_losses"](pd.DataFrame(read_json_fixture(BOXSCORES_FIXTURE))).head(100)
+    wins = (games["result"] == "W").to_numpy()
+    runs_scored, runs_allowed = games["r"].to_numpy(), games["ra"].to_numpy()
+
+    def run():
+        (path_rng, history_rng), _ = projection.make_streams(0)
+        draws = projection.simulate_remaining("bootstrap", wins, runs_scored, runs_allowed,
+                                              projection.SEASON_GAMES - len(wins), projection.DEFAULT_SIMULATIONS, path_rng)
+        projection.project_remaining(int(wins.sum()), draws)
+        return projection.projection_history("bootstrap", wins, runs_scored, runs_allowed,
+                                             projection.DEFAULT_SIMULATIONS, history_rng)
+
+    assert len(run()["mean"]) == len(wins) - projection.MIN_GAMES + 1
+    return run
+
+
+def setup_compute_games_up_back():
+    stage = load_stage("07_create_toplines_summary.py")
+    live = _live_standings()
+    assert stage["compute_games_up_back_from_live"](live, config.TEAM_FULL_NAME) is not None
+    return lambda: stage["compute_games_up_back_from_live"](live, config.TEAM_FULL_NAME)
+
+
+def setup_generate_summary():
+    recorded = RecordedRequests({"statsapi.mlb.com/api/v1/schedule": SCHEDULE_FIXTURE})
+    stage = load_stage("07_create_toplines_summary.py", {"requests": recorded})
+    live = _live_standings()
+    team_row = live[live["team_name"] == config.TEAM_FULL_NAME]
+    summary = stage["generate_summary"]("September 12", team_row)
+    assert "could not" not in summary.lower()
+
+    def run():
+        # One team snapshot per summary, as in a real run
+        stage["_team_snapshot_cache"].clear()
+        return stage["generate_summary"]("September 12", team_row)
+
+    return run
+
+
+def setup_normalize_name():
+    stage = load_stage("15_fetch_xwoba.py")
+    gamefeed = read_json_fixture(GAMEFEED_FIXTURE)
+    names: List[str] = []
+    for side in ("home_batters", "away_batters"):
+        for pitches in gamefeed[side].values():
+            for pitch in pitches:
+                names.extend([pitch["batter_name"], pitch["pitcher_name"]])
+    names.extend(stage["NAME_CORRECTIONS"].keys())
+    normalize = stage["normalize_name"]
+    return lambda: [normalize(name) for name in names]
+
+
+def setup_parse_lineup_html():
+    stage = load_stage("17_fetch_lineup.py")
+    html = read_fixture(LINEUP_FIXTURE)
+    assert not stage["parse_lineup_html"](html, "2025-09-12").empty
+    return lambda: stage["parse_lineup_html"](html, "2025-09-12")
+
+
+CASES = [
+    Case("02.build_boxscore_row", setup_build_boxscore_row, 2000),
+    Case("02.parse_game_log_rows", setup_parse_game_log_rows, 20),
+    Case("07.compute_games_up_back_from_live", setup_compute_games_up_back, 50),
+    Case("07.generate_summary", setup_generate_summary, 20),
+    Case("09.build_wins_losses", setup_build_wins_losses, 50),
+    Case("15.normalize_name", setup_normalize_name, 20),
+    Case("17.parse_lineup_html", setup_parse_lineup_html, 20),
+    Case("18.projection", setup_projection, 5),
+    Case("20.analyze_pitches", setup_analyze_pitches, 100),
+    Case("29.parse_year_data", setup_parse_year_data, 5),
+    Case("writers.write_json_array", setup_write_pitch_json, 5),
+]
+
+
+def load_baseline(path: str) -> Dict[str, Any]:
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_baseline(path: str, calibration_ms: float, results: Dict[str, Dict[str, float]]) -> None:
+    baseline = {
+        "recorded_at": datetime.now().strftime("%Y-%m-%d"),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "calibration_ms": round(calibration_ms, 4),
+        "cases": {
+            name: {"best_ms": float(f"{r['best_ms']:.6g}"), "relative": float(f"{r['relative']:.6g}")}
+            for name, r in sorted(results.items())
+        },
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(baseline, f, indent=2)
+        f.write("\n")
+    logging.info(f"Baseline written to {path}")
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(description="Benchmark pipeline parsers and transforms on recorded payloads")
+    parser.add_argument("--only", help="Run only cases whose name contains this text (e.g. '07' or 'parse')")
+    parser.add_argument("--repeat", type=int, default=7, help="Timing samples per case (default: 7)")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help=f"Allowed slowdown vs baseline before failing (default: {DEFAULT_TOLERANCE:.0%})")
+    parser.add_argument("--min-delta-ms", type=float, default=DEFAULT_MIN_DELTA_MS,
+                        help=f"Slowdowns smaller than this many ms never fail (default: {DEFAULT_MIN_DELTA_MS})")
+    parser.add_argument("--baseline", default=BASELINE_FILE, help="Baseline file to compare against")
+    parser.add_argument("--update-baseline", action="store_true", help="Record these results as the new baseline")
+    return parser.parse_args()
+
+
+def main():
+    logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(levelname)s - %(message)s')
+    args = parse_arguments()
+
+    cases = [c for c in CASES if not args.only or args.only in c.name]
+    if not cases:
+        print(f"No benchmark cases match '{args.only}'")
+        sys.exit(1)
+
+    calibration_ms = calibrate() * 1000
+    baseline = load_baseline(args.baseline).get("cases", {})
+    results: Dict[str, Dict[str, float]] = {}
+    regressions = []
+
+    print(f"Calibration loop: {calibration_ms:.2f} ms\n")
+    print(f"{'case':<38} {'best ms':>10} {'median ms':>10} {'relative':>9} {'baseline':>10} {'change':>8}")
+    for case in cases:
+        run = case.setup()
+        timing = time_call(run, case.number, args.repeat)
+        relative = timing["best_ms"] / calibration_ms
+        results[case.name] = {**timing, "relative": relative}
+
+        expected = baseline.get(case.name, {}).get("best_ms")
+        if expected:
+            delta_ms = timing["best_ms"] - expected
+            change = delta_ms / expected
+            change_text = f"{change:+.0%}"
+            if delta_ms > max(args.tolerance * expected, args.min_delta_ms):
+                regressions.append((case.name, change, delta_ms))
+                change_text += " !!"
+        else:
+            change_text = "new"
+        print(f"{case.name:<38} {timing['best_ms']:>10.3f} {timing['median_ms']:>10.3f} {relative:>9.3f} "
+              f"{(f'{expected:.3f}' if expected else '-'):>10} {change_text:>8}")
+
+    if args.update_baseline:
+        merged = {name: entry for name, entry in load_baseline(args.baseline).get("cases", {}).items()}
+        merged.update(results)
+        save_baseline(args.baseline, calibration_ms, merged)
+        return
+
+    if regressions:
+        print(f"\nREGRESSION: {len(regressions)} case(s) slower than baseline by more than "
+              f"{args.tolerance:.0%} and {args.min_delta_ms:g} ms:")
+        for name, change, delta_ms in regressions:
+            print(f"  {name}: {change:+.0%} ({delta_ms:+.2f} ms)")
+        sys.exit(1)
+    print("\nAll cases within tolerance of baseline.")
+
+
+if __name__ == "__main__":
+    main()
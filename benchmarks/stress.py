@@ -0,0 +1,220 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+"""
+League-scale stress test for the boxscore and pitch stages.
+
+Streams a synthetic league (benchmarks/synthetic.py) through the real functions
+from 02, 09, 20, 21 and 22, loaded with the same definitions-only harness as the
+micro-benchmarks. It reports wall time and peak traced memory for each stage.
+Generating the synthetic games is timed separately, so it doesn't count against
+the stages.
+
+Usage:
+    python -m benchmarks.stress --teams 30 --seasons 10 --pitches 300
+    python -m benchmarks.stress --teams 4 --seasons 1 --stages 02,09
+    python -m benchmarks.stress --teams 30 --seasons 2 --profile   # cProfile reports per stage
+"""
+
+import argparse
+import logging
+import os
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from typing import Dict, List
+
+import pandas as pd
+
+from benchmarks.harness import load_stage
+from benchmarks.synthetic import SyntheticLeague
+from scripts.profiling import profile_stage
+
+STAGES = ["02", "09", "20", "21", "22"]
+
+
+class StageReport:
+    def __init__(self, name: str):
+        self.name = name
+        self.seconds = 0.0
+        self.generate_seconds = 0.0
+        self.peak_mib = 0.0
+        self.items = 0
+        self.note = ""
+
+
+@contextmanager
+def measured(report: StageReport, trace_memory: bool):
+    if trace_memory:
+        tracemalloc.start()
+    try:
+        yield
+    finally:
+        if trace_memory:
+            report.peak_mib = tracemalloc.get_traced_memory()[1] / 1024 / 1024
+            tracemalloc.stop()
+
+
+def run_boxscores(league: SyntheticLeague, report: StageReport) -> pd.DataFrame:
+    """02: build a boxscore row per game from each club's perspective."""
+    stage = load_stage("02_update_boxscores_archive.py")
+    rows: List[dict] = []
+    games = league.iter_gamefeeds()
+    while True:
+        started = time.perf_counter()
+        item = next(games, None)
+        report.generate_seconds += time.perf_counter() - started
+        if item is None:
+            break
+        game, gamefeed = item
+        started = time.perf_counter()
+        for team in (game.home, game.away):
+            stage["DODGERS_TEAM_ID"] = team.team_id
+            row = stage["build_boxscore_row"](gamefeed)
+            if row is not None:
+                row["team_id"] = team.team_id
+                rows.append(row)
+        report.seconds += time.perf_counter() - started
+    started = time.perf_counter()
+    archive = pd.DataFrame(rows)
+    report.seconds += time.perf_counter() - started
+    report.items = len(archive)
+    return archive
+
+
+def run_wins_losses(archive: pd.DataFrame, report: StageReport) -> None:
+    """09: wins/losses series for every team-season."""
+    stage = load_stage("09_build_wins_losses_from_boxscores.py")
+    archive = archive.assign(season=archive["date"].str[:4])
+    started = time.perf_counter()
+    for _, team_season in archive.groupby(["team_id", "season"]):
+        stage["build_wins_losses"](team_season)
+        report.items += 1
+    report.seconds = time.perf_counter() - started
+
+
+def run_pitches(league: SyntheticLeague, workdir: str, report: StageReport) -> Dict[str, str]:
+    """20: annotate every pitch (both halves of every game) and write the JSON outputs."""
+    current: Dict[str, dict] = {}
+    stage = load_stage("20_fetch_game_pitches.py", {"fetch_game_pitches": lambda game_pk: current["gamefeed"]})
+    pitches_to: List[dict] = []
+    pitches_by: List[dict] = []
+    games = league.iter_gamefeeds()
+    while True:
+        started = time.perf_counter()
+        item = next(games, None)
+        report.generate_seconds += time.perf_counter() - started
+        if item is None:
+            break
+        game, gamefeed = item
+        current["gamefeed"] = gamefeed
+        game_info = {"gamePk": game.game_pk, "team_side": "home_batters", "game_date": game.game_date}
+        started = time.perf_counter()
+        pitches_to.extend(stage["analyze_pitches"](game_info, team_role="thrown_to_redsox"))
+        pitches_by.extend(stage["analyze_pitches"](game_info, batting_side_override="away_batters", team_role="thrown_by_redsox"))
+        report.seconds += time.perf_counter() - started
+
+    started = time.perf_counter()
+    paths = {"to": os.path.join(workdir, "pitches.json"), "by": os.path.join(workdir, "pitches_thrown.json")}
+    for key, rows in (("to", pitches_to), ("by", pitches_by)):
+        df = stage["combine_and_dedupe"](pd.DataFrame(), pd.DataFrame(rows))
+        df.to_json(paths[key], indent=4, orient="records")
+    report.seconds += time.perf_counter() - started
+    report.items = len(pitches_to) + len(pitches_by)
+    return paths
+
+
+def run_umpire_summary(paths: Dict[str, str], workdir: str, report: StageReport) -> None:
+    """21: build the umpire rollups from scratch over the full pitch files, then time a no-new-games rerun."""
+    stage = load_stage("21_summarize_pitch_data.py", {
+        "LOCAL_JSON_PATH": os.path.join(workdir, "summary", "umpire_summary.json"),
+        "ROLLUP_LOCAL_PATH": os.path.join(workdir, "summary", "umpire_rollups_{year}.json"),
+        "upload_to_s3": lambda file_path, key=None: None,
+        # The lookup goes through gamefeed_cache (live statsapi, data/gamefeeds/); keep the run offline
+        "get_home_plate_umpire": lambda game_pk: {"id": 0, "name": "Synthetic Umpire"},
+    })
+    started = time.perf_counter()
+    stage["analyze_pitches"](paths["to"], thrown_by_file_path=paths["by"], season="stress")
+    report.seconds = time.perf_counter() - started
+    started = time.perf_counter()
+    stage["analyze_pitches"](paths["to"], thrown_by_file_path=paths["by"], season="stress")
+    report.note = f"incremental rerun {time.perf_counter() - started:.2f}s"
+    report.items = 1
+
+
+def run_visualization(paths: Dict[str, str], workdir: str, report: StageReport) -> None:
+    """22: called-strike plot over the full pitch file."""
+    stage = load_stage("22_visualize_bad_calls.py")
+    if "plt" not in stage or "sns" not in stage:
+        report.note = "skipped: matplotlib/seaborn not installed"
+        return
+    started = time.perf_counter()
+    stage["visualize_called_strikes"](paths["to"], os.path.join(workdir, "images"))
+    report.seconds = time.perf_counter() - started
+    report.items = 1
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(description="Stress-test pipeline stages on a synthetic league")
+    parser.add_argument("--teams", type=int, default=30, help="Number of clubs (default: 30)")
+    parser.add_argument("--seasons", type=int, default=10, help="Number of seasons (default: 10)")
+    parser.add_argument("--pitches", type=int, default=300, help="Pitches per game (default: 300)")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the synthetic league (default: 0)")
+    parser.add_argument("--stages", default=",".join(STAGES), help=f"Comma-separated stages to run (default: {','.join(STAGES)})")
+    parser.add_argument("--workdir", help="Directory for intermediate files (default: a temporary directory)")
+    parser.add_argument("--no-tracemalloc", action="store_true", help="Skip peak-memory tracing (lower overhead)")
+    parser.add_argument("--profile", action="store_true", help="Also write cProfile reports per stage to data/profiles/")
+    return parser.parse_args()
+
+
+def main():
+    logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(levelname)s - %(message)s')
+    args = parse_arguments()
+    stages = [s.strip() for s in args.stages.split(",") if s.strip()]
+    league = SyntheticLeague(teams=args.teams, seasons=args.seasons, pitches_per_game=args.pitches, seed=args.seed)
+    games_per_season = sum(1 for _ in league.iter_schedule(league.seasons[0]))
+    print(f"Synthetic league: {args.teams} teams x {args.seasons} seasons ({league.seasons[0]}-{league.seasons[-1]}), "
+          f"{games_per_season * args.seasons:,} games, ~{games_per_season * args.seasons * args.pitches:,} pitches\n")
+
+    workdir_ctx = nullcontext(args.workdir) if args.workdir else tempfile.TemporaryDirectory(prefix="redsox-stress-")
+    reports: List[StageReport] = []
+    with workdir_ctx as workdir:
+        os.makedirs(workdir, exist_ok=True)
+        archive = None
+        paths = None
+        for name in STAGES:
+            if name not in stages:
+                continue
+            report = StageReport(name)
+            profiler = profile_stage(f"stress_{name}", trace_memory=False) if args.profile else nullcontext()
+            with profiler, measured(report, not args.no_tracemalloc):
+                if name == "02":
+                    archive = run_boxscores(league, report)
+                elif name == "09":
+                    if archive is None:
+                        archive = run_boxscores(league, StageReport("02"))
+                    run_wins_losses(archive, report)
+                elif name == "20":
+                    paths = run_pitches(league, workdir, report)
+                elif name in ("21", "22"):
+                    if paths is None:
+                        paths = run_pitches(league, workdir, StageReport("20"))
+                    if name == "21":
+                        run_umpire_summary(paths, workdir, report)
+                    else:
+                        run_visualization(paths, workdir, report)
+            reports.append(report)
+            print(f"  finished {name}: {report.seconds:.1f}s")
+
+        print(f"\n{'stage':<6} {'items':>12} {'stage s':>10} {'generate s':>11} {'peak MiB':>10}  note")
+        for r in reports:
+            peak = f"{r.peak_mib:.1f}" if not args.no_tracemalloc else "-"
+            print(f"{r.name:<6} {r.items:>12,} {r.seconds:>10.2f} {r.generate_seconds:>11.2f} {peak:>10}  {r.note}")
+        if paths:
+            sizes = ", ".join(f"{os.path.basename(p)} {os.path.getsize(p) / 1024 / 1024:.1f} MiB" for p in paths.values())
+            print(f"\nPitch outputs: {sizes}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,290 @@
+"""
+Synthetic league data for scale testing.
+
+Generates Savant-style gamefeeds, per-team boxscore rows and all-teams standings
+for any number of clubs and seasons. Everything is produced lazily and
+deterministically from a seed: a game is rebuilt identically whenever it is
+requested, so a full league never has to be held in memory.
+
+    league = SyntheticLeague(teams=30, seasons=10, pitches_per_game=300)
+    for game, gamefeed in league.iter_gamefeeds():
+        ...
+"""
+
+import random
+from datetime import date, timedelta
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from faker import Faker
+
+# (team_id, abbreviation, name, league, division, venue_id, venue_name)
+TEAMS = [
+    (110, "BAL", "Baltimore Orioles", "American League", "American League East", 2, "Oriole Park at Camden Yards"),
+    (111, "BOS", "Boston Red Sox", "American League", "American League East", 3, "Fenway Park"),
+    (147, "NYY", "New York Yankees", "American League", "American League East", 3313, "Yankee Stadium"),
+    (139, "TB", "Tampa Bay Rays", "American League", "American League East", 12, "Tropicana Field"),
+    (141, "TOR", "Toronto Blue Jays", "American League", "American League East", 14, "Rogers Centre"),
+    (145, "CWS", "Chicago White Sox", "American League", "American League Central", 4, "Rate Field"),
+    (114, "CLE", "Cleveland Guardians", "American League", "American League Central", 5, "Progressive Field"),
+    (116, "DET", "Detroit Tigers", "American League", "American League Central", 2394, "Comerica Park"),
+    (118, "KC", "Kansas City Royals", "American League", "American League Central", 7, "Kauffman Stadium"),
+    (142, "MIN", "Minnesota Twins", "American League", "American League Central", 3312, "Target Field"),
+    (117, "HOU", "Houston Astros", "American League", "American League West", 2392, "Daikin Park"),
+    (108, "LAA", "Los Angeles Angels", "American League", "American League West", 1, "Angel Stadium"),
+    (133, "ATH", "Athletics", "American League", "American League West", 2529, "Sutter Health Park"),
+    (136, "SEA", "Seattle Mariners", "American League", "American League West", 680, "T-Mobile Park"),
+    (140, "TEX", "Texas Rangers", "American League", "American League West", 5325, "Globe Life Field"),
+    (144, "ATL", "Atlanta Braves", "National League", "National League East", 4705, "Truist Park"),
+    (146, "MIA", "Miami Marlins", "National League", "National League East", 4169, "loanDepot park"),
+    (121, "NYM", "New York Mets", "National League", "National League East", 3289, "Citi Field"),
+    (143, "PHI", "Philadelphia Phillies", "National League", "National League East", 2681, "Citizens Bank Park"),
+    (120, "WSH", "Washington Nationals", "National League", "National League East", 3309, "Nationals Park"),
+    (112, "CHC", "Chicago Cubs", "National League", "National League Central", 17, "Wrigley Field"),
+    (113, "CIN", "Cincinnati Reds", "National League", "National League Central", 2602, "Great American Ball Park"),
+    (158, "MIL", "Milwaukee Brewers", "National League", "National League Central", 32, "American Family Field"),
+    (134, "PIT", "Pittsburgh Pirates", "National League", "National League Central", 31, "PNC Park"),
+    (138, "STL", "St. Louis Cardinals", "National League", "National League Central", 2889, "Busch Stadium"),
+    (109, "AZ", "Arizona Diamondbacks", "National League", "National League West", 15, "Chase Field"),
+    (115, "COL", "Colorado Rockies", "National League", "National League West", 19, "Coors Field"),
+    (119, "LAD", "Los Angeles Dodgers", "National League", "National League West", 22, "Dodger Stadium"),
+    (135, "SD", "San Diego Padres", "National League", "National League West", 2680, "Petco Park"),
+    (137, "SF", "San Francisco Giants", "National League", "National League West", 2395, "Oracle Park"),
+]
+
+PITCH_TYPES = [
+    ("FF", "4-Seam Fastball", 95.0), ("SI", "Sinker", 93.5), ("FC", "Cutter", 89.5), ("SL", "Slider", 86.0),
+    ("ST", "Sweeper", 82.5), ("CU", "Curveball", 79.5), ("CH", "Changeup", 86.5), ("FS", "Split-Finger", 87.0),
+]
+
+GAMES_PER_SEASON = 162
+ROSTER_SIZE = 26
+ZONE_HALF_WIDTH = 0.708
+
+
+class Team(NamedTuple):
+    team_id: int
+    abbreviation: str
+    name: str
+    league: str
+    division: str
+    venue_id: int
+    venue_name: str
+
+
+class Game(NamedTuple):
+    game_pk: int
+    season: int
+    game_date: str
+    home: Team
+    away: Team
+
+
+class SyntheticLeague:
+    """Deterministic synthetic league: schedule, rosters, gamefeeds and standings."""
+
+    def __init__(self, teams: int = 30, seasons: int = 10, pitches_per_game: int = 300,
+                 first_season: Optional[int] = None, seed: int = 0):
+        if not 2 <= teams <= len(TEAMS):
+            raise ValueError(f"teams must be between 2 and {len(TEAMS)}")
+        self.teams = [Team(*t) for t in TEAMS[:teams]]
+        last_season = date.today().year - 1
+        self.first_season = first_season or last_season - seasons + 1
+        self.seasons = list(range(self.first_season, self.first_season + seasons))
+        self.pitches_per_game = pitches_per_game
+        self.seed = seed
+        self._rosters: Dict[Tuple[int, int], List[Tuple[int, str, str]]] = {}
+
+    # --- Rosters -----------------------------------------------------------
+
+    def roster(self, team: Team, season: int) -> List[Tuple[int, str, str]]:
+        """Return (player_id, name, role) for a team-season; pitchers are the last 13."""
+        key = (team.team_id, season)
+        if key not in self._rosters:
+            fake = Faker()
+            fake.seed_instance(self.seed * 1_000_003 + team.team_id * 10_007 + season)
+            players = []
+            for i in range(ROSTER_SIZE):
+                player_id = 100_000_000 + team.team_id * 100_000 + (season % 1000) * 100 + i
+                role = "pitcher" if i >= ROSTER_SIZE // 2 else "batter"
+                players.append((player_id, f"{fake.first_name_male()} {fake.last_name()}", role))
+            self._rosters[key] = players
+        return self._rosters[key]
+
+    # --- Schedule ----------------------------------------------------------
+
+    def iter_schedule(self, season: int) -> Iterator[Game]:
+        """Yield one season of games; every club plays once per day for 162 days."""
+        rng = random.Random(f"{self.seed}-schedule-{season}")
+        opening_day = date(season, 3, 27)
+        game_pk = season * 100_000
+        for day in range(GAMES_PER_SEASON):
+            order = self.teams[:]
+            rng.shuffle(order)
+            game_date = (opening_day + timedelta(days=day + day // 6)).isoformat()
+            for home, away in zip(order[0::2], order[1::2]):
+                game_pk += 1
+                yield Game(game_pk, season, game_date, home, away)
+
+    def iter_games(self) -> Iterator[Game]:
+        for season in self.seasons:
+            yield from self.iter_schedule(season)
+
+    def iter_gamefeeds(self) -> Iterator[Tuple[Game, dict]]:
+        for game in self.iter_games():
+            yield game, self.gamefeed(game)
+
+    # --- Gamefeeds ---------------------------------------------------------
+
+    def _team_payload(self, team: Team) -> dict:
+        return {
+            "id": team.team_id, "name": team.name, "abbreviation": team.abbreviation,
+            "teamName": team.name.split()[-1], "clubName": team.name.split()[-1],
+            "venue": {"id": team.venue_id, "name": team.venue_name},
+        }
+
+    def _half(self, rng: random.Random, game: Game, batting: Team, fielding: Team,
+              n_pitches: int, first_ab: int) -> Tuple[Dict[str, list], Dict[str, list]]:
+        batters = [p for p in self.roster(batting, game.season) if p[2] == "batter"][:9]
+        pitchers = [p for p in self.roster(fielding, game.season) if p[2] == "pitcher"]
+        per_inning = max(1, n_pitches // 9)
+        by_batter: Dict[str, list] = {}
+        by_pitcher: Dict[str, list] = {}
+        ab_number = first_ab
+        spot = 0
+        for inning in range(1, 10):
+            pitcher_id, pitcher_name, _ = pitchers[min(inning - 1, len(pitchers) - 1) // 3]
+            budget = per_inning if inning < 9 else n_pitches - per_inning * 8
+            while budget > 0:
+                batter_id, batter_name, _ = batters[spot % len(batters)]
+                spot += 1
+                stand = rng.choice("LR")
+                sz_top = round(rng.uniform(3.15, 3.65), 2)
+                sz_bot = round(rng.uniform(1.45, 1.75), 2)
+                pa_pitches = min(budget, rng.randint(1, 7))
+                balls = strikes = 0
+                at_bat = []
+                for pitch_number in range(1, pa_pitches + 1):
+                    pitch_type, pitch_name, velo = rng.choice(PITCH_TYPES)
+                    px = round(rng.gauss(0.0, 0.85), 2)
+                    pz = round(rng.gauss(2.45, 0.85), 2)
+                    in_zone = abs(px) <= ZONE_HALF_WIDTH + 0.12 and sz_bot - 0.12 <= pz <= sz_top + 0.12
+                    if rng.random() < (0.65 if in_zone else 0.28):
+                        call = rng.choice(("swinging_strike", "foul", "foul", "hit_into_play"))
+                    elif in_zone:
+                        call = "called_strike" if rng.random() < 0.9 else "ball"
+                    else:
+                        call = "ball" if rng.random() < 0.93 else "called_strike"
+                    at_bat.append({
+                        "play_id": f"{game.game_pk:x}-{ab_number:03d}-{pitch_number:02d}-{rng.getrandbits(32):08x}",
+                        "game_pk": game.game_pk, "inning": inning, "ab_number": ab_number, "pitch_number": pitch_number,
+                        "batter": batter_id, "batter_name": batter_name, "pitcher": pitcher_id, "pitcher_name": pitcher_name,
+                        "team_batting": batting.abbreviation, "team_fielding": fielding.abbreviation,
+                        "stand": stand, "p_throws": "R" if pitcher_id % 3 else "L",
+                        "pitch_type": pitch_type, "pitch_name": pitch_name,
+                        "start_speed": round(rng.gauss(velo, 1.3), 1),
+                        "pitch_call": call, "balls": balls, "strikes": strikes,
+                        "px": px, "pz": pz, "sz_top": sz_top, "sz_bot": sz_bot,
+                        "zone": rng.randint(1, 14), "result": None, "des": None,
+                    })
+                    if call == "ball":
+                        balls = min(balls + 1, 3)
+                    elif call != "hit_into_play":
+                        strikes = min(strikes + 1, 2)
+                result = rng.choice(("Strikeout", "Groundout", "Flyout", "Single", "Walk", "Double", "Home Run"))
+                for pitch in at_bat:
+                    pitch["result"] = result
+                    pitch["des"] = f"{batter_name}: {result.lower()}."
+                by_batter.setdefault(str(batter_id), []).extend(at_bat)
+                for pitch in at_bat:
+                    by_pitcher.setdefault(str(pitch["pitcher"]), []).append(pitch)
+                ab_number += 2
+                budget -= pa_pitches
+        return by_batter, by_pitcher
+
+    def final_score(self, game: Game) -> Tuple[int, int]:
+        """(home_runs, away_runs) for a game; never tied."""
+        rng = random.Random(f"{self.seed}-score-{game.game_pk}")
+        strength = {t.team_id: random.Random(f"{self.seed}-strength-{t.team_id}-{game.season}").gauss(4.5, 0.6)
+                    for t in (game.home, game.away)}
+        home_runs = max(0, int(round(rng.gauss(strength[game.home.team_id] + 0.15, 2.8))))
+        away_runs = max(0, int(round(rng.gauss(strength[game.away.team_id], 2.8))))
+        if home_runs == away_runs:
+            if rng.random() < 0.5:
+                home_runs += 1
+            else:
+                away_runs += 1
+        return home_runs, away_runs
+
+    def gamefeed(self, game: Game) -> dict:
+        """Savant /gf payload for a game, with the fields the pipeline reads."""
+        rng = random.Random(f"{self.seed}-gf-{game.game_pk}")
+        home_runs, away_runs = self.final_score(game)
+        innings = []
+        home_left, away_left = home_runs, away_runs
+        for num in range(1, 10):
+            h = home_left if num == 9 else min(home_left, rng.choice((0, 0, 0, 1, 2)))
+            a = away_left if num == 9 else min(away_left, rng.choice((0, 0, 0, 1, 2)))
+            home_left -= h
+            away_left -= a
+            innings.append({"num": num, "home": {"runs": h}, "away": {"runs": a}})
+
+        half = self.pitches_per_game // 2
+        home_batters, away_pitchers = self._half(rng, game, game.home, game.away, self.pitches_per_game - half, 2)
+        away_batters, home_pitchers = self._half(rng, game, game.away, game.home, half, 1)
+        return {
+            "game_status_code": "F",
+            "game_date": game.game_date,
+            "scoreboard": {
+                "gamePk": game.game_pk,
+                "status": {"abstractGameState": "Final", "detailedState": "Final", "statusCode": "F"},
+                "teams": {"home": self._team_payload(game.home), "away": self._team_payload(game.away)},
+                "linescore": {
+                    "currentInning": 9, "scheduledInnings": 9, "innings": innings,
+                    "teams": {"home": {"runs": home_runs}, "away": {"runs": away_runs}},
+                },
+            },
+            "home_batters": home_batters,
+            "away_batters": away_batters,
+            "home_pitchers": home_pitchers,
+            "away_pitchers": away_pitchers,
+        }
+
+    # --- Standings ---------------------------------------------------------
+
+    def standings(self, season: int) -> dict:
+        """End-of-season standings in the all_teams_standings_metrics_{year}.json layout."""
+        record = {t.team_id: {"wins": 0, "losses": 0, "rs": 0, "ra": 0, "streak": 0} for t in self.teams}
+        for game in self.iter_schedule(season):
+            home_runs, away_runs = self.final_score(game)
+            for team, runs, allowed in ((game.home, home_runs, away_runs), (game.away, away_runs, home_runs)):
+                r = record[team.team_id]
+                r["rs"] += runs
+                r["ra"] += allowed
+                if runs > allowed:
+                    r["wins"] += 1
+                    r["streak"] = r["streak"] + 1 if r["streak"] > 0 else 1
+                else:
+                    r["losses"] += 1
+                    r["streak"] = r["streak"] - 1 if r["streak"] < 0 else -1
+
+        rows = []
+        for division in sorted({t.division for t in self.teams}):
+            members = sorted((t for t in self.teams if t.division == division),
+                             key=lambda t: record[t.team_id]["wins"] - record[t.team_id]["losses"], reverse=True)
+            leader = record[members[0].team_id]
+            for rank, team in enumerate(members, 1):
+                r = record[team.team_id]
+                games_back = ((leader["wins"] - r["wins"]) + (r["losses"] - leader["losses"])) / 2
+                played = r["wins"] + r["losses"]
+                rows.append({
+                    "team_id": team.team_id, "team_name": team.name,
+                    "wins": r["wins"], "losses": r["losses"],
+                    "winning_percentage": f"{r['wins'] / played:.3f}".lstrip("0") if played else ".000",
+                    "division_rank": str(rank),
+                    "games_back": "-" if rank == 1 else (int(games_back) if games_back.is_integer() else games_back),
+                    "streak_type": "wins" if r["streak"] > 0 else "losses", "streak_number": abs(r["streak"]),
+                    "magic_number": None, "elimination_number": None,
+                    "division_name": team.division, "league_name": team.league, "games_played": played,
+                    "runs_scored": r["rs"], "runs_against": r["ra"], "run_differential": r["rs"] - r["ra"],
+                })
+        return {"last_updated": f"October 1, {season}", "last_updated_iso": f"{season}-10-01T00:00:00", "teams": rows}
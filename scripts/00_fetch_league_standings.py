@@ -15,6 +15,8 @@ import json
 from typing import List, Dict, Any, Optional
 import pytz
 
+from scripts import league_fanout
+
 HEADERS = {
     'sec-ch-ua-platform': '"macOS"',
     'Referer': 'https://www.mlb.com/',
@@ -84,19 +86,6 @@ def get_pacific_time_string():
     
     return f"{month} {day} at {time_str} Pacific Time"
 
-def format_games_back(gb_value):
-    """Formats games back to be an int if a whole number, otherwise a float."""
-    try:
-        # Try to convert to a float first
-        gb_float = float(gb_value)
-        # Check if it's an integer
-        if gb_float.is_integer():
-            return int(gb_float)
-        return gb_float
-    except (ValueError, TypeError):
-        # Return original value if conversion fails (e.g., '-')
-        return gb_value
-
 def get_all_teams_standings_metrics() -> Optional[List[Dict[str, Any]]]:
     """
     Fetches MLB standings data for all teams.
@@ -106,7 +95,6 @@ def get_all_teams_standings_metrics() -> Optional[List[Dict[str, Any]]]:
         f'https://statsapi.mlb.com/api/v1/standings?leagueId=103,104&season={CURRENT_YEAR}'
         f'&standingsTypes=regularSeason&hydrate=team(division,league)'
     )
-    all_teams_data = []
     try:
         response = requests.get(url, headers=HEADERS)
         response.raise_for_status()
@@ -116,33 +104,7 @@ def get_all_teams_standings_metrics() -> Optional[List[Dict[str, Any]]]:
             logging.warning("No 'records' key in standings API response.")
             return None
 
-        for record_group in data["records"]:
-            if "teamRecords" in record_group:
-                for team_record in record_group["teamRecords"]:
-                    metrics = {
-                        "team_id": team_record.get("team", {}).get("id"),
-                        "team_name": team_record.get("team", {}).get("name"),
-                        "wins": team_record.get("wins"),
-                        "losses": team_record.get("losses"),
-                        "winning_percentage": team_record.get("winningPercentage"),
-                        "division_rank": team_record.get("divisionRank"),
-                        "league_rank": team_record.get("leagueRank"),
-                        "sport_rank": team_record.get("sportRank"),
-                        "games_back": format_games_back(team_record.get("gamesBack", "-")),
-                        "division_games_back": format_games_back(team_record.get("divisionGamesBack", "-")),
-                        "league_games_back": format_games_back(team_record.get("leagueGamesBack", "-")),
-                        "streak_type": team_record.get("streak", {}).get("streakType"),
-                        "streak_number": team_record.get("streak", {}).get("streakNumber"),
-                        "magic_number": team_record.get("magicNumber"),
-                        "elimination_number": team_record.get("eliminationNumber"),
-                        "division_name": team_record.get("team",{}).get("division",{}).get("name"),
-                        "league_name": team_record.get("team",{}).get("league",{}).get("name"),
-                        "games_played": team_record.get("gamesPlayed"),
-                        "runs_scored": team_record.get("runsScored"),
-                        "runs_against": team_record.get("runsAllowed"),
-                        "run_differential": team_record.get("runDifferential"),
-                    }
-                    all_teams_data.append(metrics)
+        all_teams_data = league_fanout.parse_standings(data)
         
         if not all_teams_data:
             logging.warning("No team data extracted from standings.")
@@ -1,5 +1,3 @@
-import json
-import os
 from urllib.parse import urlparse, parse_qs
 
 import pandas as pd
@@ -7,7 +5,7 @@ import requests
 from bs4 import BeautifulSoup
 
 
-from scripts import config
+from scripts import config, gamefeed_cache
 
 CURRENT_YEAR = pd.Timestamp.now().year
 GAME_LOGS_URL = (
@@ -66,16 +64,10 @@ def parse_game_rows(table: BeautifulSoup) -> pd.DataFrame:
     return pd.DataFrame(parsed_rows)
 
 
-def fetch_and_save_gamefeed(game_pk: int, out_dir: str) -> str:
-    os.makedirs(out_dir, exist_ok=True)
-    url = f"https://baseballsavant.mlb.com/gf?game_pk={game_pk}"
-    response = requests.get(url, timeout=30)
-    response.raise_for_status()
-    data = response.json()
-    out_path = os.path.join(out_dir, f"{game_pk}.json")
-    with open(out_path, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False)
-    return out_path
+def fetch_and_save_gamefeed(game_pk: int, out_dir: str = gamefeed_cache.CACHE_DIR) -> str:
+    # Final games already in the cache are not downloaded again
+    gamefeed_cache.get("savant", game_pk, cache_dir=out_dir)
+    return gamefeed_cache.cached_path("savant", game_pk, cache_dir=out_dir)
 
 
 def main() -> None:
@@ -86,7 +78,7 @@ def main() -> None:
     print(logs_df.head())
 
     # Save and fetch detailed gamefeed JSON for each game id we found
-    gamefeeds_dir = os.path.join("data", "gamefeeds")
+    gamefeeds_dir = gamefeed_cache.CACHE_DIR
     for game_pk in logs_df["game_pk"].dropna().astype(int).tolist():
         try:
             out_file = fetch_and_save_gamefeed(game_pk, gamefeeds_dir)
@@ -22,7 +22,7 @@ logging.basicConfig(
     format='%(asctime)s - %(levelname)s - %(message)s'
 )
 
-from scripts import config
+from scripts import config, gamefeed_cache, writers
 
 DODGERS_TEAM_ID = config.TEAM_ID
 BUCKET = "redsox-data"
@@ -361,15 +361,12 @@ def load_archive(profile_name: Optional[str] = None) -> pd.DataFrame:
 
 def save_archive(df: pd.DataFrame, profile_name: Optional[str] = None) -> None:
     s3 = get_s3_client(profile_name)
-    json_bytes = json.dumps(df.to_dict(orient="records"), ensure_ascii=False, indent=2).encode("utf-8")
+    # Streamed to disk, then uploaded from the file (the local copy doubles as the fallback)
+    writers.write_json_array(df, LOCAL_ARCHIVE_JSON)
     try:
-        s3.put_object(Bucket=BUCKET, Key=ARCHIVE_KEY_JSON, Body=json_bytes, ContentType="application/json")
+        s3.upload_file(LOCAL_ARCHIVE_JSON, BUCKET, ARCHIVE_KEY_JSON, ExtraArgs={"ContentType": "application/json"})
         print(f"Uploaded archive -> s3://{BUCKET}/{ARCHIVE_KEY_JSON}")
     except Exception as exc:
-        # Write locally as a fallback
-        os.makedirs(os.path.dirname(LOCAL_ARCHIVE_JSON), exist_ok=True)
-        with open(LOCAL_ARCHIVE_JSON, "wb") as f:
-            f.write(json_bytes)
         print(f"S3 upload failed ({exc}). Saved locally -> {LOCAL_ARCHIVE_JSON}")
 
 
@@ -410,8 +407,7 @@ def main() -> None:
     for game_pk in sorted(candidate_pks):
         if game_pk in existing_pks:
             continue
-        gf_url = f"https://baseballsavant.mlb.com/gf?game_pk={game_pk}"
-        gf = fetch_json(gf_url)
+        gf = gamefeed_cache.get("savant", game_pk, fetch=fetch_json)
         row = build_boxscore_row(gf)
         if row is not None:
             new_rows.append(row)
@@ -16,6 +16,7 @@ aws_key_id = os.environ.get("AWS_ACCESS_KEY_ID")
 aws_secret_key = os.environ.get("AWS_SECRET_ACCESS_KEY")
 
 from scripts import config
+from scripts.player_registry import PlayerRegistry
 
 # Fetch
 
@@ -137,6 +138,10 @@ player_totals_df[["ba", "obp", "slg", "ops", "ops_plus"]] = player_totals_df[
 
 player_totals_df = player_totals_df.rename(columns={'player': 'name'})
 
+# MLBAM ids from the shared player registry, so other tables can join on id (empty when unknown)
+registry = PlayerRegistry.load()
+player_totals_df["player_id"] = player_totals_df["name"].map(registry.lookup).astype("Int64")
+
 # Team stats
 # The main batting table has totals for the team, with totals and ranks by season
 
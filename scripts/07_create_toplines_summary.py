@@ -21,6 +21,8 @@ import requests
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
 from scripts import config
+from scripts import team_snapshot
+from scripts.standings_history import StandingsHistory
 
 # Base directory calculation for file paths
 base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -187,12 +189,14 @@ except json.JSONDecodeError:
 
 
 # Standings
-standings = read_parquet_s3(standings_url, sort_by='game_date').query(f"year == '{year}'")
+# Standings history is read once; seasons and single games are index lookups
+standings_history = StandingsHistory.load(standings_url)
+standings = standings_history.season(int(year))
 standings['result'] = standings['result'].str.split('-wo', expand=True)[0]
 standings['opp_name'] = standings['opp'].map(mlb_teams)
 standings.loc[standings.result == "L", "result_clean"] = "loss"
 standings.loc[standings.result == "W", "result_clean"] = "win"
-standings_past = read_parquet_s3(standings_url, sort_by='game_date').query(f"year == '{last_year}'")
+standings_past = standings_history.season(int(last_year))
 standings_now = standings.query("game_date == game_date.max()").copy()
 # Prefer local _data standings file (same one the site tables use); fallback to remote
 local_live_path = os.path.join(base_dir, '_data', 'standings', f'all_teams_standings_metrics_{year}.json')
@@ -238,8 +242,8 @@ except Exception as _:
     last_game_result_live = None
 
 game_number = standings_now['gm'].iloc[0]
-standings_last = standings_past.query(f"gm == {game_number}").head(1).reset_index(drop=True).copy()
-standings_last_season = standings_past.query(f"gm <= {game_number} and year=='{last_year}'").reset_index(drop=True).copy()
+standings_last = standings_history.game(int(last_year), game_number)
+standings_last_season = standings_history.season(int(last_year), through_gm=game_number)
 standings["rank_ordinal"] = standings["rank"].map(to_ordinal)
 # Use live standings for division rank to match NL tables
 try:
@@ -293,7 +297,7 @@ def current_season_stats(standings_now, standings_past, pitching, standings_last
     win_pct = int(standings_now["win_pct"].iloc[0] * 100)
     win_pct_last = int(standings_last["win_pct"].iloc[0] * 100)
     win_pct_decade_thispoint = int(
-        standings_past.query(f"gm == {games}").head(10)["win_pct"].mean().round(2) * 100
+        round(standings_history.mean_at(games, "win_pct", range(int(year) - 10, int(year))), 2) * 100
     )
     era = pitching['era'].iloc[0]
     era_rank = to_ordinal(league_ranks_data.get('pitching_earnedRunAverage', 'N/A'))
@@ -393,147 +397,121 @@ def get_projection_final_mean(local_path: str, remote_url: str) -> int:
     except Exception:
         return None
 
-def get_live_last_game_summary():
-    """Fetches live game data to find the last completed game and returns a summary fragment."""
+def get_playoff_odds(local_path: str, remote_url: str):
+    """Return the team's row from the playoff odds JSON written by 30.
+    Attempts local first, then remote. Returns None when unavailable or malformed.
+    """
+    data = None
+    try:
+        if os.path.exists(local_path):
+            with open(local_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+    except Exception:
+        data = None
+
+    if data is None:
+        try:
+            resp = requests.get(remote_url, timeout=20)
+            resp.raise_for_status()
+            data = resp.json()
+        except Exception:
+            data = None
+
+    try:
+        return next((t for t in data.get("teams", []) if int(t.get("team_id", 0)) == config.TEAM_ID), None)
+    except Exception:
+        return None
+
+_team_snapshot_cache = {}
+
+def get_team_snapshot():
+    """Fetches the team's games from the last few days through the next ten once per run.
+    Returns None when statsapi can't be reached; later callers reuse the same answer."""
+    if "snapshot" in _team_snapshot_cache:
+        return _team_snapshot_cache["snapshot"]
     headers = {
         "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.114 Safari/537.36"
     }
-    
-    # Fetch data for today and the last 5 days to find the last completed game
     today = date.today()
-    five_days_ago = today - timedelta(days=5)
-    
-    url = f"https://statsapi.mlb.com/api/v1/schedule?sportId=1&teamId={config.TEAM_ID}&startDate={five_days_ago.strftime('%Y-%m-%d')}&endDate={today.strftime('%Y-%m-%d')}&hydrate=team,linescore"
-    
+    snapshot = None
     try:
-        response = requests.get(url, headers=headers)
+        response = requests.get(team_snapshot.SCHEDULE_URL, params=team_snapshot.snapshot_params(config.TEAM_ID, today), headers=headers)
         response.raise_for_status()
-        data = response.json()
-        
-        # Debug logging
-        logging.info(f"Fetched schedule data for {five_days_ago} to {today}")
-        logging.info(f"Found {len(data.get('dates', []))} date(s) in response")
-        
-        # Iterate backwards through dates and games to find the most recent final game
-        for day in reversed(data.get('dates', [])):
-            logging.info(f"Checking date: {day.get('date', 'Unknown')}")
-            for game in reversed(day.get('games', [])):
-                game_status = game['status']['abstractGameState']
-                game_teams = game.get('teams', {})
-                away_team = game_teams.get('away', {}).get('team', {}).get('abbreviation', 'Unknown')
-                home_team = game_teams.get('home', {}).get('team', {}).get('abbreviation', 'Unknown')
-                logging.info(f"Game: {away_team} @ {home_team}, Status: {game_status}")
-                
-                if game_status == 'Final':
-                    teams = game['teams']
-                    
-                    # Check if LAD is either away or home team
-                    away_abbr = teams.get('away', {}).get('team', {}).get('abbreviation')
-                    home_abbr = teams.get('home', {}).get('team', {}).get('abbreviation')
-                    logging.info(f"Processing final game: {away_abbr} @ {home_abbr}")
-                    
-                    if away_abbr == config.TEAM_ABBR:
-                        home_away = "away"
-                        result_clean = "win" if teams['away'].get('isWinner') else "loss"
-                        r = teams['away'].get('score', 'N/A')
-                        ra = teams['home'].get('score', 'N/A')
-                        opp_name = teams.get('home', {}).get('team', {}).get('name', 'N/A')
-                        
-                        logging.info(f"Found LAD away game: {r}-{ra} {result_clean} vs {opp_name}")
-                        return (
-                            f"The last game was a <span class='highlight'>{r}-{ra}</span> "
-                            f"{home_away} <span class='highlight'>{result_clean}</span>."
-                        )
-                    elif teams.get('home', {}).get('team', {}).get('abbreviation') == config.TEAM_ABBR:
-                        home_away = "home"
-                        result_clean = "win" if teams['home'].get('isWinner') else "loss"
-                        r = teams['home'].get('score', 'N/A')
-                        ra = teams['away'].get('score', 'N/A')
-                        opp_name = teams.get('away', {}).get('team', {}).get('name', 'N/A')
-                        
-                        return (
-                            f"The last game was a <span class='highlight'>{r}-{ra}</span> "
-                            f"{home_away} <span class='highlight'>{result_clean}</span>."
-                        )
-        return "The last game's result is not yet available."
-        
-    except (requests.exceptions.RequestException, KeyError, IndexError) as e:
-        logging.error(f"Could not fetch or parse live last game data: {e}")
+        snapshot = team_snapshot.TeamGameSnapshot(response.json(), config.TEAM_ID, today)
+        logging.info(f"Fetched team game snapshot: {len(snapshot.games)} game(s) across {len(snapshot.by_date)} date(s)")
+    except (requests.exceptions.RequestException, ValueError) as e:
+        logging.error(f"Could not fetch team game snapshot: {e}")
+    _team_snapshot_cache["snapshot"] = snapshot
+    return snapshot
+
+def get_live_last_game_summary():
+    """Finds the last completed game in the team snapshot and returns a summary fragment."""
+    snapshot = get_team_snapshot()
+    if snapshot is None:
+        return "Could not retrieve the result of the last game."
+
+    try:
+        game = snapshot.last_final()
+        side = snapshot.team_side(game) if game else None
+        if side is None:
+            return "The last game's result is not yet available."
+
+        teams = game['teams']
+        other = "home" if side == "away" else "away"
+        result_clean = "win" if teams[side].get('isWinner') else "loss"
+        r = teams[side].get('score', 'N/A')
+        ra = teams[other].get('score', 'N/A')
+        logging.info(f"Last final game: {r}-{ra} {side} {result_clean} vs {teams.get(other, {}).get('team', {}).get('name', 'N/A')}")
+        return (
+            f"The last game was a <span class='highlight'>{r}-{ra}</span> "
+            f"{side} <span class='highlight'>{result_clean}</span>."
+        )
+    except (KeyError, IndexError) as e:
+        logging.error(f"Could not parse live last game data: {e}")
         return "Could not retrieve the result of the last game."
 
 
 def get_live_last_game_result():
-    """Returns 'win' or 'loss' for the most recent completed Dodgers game using MLB Stats API.
+    """Returns 'win' or 'loss' for the team's game completed yesterday or today.
     Returns None if it cannot be determined."""
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.114 Safari/537.36"
-    }
-    today = date.today()
-    yesterday = today - timedelta(days=1)
-    url = f"https://statsapi.mlb.com/api/v1/schedule?sportId=1&teamId={config.TEAM_ID}&startDate={yesterday.strftime('%Y-%m-%d')}&endDate={today.strftime('%Y-%m-%d')}&hydrate=team,linescore"
-    try:
-        response = requests.get(url, headers=headers)
-        response.raise_for_status()
-        data = response.json()
-        for day in reversed(data.get('dates', [])):
-            for game in reversed(day.get('games', [])):
-                if game['status']['abstractGameState'] == 'Final':
-                    teams = game['teams']
-                    # Determine result for LAD
-                    if teams.get('away', {}).get('team', {}).get('abbreviation') == config.TEAM_ABBR:
-                        return 'win' if teams['away'].get('isWinner') else 'loss'
-                    else:
-                        return 'win' if teams['home'].get('isWinner') else 'loss'
+    snapshot = get_team_snapshot()
+    if snapshot is None:
         return None
-    except (requests.exceptions.RequestException, KeyError, IndexError):
+    game = snapshot.last_final(since=date.today() - timedelta(days=1))
+    side = snapshot.team_side(game) if game else None
+    if side is None:
         return None
+    return 'win' if game['teams'][side].get('isWinner') else 'loss'
 
 def get_next_game_info():
-    """Fetches the next scheduled Dodgers game and returns formatted info."""
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.114 Safari/537.36"
-    }
-    
-    # Fetch upcoming games for the next 10 days
-    today = date.today()
-    ten_days_ahead = today + timedelta(days=10)
-    
-    url = f"https://statsapi.mlb.com/api/v1/schedule?sportId=1&teamId={config.TEAM_ID}&startDate={today.strftime('%Y-%m-%d')}&endDate={ten_days_ahead.strftime('%Y-%m-%d')}&hydrate=team,venue"
-    
-    try:
-        response = requests.get(url, headers=headers)
-        response.raise_for_status()
-        data = response.json()
-        
-        # Find the next scheduled game
-        for date_entry in data.get('dates', []):
-            for game in date_entry.get('games', []):
-                if game.get('status', {}).get('abstractGameState') == 'Preview':
-                    # Parse game info
-                    game_date_utc = datetime.fromisoformat(game['gameDate'].replace('Z', '+00:00'))
-                    # Convert to PT using pytz for proper DST handling
-                    import pytz
-                    pt_tz = pytz.timezone('US/Pacific')
-                    game_date_pt = game_date_utc.astimezone(pt_tz)
-                    
-                    # Format day and time
-                    day_name = game_date_pt.strftime('%A')  # Monday, Tuesday, etc.
-                    time_str = game_date_pt.strftime('%-I:%M p.m. PT')
-                    
-                    # Get venue info and highlight it
-                    venue_name = game.get('venue', {}).get('name', '')
-                    highlighted_venue = f"<span class='highlight'>{venue_name}</span>" if venue_name else ""
-                    
-                    # Determine if home or away
-                    home_team_id = game.get('teams', {}).get('home', {}).get('team', {}).get('id')
-                    is_dodgers_home = home_team_id == config.TEAM_ID
-                    
-                    location_text = f"at {highlighted_venue}" if not is_dodgers_home else f"at {highlighted_venue}"
-                    
-                    return f"The next game is {day_name} at {time_str} {location_text}"
-        
+    """Returns formatted info for the team's next scheduled game from the team snapshot."""
+    snapshot = get_team_snapshot()
+    if snapshot is None:
         return None
-        
+
+    try:
+        game = snapshot.next_preview()
+        if game is None:
+            return None
+
+        # Parse game info
+        game_date_utc = datetime.fromisoformat(game['gameDate'].replace('Z', '+00:00'))
+        # Convert to PT using pytz for proper DST handling
+        import pytz
+        pt_tz = pytz.timezone('US/Pacific')
+        game_date_pt = game_date_utc.astimezone(pt_tz)
+
+        # Format day and time
+        day_name = game_date_pt.strftime('%A')  # Monday, Tuesday, etc.
+        time_str = game_date_pt.strftime('%-I:%M p.m. PT')
+
+        # Get venue info and highlight it
+        venue_name = game.get('venue', {}).get('name', '')
+        highlighted_venue = f"<span class='highlight'>{venue_name}</span>" if venue_name else ""
+        location_text = f"at {highlighted_venue}"
+
+        return f"The next game is {day_name} at {time_str} {location_text}"
+
     except Exception as e:
         logging.warning(f"Could not fetch next game info: {e}")
         return None
@@ -923,6 +901,16 @@ if last_game_result_final is not None:
         summary_df,
         pd.DataFrame([{ "stat_label": "Last game result", "stat": "last_game_result", "value": last_game_result_final, "category": "summary", "context_value": "", "context_value_label": '' }])
     ], ignore_index=True)
+playoff_odds_team = get_playoff_odds(
+    os.path.join(base_dir, 'data', 'standings', f'playoff_odds_{year}.json'),
+    f"https://redsox-data.s3.amazonaws.com/redsox/data/standings/playoff_odds_{year}.json",
+)
+if playoff_odds_team is not None:
+    summary_df = pd.concat([
+        summary_df,
+        pd.DataFrame([{ "stat_label": "Playoff odds", "stat": "playoff_odds", "value": f"{playoff_odds_team['playoff_odds']}%", "category": "standings", "context_value": f"{playoff_odds_team['division_odds']}%", "context_value_label": 'Division title odds' }])
+    ], ignore_index=True)
+
 summary_df.to_csv(os.path.join(base_dir, 'data', 'standings', 'season_summary_latest.csv'), index=False)
 summary_df.to_json(os.path.join(base_dir, 'data', 'standings', 'season_summary_latest.json'), orient='records', indent=4, lines=False)
 summary_df.to_json(os.path.join(base_dir, '_data', 'season_summary_latest.json'), orient='records', indent=4, lines=False)
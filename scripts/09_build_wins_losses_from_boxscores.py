@@ -7,7 +7,7 @@ import boto3
 import pandas as pd
 
 
-from scripts import config
+from scripts import config, writers
 
 BUCKET = "redsox-data"
 BOXES_KEY_JSON = "redsox/data/standings/redsox_boxscores.json"
@@ -113,16 +113,13 @@ def build_wins_losses(df: pd.DataFrame) -> pd.DataFrame:
 
 def save_json(df: pd.DataFrame, profile_name: Optional[str]) -> None:
     # Local
-    os.makedirs(os.path.dirname(LOCAL_OUT_JSON), exist_ok=True)
-    with open(LOCAL_OUT_JSON, "w", encoding="utf-8") as f:
-        json.dump(df.to_dict(orient="records"), f, ensure_ascii=False, indent=2)
+    writers.write_json_array(df, LOCAL_OUT_JSON)
     print(f"Saved locally -> {LOCAL_OUT_JSON}")
 
     # S3
     try:
         s3 = get_s3_client(profile_name)
-        payload = json.dumps(df.to_dict(orient="records"), ensure_ascii=False, indent=2).encode("utf-8")
-        s3.put_object(Bucket=BUCKET, Key=OUT_KEY_JSON, Body=payload, ContentType="application/json")
+        s3.upload_file(LOCAL_OUT_JSON, BUCKET, OUT_KEY_JSON, ExtraArgs={"ContentType": "application/json"})
         print(f"Uploaded -> s3://{BUCKET}/{OUT_KEY_JSON}")
     except Exception as exc:
         print(f"S3 upload failed ({exc}). Using local file only.")
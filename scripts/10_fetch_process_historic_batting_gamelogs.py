@@ -7,12 +7,15 @@ This script fetches and processes current and past game-by-game and cumulative t
 """
 
 import os
+import sys
+import argparse
 import boto3
 import datetime
 import logging
 import pandas as pd
 from io import BytesIO
 from scripts import config
+from scripts import gamelog_warehouse
 
 # Set up basic configuration for logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -53,68 +56,51 @@ headers = {
     "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/109.0.0.0 Safari/537.36",
 }
 
-# Fetch Archive game logs
-# archive_url = "https://redsox-data/dodgers/data/batting/archive/dodgers_team_cumulative_batting_logs_1958_2024.parquet"
-# archive_df = pd.read_parquet(archive_url)
 
-# Fetch Current game logs - try current year first, fall back to previous year if off-season
-current_url = f"https://www.baseball-reference.com/teams/tgl.cgi?team={config.TEAM_ID_BBREF}&t=b&year={year}"
-try:
-    current_df = pd.read_html(current_url)[0].assign(year=year)
-except (ValueError, IndexError) as e:
-    # No data for current year yet (off-season), use previous year
+def parse_arguments():
+    parser = argparse.ArgumentParser(description="Update the batting game-log warehouse and publish cumulative logs")
+    parser.add_argument("--backfill", action="store_true", help="Fetch every season not yet in the warehouse first")
+    parser.add_argument("--start-year", type=int, default=gamelog_warehouse.START_YEAR,
+                        help=f"First season to backfill (default: {gamelog_warehouse.START_YEAR})")
+    parser.add_argument("--delay", type=float, default=3.0, help="Seconds between BBRef requests when backfilling")
+    parser.add_argument("--rebuild", action="store_true", help="Rebuild the published history from every partition")
+    return parser.parse_args()
+
+
+args = parse_arguments()
+spec = gamelog_warehouse.SPECS["batting"]
+bucket = s3_resource.Bucket("redsox-data")
+
+if args.backfill:
+    written = gamelog_warehouse.backfill(spec, args.start_year, year, bucket=bucket, delay=args.delay)
+    logging.info(f"Backfilled {len(written)} season(s)")
+
+# Append new games of the current season - fall back to previous year if off-season
+season_df = gamelog_warehouse.update_season(spec, year, bucket=bucket)
+if season_df is None:
     logging.warning(f"No data available for {year}, falling back to {year-1}")
     year = year - 1
-    current_url = f"https://www.baseball-reference.com/teams/tgl.cgi?team={config.TEAM_ID_BBREF}&t=b&year={year}"
-    current_df = pd.read_html(current_url)[0].assign(year=year)
-# Drop the top level of the MultiIndex columns
-current_df.columns = current_df.columns.droplevel(0)
-# Restore column lowercasing
-current_df.columns = current_df.columns.str.lower()
-# Rename the column that was ('year', '') and became '' to 'year'
-current_df = current_df.rename(columns={'': 'year'})
-# Filter out header/summary rows by ensuring 'gtm' is a numeric value
-current_df = current_df[pd.to_numeric(current_df['gtm'], errors='coerce').notna()]
-
-# Process current game logs
-current_df["game_date"] = pd.to_datetime(
-    current_df["date"] + " " + current_df["year"].astype(str),
-    format="%b %d %Y",
-    errors="coerce"
-).dt.strftime("%Y-%m-%d")
-
-# Drop unnecessary columns
-drop_cols = [
-    "rk", "date", "unnamed: 3", "opp", "rslt", "ba", "obp", "slg", "ops", "lob", "#", "thr", "opp. starter (gmesc)"
-]
-# Only attempt to drop columns that actually exist in the DataFrame
-cols_to_actually_drop = [col for col in drop_cols if col in current_df.columns]
-current_df = current_df.drop(cols_to_actually_drop, axis=1).copy()
-
-# Define value columns
-val_cols = [
-    "gtm", "pa", "ab", "r", "h", "2b", "3b", "hr", "rbi", "bb", "ibb", "so", "hbp", "sh", "sf", "roe", "gdp", "sb", "cs"
-]
-
-# Filter val_cols to only include columns present in the DataFrame
-existing_val_cols = [col for col in val_cols if col in current_df.columns]
-
-# Convert existing value columns to integers
-current_df[existing_val_cols] = current_df[existing_val_cols].astype(int)
-
-# Calculate cumulative columns for existing value columns
-for col in existing_val_cols:
-    current_df[f"{col}_cum"] = current_df.groupby("year")[col].cumsum()
-current_df = current_df.drop("gtm_cum", axis=1)
-
-# Combine current and archive data
-# df = (
-#     pd.concat([current_df, archive_df])
-#     .sort_values(["year", "gtm"], ascending=[False, True])
-#     .reset_index(drop=True)
-#     .drop_duplicates()
-# )
-df = current_df.sort_values(["year", "gtm"], ascending=[False, True]).reset_index(drop=True)
+    season_df = gamelog_warehouse.update_season(spec, year, bucket=bucket)
+if season_df is None:
+    season_df = gamelog_warehouse.load_partition(spec, year, bucket=bucket)
+
+# Past seasons never change: swap this season into the published history instead of rebuilding it
+archive_url = "https://redsox-data.s3.amazonaws.com/redsox/data/batting/archive/redsox_historic_batting_gamelogs.parquet"
+archive_df = None
+if not (args.backfill or args.rebuild):
+    try:
+        archive_df = pd.read_parquet(archive_url)
+    except Exception as e:
+        logging.warning(f"Could not read published history, rebuilding from the warehouse: {e}")
+if archive_df is not None and season_df is not None:
+    df = gamelog_warehouse.replace_season(archive_df, season_df, year)
+else:
+    df = gamelog_warehouse.load_history(spec, bucket=bucket)
+
+# Nothing in the warehouse yet (or it couldn't be read): keep the published history as it is
+if df.empty:
+    logging.warning("No batting game logs in the warehouse; nothing to publish.")
+    sys.exit(0)
 
 # Optimize DataFrame for output
 optimized_df = df[
@@ -10,6 +10,8 @@
 # coding: utf-8
 
 import os
+import sys
+import argparse
 import requests
 import datetime
 import pandas as pd
@@ -17,6 +19,7 @@ from io import BytesIO
 import boto3
 import logging
 from scripts import config
+from scripts import gamelog_warehouse
 
 
 # Set up basic configuration for logging
@@ -62,82 +65,56 @@ headers = {
 }
 
 
-# Fetch archive game logs
-# Fetch archive game logs
-# archive_url = "https://redsox-data/dodgers/data/pitching/archive/dodgers_historic_pitching_gamelogs_1958_2023.parquet"
-# archive_df = pd.read_parquet(archive_url)
+def parse_arguments():
+    parser = argparse.ArgumentParser(description="Update the pitching game-log warehouse and publish cumulative logs")
+    parser.add_argument("--backfill", action="store_true", help="Fetch every season not yet in the warehouse first")
+    parser.add_argument("--start-year", type=int, default=gamelog_warehouse.START_YEAR,
+                        help=f"First season to backfill (default: {gamelog_warehouse.START_YEAR})")
+    parser.add_argument("--delay", type=float, default=3.0, help="Seconds between BBRef requests when backfilling")
+    parser.add_argument("--rebuild", action="store_true", help="Rebuild the published history from every partition")
+    return parser.parse_args()
 
 
-# Fetch Current game logs - try current year first, fall back to previous year if off-season
-current_url = f"https://www.baseball-reference.com/teams/tgl.cgi?team={config.TEAM_ID_BBREF}&t=p&year={year}"
-try:
-    # Use index [0] for the main table and assign year
-    current_src = pd.read_html(current_url)[0].assign(year=year)
-except (ValueError, IndexError) as e:
-    # No data for current year yet (off-season), use previous year
-    logging.warning(f"No data available for {year}, falling back to {year-1}")
-    year = year - 1
-    current_url = f"https://www.baseball-reference.com/teams/tgl.cgi?team={config.TEAM_ID_BBREF}&t=p&year={year}"
-    current_src = pd.read_html(current_url)[0].assign(year=year)
-# Drop the top level of the MultiIndex columns
-current_src.columns = current_src.columns.droplevel(0)
-# Lowercase column names
-current_src.columns = current_src.columns.str.lower()
-# Rename the column that was ('year', '') and became '' to 'year'
-current_src = current_src.rename(columns={'': 'year'})
-# Filter out header/summary rows by ensuring 'gtm' is a numeric value
-current_src = current_src[pd.to_numeric(current_src['gtm'], errors='coerce').notna()]
-
-
-# Process current game logs
-current_src["game_date"] = pd.to_datetime(
-    current_src["date"] + " " + current_src["year"].astype(str),
-    format="%b %d %Y",
-    errors="coerce"
-).dt.strftime("%Y-%m-%d")
-
-
-# Just the columns we need
-keep_cols = ['gtm', 'year', 'game_date', 'h', 'hr', 'er', 'so', 'era']
-current_df = current_src[keep_cols].copy()
+args = parse_arguments()
+spec = gamelog_warehouse.SPECS["pitching"]
+bucket = s3_resource.Bucket("redsox-data")
 
+if args.backfill:
+    written = gamelog_warehouse.backfill(spec, args.start_year, year, bucket=bucket, delay=args.delay)
+    logging.info(f"Backfilled {len(written)} season(s)")
 
-# Define value columns
-int_cols = ["gtm", 'h', 'hr', 'er', 'so']
 
-# Convert value columns to numbers
-current_df[int_cols] = current_df[int_cols].astype(int)
-current_df['era'] = current_df['era'].astype(float)
-current_df['era_cum'] = current_df['era']
-
-
-# Calculate cumulative columns
-for col in ['h', 'hr', 'er', 'so']:
-    current_df[f"{col}_cum"] = current_df.groupby("year")[col].cumsum()
+# Append new games of the current season - fall back to previous year if off-season
+current_df = gamelog_warehouse.update_season(spec, year, bucket=bucket)
+if current_df is None:
+    logging.warning(f"No data available for {year}, falling back to {year-1}")
+    year = year - 1
+    current_df = gamelog_warehouse.update_season(spec, year, bucket=bucket)
+if current_df is None:
+    current_df = gamelog_warehouse.load_partition(spec, year, bucket=bucket)
 
 
 """
 MERGE
 """
 
-# Normalize dtypes before merge to avoid mixed object types in Parquet
-# archive_df = archive_df.copy()
-# try:
-#     archive_df['year'] = archive_df['year'].astype(int)
-# except Exception:
-#     archive_df['year'] = pd.to_numeric(archive_df['year'], errors='coerce').fillna(0).astype(int)
-
-current_df['year'] = pd.to_numeric(current_df['year'], errors='coerce').fillna(0).astype(int)
-current_df['gtm'] = pd.to_numeric(current_df['gtm'], errors='coerce').fillna(0).astype(int)
-
-# Combine current and archive data
-# df = (
-#     pd.concat([current_df, archive_df], ignore_index=True)
-#     .sort_values(["year", "gtm"], ascending=[False, True])
-#     .reset_index(drop=True)
-#     .drop_duplicates()
-# )
-df = current_df.sort_values(["year", "gtm"], ascending=[False, True]).reset_index(drop=True)
+# Past seasons never change: swap this season into the published history instead of rebuilding it
+archive_url = "https://redsox-data.s3.amazonaws.com/redsox/data/pitching/redsox_historic_pitching_gamelogs_1901-present.parquet"
+archive_df = None
+if not (args.backfill or args.rebuild):
+    try:
+        archive_df = pd.read_parquet(archive_url)
+    except Exception as e:
+        logging.warning(f"Could not read published history, rebuilding from the warehouse: {e}")
+if archive_df is not None and current_df is not None:
+    df = gamelog_warehouse.replace_season(archive_df, current_df, year)
+else:
+    df = gamelog_warehouse.load_history(spec, bucket=bucket)
+
+# Nothing in the warehouse yet (or it couldn't be read): keep the published history as it is
+if df.empty:
+    logging.warning("No pitching game logs in the warehouse; nothing to publish.")
+    sys.exit(0)
 
 """
 OUTPUT
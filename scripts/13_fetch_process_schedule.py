@@ -17,6 +17,7 @@ from io import BytesIO
 import logging
 from datetime import datetime, timedelta
 from scripts import config
+from scripts import teams
 
 # Set up basic configuration for logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -51,38 +52,8 @@ profile_name = os.environ.get("AWS_PERSONAL_PROFILE")
 year = pd.Timestamp.today().year
 year = pd.to_datetime("now").strftime("%Y")
 
-mlb_teams = {
-    "ARI": "Arizona Diamondbacks",
-    "ATL": "Atlanta Braves",
-    "BAL": "Baltimore Orioles",
-    "BOS": "Boston Red Sox",
-    "CHC": "Chicago Cubs",
-    "CHW": "Chicago White Sox",
-    "CIN": "Cincinnati Reds",
-    "CLE": "Cleveland Guardians",
-    "COL": "Colorado Rockies",
-    "DET": "Detroit Tigers",
-    "HOU": "Houston Astros",
-    "KCR": "Kansas City Royals",
-    "LAA": "Los Angeles Angels",
-    "LAD": "Los Angeles Dodgers",
-    "MIA": "Miami Marlins",
-    "MIL": "Milwaukee Brewers",
-    "MIN": "Minnesota Twins",
-    "NYM": "New York Mets",
-    "NYY": "New York Yankees",
-    "ATH": "Athletics",
-    "PHI": "Philadelphia Phillies",
-    "PIT": "Pittsburgh Pirates",
-    "SDP": "San Diego Padres",
-    "SFG": "San Francisco Giants",
-    "SEA": "Seattle Mariners",
-    "STL": "St. Louis Cardinals",
-    "TBR": "Tampa Bay Rays",
-    "TEX": "Texas Rangers",
-    "TOR": "Toronto Blue Jays",
-    "WSN": "Washington Nationals"
-}
+# BBRef abbreviations -> full names
+mlb_teams = {t.bbref: t.full_name for t in teams.TEAMS}
 
 # Configuration
 year = pd.to_datetime("now").strftime("%Y")
@@ -18,7 +18,6 @@ import logging
 from io import StringIO
 from datetime import datetime
 import re
-import unicodedata
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
@@ -26,6 +25,7 @@ logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(
 CURRENT_YEAR = datetime.now().year
 
 from scripts import config
+from scripts.player_registry import PlayerRegistry, normalize_name
 
 # Configuration
 output_dir = "data/batting"
@@ -99,58 +99,17 @@ def format_player_name(name):
         return f"{first.strip()} {last.strip()}"
     return name
 
-def strip_accents(text: str) -> str:
-    """Remove diacritics from text."""
-    text_norm = unicodedata.normalize('NFD', text)
-    return ''.join(ch for ch in text_norm if not unicodedata.combining(ch))
-
-def normalize_name(name: str) -> str:
-    """
-    Normalize a player name for comparison:
-    - lower case
-    - remove accents
-    - remove punctuation, commas, periods
-    - collapse whitespace
-    - remove hyphens
-    Output as "first last" order regardless of input.
-    """
-    if not name:
-        return ""
-    name = name.strip()
-    # If "Last, First" flip to "First Last"
-    if ',' in name:
-        parts = [p.strip() for p in name.split(',')]
-        if len(parts) >= 2:
-            name = f"{parts[1]} {parts[0]}"
-    # Remove accents
-    name = strip_accents(name)
-    # Remove punctuation and hyphens
-    name = re.sub(r"[\-\.]+", " ", name)
-    name = re.sub(r"[^a-zA-Z\s]", " ", name)
-    # Collapse whitespace
-    name = re.sub(r"\s+", " ", name).strip()
-    return name.lower()
-
-def to_last_first(name: str) -> str:
-    """Convert "First Last" to "Last, First" for display."""
-    if not name:
-        return name
-    tokens = name.strip().split()
-    if len(tokens) >= 2:
-        first = " ".join(tokens[:-1])
-        last = tokens[-1]
-        return f"{last}, {first}"
-    return name
-
-def build_allowed_set(raw_names: list[str]) -> set[str]:
-    normalized = set()
-    for nm in raw_names:
-        key = normalize_name(nm)
-        key = NAME_CORRECTIONS.get(key, key)
-        normalized.add(key)
-    return normalized
-
-ALLOWED_NORMALIZED = build_allowed_set(ALLOWED_BATTERS)
+def allowed_player_ids(registry):
+    """MLBAM ids of the allowlisted batters (after NAME_CORRECTIONS), resolved through the player registry."""
+    ids = set()
+    for name in ALLOWED_BATTERS:
+        key = normalize_name(name)
+        player_id = registry.lookup(NAME_CORRECTIONS.get(key, key))
+        if player_id is None:
+            logging.info(f"Allowlisted batter not found on the roster: {name}")
+            continue
+        ids.add(player_id)
+    return ids
 
 def fetch_player_ids():
     """
@@ -177,8 +136,9 @@ def fetch_player_ids():
         player_rows = soup.find_all('tr', id=lambda x: x and x.startswith('scg_'))
         logging.info(f"Found {len(player_rows)} player rows")
         
-        # Create dictionary mapping player names to IDs
-        player_lookup = {}
+        # Savant ids are MLBAM ids: register each roster row, then keep the allowlisted ids
+        registry = PlayerRegistry.load()
+        roster = {}
         for row in player_rows:
             try:
                 player_id = row['id'].replace('scg_', '')
@@ -186,38 +146,19 @@ def fetch_player_ids():
                 if player_id in ['119', '999999']:
                     continue
                 player_name_raw = row.find('a').text.strip()
-                # Format to "First Last" then filter by allowlist
+                # Format to "First Last"
                 formatted_name = format_player_name(player_name_raw)
-                normalized = normalize_name(formatted_name)
-                # Apply corrections map before comparison
-                normalized = NAME_CORRECTIONS.get(normalized, normalized)
-                # Check allowlist: require last name exact match and loose first-name prefix match
-                if normalized not in ALLOWED_NORMALIZED:
-                    # try prefix match on first name with exact last name
-                    # split to first/last for both candidate and allowed
-                    cand_tokens = normalized.split()
-                    if len(cand_tokens) >= 2:
-                        cand_first = " ".join(cand_tokens[:-1])
-                        cand_last = cand_tokens[-1]
-                        matched = False
-                        for allowed in ALLOWED_NORMALIZED:
-                            a_tokens = allowed.split()
-                            if len(a_tokens) >= 2:
-                                a_first = " ".join(a_tokens[:-1])
-                                a_last = a_tokens[-1]
-                                if cand_last == a_last and (cand_first.startswith(a_first) or a_first.startswith(cand_first)):
-                                    matched = True
-                                    break
-                        if not matched:
-                            continue
-                    else:
-                        continue
-                player_lookup[formatted_name] = player_id
-                logging.debug(f"Added allowed player: {formatted_name} (ID: {player_id})")
+                registry.add(player_id, formatted_name)
+                roster[player_id] = formatted_name
             except Exception as e:
                 logging.warning(f"Skipping row with ID {row.get('id', 'unknown')}: {str(e)}")
                 continue
-        
+
+        allowed_ids = allowed_player_ids(registry)
+        player_lookup = {name: player_id for player_id, name in roster.items() if int(player_id) in allowed_ids}
+        for name, player_id in player_lookup.items():
+            logging.debug(f"Added allowed player: {name} (ID: {player_id})")
+
         logging.info(f"Successfully created lookup for {len(player_lookup)} players")
         return player_lookup
         
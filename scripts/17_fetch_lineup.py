@@ -16,10 +16,10 @@ import logging
 from datetime import datetime, date
 import re
 import argparse
-from atproto import Client
-from botocore.exceptions import ClientError
 from zoneinfo import ZoneInfo
 from scripts import config
+from scripts.bluesky import BlueskyPoster
+from scripts.bot_state import BotState
 
 # Set up basic configuration for logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -43,31 +43,6 @@ else:
 
 s3_resource = session.resource("s3")
 
-def get_last_post_date():
-    """Reads the last post date from S3."""
-    try:
-        obj = s3_resource.Object(s3_bucket_name, "redsox/data/bluesky/last_lineup_post_date.txt")
-        last_date_str = obj.get()['Body'].read().decode('utf-8').strip()
-        logging.info(f"Last post date found in S3: {last_date_str}")
-        return last_date_str
-    except ClientError as e:
-        if e.response['Error']['Code'] == 'NoSuchKey':
-            logging.info("last_lineup_post_date.txt not found. This is expected for the first run of the day.")
-            return None
-        else:
-            # For other S3-related errors, we should know about them.
-            logging.error(f"An unexpected S3 error occurred in get_last_post_date: {e}")
-            raise
-
-def set_last_post_date(date_str):
-    """Writes the last post date to S3."""
-    try:
-        obj = s3_resource.Object(s3_bucket_name, "redsox/data/bluesky/last_lineup_post_date.txt")
-        obj.put(Body=date_str)
-        logging.info(f"Successfully updated last post date in S3 to: {date_str}")
-    except Exception as e:
-        logging.error(f"Failed to write last post date to S3: {e}")
-
 def get_player_details(player_element_text):
     """
     Parses player string like 'Shohei Ohtani (L) DH' or just 'Shohei Ohtani'
@@ -108,7 +83,14 @@ def fetch_lineup_data(current_date_str):
         logging.error(f"Error fetching URL {url}: {e}")
         return None
 
-    soup = BeautifulSoup(response.content, 'html.parser')
+    return parse_lineup_html(response.content, current_date_str)
+
+
+def parse_lineup_html(html, current_date_str):
+    """
+    Parses an MLB.com starting-lineups page into one row per pitcher and batter.
+    """
+    soup = BeautifulSoup(html, 'html.parser')
     
     # Find the first matchup, which should be the current day's game
     matchup_div = soup.find("div", class_="starting-lineups__matchup")
@@ -286,23 +268,18 @@ def save_to_s3(df, base_s3_path, formats=["csv", "json"]):
         except Exception as e:
             logging.error(f"Failed to upload {fmt} to S3 for {base_s3_path}: {e}")
 
-def post_to_bluesky(post_text, current_date_str):
+def post_to_bluesky(post_text, current_date_str, state):
     """
     Posts to the authenticated Bluesky account.
     """
-    BLUESKY_HANDLE = os.environ.get("BLUESKY_HANDLE")
-    BLUESKY_APP_PASSWORD = os.environ.get("BLUESKY_APP_PASSWORD")
-
-    if not all([BLUESKY_HANDLE, BLUESKY_APP_PASSWORD]):
+    poster = BlueskyPoster(state)
+    if not poster.has_credentials:
         logging.error("Bluesky credentials are not fully set in environment variables. Cannot post.")
         return
 
     try:
-        client = Client()
-        client.login(BLUESKY_HANDLE, BLUESKY_APP_PASSWORD)
-        response = client.send_post(text=post_text)
-        logging.info(f"Post published successfully to Bluesky: {response.uri}")
-        set_last_post_date(current_date_str)
+        poster.post(post_text)
+        state.set_last_post_date("lineup", current_date_str)
     except Exception as e:
         logging.error(f"Failed to post to Bluesky: {e}")
 
@@ -447,12 +424,14 @@ def main():
                 print(tweet_text)
 
                 if args.post:
-                    last_post_date = get_last_post_date()
+                    state = BotState.load(s3_resource.meta.client)
+                    last_post_date = state.last_post_date("lineup")
                     if last_post_date == current_date_str and not args.force:
                         logging.info(f"Already posted for {current_date_str}. Skipping (use --force to override).")
                     else:
                         logging.info("Attempting to post to Bluesky...")
-                        post_to_bluesky(tweet_text, current_date_str)
+                        post_to_bluesky(tweet_text, current_date_str, state)
+                        state.flush(s3_resource.meta.client)
                 else:
                     logging.info("Dry run: --post flag not provided. Not posting to Bluesky.")
             else:
@@ -1,14 +1,27 @@
+import argparse
 import pandas as pd
 import numpy as np
-import json
 import os
 import boto3 # Added for S3
 from io import BytesIO # Added for S3
 import logging # Added for logging
+from scripts import projection
+from scripts import writers
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+def parse_arguments():
+    parser = argparse.ArgumentParser(description="Project season wins from game-by-game results")
+    parser.add_argument("--model", choices=projection.MODELS, default="bootstrap",
+                        help="Projection model for remaining games (default: bootstrap)")
+    parser.add_argument("--seed", type=int, help="Seed for the simulations, e.g. a recorded \"seed\" value (default: fresh entropy, recorded in the output)")
+    parser.add_argument("--sims", type=int, default=projection.DEFAULT_SIMULATIONS,
+                        help=f"Number of simulated seasons (default: {projection.DEFAULT_SIMULATIONS})")
+    return parser.parse_args()
+
+args = parse_arguments()
+
 # Define the output directory and file name
 output_dir = os.path.join("data", "standings")
 output_file_name = "redsox_wins_projection_timeseries.json"
@@ -27,6 +40,9 @@ output_data = {
     "current_wins": 0,
     "current_losses": 0,
     "timeseries": [],
+    "history": [],
+    "model": args.model,
+    "simulations": args.sims,
     "message": "Data not yet processed."
 }
 
@@ -50,7 +66,7 @@ def upload_json_to_s3(data_dict, bucket_name, object_key):
         session = boto3.Session(**session_params)
         s3_resource = session.resource("s3")
         
-        json_buffer = BytesIO(json.dumps(data_dict, indent=4).encode('utf-8'))
+        json_buffer = BytesIO(writers.dumps(data_dict))
         
         s3_resource.Bucket(bucket_name).put_object(
             Key=object_key, 
@@ -102,46 +118,49 @@ try:
             "timeseries": [] # Reset timeseries before populating
         })
         
-        for index, row in df.iterrows():
-            game_num = int(row["gm"])
-            cum_wins = int(row["cumulative_wins"])
-            output_data["timeseries"].append({
-                "game_number": game_num,
+        output_data["timeseries"] = [
+            {
+                "game_number": int(game_num),
                 "mean_projected_wins": float(cum_wins),
                 "lower_ci_wins": float(cum_wins),
                 "upper_ci_wins": float(cum_wins)
-            })
+            }
+            for game_num, cum_wins in zip(df["gm"], df["cumulative_wins"])
+        ]
+
+        remaining_games = projection.SEASON_GAMES - games_played
+        wins = df["win"].to_numpy()
+        if args.model == "pythagorean":
+            if not {"r", "ra"}.issubset(df.columns):
+                raise ValueError("Columns 'r' and 'ra' are required for the pythagorean model.")
+            runs_scored, runs_allowed = df["r"].to_numpy(), df["ra"].to_numpy()
+        else:
+            runs_scored = runs_allowed = np.zeros(games_played)
+        (path_rng, history_rng), seed_entropy = projection.make_streams(args.seed)
+        # A string: the entropy is usually 128 bits, past what JSON readers keep exactly (pass it back via --seed)
+        output_data["seed"] = str(seed_entropy)
 
-        remaining_games = 162 - games_played
+        # Projected final wins as of every game played so far (how the forecast evolved)
+        history = projection.projection_history(args.model, wins, runs_scored, runs_allowed, args.sims, history_rng)
+        output_data["history"] = projection.timeseries_rows(history["game_number"], history)
 
-        if games_played < 10:
-            output_data["message"] = "Not enough games played for a meaningful projection (minimum 10 games required)."
+        if games_played < projection.MIN_GAMES:
+            output_data["message"] = f"Not enough games played for a meaningful projection (minimum {projection.MIN_GAMES} games required)."
             logging.info(output_data["message"])
         elif remaining_games <= 0:
-            output_data["message"] = "Season complete. All 162 games have been played."
+            output_data["message"] = f"Season complete. All {projection.SEASON_GAMES} games have been played."
             logging.info(output_data["message"])
         else:
-            past_outcomes = df["win"].values
-            n_simulations = 10000
-            boot_simulations_remaining = np.random.choice(past_outcomes, 
-                                                          size=(n_simulations, remaining_games), 
-                                                          replace=True)
-            cumulative_boot_wins_for_remaining_part = np.cumsum(boot_simulations_remaining, axis=1)
-
-            for i in range(remaining_games):
-                game_num_overall = games_played + 1 + i
-                projected_total_wins_at_game_sims = current_wins + cumulative_boot_wins_for_remaining_part[:, i]
-                mean_wins = np.mean(projected_total_wins_at_game_sims)
-                lower_ci = np.percentile(projected_total_wins_at_game_sims, 2.5)
-                upper_ci = np.percentile(projected_total_wins_at_game_sims, 97.5)
-                output_data["timeseries"].append({
-                    "game_number": game_num_overall,
-                    "mean_projected_wins": round(mean_wins, 1),
-                    "lower_ci_wins": int(np.round(lower_ci)),
-                    "upper_ci_wins": int(np.round(upper_ci))
-                })
-            
-            output_data["message"] = f"Projection based on bootstrapping {games_played} past game outcomes for {remaining_games} remaining games."
+            draws = projection.simulate_remaining(args.model, wins, runs_scored, runs_allowed,
+                                                  remaining_games, args.sims, path_rng)
+            projected = projection.project_remaining(current_wins, draws)
+            game_numbers = np.arange(games_played + 1, projection.SEASON_GAMES + 1)
+            output_data["timeseries"].extend(projection.timeseries_rows(game_numbers, projected))
+
+            if args.model == "bootstrap":
+                output_data["message"] = f"Projection based on bootstrapping {games_played} past game outcomes for {remaining_games} remaining games."
+            else:
+                output_data["message"] = f"Projection based on the Pythagorean win expectation of {games_played} past games for {remaining_games} remaining games."
             logging.info(f"Current record: {current_wins}-{current_losses} ({games_played} games)")
             final_mean = output_data['timeseries'][-1]['mean_projected_wins']
             final_lower = output_data['timeseries'][-1]['lower_ci_wins']
@@ -162,8 +181,7 @@ except Exception as e:
     logging.error(output_data["message"])
 finally:
     try:
-        with open(local_output_file_path, 'w') as f:
-            json.dump(output_data, f, indent=4)
+        writers.write_json(output_data, local_output_file_path)
         logging.info(f"Local data saved to {local_output_file_path}")
     except Exception as e_local_save:
         logging.error(f"Failed to save data locally to {local_output_file_path}: {e_local_save}")
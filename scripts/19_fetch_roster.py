@@ -9,9 +9,11 @@ import boto3
 import re
 import unicodedata
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from dateutil.relativedelta import relativedelta
 from scripts import config
+from scripts import player_registry
+from scripts.transaction_store import TransactionStore
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
@@ -23,12 +25,14 @@ json_file = f"{output_dir}/redsox_roster_current.json"
 transactions_csv_file = f"{output_dir}/redsox_transactions_current.csv"
 transactions_json_file = f"{output_dir}/redsox_transactions_current.json"
 transactions_archive_json_file = f"{output_dir}/redsox_transactions_archive.json"
+transactions_store_file = f"{output_dir}/redsox_transactions.sqlite"
 s3_bucket = "redsox-data"
 s3_key_csv = "redsox/data/roster/redsox_roster_current.csv"
 s3_key_json = "redsox/data/roster/redsox_roster_current.json"
 s3_key_transactions_csv = "redsox/data/roster/redsox_transactions_current.csv"
 s3_key_transactions_json = "redsox/data/roster/redsox_transactions_current.json"
 s3_key_transactions_archive_json = "redsox/data/roster/redsox_transactions_archive.json"
+s3_key_transactions_store = "redsox/data/roster/redsox_transactions.sqlite"
 
 # AWS session (same logic as your other scripts)
 is_github_actions = os.getenv('GITHUB_ACTIONS') == 'true'
@@ -130,47 +134,36 @@ def parse_player_row(row, position_group):
         "is_40_man": is_40_man
     }
 
-def fetch_transactions():
+def transactions_url(month):
+    year, mm = month.split('-')
+    return f'https://www.mlb.com/{config.TEAM_NAME.lower().replace(" ", "")}/roster/transactions/{year}/{mm}'
+
+def fetch_transaction_month(month):
     """
-    Fetches team transactions for the current and previous 3 months,
-    merges them with a historical archive, and saves the full archive
-    as well as a separate file with the 100 most recent transactions.
+    Fetches one month of transactions. Returns (month, table or None, fetched),
+    where fetched is False only when the page could not be retrieved.
     """
-    logging.info("Fetching and archiving transactions...")
-
-    # Determine the URLs to fetch (current month and previous 3)
-    today = datetime.now()
-    urls_to_fetch = []
-    for i in range(4):
-        target_date = today - relativedelta(months=i)
-        year = target_date.year
-        month = target_date.strftime('%m')
-        urls_to_fetch.append(f'https://www.mlb.com/{config.TEAM_NAME.lower().replace(" ", "")}/roster/transactions/{year}/{month}')
-
-    # Fetch new data
-    new_transactions_list = []
-    for url in urls_to_fetch:
-        try:
-            df_list = pd.read_html(url)
-            if df_list:
-                new_transactions_list.append(df_list[0])
-                logging.info(f"Successfully fetched {url}")
-        except Exception as e:
-            logging.warning(f"Could not fetch or parse {url}. It might be a month with no transactions. Error: {e}")
-            continue
-
-    if not new_transactions_list:
-        logging.info("No new transactions found in the last 4 months. Exiting transaction fetch.")
-        return
-
-    # Combine all newly fetched dataframes
-    new_df = pd.concat(new_transactions_list, ignore_index=True)
-    new_df.columns = new_df.columns.str.lower()
-    new_df.dropna(subset=['date', 'transaction'], inplace=True)
-
-    # Process new data
-    new_df['transaction'] = new_df['transaction'].str.replace(config.TEAM_FULL_NAME, config.TEAM_NAME_SIMPLE, regex=False)
-    new_df['date'] = pd.to_datetime(new_df['date'], format='%m/%d/%y')
+    url = transactions_url(month)
+    try:
+        df_list = pd.read_html(url)
+        logging.info(f"Successfully fetched {url}")
+        return month, (df_list[0] if df_list else None), True
+    except ValueError as e:
+        # read_html raises ValueError when the page has no table: a month with no transactions
+        logging.info(f"No transactions table at {url}: {e}")
+        return month, None, True
+    except Exception as e:
+        logging.warning(f"Could not fetch or parse {url}. Error: {e}")
+        return month, None, False
+
+def process_transactions(df, registry=None):
+    """Cleans a transactions table into store rows (date as YYYY-MM-DD, players named in the text)."""
+    df = df.copy()
+    df.columns = df.columns.str.lower()
+    df = df.dropna(subset=['date', 'transaction'])
+
+    df['transaction'] = df['transaction'].str.replace(config.TEAM_FULL_NAME, config.TEAM_NAME_SIMPLE, regex=False)
+    df['date'] = pd.to_datetime(df['date'], format='%m/%d/%y').dt.strftime('%Y-%m-%d')
 
     positions = ["RHP", "LHP", "P", "C", "1B", "2B", "3B", "SS", "INF", "OF", "LF", "CF", "RF", "DH"]
     position_regex = r'(?:' + '|'.join(positions) + r')\s'
@@ -181,30 +174,84 @@ def fetch_transactions():
         names = re.findall(full_regex, transaction_text)
         return [name.strip().rstrip('.') for name in names] if names else None
 
-    new_df['players'] = new_df['transaction'].apply(extract_names)
-
-    # Load archive
-    archive_df = pd.DataFrame()
-    if os.path.exists(transactions_archive_json_file):
-        archive_df = pd.read_json(transactions_archive_json_file)
-        if not archive_df.empty:
-            archive_df['date'] = pd.to_datetime(archive_df['date'])
-
-    # Combine, de-duplicate, and sort
-    combined_df = pd.concat([archive_df, new_df], ignore_index=True)
-    combined_df.drop_duplicates(subset=['date', 'transaction'], keep='last', inplace=True)
-    combined_df.sort_values(by='date', ascending=False, inplace=True)
-    combined_df['date'] = combined_df['date'].dt.strftime('%Y-%m-%d')
-
-    # Save full archive
-    with open(transactions_archive_json_file, 'w', encoding='utf-8') as f:
-        combined_df.to_json(f, indent=2, orient="records", force_ascii=False)
-    logging.info(f"Full transaction archive saved to {transactions_archive_json_file}")
-    if s3:
-        s3.Bucket(s3_bucket).upload_file(transactions_archive_json_file, s3_key_transactions_archive_json)
+    def known_players(transaction_text):
+        # Registered players the position-based regex missed (e.g. no position listed)
+        names = extract_names(transaction_text) or []
+        seen = {player_registry.normalize_name(name) for name in names}
+        for player_id in registry.find_in_text(transaction_text):
+            name = registry.get(player_id)['full_name']
+            if player_registry.normalize_name(name) not in seen:
+                names.append(name)
+        return names or None
+
+    df['players'] = df['transaction'].apply(known_players if registry else extract_names)
+    return df[['date', 'transaction', 'players']].to_dict(orient='records')
+
+def open_transaction_store():
+    """Opens the local transaction store, pulling it from S3 or seeding it from the legacy JSON archive."""
+    if not os.path.exists(transactions_store_file) and s3:
+        try:
+            s3.Bucket(s3_bucket).download_file(s3_key_transactions_store, transactions_store_file)
+            logging.info(f"Downloaded transaction store from s3://{s3_bucket}/{s3_key_transactions_store}")
+        except Exception as e:
+            logging.info(f"No transaction store in S3 yet ({e})")
+    store = TransactionStore(transactions_store_file)
+    if len(store) == 0:
+        archive = []
+        try:
+            if os.path.exists(transactions_archive_json_file):
+                with open(transactions_archive_json_file, encoding='utf-8') as f:
+                    archive = json.load(f)
+            elif s3:
+                obj = s3.Object(s3_bucket, s3_key_transactions_archive_json)
+                archive = json.loads(obj.get()['Body'].read().decode('utf-8'))
+        except Exception as e:
+            logging.info(f"No legacy transaction archive to seed from ({e})")
+        if archive:
+            # Oldest first so rowid order matches arrival order
+            added = store.insert(reversed(archive))
+            logging.info(f"Seeded transaction store with {added} archived transactions")
+    return store
+
+def fetch_transactions(registry=None):
+    """
+    Fetches team transactions for the months that are not sealed yet (the current
+    month and up to 3 before it), adds new ones to the transaction store, and saves
+    the full archive and a separate file with the 100 most recent transactions.
+    """
+    logging.info("Fetching and archiving transactions...")
+
+    store = open_transaction_store()
+    today = datetime.now().date()
+    months = store.months_to_fetch(today)
+
+    with ThreadPoolExecutor(max_workers=len(months)) as pool:
+        results = list(pool.map(fetch_transaction_month, months))
+
+    added = 0
+    sealed = []
+    for month, df, fetched in results:
+        if df is not None:
+            added += store.insert(process_transactions(df, registry))
+        if fetched and store.mark_fetched(month, today):
+            sealed.append(month)
+    logging.info(f"Fetched {', '.join(months)}: {added} new transactions ({len(store)} stored)"
+                 + (f"; sealed {', '.join(sealed)}" if sealed else ""))
+
+    if added or sealed:
+        if s3:
+            s3.Bucket(s3_bucket).upload_file(transactions_store_file, s3_key_transactions_store)
+    if added or not os.path.exists(transactions_archive_json_file):
+        # Save full archive (only rewritten when something new arrived)
+        with open(transactions_archive_json_file, 'w', encoding='utf-8') as f:
+            json.dump(store.all(), f, indent=2, ensure_ascii=False)
+        logging.info(f"Full transaction archive saved to {transactions_archive_json_file}")
+        if s3:
+            s3.Bucket(s3_bucket).upload_file(transactions_archive_json_file, s3_key_transactions_archive_json)
 
     # Save current view (top 100)
-    current_df = combined_df.head(100)
+    current_df = pd.DataFrame(store.latest(100), columns=['date', 'transaction', 'players'])
+    store.close()
     current_df.to_csv(transactions_csv_file, index=False)
     with open(transactions_json_file, 'w', encoding='utf-8') as f:
         current_df.to_json(f, indent=2, orient="records", force_ascii=False)
@@ -217,6 +264,19 @@ def fetch_transactions():
         s3.Bucket(s3_bucket).upload_file(transactions_json_file, s3_key_transactions_json)
     logging.info("Current transactions data written and uploaded to S3.")
 
+def update_player_registry(players):
+    """Refreshes the shared player registry from statsapi and the scraped roster, then saves and uploads it."""
+    registry = player_registry.PlayerRegistry.load()
+    added = registry.add_people(player_registry.fetch_team_people())
+    for player in players:
+        if player.get('player_id') and player.get('name'):
+            registry.add(player['player_id'], player['name'])
+    registry.save()
+    logging.info(f"Player registry has {len(registry)} players ({added} from statsapi this run)")
+    if s3:
+        s3.Bucket(s3_bucket).upload_file(player_registry.LOCAL_PATH, player_registry.S3_KEY)
+    return registry
+
 def main():
     os.makedirs(output_dir, exist_ok=True)
     os.makedirs(jekyll_data_dir, exist_ok=True)
@@ -260,7 +320,8 @@ def main():
     else:
         logging.info("Roster data written locally. S3 upload skipped (no AWS credentials).")
 
-    fetch_transactions()
+    registry = update_player_registry(all_players)
+    fetch_transactions(registry)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
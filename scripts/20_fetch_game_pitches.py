@@ -2,15 +2,15 @@ import requests
 import pandas as pd
 from datetime import datetime, timedelta
 from tqdm import tqdm
-import math
 import os
 import boto3
 from scripts import config
+from scripts import gamefeed_cache
+from scripts import game_pitches
+from scripts import writers
 
 # === Constants ===
 SCHEDULE_URL = "https://statsapi.mlb.com/api/v1/schedule"
-GAMEFEED_URL = "https://baseballsavant.mlb.com/gf"
-BALL_RADIUS_FEET = 1.45 / 12
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 
 # === Configuration ===
@@ -84,9 +84,7 @@ def get_team_game_ids(date_str):
     return team_games
 
 def fetch_game_pitches(game_pk):
-    resp = requests.get(GAMEFEED_URL, params={"game_pk": game_pk})
-    resp.raise_for_status()
-    return resp.json()
+    return gamefeed_cache.get("savant", game_pk)
 
 def load_existing_json(url: str) -> pd.DataFrame:
     try:
@@ -107,72 +105,7 @@ def analyze_pitches(game_info, batting_side_override: str = None, team_role: str
         print(f"⚠️ Failed to fetch game {game_pk}: {e}")
         return []
 
-    rows = []
-    # Strike zone horizontal boundaries (in feet)
-    sz_right = 0.708 
-    sz_left = -0.708
-
-    for batter_id, pitches in data.get(team_side, {}).items():
-        for pitch in pitches:
-            px = pitch.get("px")
-            pz = pitch.get("pz")
-            sz_bot = pitch.get("sz_bot")
-            sz_top = pitch.get("sz_top")
-
-            dist_from_sz_center_feet = None
-            dist_from_sz_edge_feet = None
-            dist_from_sz_center_inches = None
-            dist_from_sz_edge_inches = None
-            inside_margin_inches = None
-            if all(v is not None for v in [px, pz, sz_bot, sz_top]):
-                # Distance from ball center to closest point on the zone rectangle
-                closest_x = max(sz_left, min(sz_right, px))
-                closest_z = max(sz_bot, min(sz_top, pz))
-                dist_from_sz_center_feet = math.sqrt((px - closest_x)**2 + (pz - closest_z)**2)
-                dist_from_sz_edge_feet = dist_from_sz_center_feet - BALL_RADIUS_FEET
-                dist_from_sz_center_inches = dist_from_sz_center_feet * 12
-                dist_from_sz_edge_inches = dist_from_sz_edge_feet * 12
-
-                # Depth inside zone (from the ball's outside edge to nearest edge)
-                # Compute minimal center-to-edge distance when inside the zone
-                left_gap = px - sz_left
-                right_gap = sz_right - px
-                bottom_gap = pz - sz_bot
-                top_gap = sz_top - pz
-                min_gap_feet = min(left_gap, right_gap, bottom_gap, top_gap)
-                # Positive only when the center is inside the rectangle
-                if min_gap_feet is not None:
-                    inside_margin_inches = max(0.0, (min_gap_feet - BALL_RADIUS_FEET) * 12)
-            
-            in_strike_zone = dist_from_sz_center_feet is not None and dist_from_sz_center_feet <= BALL_RADIUS_FEET
-            
-            rows.append({
-                "game_pk": game_pk,
-                "game_date": game_date,
-                "pitch_id": pitch.get("play_id"),
-                "inning": pitch.get("inning"),
-                "ab_number": pitch.get("ab_number"),
-                "pitch_number": pitch.get("pitch_number"),
-                "batter": pitch.get("batter_name"),
-                "pitcher": pitch.get("pitcher_name"),
-                "pitch_name": pitch.get("pitch_name"),
-                "pitch_velocity": pitch.get("start_speed"),
-                "pitch_call": pitch.get("pitch_call"),
-                "pitch_in_zone": in_strike_zone,
-                "at_bat_eventual_result": pitch.get("result"),
-                "at_bat_eventual_desc": pitch.get("des"),
-                "dist_from_sz_center_inches": dist_from_sz_center_inches,
-                "dist_from_sz_edge_inches": dist_from_sz_edge_inches,
-                "inside_margin_inches": inside_margin_inches,
-                "zone": pitch.get("zone"),
-                "px": px,
-                "pz": pz,
-                "sz_bot": sz_bot,
-                "sz_top": sz_top,
-                "team_role": team_role or "thrown_to_redsox",
-            })
-    rows.sort(key=lambda p: (p.get('inning', 0), p.get('ab_number', 0), p.get('pitch_number', 0)))
-    return rows
+    return game_pitches.pitch_rows(data, team_side, game_pk, game_date, team_role)
 
 # === Main ===
 all_team_games = []
@@ -204,8 +137,7 @@ for game_info in tqdm(all_team_games, desc="Analyzing games"):
 
     # Pitches thrown BY Team pitchers (skip if already processed)
     if gpk not in processed_gamepks_by:
-        ts = game_info.get("team_side")
-        other_side = "away_batters" if ts == "home_batters" else "home_batters"
+        other_side = game_pitches.other_side(game_info.get("team_side"))
         all_pitches_thrown_by_team.extend(
             analyze_pitches(game_info, batting_side_override=other_side, team_role="thrown_by_redsox")
         )
@@ -246,14 +178,17 @@ json_path_by = os.path.join(OUTPUT_DIR, f"redsox_pitches_thrown_{current_year}.j
 
 df.to_csv(csv_path, index=False)
 print(f"Pitch data saved locally to {csv_path}")
-df.to_json(json_path, indent=4, orient="records")
+writers.write_json_array(df, json_path)
 print(f"Pitch data saved locally to {json_path}")
+# NDJSON and parquet copies for consumers that read the file in chunks
+stream_paths = writers.write_frame(df, os.path.splitext(json_path)[0])
 
 # Save pitches thrown by Team
 df_by_team.to_csv(csv_path_by, index=False)
 print(f"Pitch data (thrown by {config.TEAM_NAME}) saved locally to {csv_path_by}")
-df_by_team.to_json(json_path_by, indent=4, orient="records")
+writers.write_json_array(df_by_team, json_path_by)
 print(f"Pitch data (thrown by {config.TEAM_NAME}) saved locally to {json_path_by}")
+stream_paths_by = writers.write_frame(df_by_team, os.path.splitext(json_path_by)[0])
 
 # === Upload to S3 ===
 try:
@@ -269,5 +204,10 @@ try:
     print(f"Successfully uploaded {os.path.basename(csv_path_by)} to {S3_BUCKET}/{s3_key_csv_by}")
     s3.Bucket(S3_BUCKET).upload_file(json_path_by, s3_key_json_by)
     print(f"Successfully uploaded {os.path.basename(json_path_by)} to {S3_BUCKET}/{s3_key_json_by}")
+
+    for path in list(stream_paths.values()) + list(stream_paths_by.values()):
+        key = f"redsox/data/pitches/{os.path.basename(path)}"
+        s3.Bucket(S3_BUCKET).upload_file(path, key)
+        print(f"Successfully uploaded {os.path.basename(path)} to {S3_BUCKET}/{key}")
 except Exception as e:
     print(f"An error occurred during S3 upload: {e}")
\ No newline at end of file
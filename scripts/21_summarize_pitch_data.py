@@ -1,14 +1,21 @@
 import json
-import requests
 import pandas as pd
 import os
 import boto3
 from botocore.exceptions import NoCredentialsError
+from collections import Counter
+from scripts import config
+from scripts import gamefeed_cache
+from scripts import query_layer
+from scripts import umpire_rollups
+from scripts import writers
 
 # === Configuration ===
 LOCAL_JSON_PATH = "data/summary/umpire_summary.json"
 S3_BUCKET = "redsox-data"
 S3_KEY = "redsox/data/summary/umpire_summary.json"
+ROLLUP_LOCAL_PATH = "data/summary/umpire_rollups_{year}.json"
+ROLLUP_S3_KEY = "redsox/data/summary/umpire_rollups_{year}.json"
 
 # === AWS Session Setup ===
 is_github_actions = os.getenv('GITHUB_ACTIONS') == 'true'
@@ -25,15 +32,15 @@ else:
     session = boto3.Session(profile_name="haekeo", region_name="us-west-1")
 s3 = session.resource('s3')
 
-def upload_to_s3(file_path):
+def upload_to_s3(file_path, key=S3_KEY):
     """Uploads a file to the configured S3 bucket."""
     if not S3_BUCKET:
         print("S3 upload skipped: Bucket name is not configured.")
         return
     
     try:
-        s3.Bucket(S3_BUCKET).upload_file(file_path, S3_KEY)
-        print(f"Successfully uploaded {os.path.basename(file_path)} to {S3_BUCKET}/{S3_KEY}")
+        s3.Bucket(S3_BUCKET).upload_file(file_path, key)
+        print(f"Successfully uploaded {os.path.basename(file_path)} to {S3_BUCKET}/{key}")
     except FileNotFoundError:
         print(f"Error: The file {file_path} was not found for S3 upload.")
     except NoCredentialsError:
@@ -41,207 +48,174 @@ def upload_to_s3(file_path):
     except Exception as e:
         print(f"An error occurred during S3 upload: {e}")
 
-def analyze_pitches(file_path, thrown_by_file_path=None):
+def load_rollups(season):
+    """Loads the season's per-game umpire rollups from S3, falling back to the local copy."""
+    try:
+        obj = s3.Object(S3_BUCKET, ROLLUP_S3_KEY.format(year=season)).get()
+        store = json.loads(obj["Body"].read())
+        if store.get("version") == umpire_rollups.ROLLUP_VERSION:
+            return store
+    except Exception as e:
+        print(f"Umpire rollups not loaded from S3 ({e}); trying local copy.")
+    local_path = ROLLUP_LOCAL_PATH.format(year=season)
+    try:
+        with open(local_path, 'r') as f:
+            store = json.load(f)
+        if store.get("version") == umpire_rollups.ROLLUP_VERSION:
+            return store
+    except (FileNotFoundError, json.JSONDecodeError):
+        pass
+    print("Starting new umpire rollups; every game will be rolled up.")
+    return umpire_rollups.new_store(season)
+
+def get_home_plate_umpire(game_pk: int):
+    """Returns {"id", "name"} of the home plate umpire from the statsapi live feed, or None."""
+    try:
+        payload = gamefeed_cache.get("statsapi", game_pk)
+        officials = (
+            payload
+            .get("liveData", {})
+            .get("boxscore", {})
+            .get("officials", [])
+        )
+        for off in officials:
+            if str(off.get("officialType", "")).lower() == "home plate":
+                official = off.get("official", {})
+                return {
+                    "id": official.get("id"),
+                    "name": official.get("fullName"),
+                }
+    except Exception:
+        pass
+    return None
+
+def _json_source(file_path):
+    with open(file_path, 'r') as f:
+        pitches = json.load(f)
+    counts = Counter(str(p.get("game_pk")) for p in pitches)
+    return counts, lambda stale: pd.DataFrame([p for p in pitches if str(p.get("game_pk")) in stale])
+
+def pitch_source(file_path):
+    """(per-game pitch counts, loader for selected games) for one of 20's pitch files.
+
+    With duckdb installed and 20's parquet copy next to the JSON, the counts are a
+    SQL group-by and only the games being rolled up are read; otherwise, or when
+    a query fails, the JSON is loaded whole. Each query opens and closes its own
+    connection.
+    """
+    parquet_path = os.path.splitext(file_path)[0] + ".parquet"
+    if not (query_layer.available() and os.path.exists(parquet_path)):
+        return _json_source(file_path)
+    datasets = {"pitches": parquet_path}
+    try:
+        with query_layer.QueryLayer(root="", datasets=datasets) as layer:
+            counts = {str(pk): int(n) for pk, n in layer.conn.execute(
+                "SELECT game_pk, COUNT(*) FROM pitches GROUP BY game_pk").fetchall()}
+    except query_layer.duckdb.Error as e:
+        print(f"Could not query {parquet_path}, reading {file_path} instead: {e}")
+        return _json_source(file_path)
+
+    def load_games(stale):
+        try:
+            with query_layer.QueryLayer(root="", datasets=datasets) as layer:
+                return layer.sql("SELECT * FROM pitches WHERE CAST(game_pk AS VARCHAR) IN "
+                                 "(SELECT UNNEST(?::VARCHAR[]))", [sorted(stale)])
+        except query_layer.duckdb.Error as e:
+            print(f"Could not query {parquet_path}, reading {file_path} instead: {e}")
+            return _json_source(file_path)[1](stale)
+
+    return counts, load_games
+
+def analyze_pitches(file_path, thrown_by_file_path=None, season=None):
     """
-    Analyzes pitch data and saves a JSON summary locally and to S3.
+    Updates the per-game umpire rollups with new games and saves a JSON summary locally and to S3.
     """
     try:
-        with open(file_path, 'r') as f:
-            pitches = json.load(f)
+        source = pitch_source(file_path)
     except (FileNotFoundError, json.JSONDecodeError) as e:
         print(f"Error reading pitch data file: {e}")
         return
-
-    if not pitches:
+    if not source[0]:
         print("No pitch data available.")
         return
 
-    df = pd.DataFrame(pitches)
-    df['game_date'] = pd.to_datetime(df['game_date'])
-    df['dist_from_sz_edge_inches'] = pd.to_numeric(df['dist_from_sz_edge_inches'], errors='coerce')
+    season = season or pd.to_datetime("now").strftime("%Y")
+    rollups = load_rollups(season)
+
+    # --- Roll up only new or changed games ---
+    updated = umpire_rollups.sync_rollups(rollups, *source, "batting", fetch_umpire=get_home_plate_umpire)
+    print(f"Rolled up {len(updated)} new or changed game(s) (pitches thrown to {config.TEAM_NAME}).")
 
-    # --- Calculations ---
-    df_called_strikes = df[df['pitch_call'] == 'called_strike'].copy()
-    df_bad_calls = df_called_strikes[~df_called_strikes['pitch_in_zone']].copy()
-    
-    # Season Summary
-    season_total_strikes = len(df_called_strikes)
-    season_bad_calls = len(df_bad_calls)
-    season_correct_calls = season_total_strikes - season_bad_calls
-    season_correct_pct = (season_correct_calls / season_total_strikes * 100) if season_total_strikes > 0 else 0
-    season_incorrect_pct = 100 - season_correct_pct
-
-    # Last Game Summary
-    most_recent_date = df['game_date'].max()
-    df_game = df[df['game_date'] == most_recent_date]
-    game_called_strikes = df_game[df_game['pitch_call'] == 'called_strike']
-    game_bad_calls = game_called_strikes[~game_called_strikes['pitch_in_zone']]
-    game_total_strikes = len(game_called_strikes)
-    game_bad_calls_count = len(game_bad_calls)
-    game_correct_calls = game_total_strikes - game_bad_calls_count
-    game_correct_pct = (game_correct_calls / game_total_strikes * 100) if game_total_strikes > 0 else 0
-    game_incorrect_pct = 100 - game_correct_pct
-
-    # Worst Calls
-    df_rankable = df_bad_calls.dropna(subset=['dist_from_sz_edge_inches'])
-    df_worst = df_rankable.sort_values(by='dist_from_sz_edge_inches', ascending=False).head(4)
-    worst_calls_list = [
-        {
-            "distance_inches": row['dist_from_sz_edge_inches'],
-            "batter": row['batter'],
-            "pitcher": row['pitcher'],
-            "pitch_type": row['pitch_name'],
-            "velocity_mph": row['pitch_velocity'],
-            "date": row['game_date'].strftime('%Y-%m-%d'),
-            "date_formatted": row['game_date'].strftime('%B %-d, %Y'),
-            "video_link": f"https://baseballsavant.mlb.com/sporty-videos?playId={row['pitch_id']}"
-        }
-        for _, row in df_worst.iterrows()
-    ]
-    
     # --- Optional: Pitching-side analysis (balls called in zone against Team pitchers) ---
-    pitching_summary = None
-    pitching_last_game = None
-    pitching_worst_calls_list = []
+    include_pitching = False
     if thrown_by_file_path:
         try:
-            with open(thrown_by_file_path, 'r') as f:
-                pitches_by = json.load(f)
-            if pitches_by:
-                df_by = pd.DataFrame(pitches_by)
-                df_by['game_date'] = pd.to_datetime(df_by['game_date'])
-                df_by['dist_from_sz_edge_inches'] = pd.to_numeric(df_by['dist_from_sz_edge_inches'], errors='coerce')
-
-                # Bad calls for pitching: balls called inside the zone
-                df_called_balls = df_by[df_by['pitch_call'] == 'ball'].copy()
-                df_bad_pitch_calls = df_called_balls[df_called_balls['pitch_in_zone']].copy()
-
-                season_total_balls = len(df_called_balls)
-                season_bad_balls = len(df_bad_pitch_calls)
-                season_correct_balls = season_total_balls - season_bad_balls
-                season_correct_pct_balls = (season_correct_balls / season_total_balls * 100) if season_total_balls > 0 else 0
-                season_incorrect_pct_balls = 100 - season_correct_pct_balls
-
-                # Last game summary (by game date)
-                most_recent_date_by = df_by['game_date'].max()
-                df_game_by = df_by[df_by['game_date'] == most_recent_date_by]
-                game_called_balls = df_game_by[df_game_by['pitch_call'] == 'ball']
-                game_bad_balls = game_called_balls[game_called_balls['pitch_in_zone']]
-                game_total_balls = len(game_called_balls)
-                game_bad_balls_count = len(game_bad_balls)
-                game_correct_balls = game_total_balls - game_bad_balls_count
-                game_correct_pct_balls = (game_correct_balls / game_total_balls * 100) if game_total_balls > 0 else 0
-                game_incorrect_pct_balls = 100 - game_correct_pct_balls
-
-                # Worst calls (how off): prefer depth inside zone if available
-                # inside_margin_inches measures depth from ball's outer edge to nearest zone edge
-                if 'inside_margin_inches' in df_bad_pitch_calls.columns:
-                    df_rankable_by = df_bad_pitch_calls.dropna(subset=['inside_margin_inches']).copy()
-                    df_rankable_by['inside_inches'] = df_rankable_by['inside_margin_inches']
-                else:
-                    df_rankable_by = df_bad_pitch_calls.dropna(subset=['dist_from_sz_edge_inches']).copy()
-                    df_rankable_by['inside_inches'] = df_rankable_by['dist_from_sz_edge_inches'].abs()
-                # Filter out borderline cases (< 2") to highlight truly egregious
-                df_rankable_by = df_rankable_by[df_rankable_by['inside_inches'] >= 2.0]
-                df_worst_by = df_rankable_by.sort_values(by='inside_inches', ascending=False).head(4)
-                pitching_worst_calls_list = [
-                    {
-                        "distance_inches": row['inside_inches'],
-                        "batter": row['batter'],
-                        "pitcher": row['pitcher'],
-                        "pitch_type": row['pitch_name'],
-                        "velocity_mph": row['pitch_velocity'],
-                        "date": row['game_date'].strftime('%Y-%m-%d'),
-                        "date_formatted": row['game_date'].strftime('%B %-d, %Y'),
-                        "video_link": f"https://baseballsavant.mlb.com/sporty-videos?playId={row['pitch_id']}"
-                    }
-                    for _, row in df_worst_by.iterrows()
-                ]
-
-                pitching_summary = {
-                    "correct_balls_pct": season_correct_pct_balls,
-                    "incorrect_balls_pct": season_incorrect_pct_balls,
-                    "total_called_balls": season_total_balls,
-                    "bad_calls_count": season_bad_balls
-                }
-                pitching_last_game = {
-                    "date": most_recent_date_by.strftime('%B %-d, %Y'),
-                    "correct_balls_pct": game_correct_balls and game_correct_pct_balls or 0,
-                    "incorrect_balls_pct": game_incorrect_pct_balls,
-                    "total_called_balls": game_total_balls,
-                    "bad_calls_count": game_bad_balls_count
-                }
+            source_by = pitch_source(thrown_by_file_path)
+            if source_by[0]:
+                updated_by = umpire_rollups.sync_rollups(rollups, *source_by, "pitching")
+                print(f"Rolled up {len(updated_by)} new or changed game(s) (pitches thrown by {config.TEAM_NAME}).")
+                include_pitching = True
         except (FileNotFoundError, json.JSONDecodeError):
             pass
 
-    # --- Helper: Fetch Home Plate Umpire for the last game ---
-    def get_home_plate_umpire(game_pk: int):
-        try:
-            url = f"https://statsapi.mlb.com/api/v1.1/game/{int(game_pk)}/feed/live"
-            resp = requests.get(url, timeout=15)
-            resp.raise_for_status()
-            payload = resp.json()
-            officials = (
-                payload
-                .get("liveData", {})
-                .get("boxscore", {})
-                .get("officials", [])
-            )
-            for off in officials:
-                if str(off.get("officialType", "")).lower() == "home plate":
-                    official = off.get("official", {})
-                    return {
-                        "id": official.get("id"),
-                        "name": official.get("fullName"),
-                    }
-        except Exception:
-            pass
-        return None
-
-    # Determine the gamePk for the most recent game in the dataset
-    recent_game_pk = None
-    try:
-        # Use mode or first unique pk on the most recent date
-        game_pks = df_game.get("game_pk")
-        if game_pks is not None and not game_pks.empty:
-            recent_game_pk = int(pd.Series(game_pks).mode().iloc[0])
-    except Exception:
-        recent_game_pk = None
-
-    home_plate_umpire = get_home_plate_umpire(recent_game_pk) if recent_game_pk is not None else None
+    # --- Derive the summary views from the rollups ---
+    season_view = umpire_rollups.season_view(rollups, "batting")
+    last_game = umpire_rollups.last_game_view(rollups, "batting")
+    home_plate_umpire = last_game["home_plate_umpire"]
 
     # --- Create Summary Object ---
     summary_data = {
         "season_summary": {
-            "correct_strikes_pct": season_correct_pct,
-            "incorrect_strikes_pct": season_incorrect_pct,
-            "total_called_strikes": season_total_strikes,
-            "bad_calls_count": season_bad_calls
+            "correct_strikes_pct": season_view["correct_pct"],
+            "incorrect_strikes_pct": season_view["incorrect_pct"],
+            "total_called_strikes": season_view["total"],
+            "bad_calls_count": season_view["bad"]
         },
         "last_game_summary": {
-            "date": most_recent_date.strftime("%B %-d, %Y"),
-            "correct_strikes_pct": game_correct_pct,
-            "incorrect_strikes_pct": game_incorrect_pct,
-            "total_called_strikes": game_total_strikes,
-            "bad_calls_count": game_bad_calls_count,
+            "date": last_game["date"].strftime("%B %-d, %Y"),
+            "correct_strikes_pct": last_game["correct_pct"],
+            "incorrect_strikes_pct": last_game["incorrect_pct"],
+            "total_called_strikes": last_game["total"],
+            "bad_calls_count": last_game["bad"],
             **({"home_plate_umpire": home_plate_umpire.get("name") if home_plate_umpire else None} ),
         },
-        "worst_calls_of_season": worst_calls_list
+        "worst_calls_of_season": umpire_rollups.worst_calls(rollups, "batting")
     }
 
-    if pitching_summary is not None and pitching_last_game is not None:
-        summary_data["pitching_season_summary"] = pitching_summary
-        summary_data["pitching_last_game_summary"] = pitching_last_game
-        summary_data["pitching_worst_calls_of_season"] = pitching_worst_calls_list
+    if include_pitching:
+        season_by = umpire_rollups.season_view(rollups, "pitching")
+        last_game_by = umpire_rollups.last_game_view(rollups, "pitching")
+        summary_data["pitching_season_summary"] = {
+            "correct_balls_pct": season_by["correct_pct"],
+            "incorrect_balls_pct": season_by["incorrect_pct"],
+            "total_called_balls": season_by["total"],
+            "bad_calls_count": season_by["bad"]
+        }
+        summary_data["pitching_last_game_summary"] = {
+            "date": last_game_by["date"].strftime('%B %-d, %Y'),
+            "correct_balls_pct": last_game_by["correct"] and last_game_by["correct_pct"] or 0,
+            "incorrect_balls_pct": last_game_by["incorrect_pct"],
+            "total_called_balls": last_game_by["total"],
+            "bad_calls_count": last_game_by["bad"]
+        }
+        summary_data["pitching_worst_calls_of_season"] = umpire_rollups.worst_calls(rollups, "pitching")
+
+    # Monthly and per-umpire breakdowns come straight from the same rollups
+    summary_data["monthly_summary"] = umpire_rollups.by_month(rollups, "batting")
+    summary_data["umpire_summary"] = umpire_rollups.by_umpire(rollups, "batting")
 
     # --- Save and Upload ---
+    rollup_path = ROLLUP_LOCAL_PATH.format(year=season)
+    os.makedirs(os.path.dirname(rollup_path), exist_ok=True)
+    writers.write_json(rollups, rollup_path)
+    upload_to_s3(rollup_path, ROLLUP_S3_KEY.format(year=season))
+
     os.makedirs(os.path.dirname(LOCAL_JSON_PATH), exist_ok=True)
-    with open(LOCAL_JSON_PATH, 'w') as f:
-        json.dump(summary_data, f, indent=4)
+    writers.write_json(summary_data, LOCAL_JSON_PATH)
     print(f"Summary saved locally to {LOCAL_JSON_PATH}")
 
     upload_to_s3(LOCAL_JSON_PATH)
 
 if __name__ == "__main__":
     year = pd.to_datetime("now").strftime("%Y")
-    analyze_pitches(f'data/pitches/redsox_pitches_{year}.json', thrown_by_file_path=f'data/pitches/redsox_pitches_thrown_{year}.json') 
\ No newline at end of file
+    analyze_pitches(f'data/pitches/redsox_pitches_{year}.json', thrown_by_file_path=f'data/pitches/redsox_pitches_thrown_{year}.json', season=year)
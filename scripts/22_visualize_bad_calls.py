@@ -1,11 +1,13 @@
+import argparse
 import json
 import pandas as pd
 import matplotlib.pyplot as plt
+import numpy as np
 import matplotlib.patches as patches
 import seaborn as sns
 import os
-
-BALL_RADIUS_FEET = 1.45 / 12
+from scripts import pitch_grids
+from scripts import strike_zone
 
 def visualize_called_strikes(file_path, output_dir):
     """
@@ -36,7 +38,7 @@ def visualize_called_strikes(file_path, output_dir):
     # The catcher's view is from behind the plate.
     # The x-axis (px) is horizontal, y-axis (pz) is vertical.
     # Horizontal boundaries are constant (in feet).
-    sz_width = 0.708 * 2  # -0.708 to +0.708 feet
+    sz_width = strike_zone.SZ_HALF_WIDTH * 2  # -0.708 to +0.708 feet
     # Vertical boundaries (sz_top, sz_bot) vary by batter and pitch.
     # We'll use the average for visualization.
     avg_sz_top = df['sz_top'].mean()
@@ -46,23 +48,10 @@ def visualize_called_strikes(file_path, output_dir):
     # Re-classify pitches based on the AVERAGE strike zone for visual consistency.
     # The original 'pitch_in_zone' is more accurate for stats, but for this plot,
     # we use a recalculated version to match the single rectangle being drawn.
-    sz_left = -sz_width / 2
-    sz_right = sz_width / 2
-
-    def is_in_visual_zone(row):
-        px, pz = row['px'], row['pz']
-        if pd.isna(px) or pd.isna(pz):
-            return False
-        
-        # Find closest point on the average strike zone rectangle
-        closest_x = max(sz_left, min(sz_right, px))
-        closest_z = max(avg_sz_bot, min(avg_sz_top, pz))
-        
-        # Check if distance from pitch center to closest point is within ball radius
-        dist_sq = (px - closest_x)**2 + (pz - closest_z)**2
-        return dist_sq <= (BALL_RADIUS_FEET**2)
-
-    df_called_strikes['visual_in_zone'] = df_called_strikes.apply(is_in_visual_zone, axis=1)
+    visual_zone = strike_zone.zone_metrics(
+        df_called_strikes['px'], df_called_strikes['pz'], avg_sz_top, avg_sz_bot, half_width=sz_width / 2
+    )
+    df_called_strikes['visual_in_zone'] = visual_zone['pitch_in_zone']
 
     df_called_strikes['call_type'] = df_called_strikes['visual_in_zone'].apply(
         lambda x: 'In Zone (Correct)' if x else 'Out of Zone (Incorrect)'
@@ -85,7 +74,7 @@ def visualize_called_strikes(file_path, output_dir):
     )
 
     # Draw the average strike zone rectangle
-    strike_zone = patches.Rectangle(
+    zone_rect = patches.Rectangle(
         (-sz_width / 2, avg_sz_bot),
         sz_width,
         sz_height,
@@ -95,7 +84,7 @@ def visualize_called_strikes(file_path, output_dir):
         linestyle='--',
         label='Average Strike Zone'
     )
-    ax.add_patch(strike_zone)
+    ax.add_patch(zone_rect)
 
     # --- Formatting ---
     ax.set_title('Called Strikes (Catcher\'s View)', fontsize=16, fontweight='bold')
@@ -120,10 +109,80 @@ def visualize_called_strikes(file_path, output_dir):
 
     print(f"Plot saved to {output_path}")
 
+def visualize_called_strike_grid(grid_path, output_dir, team_role="thrown_to_redsox"):
+    """
+    Draws called strikes as a heatmap from the precomputed pitch grids (34) instead of every pitch.
+
+    Args:
+        grid_path (str): The path to the pitch grids JSON file.
+        output_dir (str): The directory to save the plot image.
+        team_role (str): "thrown_to_redsox" (calls against Red Sox batters) or "thrown_by_redsox".
+    """
+    try:
+        with open(grid_path, 'r') as f:
+            store = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError) as e:
+        print(f"Error reading or parsing {grid_path}: {e}")
+        return
+
+    if not pitch_grids.is_current(store) or team_role not in store.get("called_strikes", {}):
+        print("No called strike grid available.")
+        return
+
+    counts = pitch_grids.as_matrix(pitch_grids.decode(store["called_strikes"][team_role]))
+    spec = store["grid"]
+
+    fig, ax = plt.subplots(figsize=(8, 10))
+    image = ax.imshow(
+        np.ma.masked_equal(counts, 0),
+        origin='lower',
+        extent=(spec["x_min"], spec["x_max"], spec["z_min"], spec["z_max"]),
+        cmap='Reds',
+        interpolation='nearest'
+    )
+    fig.colorbar(image, ax=ax, shrink=0.6, label='Called strikes')
+
+    # Average strike zone over the same pitches
+    zone = pitch_grids.average_zone(store, team_role)
+    if zone:
+        avg_sz_top, avg_sz_bot = zone
+        sz_width = strike_zone.SZ_HALF_WIDTH * 2
+        ax.add_patch(patches.Rectangle(
+            (-sz_width / 2, avg_sz_bot),
+            sz_width,
+            avg_sz_top - avg_sz_bot,
+            linewidth=2,
+            edgecolor='black',
+            facecolor='none',
+            linestyle='--',
+            label='Average Strike Zone'
+        ))
+        ax.legend(loc='upper right')
+
+    ax.set_title(f"Called Strikes (Catcher's View), {len(store['games'])} games", fontsize=16, fontweight='bold')
+    ax.set_xlabel('Horizontal Position (feet from center of plate)', fontsize=12)
+    ax.set_ylabel('Vertical Position (feet from ground)', fontsize=12)
+    ax.set_aspect('equal', adjustable='box')
+
+    os.makedirs(output_dir, exist_ok=True)
+    output_path = os.path.join(output_dir, 'called_strikes_heatmap.png')
+    plt.tight_layout()
+    plt.savefig(output_path, dpi=300)
+    plt.close()
+
+    print(f"Plot saved to {output_path}")
+
 if __name__ == "__main__":
     # Example usage with Red Sox data
     import datetime
     current_year = datetime.datetime.now().year
-    file_path = f'data/pitches/redsox_pitches_{current_year}.json'
+    parser = argparse.ArgumentParser(description="Plot called strikes against Red Sox batters")
+    parser.add_argument("--grid", action="store_true",
+                        help="Draw a heatmap from the precomputed pitch grids instead of every pitch")
+    args = parser.parse_args()
     output_dir = 'images'
-    visualize_called_strikes(file_path, output_dir) 
\ No newline at end of file
+    if args.grid:
+        visualize_called_strike_grid(f'data/pitches/pitch_grids_{current_year}.json', output_dir)
+    else:
+        file_path = f'data/pitches/redsox_pitches_{current_year}.json'
+        visualize_called_strikes(file_path, output_dir) 
\ No newline at end of file
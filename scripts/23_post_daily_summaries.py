@@ -12,11 +12,11 @@ import argparse
 import logging
 from datetime import datetime
 import requests
-from atproto import Client
 import boto3
-from botocore.exceptions import ClientError
 from zoneinfo import ZoneInfo
 from scripts import config
+from scripts.bluesky import BlueskyPoster
+from scripts.bot_state import BotState
 
 # --- Setup ---
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -24,6 +24,8 @@ logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(
 # --- Environment Variables & AWS/S3 ---
 is_github_actions = os.getenv('GITHUB_ACTIONS') == 'true'
 s3_bucket_name = "redsox-data"
+# Bluesky post length limit (graphemes)
+BLUESKY_MAX_CHARS = 300
 
 if is_github_actions:
     session = boto3.Session(
@@ -37,56 +39,25 @@ else:
 
 s3_resource = session.resource("s3")
 
-# --- Bluesky & S3 Functions ---
-def get_last_post_date(post_type):
-    """Reads the last post date for a given type from S3."""
-    s3_key = f"redsox/data/bluesky/last_post_date_{post_type}.txt"
-    try:
-        obj = s3_resource.Object(s3_bucket_name, s3_key)
-        last_date_str = obj.get()['Body'].read().decode('utf-8').strip()
-        logging.info(f"Last post date for '{post_type}' found in S3: {last_date_str}")
-        return last_date_str
-    except ClientError as e:
-        if e.response['Error']['Code'] == 'NoSuchKey':
-            logging.info(f"{s3_key} not found. This is expected for the first run of the day.")
-            return None
-        else:
-            logging.error(f"An unexpected S3 error occurred in get_last_post_date: {e}")
-            raise
-
-def set_last_post_date(date_str, post_type):
-    """Writes the last post date for a given type to S3."""
-    s3_key = f"redsox/data/bluesky/last_post_date_{post_type}.txt"
-    try:
-        obj = s3_resource.Object(s3_bucket_name, s3_key)
-        obj.put(Body=date_str)
-        logging.info(f"Successfully updated last post date in S3 for '{post_type}' to: {date_str}")
-    except Exception as e:
-        logging.error(f"Failed to write last post date to S3: {e}")
-
-def post_to_bluesky(post_text, post_type):
+# --- Bluesky Functions ---
+def post_to_bluesky(post_text, post_type, state):
     """Posts to Bluesky and updates the last post date on success."""
-    BLUESKY_HANDLE = os.environ.get("BLUESKY_HANDLE")
-    BLUESKY_APP_PASSWORD = os.environ.get("BLUESKY_APP_PASSWORD")
-
-    if not all([BLUESKY_HANDLE, BLUESKY_APP_PASSWORD]):
+    poster = BlueskyPoster(state)
+    if not poster.has_credentials:
         logging.error("Bluesky credentials are not fully set. Cannot post.")
         return
 
     try:
-        client = Client()
-        client.login(BLUESKY_HANDLE, BLUESKY_APP_PASSWORD)
-        response = client.send_post(text=post_text)
-        logging.info(f"Post published successfully to Bluesky: {response.uri}")
+        poster.post(post_text)
         # Use timezone-aware date for setting last post
         team_tz = ZoneInfo(config.TEAM_TIMEZONE)
         today_str = datetime.now(team_tz).strftime('%Y-%m-%d')
-        set_last_post_date(today_str, post_type)
+        state.set_last_post_date(post_type, today_str)
     except Exception as e:
         logging.error(f"Failed to post to Bluesky: {e}")
 
 # --- Main Logic ---
-def determine_summary_type():
+def determine_summary_type(state):
     """Determines which type of summary to post based on current time in Team Timezone."""
     team_tz = ZoneInfo(config.TEAM_TIMEZONE)
     current_hour = datetime.now(team_tz).hour
@@ -103,7 +74,7 @@ def determine_summary_type():
 
         # Check in order of priority: summary, batting, pitching
         for post_type in ['summary', 'batting', 'pitching']:
-            last_post_date = get_last_post_date(post_type)
+            last_post_date = state.last_post_date(post_type)
             if last_post_date != today_str:
                 logging.info(f"Outside prime hours, posting {post_type} (not yet posted today)")
                 return post_type
@@ -117,6 +88,9 @@ def main():
     parser.add_argument("--type", type=str, required=True, choices=['auto', 'summary', 'batting', 'pitching'], help="The type of update to post. Use 'auto' to determine based on time.")
     args = parser.parse_args()
 
+    # All bot state (last post dates per type) in one read; written back once after posting
+    state = BotState.load(s3_resource.meta.client)
+
     # Use timezone-aware date for all checks
     team_tz = ZoneInfo(config.TEAM_TIMEZONE)
     today_date = datetime.now(team_tz).date()
@@ -124,7 +98,7 @@ def main():
 
     # Determine the summary type to post
     if args.type == 'auto':
-        summary_type = determine_summary_type()
+        summary_type = determine_summary_type(state)
         if summary_type is None:
             logging.info("No summary type determined for posting. Exiting.")
             return
@@ -132,7 +106,7 @@ def main():
         summary_type = args.type
 
     # Check if we've already posted this type of update today
-    last_post_date = get_last_post_date(summary_type)
+    last_post_date = state.last_post_date(summary_type)
     if last_post_date == today_str:
         logging.info(f"An update of type '{summary_type}' has already been posted today. Skipping.")
         return
@@ -181,6 +155,13 @@ def main():
         summary_text = re.sub('<[^<]+?>', '', summary_html).replace('\\/','/')
         post_text = f"⚾️ {config.TEAM_NAME_SIMPLE} daily summary ⚾️\n\n{summary_text}"
 
+        # Simulated playoff odds (from 30 via 07), when they still fit in one post
+        odds = stats.get('playoff_odds')
+        if odds:
+            odds_line = f"\n\n📈 Playoff odds: {odds.get('value')} (division title: {odds.get('context_value')})"
+            if len(post_text) + len(odds_line) <= BLUESKY_MAX_CHARS:
+                post_text += odds_line
+
     elif summary_type == 'batting':
         ba = stats.get('batting_average', {}).get('value', 'N/A')
         obp = stats.get('on_base_pct', {}).get('value', 'N/A')
@@ -219,7 +200,11 @@ def main():
 
     if post_text:
         logging.info(f"Generated post for type '{summary_type}':\n{post_text}")
-        post_to_bluesky(post_text, summary_type)
+        # Flush even if posting raises: the post may be out, and the session may have been refreshed
+        try:
+            post_to_bluesky(post_text, summary_type, state)
+        finally:
+            state.flush(s3_resource.meta.client)
     else:
         logging.error("Failed to generate post text.")
 
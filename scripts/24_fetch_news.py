@@ -2,14 +2,14 @@ import requests
 from bs4 import BeautifulSoup
 import json
 import os
-from atproto import Client
 import argparse
 import logging
 from datetime import datetime
 from zoneinfo import ZoneInfo
 import boto3
-from botocore.exceptions import ClientError
 from scripts import config
+from scripts.bluesky import BlueskyPoster
+from scripts.bot_state import BotState
 # --- Setup ---
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
@@ -27,42 +27,18 @@ else:
 
 s3_resource = session.resource("s3")
 
-def get_last_post_date(post_type):
-    """Reads the last post date for a given type from S3."""
-    s3_key = f"redsox/data/bluesky/last_post_date_{post_type}.txt"
-    try:
-        obj = s3_resource.Object(s3_bucket_name, s3_key)
-        last_date_str = obj.get()['Body'].read().decode('utf-8').strip()
-        return last_date_str
-    except ClientError as e:
-        if e.response['Error']['Code'] == 'NoSuchKey':
-            return None
-        raise
-
-def set_last_post_date(date_str, post_type):
-    """Writes the last post date for a given type to S3."""
-    s3_key = f"redsox/data/bluesky/last_post_date_{post_type}.txt"
-    obj = s3_resource.Object(s3_bucket_name, s3_key)
-    obj.put(Body=date_str)
-    logging.info(f"Successfully updated last post date for '{post_type}' to: {date_str}")
-
-def post_to_bluesky(post_text, post_type):
+def post_to_bluesky(post_text, post_type, state):
     """Posts to Bluesky and updates the last post date on success."""
-    BLUESKY_HANDLE = os.environ.get("BLUESKY_HANDLE")
-    BLUESKY_APP_PASSWORD = os.environ.get("BLUESKY_APP_PASSWORD")
-
-    if not all([BLUESKY_HANDLE, BLUESKY_APP_PASSWORD]):
+    poster = BlueskyPoster(state)
+    if not poster.has_credentials:
         logging.error("Bluesky credentials are not fully set. Cannot post.")
         return
 
     try:
-        client = Client()
-        client.login(BLUESKY_HANDLE, BLUESKY_APP_PASSWORD)
-        response = client.send_post(text=post_text)
-        logging.info(f"Post published successfully to Bluesky: {response.uri}")
+        poster.post(post_text)
         team_tz = ZoneInfo(config.TEAM_TIMEZONE)
         today_str = datetime.now(team_tz).strftime('%Y-%m-%d')
-        set_last_post_date(today_str, post_type)
+        state.set_last_post_date(post_type, today_str)
     except Exception as e:
         logging.error(f"Failed to post to Bluesky: {e}")
 
@@ -123,14 +99,14 @@ def format_news_post(articles):
             post_lines.append(f"- {article['source']}: {article['title']} {article['url']}")
     return "\n\n".join(post_lines)
 
-def should_post_news():
+def should_post_news(state):
     """Determines if news should be posted based on time and whether it's been posted today."""
     team_tz = ZoneInfo(config.TEAM_TIMEZONE)
     current_hour = datetime.now(team_tz).hour
     today_str = datetime.now(team_tz).strftime('%Y-%m-%d')
 
     # Check if already posted today
-    last_post_date = get_last_post_date("news")
+    last_post_date = state.last_post_date("news")
     if last_post_date == today_str:
         logging.info("News has already been posted today. Skipping.")
         return False
@@ -152,9 +128,10 @@ if __name__ == '__main__':
     post_type = "news"
     team_tz = ZoneInfo(config.TEAM_TIMEZONE)
     today_str = datetime.now(team_tz).strftime('%Y-%m-%d')
+    state = BotState.load(s3_resource.meta.client)
 
     # Check if we should post (unless forced)
-    if not args.force and not should_post_news():
+    if not args.force and not should_post_news(state):
         exit()
 
     articles = []
@@ -171,7 +148,11 @@ if __name__ == '__main__':
         print(post_text)
 
         if args.post:
-            post_to_bluesky(post_text, post_type)
+            # Flush even if posting raises: the post may be out, and the session may have been refreshed
+            try:
+                post_to_bluesky(post_text, post_type, state)
+            finally:
+                state.flush(s3_resource.meta.client)
         else:
             logging.info("Dry run: --post flag not provided. Not posting to Bluesky.")
     else:
@@ -1,14 +1,13 @@
 import os
 import json
 import boto3
-from atproto import Client
 import logging
 import argparse
 from datetime import datetime, timedelta
 from zoneinfo import ZoneInfo
-from botocore.exceptions import ClientError
 from scripts import config
-import time
+from scripts.bluesky import BlueskyPoster
+from scripts.bot_state import BotState
 
 # Setup
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -26,62 +25,32 @@ else:
 
 s3_resource = session.resource("s3")
 
-def get_posted_transactions():
-    """Reads the list of already posted transaction IDs from S3."""
-    s3_key = "redsox/data/bluesky/posted_transactions.json"
-    try:
-        obj = s3_resource.Object(s3_bucket_name, s3_key)
-        posted_data = json.loads(obj.get()['Body'].read().decode('utf-8'))
-        return set(posted_data.get('transaction_ids', []))
-    except ClientError as e:
-        if e.response['Error']['Code'] == 'NoSuchKey':
-            return set()
-        raise
-
-def add_posted_transaction(transaction_id):
-    """Adds a transaction ID to the list of posted transactions in S3."""
-    s3_key = "redsox/data/bluesky/posted_transactions.json"
-
-    # Get existing posted transactions
-    posted_ids = get_posted_transactions()
-    posted_ids.add(transaction_id)
-
-    # Keep only the most recent 1000 to prevent the file from growing too large
-    posted_list = list(posted_ids)
-    if len(posted_list) > 1000:
-        posted_list = posted_list[-1000:]
-
-    # Save back to S3
-    posted_data = {"transaction_ids": posted_list}
-    obj = s3_resource.Object(s3_bucket_name, s3_key)
-    obj.put(Body=json.dumps(posted_data, indent=2))
-    logging.info(f"Added transaction ID to posted list: {transaction_id}")
-
 def create_transaction_id(transaction_row):
     """Creates a unique ID for a transaction based on date and transaction text."""
     # Use first 50 characters of transaction text to create a unique but manageable ID
     transaction_snippet = transaction_row['transaction'][:50].replace(' ', '_').replace(',', '').replace('.', '')
     return f"{transaction_row['date']}_{transaction_snippet}"
 
-def post_to_bluesky(post_text, transaction_id):
-    """Posts to Bluesky and marks the transaction as posted on success."""
-    BLUESKY_HANDLE = os.environ.get("BLUESKY_HANDLE")
-    BLUESKY_APP_PASSWORD = os.environ.get("BLUESKY_APP_PASSWORD")
-
-    if not all([BLUESKY_HANDLE, BLUESKY_APP_PASSWORD]):
+def post_transactions(posts, state):
+    """
+    Posts (transaction_id, text) pairs as one thread in a single Bluesky session and
+    marks each transaction as posted once its post is out. Returns the number posted.
+    """
+    poster = BlueskyPoster(state)
+    if not poster.has_credentials:
         logging.error("Bluesky credentials are not fully set. Cannot post.")
-        return False
+        return 0
 
+    for _, post_text in posts:
+        poster.enqueue(post_text)
     try:
-        client = Client()
-        client.login(BLUESKY_HANDLE, BLUESKY_APP_PASSWORD)
-        response = client.send_post(text=post_text)
-        logging.info(f"Post published successfully to Bluesky: {response.uri}")
-        add_posted_transaction(transaction_id)
-        return True
+        responses = poster.flush_queue(as_thread=True)
     except Exception as e:
         logging.error(f"Failed to post to Bluesky: {e}")
-        return False
+        return 0
+    for transaction_id, _ in posts[:len(responses)]:
+        state.mark_posted("transaction", transaction_id)
+    return len(responses)
 
 def format_transaction_post(transaction_row):
     """Formats a transaction into a Bluesky post."""
@@ -107,7 +76,7 @@ def format_transaction_post(transaction_row):
 
     return post_text
 
-def fetch_new_transactions():
+def fetch_new_transactions(state):
     """Fetches new transactions that haven't been posted yet."""
     try:
         # Download the transaction archive from S3
@@ -115,7 +84,7 @@ def fetch_new_transactions():
         transactions_data = json.loads(obj.get()['Body'].read().decode('utf-8'))
 
         # Get posted transaction IDs
-        posted_ids = get_posted_transactions()
+        posted_ids = state.posted_ids("transaction")
 
         # Find new transactions (not already posted)
         new_transactions = []
@@ -167,32 +136,35 @@ if __name__ == '__main__':
     if not args.force and not should_post_transactions():
         exit()
 
+    # Posted ids are read once here and written back once after posting
+    state = BotState.load(s3_resource.meta.client)
+
     # Fetch new transactions
-    new_transactions = fetch_new_transactions()
+    new_transactions = fetch_new_transactions(state)
 
     if new_transactions:
         logging.info(f"Found {len(new_transactions)} new transactions to potentially post")
 
-        posts_made = 0
-        for transaction in new_transactions:
+        # Oldest first, so the thread reads in order
+        posts = []
+        for i, transaction in enumerate(reversed(new_transactions)):
             transaction_id = create_transaction_id(transaction)
             post_text = format_transaction_post(transaction)
+            posts.append((transaction_id, post_text))
 
-            print(f"--- Transaction Post {posts_made + 1} ---")
+            print(f"--- Transaction Post {i + 1} ---")
             print(f"ID: {transaction_id}")
             print(f"Post: {post_text}")
             print()
 
-            if args.post:
-                success = post_to_bluesky(post_text, transaction_id)
-                if success:
-                    posts_made += 1
-                    # Add a small delay between posts to be respectful to Bluesky's API
-                    time.sleep(2)
-            else:
-                logging.info("Dry run: --post flag not provided. Not posting to Bluesky.")
-
         if args.post:
-            logging.info(f"Successfully posted {posts_made} transaction posts to Bluesky")
+            # Flush even if posting raises, so transactions already posted aren't posted again
+            try:
+                posts_made = post_transactions(posts, state)
+                logging.info(f"Successfully posted {posts_made} transaction posts to Bluesky")
+            finally:
+                state.flush(s3_resource.meta.client)
+        else:
+            logging.info("Dry run: --post flag not provided. Not posting to Bluesky.")
     else:
         logging.info("No new transactions found to post.")
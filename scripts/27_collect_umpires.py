@@ -12,11 +12,12 @@ Output:
 - s3://redsox-data/dodgers/data/pitches/dodgers_umpires_{year}.json
 
 Idempotent: Reuses existing output and appends only missing game_pks.
-Also reuses local Savant gamefeeds (data/gamefeeds/*.json) to seed game_pks.
+Candidate games come from the season's schedule only. Live feeds are read through
+the local gamefeed cache (scripts/gamefeed_cache.py), so final games aren't
+refetched; the cache also holds other seasons' games, so it isn't used to list them.
 """
 
 import os
-import re
 import json
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime
@@ -25,11 +26,12 @@ import requests
 import pandas as pd
 import boto3
 from scripts import config
+from scripts import gamefeed_cache
+from scripts import writers
 
 
 DODGERS_TEAM_ID = config.TEAM_ID
 SCHEDULE_URL = "https://statsapi.mlb.com/api/v1/schedule"
-LIVE_FEED_URL_TMPL = "https://statsapi.mlb.com/api/v1.1/game/{game_pk}/feed/live"
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 LOCAL_GAMEFEEDS_DIR = os.path.join(BASE_DIR, "data", "gamefeeds")
@@ -57,19 +59,6 @@ def get_session():
     return boto3.Session(profile_name=os.environ.get("AWS_PERSONAL_PROFILE", "haekeo"), region_name="us-west-1")
 
 
-def find_local_gamepks(gamefeeds_dir: str) -> List[int]:
-    game_pks: List[int] = []
-    if not os.path.isdir(gamefeeds_dir):
-        return game_pks
-    for name in os.listdir(gamefeeds_dir):
-        if re.fullmatch(r"\d+\.json", name):
-            try:
-                game_pks.append(int(name.split(".")[0]))
-            except Exception:
-                continue
-    return sorted(set(game_pks))
-
-
 def fetch_season_schedule_gamepks(year: int) -> List[Tuple[int, str]]:
     """Return list of (gamePk, date_iso) for all Red Sox games in the given year."""
     params = {
@@ -111,11 +100,8 @@ def load_existing_output(path: str) -> pd.DataFrame:
 
 
 def fetch_home_plate_umpire(game_pk: int) -> Optional[Dict]:
-    url = LIVE_FEED_URL_TMPL.format(game_pk=game_pk)
     try:
-        resp = requests.get(url, timeout=15)
-        resp.raise_for_status()
-        payload = resp.json()
+        payload = gamefeed_cache.get("statsapi", game_pk, cache_dir=LOCAL_GAMEFEEDS_DIR)
         officials = (
             payload.get("liveData", {}).get("boxscore", {}).get("officials", [])
         )
@@ -135,16 +121,14 @@ def main() -> None:
     existing_df = load_existing_output(LOCAL_OUT_PATH)
     existing_gpk = set(existing_df.get("game_pk", pd.Series([], dtype=int)).astype(int).tolist())
 
-    # Collect candidate game_pks
-    local_gpk = find_local_gamepks(LOCAL_GAMEFEEDS_DIR)
+    # Candidate game_pks: this season's schedule
     sched = fetch_season_schedule_gamepks(YEAR)
     sched_map: Dict[int, str] = {gpk: date for gpk, date in sched}
-    union_gpks = sorted(set(local_gpk).union(set(sched_map.keys())))
 
     new_rows: List[Dict] = []
     pending: List[int] = []
 
-    for gpk in union_gpks:
+    for gpk in sorted(sched_map):
         if gpk in existing_gpk:
             continue
         ump = fetch_home_plate_umpire(gpk)
@@ -170,16 +154,14 @@ def main() -> None:
         combined = existing_df
 
     # Write locally
-    with open(LOCAL_OUT_PATH, "w", encoding="utf-8") as f:
-        json.dump(combined.to_dict(orient="records"), f, indent=2)
+    writers.write_json_array(combined, LOCAL_OUT_PATH)
     print(f"Saved umpires -> {LOCAL_OUT_PATH} (added {len(new_rows)}, pending {len(pending)})")
 
     # Upload to S3
     try:
         session = get_session()
         s3 = session.resource("s3")
-        payload = json.dumps(combined.to_dict(orient="records"), ensure_ascii=False, indent=2).encode("utf-8")
-        s3.Bucket(S3_BUCKET).put_object(Key=S3_KEY, Body=payload, ContentType="application/json")
+        s3.Bucket(S3_BUCKET).upload_file(LOCAL_OUT_PATH, S3_KEY, ExtraArgs={"ContentType": "application/json"})
         print(f"Uploaded -> s3://{S3_BUCKET}/{S3_KEY}")
     except Exception as exc:
         print(f"S3 upload failed ({exc}). Using local file only.")
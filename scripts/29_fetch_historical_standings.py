@@ -12,14 +12,14 @@ import os
 import sys
 import pandas as pd
 import requests
-from bs4 import BeautifulSoup
 import boto3
-from io import StringIO
 import logging
 import time
 import argparse
 from datetime import datetime
 from scripts import config
+from scripts import writers
+from scripts.standings_history import parse_year_data
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -56,15 +56,15 @@ else:
 s3 = session.resource('s3')
 
 
-def fetch_year_data(year):
+def fetch_year_html(year):
     """
-    Fetch game-by-game data for a specific year from Baseball Reference.
+    Download the Baseball Reference schedule page for a specific year.
     
     Args:
-        year (int): The year to fetch data for
+        year (int): The year to fetch
         
     Returns:
-        pandas.DataFrame: Processed game data for the year
+        bytes: Raw page content
     """
     # Handle team name changes
     # Red Sox have been BOS since 1901
@@ -72,267 +72,29 @@ def fetch_year_data(year):
     
     url = f"https://www.baseball-reference.com/teams/{team_code}/{year}-schedule-scores.shtml"
     
-    try:
-        logging.info(f"Fetching data for {year} from {url}")
-        response = requests.get(url, timeout=30)
-        response.raise_for_status()
-        
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        # Find the schedule table
-        tables = pd.read_html(StringIO(str(soup)))
-        if not tables:
-            logging.warning(f"No tables found for year {year}")
-            return None
-            
-        # Get the first table (schedule/scores)
-        src = tables[0]
-        
-        # Filter out header rows and preview games
-        src = src.query("Tm != 'Tm' and Inn != 'Game Preview, and Matchups'").copy()
-        
-        if src.empty:
-            logging.warning(f"No valid game data found for year {year}")
-            return None
-            
-        # Clean up columns - handle variations in column structure across years
-        src = src.dropna(how='all', axis=1)  # Remove completely empty columns
-        
-        # Drop problematic columns that exist in some years
-        columns_to_drop = ['Streak', 'Orig. Scheduled']
-        for col in columns_to_drop:
-            if col in src.columns:
-                src = src.drop(col, axis=1)
-        
-        # Standardize column names based on what's available
-        column_mapping = {}
-        for col in src.columns:
-            if 'Unnamed' in str(col):
-                col_pos = src.columns.get_loc(col)
-                if col_pos == 2:
-                    column_mapping[col] = 'home_away_indicator'
-                elif col_pos == 4 or (col_pos == 4 and 'home_away' not in [column_mapping.get(c) for c in src.columns[:col_pos]]):
-                    column_mapping[col] = 'home_away'
-                    
-        src = src.rename(columns=column_mapping)
-        
-        # Assign year
-        src = src.assign(year=year)
-        
-        # Standardize column names and handle duplicates
-        new_columns = []
-        seen_columns = set()
-        
-        for col in src.columns:
-            # Standardize the column name
-            std_col = str(col).lower().replace("/", "_").replace("-", "_")
-            
-            # Handle specific cases to avoid duplicates
-            if std_col == 'w_l':
-                if 'result' not in seen_columns:
-                    std_col = 'result'
-                elif 'record' not in seen_columns:
-                    std_col = 'record'
-                else:
-                    std_col = f'w_l_{len([c for c in seen_columns if c.startswith("w_l")])}'
-            
-            # Ensure uniqueness
-            original_std_col = std_col
-            counter = 1
-            while std_col in seen_columns:
-                std_col = f"{original_std_col}_{counter}"
-                counter += 1
-                
-            new_columns.append(std_col)
-            seen_columns.add(std_col)
-            
-        src.columns = new_columns
-        
-        # Map actual columns to standard names dynamically
-        actual_columns = list(src.columns)
-        standard_column_mapping = {}
-        
-        # Create a flexible mapping based on common patterns
-        for i, col in enumerate(actual_columns):
-            if col in ['gm#', 'gm']:
-                standard_column_mapping[col] = 'gm'
-            elif col == 'date':
-                standard_column_mapping[col] = 'date'
-            elif col in ['tm', 'team']:
-                standard_column_mapping[col] = 'tm'
-            elif col in ['home_away'] and 'home_away' not in standard_column_mapping.values():
-                standard_column_mapping[col] = 'home_away'
-            elif col in ['home_away_indicator'] and 'home_away' not in standard_column_mapping.values():
-                standard_column_mapping[col] = 'home_away'
-            elif col in ['opp', 'opponent']:
-                standard_column_mapping[col] = 'opp'
-            elif col in ['result'] or (col.startswith('w_l') and 'result' not in standard_column_mapping.values()):
-                standard_column_mapping[col] = 'result'
-            elif col in ['r', 'runs']:
-                standard_column_mapping[col] = 'r'
-            elif col in ['ra', 'runs_allowed']:
-                standard_column_mapping[col] = 'ra'
-            elif col in ['inn', 'innings']:
-                standard_column_mapping[col] = 'inn'
-            elif col in ['record'] or (col.startswith('w_l') and 'record' not in standard_column_mapping.values()):
-                standard_column_mapping[col] = 'record'
-            elif col == 'rank':
-                standard_column_mapping[col] = 'rank'
-            elif col == 'gb':
-                standard_column_mapping[col] = 'gb'
-            elif col == 'win':
-                standard_column_mapping[col] = 'win'
-            elif col == 'loss':
-                standard_column_mapping[col] = 'loss'
-            elif col == 'save':
-                standard_column_mapping[col] = 'save'
-            elif col == 'time':
-                standard_column_mapping[col] = 'time'
-            elif col in ['d_n', 'day_night']:
-                standard_column_mapping[col] = 'day_night'
-            elif col in ['attendance', 'att']:
-                standard_column_mapping[col] = 'attendance'
-            elif col in ['cli', 'leverage']:
-                standard_column_mapping[col] = 'cli'
-            elif col == 'year':
-                standard_column_mapping[col] = 'year'
-                
-        # Apply the mapping
-        src = src.rename(columns=standard_column_mapping)
-        
-        # Handle duplicate columns by keeping only the first occurrence
-        if src.columns.duplicated().any():
-            # Get unique columns while preserving order
-            seen = set()
-            unique_cols = []
-            for col in src.columns:
-                if col not in seen:
-                    unique_cols.append(col)
-                    seen.add(col)
-                else:
-                    unique_cols.append(f"{col}_dup")
-            src.columns = unique_cols
-            
-        # Ensure we have minimum required columns
-        required_columns = ['gm', 'date', 'year']
-        missing_required = [col for col in required_columns if col not in src.columns]
-        if missing_required:
-            logging.warning(f"Missing required columns for year {year}: {missing_required}")
-            return None
-        
-        # Basic data cleaning
-        if 'gm' in src.columns:
-            src["gm"] = pd.to_numeric(src["gm"], errors='coerce')
-            
-        if 'year' in src.columns:
-            src["year"] = src["year"].astype(str)
-            
-        # Process date if available
-        if 'date' in src.columns:
-            try:
-                # Split date if it contains weekday
-                if src["date"].str.contains(", ").any():
-                    src[["weekday", "date_clean"]] = src["date"].str.split(", ", expand=True)
-                    src["date"] = src["date_clean"]
-                    
-                # Remove game number indicators
-                src["date"] = src["date"].str.replace(r" \(\d+\)", "", regex=True)
-                
-                # Create full date
-                src["game_date"] = pd.to_datetime(
-                    src["date"] + ", " + src["year"], 
-                    format="%b %d, %Y", 
-                    errors='coerce'
-                ).dt.strftime('%Y-%m-%d')
-                
-            except Exception as e:
-                logging.warning(f"Date processing failed for year {year}: {e}")
-                src["game_date"] = None
-                
-        # Clean home/away indicator
-        if 'home_away' in src.columns:
-            src.loc[src['home_away'] == "@", "home_away"] = "away"
-            src.loc[src['home_away'].isna(), "home_away"] = "home"
-            
-        # Process games back if available
-        if 'gb' in src.columns:
-            try:
-                src["gb"] = (
-                    src["gb"].astype(str)
-                    .str.replace("up ", "up", regex=False)
-                    .str.replace("up", "+", regex=False)
-                    .str.replace("Tied", "0", regex=False)
-                )
-                src["gb"] = src["gb"].apply(
-                    lambda x: float(x) if str(x).startswith("+") else -float(x) if str(x) != '0' and str(x) != 'nan' else 0
-                )
-            except Exception as e:
-                logging.warning(f"Games back processing failed for year {year}: {e}")
-                
-        # Convert numeric columns
-        numeric_columns = ["r", "ra", "attendance", "rank"]
-        for col in numeric_columns:
-            if col in src.columns:
-                src[col] = pd.to_numeric(src[col], errors='coerce').fillna(0).astype(int)
-                
-        # Process time if available
-        if 'time' in src.columns:
-            try:
-                src["time"] = src["time"].astype(str) + ":00"
-                src["time_minutes"] = pd.to_timedelta(src["time"], errors='coerce').dt.total_seconds() / 60
-                src["time_minutes"] = src["time_minutes"].fillna(0).astype(int)
-            except Exception as e:
-                logging.warning(f"Time processing failed for year {year}: {e}")
-                
-        # Calculate wins and losses from record if available
-        if 'record' in src.columns:
-            try:
-                record_split = src['record'].str.split('-', expand=True)
-                if len(record_split.columns) >= 2:
-                    src['wins'] = pd.to_numeric(record_split[0], errors='coerce').fillna(0).astype(int)
-                    src['losses'] = pd.to_numeric(record_split[1], errors='coerce').fillna(0).astype(int)
-                    src['win_pct'] = (src['wins'] / src['gm']).round(3)
-            except Exception as e:
-                logging.warning(f"Record processing failed for year {year}: {e}")
-                
-        # Select final columns
-        final_columns = [
-            "gm", "game_date", "home_away", "opp", "result", "r", "ra", 
-            "record", "rank", "gb", "time", "time_minutes", "day_night", 
-            "attendance", "year"
-        ]
-        
-        # Add calculated columns if they exist
-        if 'wins' in src.columns:
-            final_columns.extend(["wins", "losses", "win_pct"])
-            
-        # Only include columns that exist
-        available_columns = [col for col in final_columns if col in src.columns]
-        
-        if not available_columns:
-            logging.warning(f"No available columns found for year {year}")
-            return None
-            
-        try:
-            src_df = src[available_columns].copy()
-        except Exception as e:
-            logging.error(f"Column selection failed for year {year}: {e}")
-            raise
-        
-        # Remove rows with no game number (likely totals or headers)
-        if 'gm' in src_df.columns:
-            src_df = src_df.dropna(subset=['gm'])
-            src_df = src_df[src_df['gm'] > 0]
-        
-        logging.info(f"Successfully processed {len(src_df)} games for year {year}")
-        return src_df
+    logging.info(f"Fetching data for {year} from {url}")
+    response = requests.get(url, timeout=30)
+    response.raise_for_status()
+    return response.content
+
+
+def fetch_year_data(year):
+    """
+    Fetch game-by-game data for a specific year from Baseball Reference.
+    
+    Args:
+        year (int): The year to fetch data for
         
+    Returns:
+        pandas.DataFrame: Processed game data for the year
+    """
+    try:
+        html = fetch_year_html(year)
     except requests.exceptions.RequestException as e:
         logging.error(f"Network error fetching data for year {year}: {e}")
         return None
-    except Exception as e:
-        logging.error(f"Error processing data for year {year}: {e}")
-        return None
+    
+    return parse_year_data(html, year)
 
 
 def fetch_all_historical_data(start_year=START_YEAR, end_year=CURRENT_YEAR, delay=3.0):
@@ -397,12 +159,12 @@ def save_data(df, base_path):
         
         # Save JSON
         json_path = f"{base_path}.json"
-        df.to_json(json_path, orient="records", indent=4)
+        writers.write_json_array(df, json_path)
         logging.info(f"Saved JSON: {json_path}")
         
-        # Save Parquet
+        # Save Parquet (in row groups)
         parquet_path = f"{base_path}.parquet"
-        df.to_parquet(parquet_path, index=False)
+        writers.write_parquet(df, parquet_path)
         logging.info(f"Saved Parquet: {parquet_path}")
         
         return csv_path, json_path, parquet_path
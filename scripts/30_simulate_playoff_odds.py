@@ -0,0 +1,178 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+"""
+Simulates the rest of the MLB regular season for every club and publishes
+division, wild-card, bye and postseason odds plus magic numbers.
+Reads the all-teams standings written by 00 and the remaining schedule from statsapi.
+"""
+
+import argparse
+import json
+import logging
+import os
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import boto3
+import pytz
+import requests
+
+from scripts import config
+from scripts import playoff_odds
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+is_github_actions = os.getenv('GITHUB_ACTIONS') == 'true'
+
+aws_key_id = os.environ.get("AWS_ACCESS_KEY_ID")
+aws_secret_key = os.environ.get("AWS_SECRET_ACCESS_KEY")
+aws_region = "us-west-1"
+s3_bucket_name = "redsox-data"
+
+if is_github_actions:
+    session = boto3.Session(
+        aws_access_key_id=aws_key_id,
+        aws_secret_access_key=aws_secret_key,
+        region_name=aws_region
+    )
+else:
+    profile_name = os.environ.get("AWS_PERSONAL_PROFILE", "haekeo")
+    session = boto3.Session(profile_name=profile_name, region_name=aws_region)
+
+s3_resource = session.resource("s3")
+
+CURRENT_YEAR = datetime.now().year
+SCHEDULE_URL = "https://statsapi.mlb.com/api/v1/schedule"
+STANDINGS_URL = f"https://redsox-data.s3.amazonaws.com/redsox/data/standings/all_teams_standings_metrics_{CURRENT_YEAR}.json"
+LOCAL_STANDINGS_PATH = os.path.join("data", "standings", f"all_teams_standings_metrics_{CURRENT_YEAR}.json")
+LOCAL_OUTPUT_PATH = os.path.join("data", "standings", f"playoff_odds_{CURRENT_YEAR}.json")
+S3_KEY = f"redsox/data/standings/playoff_odds_{CURRENT_YEAR}.json"
+NOT_PLAYED_STATES = {"Postponed", "Cancelled"}
+
+
+def load_standings() -> Optional[List[Dict[str, Any]]]:
+    """Loads 00's all-teams standings, preferring the local file from this run."""
+    try:
+        if os.path.exists(LOCAL_STANDINGS_PATH):
+            with open(LOCAL_STANDINGS_PATH, "r") as f:
+                return json.load(f).get("teams")
+        response = requests.get(STANDINGS_URL, timeout=20)
+        response.raise_for_status()
+        return response.json().get("teams")
+    except (requests.exceptions.RequestException, ValueError) as e:
+        logging.error(f"Could not load league standings: {e}")
+        return None
+
+
+def parse_remaining_games(schedule: Dict[str, Any]) -> List[Dict[str, int]]:
+    """Regular-season games in a statsapi schedule payload that have not gone final."""
+    games = []
+    for day in schedule.get("dates", []):
+        for game in day.get("games", []):
+            status = game.get("status", {})
+            if game.get("gameType") != "R" or status.get("abstractGameState") == "Final":
+                continue
+            if status.get("detailedState") in NOT_PLAYED_STATES:
+                continue
+            games.append({
+                "game_pk": game.get("gamePk"),
+                "home_id": game.get("teams", {}).get("home", {}).get("team", {}).get("id"),
+                "away_id": game.get("teams", {}).get("away", {}).get("team", {}).get("id"),
+            })
+    # A suspended game can be listed on both dates
+    return list({g["game_pk"]: g for g in games}.values())
+
+
+def fetch_remaining_games(start_date: str) -> Optional[List[Dict[str, int]]]:
+    params = {"sportId": 1, "gameType": "R", "startDate": start_date, "endDate": f"{CURRENT_YEAR}-11-30"}
+    try:
+        response = requests.get(SCHEDULE_URL, params=params, timeout=30)
+        response.raise_for_status()
+        return parse_remaining_games(response.json())
+    except (requests.exceptions.RequestException, ValueError) as e:
+        logging.error(f"Could not fetch the remaining schedule: {e}")
+        return None
+
+
+def build_output(teams: List[Dict[str, Any]], league: playoff_odds.League, totals: Dict, magic: Dict, seed: int) -> Dict:
+    sims = int(totals["simulations"])
+
+    def pct(key, i):
+        return round(float(totals[key][i]) / sims * 100, 1)
+
+    rows = []
+    for i, team in enumerate(teams):
+        rows.append({
+            "team_id": team["team_id"],
+            "team_name": team["team_name"],
+            "league_name": team["league_name"],
+            "division_name": team["division_name"],
+            "wins": int(league.wins[i]),
+            "losses": int(league.losses[i]),
+            "strength": round(float(league.strength[i]), 3),
+            "mean_wins": round(float(totals["wins"][i]) / sims, 1),
+            "division_odds": pct("division", i),
+            "wild_card_odds": pct("wild_card", i),
+            "bye_odds": pct("bye", i),
+            "playoff_odds": pct("playoffs", i),
+            **{key: values[i] for key, values in magic.items()},
+        })
+    rows.sort(key=lambda r: (r["league_name"], r["division_name"], -r["playoff_odds"], -r["wins"]))
+    return {
+        "last_updated_iso": datetime.now(pytz.timezone('US/Pacific')).isoformat(),
+        "season": CURRENT_YEAR,
+        "simulations": sims,
+        "seed": seed,
+        "remaining_games": int(len(league.home)),
+        "teams": rows,
+    }
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(description="Simulate the remaining MLB season and publish playoff odds")
+    parser.add_argument("--sims", type=int, default=playoff_odds.DEFAULT_SIMULATIONS,
+                        help=f"Number of simulated seasons (default: {playoff_odds.DEFAULT_SIMULATIONS})")
+    parser.add_argument("--seed", type=int, help="Seed for the simulations (default: fresh entropy, recorded in the output)")
+    parser.add_argument("--chunk", type=int, default=playoff_odds.DEFAULT_CHUNK,
+                        help=f"Seasons per chunk (default: {playoff_odds.DEFAULT_CHUNK})")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: CPU count)")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_arguments()
+    teams = load_standings()
+    if not teams:
+        logging.error("No standings available. Exiting.")
+        return
+
+    start_date = datetime.now(pytz.timezone(config.TEAM_TIMEZONE)).strftime("%Y-%m-%d")
+    games = fetch_remaining_games(start_date)
+    if games is None:
+        return
+
+    league = playoff_odds.build_league(teams, games)
+    logging.info(f"Simulating {args.sims:,} seasons over {len(league.home):,} remaining games...")
+    totals, seed = playoff_odds.simulate(league, args.sims, seed=args.seed, chunk=args.chunk, workers=args.workers)
+    output = build_output(teams, league, totals, playoff_odds.magic_numbers(league), seed)
+
+    team = next((t for t in output["teams"] if t["team_id"] == config.TEAM_ID), None)
+    if team:
+        logging.info(f"{config.TEAM_NAME}: {team['playoff_odds']}% playoffs, {team['division_odds']}% division, "
+                     f"{team['bye_odds']}% bye, {team['mean_wins']} projected wins")
+
+    os.makedirs(os.path.dirname(LOCAL_OUTPUT_PATH), exist_ok=True)
+    with open(LOCAL_OUTPUT_PATH, "w") as f:
+        json.dump(output, f, indent=4)
+    logging.info(f"Saved playoff odds to {LOCAL_OUTPUT_PATH}")
+
+    try:
+        s3_resource.Bucket(s3_bucket_name).upload_file(LOCAL_OUTPUT_PATH, S3_KEY)
+        logging.info(f"Uploaded playoff odds to s3://{s3_bucket_name}/{S3_KEY}")
+    except Exception as e:
+        logging.error(f"Failed to upload playoff odds to S3: {e}")
+
+
+if __name__ == "__main__":
+    main()
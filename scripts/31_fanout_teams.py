@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+"""
+League-wide mode: builds standings, league ranks, schedule and attendance outputs
+for every club (or a subset) from one fetch of each shared source.
+Writes data/teams/{abbr}/ locally and uploads to s3://redsox-data/redsox/data/teams/{abbr}/.
+"""
+
+import argparse
+import logging
+import os
+
+import boto3
+
+from scripts import league_fanout
+from scripts import teams
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+is_github_actions = os.getenv('GITHUB_ACTIONS') == 'true'
+
+aws_key_id = os.environ.get("AWS_ACCESS_KEY_ID")
+aws_secret_key = os.environ.get("AWS_SECRET_ACCESS_KEY")
+aws_region = "us-west-1"
+s3_bucket_name = "redsox-data"
+
+
+def get_s3_client():
+    # Clients (unlike resources) can be shared across the worker threads
+    if is_github_actions:
+        session = boto3.Session(
+            aws_access_key_id=aws_key_id,
+            aws_secret_access_key=aws_secret_key,
+            region_name=aws_region
+        )
+    else:
+        profile_name = os.environ.get("AWS_PERSONAL_PROFILE", "haekeo")
+        session = boto3.Session(profile_name=profile_name, region_name=aws_region)
+    return session.client("s3")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build per-team outputs for all clubs from shared league-wide fetches")
+    parser.add_argument("--teams", nargs="*", help="Team ids or abbreviations (default: all 30)")
+    parser.add_argument("--season", type=int, help="Season (default: current year)")
+    parser.add_argument("--workers", type=int, default=league_fanout.DEFAULT_WORKERS,
+                        help="Worker threads for shared fetches and per-team stages")
+    parser.add_argument("--local-only", action="store_true", help="Write local files without uploading to S3")
+    args = parser.parse_args()
+
+    try:
+        selected = teams.select(args.teams)
+    except ValueError as e:
+        parser.error(str(e))
+
+    upload = None
+    if not args.local_only:
+        s3_client = get_s3_client()
+        upload = lambda path, key: s3_client.upload_file(path, s3_bucket_name, key,
+                                                         ExtraArgs={"ContentType": "application/json"})
+
+    written = league_fanout.run(selected, season=args.season, workers=args.workers, upload=upload)
+    if not written:
+        logging.error("League-wide fan-out produced no outputs.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+"""
+Publishes the dashboard's data: versioned artifacts, a manifest and a first-paint bundle.
+
+Every file the dashboard reads is published under a content-hashed, immutable key
+next to its fixed key, and redsox/data/manifest.json maps each fixed key to its
+current version (scripts/storage.py). Unchanged files cost one HEAD request.
+
+The small current-season files needed for first paint are also combined into a
+single compact JSON object {"files": {key: data}}, gzip-encoded and published the
+same way under the logical name redsox/data/bundles/dashboard.json.
+
+assets/js/dashboard.js reads the manifest, then the bundle (two requests on first
+paint). Other files are loaded from their versioned keys, so repeat visitors only
+download what changed. Versions that are no longer current are deleted after
+storage.GC_MAX_AGE_DAYS. Run after the stages that write these files.
+"""
+
+import gzip
+import json
+import logging
+import os
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import boto3
+from botocore.exceptions import ClientError
+
+from scripts import storage
+from scripts import writers
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+is_github_actions = os.getenv('GITHUB_ACTIONS') == 'true'
+
+aws_key_id = os.environ.get("AWS_ACCESS_KEY_ID")
+aws_secret_key = os.environ.get("AWS_SECRET_ACCESS_KEY")
+aws_region = "us-west-1"
+s3_bucket_name = "redsox-data"
+
+CURRENT_YEAR = datetime.now().year
+BUNDLE_NAME = "redsox/data/bundles/dashboard.json"
+
+# First-paint files, by the S3 key dashboard.js requests them with
+BUNDLE_KEYS = [
+    "redsox/data/standings/redsox_wins_losses_current.json",
+    "redsox/data/standings/redsox_schedule.json",
+    "redsox/data/standings/redsox_wins_projection_timeseries.json",
+    "redsox/data/standings/mlb_team_attendance.json",
+    "redsox/data/batting/redsox_player_batting_current_table.json",
+    "redsox/data/batting/redsox_xwoba_current.json",
+    "redsox/data/summary/umpire_summary.json",
+    f"redsox/data/standings/all_teams_standings_metrics_{CURRENT_YEAR}.json",
+]
+# Larger files loaded individually (from their versioned keys)
+ARTIFACT_KEYS = BUNDLE_KEYS + [
+    "redsox/data/standings/redsox_standings_1901_present.json",
+    "redsox/data/batting/archive/redsox_historic_batting_gamelogs.json",
+    "redsox/data/pitching/redsox_historic_pitching_gamelogs_1901-present.json",
+    f"redsox/data/postseason/redsox_postseason_stats_{CURRENT_YEAR}.json",
+    f"redsox/data/postseason/redsox_postseason_series_{CURRENT_YEAR}.json",
+    f"redsox/data/pitches/pitch_grids_{CURRENT_YEAR}.json",
+]
+
+
+def get_s3_client():
+    if is_github_actions:
+        session = boto3.Session(
+            aws_access_key_id=aws_key_id,
+            aws_secret_access_key=aws_secret_key,
+            region_name=aws_region
+        )
+    else:
+        profile_name = os.environ.get("AWS_PERSONAL_PROFILE", "haekeo")
+        session = boto3.Session(profile_name=profile_name, region_name=aws_region)
+    return session.client("s3")
+
+
+def read_files(s3_client, keys: List[str], bucket: str = s3_bucket_name) -> Dict[str, object]:
+    """{key: parsed JSON} for the keys that exist; missing or unreadable files are left out."""
+    files = {}
+    for key in keys:
+        try:
+            obj = s3_client.get_object(Bucket=bucket, Key=key)
+            files[key] = json.loads(obj["Body"].read())
+        except ClientError as e:
+            logging.warning(f"Skipping {key}: {e.response['Error']['Code']}")
+        except ValueError as e:
+            logging.warning(f"Skipping {key}: not valid JSON ({e})")
+    return files
+
+
+def build_bundle(files: Dict[str, object]) -> bytes:
+    """The gzip-compressed bundle; the same files always give the same bytes (and so the same hash)."""
+    raw = writers.dumps({"files": {key: files[key] for key in sorted(files)}})
+    # mtime=0 keeps the gzip header stable across runs
+    return gzip.compress(raw, compresslevel=9, mtime=0)
+
+
+def publish(s3_client, bucket: str = s3_bucket_name) -> Optional[storage.Manifest]:
+    """Version every artifact, publish the bundle, save the manifest and drop old versions."""
+    manifest = storage.Manifest.load(s3_client, bucket)
+    for key in ARTIFACT_KEYS:
+        try:
+            storage.publish_existing(s3_client, manifest, key)
+        except ClientError as e:
+            logging.error(f"Failed to publish {key}: {e}")
+
+    files = read_files(s3_client, BUNDLE_KEYS, bucket)
+    if files:
+        body = build_bundle(files)
+        storage.publish_artifact(s3_client, manifest, BUNDLE_NAME, body, content_encoding="gzip")
+        logging.info(f"Dashboard bundle: {len(files)} files, {len(body) / 1024:.1f} KiB gzipped")
+    else:
+        logging.error("No dashboard files could be read; keeping the current bundle.")
+
+    if not manifest.save(s3_client):
+        return None
+    storage.collect_garbage(s3_client, manifest)
+    return manifest
+
+
+def main():
+    publish(get_s3_client())
+
+
+if __name__ == "__main__":
+    main()
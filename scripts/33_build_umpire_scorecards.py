@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+"""
+League-wide umpire scorecards: ingests the called pitches of every MLB game not
+yet on disk (scripts/umpire_scorecards.py) and writes per-umpire season
+scorecards and per-game scorecards.
+
+Outputs:
+- data/umpires/umpire_scorecards_{season}.json
+- data/umpires/umpire_game_scorecards_{season}.json
+- s3://redsox-data/redsox/data/umpires/ (same file names)
+"""
+
+import argparse
+import logging
+import os
+from datetime import datetime, timezone
+
+import boto3
+
+from scripts import umpire_scorecards
+from scripts import writers
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+is_github_actions = os.getenv('GITHUB_ACTIONS') == 'true'
+
+aws_key_id = os.environ.get("AWS_ACCESS_KEY_ID")
+aws_secret_key = os.environ.get("AWS_SECRET_ACCESS_KEY")
+aws_region = "us-west-1"
+s3_bucket_name = "redsox-data"
+S3_PREFIX = "redsox/data/umpires"
+LOCAL_DIR = os.path.join("data", "umpires")
+
+
+def get_s3_client():
+    if is_github_actions:
+        session = boto3.Session(
+            aws_access_key_id=aws_key_id,
+            aws_secret_access_key=aws_secret_key,
+            region_name=aws_region
+        )
+    else:
+        profile_name = os.environ.get("AWS_PERSONAL_PROFILE", "haekeo")
+        session = boto3.Session(profile_name=profile_name, region_name=aws_region)
+    return session.client("s3")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build home plate umpire scorecards for every MLB game")
+    parser.add_argument("--season", type=int, default=datetime.now().year)
+    parser.add_argument("--workers", type=int, default=umpire_scorecards.DEFAULT_WORKERS,
+                        help="Concurrent live feed fetches")
+    parser.add_argument("--local-only", action="store_true", help="Write local files without uploading to S3")
+    args = parser.parse_args()
+
+    counts = umpire_scorecards.ingest(args.season, workers=args.workers)
+    logging.info(f"Ingested {counts['done']} game(s) ({counts['pitches']} called pitches), {counts['failed']} skipped")
+
+    calls = umpire_scorecards.load_calls(args.season)
+    if calls.empty:
+        logging.info(f"No called pitches for {args.season} yet.")
+        return
+
+    scorecards = {
+        "season": args.season,
+        "updated_at": datetime.now(timezone.utc).isoformat(),
+        "games": int(calls["game_pk"].nunique()),
+        "called_pitches": len(calls),
+        "umpires": umpire_scorecards.umpire_scorecards(calls),
+    }
+    paths = [
+        writers.write_json(scorecards, os.path.join(LOCAL_DIR, f"umpire_scorecards_{args.season}.json")),
+        writers.write_json_array(umpire_scorecards.game_scorecards(calls),
+                                 os.path.join(LOCAL_DIR, f"umpire_game_scorecards_{args.season}.json")),
+    ]
+    logging.info(f"{len(scorecards['umpires'])} umpire scorecards over {scorecards['games']} games")
+
+    if args.local_only:
+        return
+    s3_client = get_s3_client()
+    for path in paths:
+        key = f"{S3_PREFIX}/{os.path.basename(path)}"
+        try:
+            s3_client.upload_file(path, s3_bucket_name, key, ExtraArgs={"ContentType": "application/json"})
+            logging.info(f"Uploaded {path} to s3://{s3_bucket_name}/{key}")
+        except Exception as e:
+            logging.error(f"Failed to upload {path}: {e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+"""
+Bins the season's pitch locations (from 20) into heatmap grids per pitcher,
+batter, pitch type and count bucket (scripts/pitch_grids.py). Only games not
+already in the stored grids are added.
+
+Output:
+- data/pitches/pitch_grids_{year}.json
+- s3://redsox-data/redsox/data/pitches/pitch_grids_{year}.json
+"""
+
+import json
+import logging
+import os
+from datetime import datetime
+
+import boto3
+import pandas as pd
+
+from scripts import pitch_grids
+from scripts import writers
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+is_github_actions = os.getenv('GITHUB_ACTIONS') == 'true'
+
+aws_key_id = os.environ.get("AWS_ACCESS_KEY_ID")
+aws_secret_key = os.environ.get("AWS_SECRET_ACCESS_KEY")
+aws_region = "us-west-1"
+s3_bucket_name = "redsox-data"
+
+YEAR = datetime.now().year
+PITCHES_DIR = os.path.join("data", "pitches")
+LOCAL_PATH = os.path.join(PITCHES_DIR, f"pitch_grids_{YEAR}.json")
+S3_KEY = f"redsox/data/pitches/pitch_grids_{YEAR}.json"
+
+
+def get_s3_client():
+    if is_github_actions:
+        session = boto3.Session(
+            aws_access_key_id=aws_key_id,
+            aws_secret_access_key=aws_secret_key,
+            region_name=aws_region
+        )
+    else:
+        profile_name = os.environ.get("AWS_PERSONAL_PROFILE", "haekeo")
+        session = boto3.Session(profile_name=profile_name, region_name=aws_region)
+    return session.client("s3")
+
+
+def read_pitches(stem: str) -> pd.DataFrame:
+    """One of 20's pitch files, from its parquet copy when there is one."""
+    base = os.path.join(PITCHES_DIR, stem)
+    if os.path.exists(f"{base}.parquet"):
+        return pd.read_parquet(f"{base}.parquet")
+    try:
+        return pd.read_json(f"{base}.json")
+    except (FileNotFoundError, ValueError) as e:
+        logging.warning(f"No pitch data in {base}.json: {e}")
+        return pd.DataFrame()
+
+
+def load_store(s3_client):
+    """The stored grids from S3, falling back to the local copy; a new store if neither is current."""
+    try:
+        obj = s3_client.get_object(Bucket=s3_bucket_name, Key=S3_KEY)
+        store = json.loads(obj["Body"].read())
+        if pitch_grids.is_current(store):
+            return store
+    except Exception as e:
+        logging.info(f"Pitch grids not loaded from S3 ({e}); trying local copy.")
+    try:
+        with open(LOCAL_PATH, "r") as f:
+            store = json.load(f)
+        if pitch_grids.is_current(store):
+            return store
+    except (FileNotFoundError, json.JSONDecodeError):
+        pass
+    logging.info("Starting new pitch grids; every game will be binned.")
+    return pitch_grids.new_store(YEAR)
+
+
+def main():
+    s3_client = get_s3_client()
+    store = load_store(s3_client)
+
+    frames = [read_pitches(f"redsox_pitches_{YEAR}"), read_pitches(f"redsox_pitches_thrown_{YEAR}")]
+    frames = [f for f in frames if not f.empty]
+    pitches = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+    added = pitch_grids.add_pitches(store, pitches)
+    logging.info(f"Binned {len(added)} new game(s); grids cover {len(store['games'])} games")
+
+    writers.write_json(store, LOCAL_PATH)
+    logging.info(f"Saved {LOCAL_PATH} ({os.path.getsize(LOCAL_PATH) / 1024:.1f} KiB)")
+    try:
+        s3_client.upload_file(LOCAL_PATH, s3_bucket_name, S3_KEY, ExtraArgs={"ContentType": "application/json"})
+        logging.info(f"Uploaded {LOCAL_PATH} to s3://{s3_bucket_name}/{S3_KEY}")
+    except Exception as e:
+        logging.error(f"Failed to upload {LOCAL_PATH}: {e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Shared Bluesky poster for the bots (17, 23, 24, 26).
+
+Logging in is the slowest and most rate-limited call a bot run makes, so the
+atproto session is exported after login and kept in the bot state store
+(scripts/bot_state.py). Later runs resume it; atproto refreshes the access
+token on its own once it expires, and every new or refreshed session is written
+back to the state. Only when the stored session can't be resumed (e.g. the
+refresh token expired) does the poster log in with the app password again.
+
+Posts go through a queue drained by one authenticated client. Consecutive posts
+are spaced by a minimum interval (waiting only for what's left of it) and can be
+chained into a single thread.
+"""
+
+import logging
+import os
+import time
+from typing import List, Optional
+
+from atproto import Client, SessionEvent, models
+
+from scripts.bot_state import BotState
+
+SESSION_STATE_NAME = "bluesky_session"
+MIN_POST_INTERVAL = 2.0
+
+
+class RateLimiter:
+    """Keeps at least min_interval seconds between calls to wait()."""
+
+    def __init__(self, min_interval: float = MIN_POST_INTERVAL):
+        self.min_interval = min_interval
+        self._last: Optional[float] = None
+
+    def wait(self) -> None:
+        if self._last is not None:
+            delay = self._last + self.min_interval - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+        self._last = time.monotonic()
+
+
+class BlueskyPoster:
+    def __init__(self, state: BotState, handle: Optional[str] = None, password: Optional[str] = None,
+                 min_interval: float = MIN_POST_INTERVAL):
+        self.state = state
+        self.handle = handle or os.environ.get("BLUESKY_HANDLE")
+        self.password = password or os.environ.get("BLUESKY_APP_PASSWORD")
+        self.limiter = RateLimiter(min_interval)
+        self.queue: List[str] = []
+        self._client: Optional[Client] = None
+
+    @property
+    def has_credentials(self) -> bool:
+        return bool(self.handle and self.password)
+
+    def _save_session(self, event, session) -> None:
+        if event in (SessionEvent.CREATE, SessionEvent.REFRESH):
+            self.state.set(SESSION_STATE_NAME, self._client.export_session_string())
+
+    def client(self) -> Client:
+        """An authenticated client, resuming the stored session when possible."""
+        if self._client is not None:
+            return self._client
+        client = Client()
+        self._client = client
+        client.on_session_change(self._save_session)
+        session_string = self.state.get(SESSION_STATE_NAME)
+        if session_string:
+            try:
+                client.login(session_string=session_string)
+                logging.info("Resumed stored Bluesky session")
+                return client
+            except Exception as e:
+                logging.info(f"Stored Bluesky session could not be resumed ({e}); logging in")
+        client.login(self.handle, self.password)
+        return client
+
+    def post(self, text: str, reply_to=None):
+        """Send one post (optionally as a reply); returns atproto's response."""
+        client = self.client()
+        self.limiter.wait()
+        response = client.send_post(text=text, reply_to=reply_to)
+        logging.info(f"Post published successfully to Bluesky: {response.uri}")
+        return response
+
+    def enqueue(self, text: str) -> None:
+        self.queue.append(text)
+
+    def flush_queue(self, as_thread: bool = True) -> list:
+        """Post everything queued, in order; each post replies to the previous one when as_thread.
+
+        Stops at the first failure and returns the responses of the posts that went out
+        (the failed post and anything after it stay queued).
+        """
+        responses = []
+        root = parent = None
+        while self.queue:
+            reply_to = None
+            if as_thread and parent is not None:
+                reply_to = models.AppBskyFeedPost.ReplyRef(parent=parent, root=root)
+            try:
+                response = self.post(self.queue[0], reply_to=reply_to)
+            except Exception as e:
+                logging.error(f"Failed to post to Bluesky: {e}")
+                break
+            self.queue.pop(0)
+            responses.append(response)
+            parent = models.create_strong_ref(response)
+            root = root or parent
+        return responses
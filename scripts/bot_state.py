@@ -0,0 +1,205 @@
+"""
+Durable state shared by the Bluesky bots (17, 23, 24, 26).
+
+All bot state lives in one small SQLite file stored in S3 as a single private
+object: last-post dates per post type, ids of posted items, the Bluesky session
+and any other named values (watermarks). A bot run loads it once (one GET) and
+flushes it once (one PUT) instead of reading and writing a text object per check
+or per post.
+
+Writes are conditional on the ETag that was loaded. If another run flushed in
+between, the PUT fails with 412, the current object is re-read, this run's
+changes are replayed on top of it and the write is retried.
+
+The first load when no state object exists imports the legacy per-type objects
+under redsox/data/bluesky/.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import tempfile
+from datetime import datetime, timezone
+from typing import List, Optional, Set, Tuple
+
+from botocore.exceptions import ClientError
+
+S3_BUCKET = "redsox-data"
+# Not under redsox/data/: the bucket's public prefix
+STATE_KEY = "private/redsox/bluesky/bot_state.sqlite"
+LOCAL_PATH = os.path.join("data", "bluesky", "bot_state.sqlite")
+LEGACY_PREFIX = "redsox/data/bluesky"
+LEGACY_LAST_POST_KEYS = {
+    "summary": "last_post_date_summary.txt",
+    "batting": "last_post_date_batting.txt",
+    "pitching": "last_post_date_pitching.txt",
+    "news": "last_post_date_news.txt",
+    "lineup": "last_lineup_post_date.txt",
+}
+LEGACY_POSTED_TRANSACTIONS_KEY = "posted_transactions.json"
+FLUSH_RETRIES = 3
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS state_values (
+    name TEXT PRIMARY KEY,
+    value TEXT,
+    updated_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS posted (
+    kind TEXT NOT NULL,
+    item_id TEXT NOT NULL,
+    posted_at TEXT NOT NULL,
+    PRIMARY KEY (kind, item_id)
+);
+"""
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _conflict(e: ClientError) -> bool:
+    code = e.response.get("Error", {}).get("Code")
+    status = e.response.get("ResponseMetadata", {}).get("HTTPStatusCode")
+    return code in ("PreconditionFailed", "ConditionalRequestConflict") or status in (409, 412)
+
+
+class BotState:
+    def __init__(self, path: str = LOCAL_PATH, etag: Optional[str] = None):
+        self.path = path
+        self.etag = etag
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript(SCHEMA)
+        # Changes since load, replayed onto a newer copy if a conditional write loses
+        self._ops: List[Tuple] = []
+
+    # --- Loading and flushing ---
+    @classmethod
+    def load(cls, s3_client, bucket: str = S3_BUCKET, key: str = STATE_KEY, path: str = LOCAL_PATH) -> "BotState":
+        """Fetch the state object (one GET); a missing object starts a new state seeded from legacy objects."""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        try:
+            obj = s3_client.get_object(Bucket=bucket, Key=key)
+        except ClientError as e:
+            if e.response["Error"]["Code"] != "NoSuchKey":
+                raise
+            logging.info(f"No bot state at s3://{bucket}/{key}; starting a new one from the legacy objects")
+            if os.path.exists(path):
+                os.remove(path)
+            state = cls(path)
+            state.import_legacy(s3_client, bucket)
+            return state
+        with open(path, "wb") as f:
+            f.write(obj["Body"].read())
+        return cls(path, etag=obj["ETag"])
+
+    def flush(self, s3_client, bucket: str = S3_BUCKET, key: str = STATE_KEY, retries: int = FLUSH_RETRIES) -> bool:
+        """Write the state back (one PUT) if anything changed, merging with a concurrent writer if needed."""
+        if not self._ops:
+            return True
+        for attempt in range(retries + 1):
+            self.conn.commit()
+            with open(self.path, "rb") as f:
+                body = f.read()
+            condition = {"IfMatch": self.etag} if self.etag else {"IfNoneMatch": "*"}
+            try:
+                response = s3_client.put_object(Bucket=bucket, Key=key, Body=body,
+                                                ContentType="application/vnd.sqlite3", **condition)
+                self.etag = response.get("ETag")
+                self._ops = []
+                logging.info(f"Saved bot state to s3://{bucket}/{key}")
+                return True
+            except ClientError as e:
+                if not _conflict(e) or attempt == retries:
+                    logging.error(f"Failed to save bot state to S3: {e}")
+                    return False
+                logging.info("Bot state changed since it was loaded; merging and retrying")
+                self._merge_remote(s3_client, bucket, key)
+        return False
+
+    def _merge_remote(self, s3_client, bucket: str, key: str) -> None:
+        """Replace the local copy with the current object and replay this run's changes on it."""
+        ops = self._ops
+        self.conn.close()
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(self.path) or ".", suffix=".sqlite")
+        os.close(fd)
+        try:
+            obj = s3_client.get_object(Bucket=bucket, Key=key)
+            with open(tmp, "wb") as f:
+                f.write(obj["Body"].read())
+            etag = obj["ETag"]
+        except ClientError as e:
+            if e.response["Error"]["Code"] != "NoSuchKey":
+                raise
+            etag = None
+        os.replace(tmp, self.path)
+        self.conn = sqlite3.connect(self.path)
+        self.conn.executescript(SCHEMA)
+        self.etag = etag
+        self._ops = []
+        for op in ops:
+            self._apply(op)
+
+    def close(self) -> None:
+        self.conn.close()
+
+    # --- Changes ---
+    def _apply(self, op: Tuple) -> None:
+        if op[0] == "set":
+            _, name, value, updated_at = op
+            self.conn.execute(
+                "INSERT INTO state_values (name, value, updated_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET value = excluded.value, updated_at = excluded.updated_at",
+                (name, value, updated_at),
+            )
+        elif op[0] == "posted":
+            _, kind, item_id, posted_at = op
+            self.conn.execute("INSERT OR IGNORE INTO posted (kind, item_id, posted_at) VALUES (?, ?, ?)",
+                              (kind, item_id, posted_at))
+        self._ops.append(op)
+
+    def get(self, name: str, default: Optional[str] = None) -> Optional[str]:
+        row = self.conn.execute("SELECT value FROM state_values WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else default
+
+    def set(self, name: str, value: Optional[str]) -> None:
+        if self.get(name) != value:
+            self._apply(("set", name, value, _now()))
+
+    def last_post_date(self, post_type: str) -> Optional[str]:
+        return self.get(f"last_post_date:{post_type}")
+
+    def set_last_post_date(self, post_type: str, date_str: str) -> None:
+        self.set(f"last_post_date:{post_type}", date_str)
+
+    def posted_ids(self, kind: str) -> Set[str]:
+        return {row[0] for row in self.conn.execute("SELECT item_id FROM posted WHERE kind = ?", (kind,))}
+
+    def is_posted(self, kind: str, item_id: str) -> bool:
+        return self.conn.execute("SELECT 1 FROM posted WHERE kind = ? AND item_id = ?", (kind, item_id)).fetchone() is not None
+
+    def mark_posted(self, kind: str, item_id: str) -> None:
+        if not self.is_posted(kind, item_id):
+            self._apply(("posted", kind, item_id, _now()))
+
+    # --- Migration ---
+    def import_legacy(self, s3_client, bucket: str = S3_BUCKET, prefix: str = LEGACY_PREFIX) -> None:
+        """Copy the old one-object-per-value state (last-post text files, posted_transactions.json)."""
+        def read(name):
+            try:
+                return s3_client.get_object(Bucket=bucket, Key=f"{prefix}/{name}")["Body"].read().decode("utf-8")
+            except ClientError as e:
+                if e.response["Error"]["Code"] != "NoSuchKey":
+                    logging.warning(f"Could not read legacy state {name}: {e}")
+                return None
+
+        for post_type, name in LEGACY_LAST_POST_KEYS.items():
+            value = read(name)
+            if value:
+                self.set_last_post_date(post_type, value.strip())
+        posted = read(LEGACY_POSTED_TRANSACTIONS_KEY)
+        if posted:
+            for item_id in json.loads(posted).get("transaction_ids", []):
+                self.mark_posted("transaction", item_id)
+        logging.info(f"Imported {len(self._ops)} legacy bot state value(s)")
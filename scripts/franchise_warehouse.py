@@ -0,0 +1,403 @@
+"""
+All-franchise game-by-game warehouse (1901-present).
+
+29 keeps the team's own schedule-and-results history. This crawls the same
+Baseball Reference page for every franchise and season (about 2,700
+team-seasons; each of the ~220k games is stored once per team) into one parquet
+partition per season:
+
+    data/franchises/games/{year}.parquet
+
+Each crawled team-season replaces that franchise's rows in its season's
+partition. Per-season files keep a full load to ~125 reads; one file per
+team-season would mean ~2,700 reads, and per-file overhead dominates at that
+size.
+
+Franchises are keyed by their current statsapi abbreviation, and
+teams.FRANCHISE_ERAS gives the BBRef code of each season. The 1950 Senators are
+MIN, listed as "WSH" on BBRef. Opponents get the same franchise key
+(opp_franchise).
+
+The crawl is serial and rate limited, because BBRef blocks clients that make more
+than about 20 requests a minute. It backs off on HTTP 429, honouring Retry-After.
+Per-season progress is kept in a SQLite journal next to the partitions and is
+committed after each season, so a stopped crawl resumes where it was. Finished
+seasons are never fetched again. The current season is re-fetched on every run.
+
+FranchiseGames is the query API. Games are typed and indexed by (franchise, year,
+gm), with season-to-date records, so a team x season x game-number slice is an
+index lookup. League-wide questions ("best 60-game start since 1901") are one
+vectorized pass.
+
+    python -m scripts.franchise_warehouse --start-year 1901 --teams BOS NYY
+    python -m scripts.franchise_warehouse --best-start 60
+"""
+
+import argparse
+import logging
+import os
+import sqlite3
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+import requests
+
+from scripts import teams
+from scripts.standings_history import parse_year_data
+
+START_YEAR = 1901
+SCHEDULE_URL = "https://www.baseball-reference.com/teams/{code}/{year}-schedule-scores.shtml"
+OUT_DIR = os.path.join("data", "franchises", "games")
+JOURNAL_PATH = os.path.join(OUT_DIR, "crawl_journal.sqlite")
+# Seconds between requests, and the first pause after a 429 without Retry-After
+MIN_INTERVAL = 3.5
+BACKOFF_SECONDS = 60.0
+MAX_RETRIES = 3
+
+# Partition columns and types, identical for every season (older pages lack some)
+COLUMNS = {
+    "franchise": "string",
+    "bbref_code": "string",
+    "year": "Int64",
+    "gm": "Int64",
+    "game_date": "string",
+    "home_away": "string",
+    "opp": "string",
+    "opp_franchise": "string",
+    "result": "string",
+    "r": "Int64",
+    "ra": "Int64",
+    "wins": "Int64",
+    "losses": "Int64",
+    "rank": "Int64",
+    "gb": "float64",
+    "time_minutes": "Int64",
+    "day_night": "string",
+    "attendance": "Int64",
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS seasons (
+    franchise TEXT NOT NULL,
+    year INTEGER NOT NULL,
+    bbref_code TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    games INTEGER,
+    error TEXT,
+    updated_at TEXT,
+    PRIMARY KEY (franchise, year)
+);
+CREATE INDEX IF NOT EXISTS seasons_status ON seasons (status);
+"""
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+class CrawlJournal:
+    """Per team-season progress: pending -> done | current | failed.
+
+    "current" marks a season crawled while it was still being played; it is
+    fetched again until a crawl in a later year marks it done.
+    """
+
+    def __init__(self, path: str = JOURNAL_PATH):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def add_seasons(self, seasons: Iterable[Tuple[str, int, str]]) -> int:
+        """Register (franchise, year, bbref_code) seasons; returns how many were new."""
+        before = self.conn.total_changes
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO seasons (franchise, year, bbref_code) VALUES (?, ?, ?)", list(seasons))
+        return self.conn.total_changes - before
+
+    def pending(self, franchises: Iterable[str], years: Iterable[int]) -> List[Tuple[str, int, str]]:
+        """Seasons of these franchises and years not done yet, oldest first."""
+        franchises, years = list(franchises), list(years)
+        if not franchises or not years:
+            return []
+        cursor = self.conn.execute(
+            f"SELECT franchise, year, bbref_code FROM seasons "
+            f"WHERE franchise IN ({','.join('?' * len(franchises))}) AND year IN ({','.join('?' * len(years))}) "
+            f"AND status != 'done' ORDER BY year, franchise",
+            franchises + years,
+        )
+        return [tuple(row) for row in cursor]
+
+    def mark_done(self, franchise: str, year: int, games: int, status: str = "done") -> None:
+        with self.conn:
+            self.conn.execute("UPDATE seasons SET status = ?, games = ?, error = NULL, updated_at = ? "
+                              "WHERE franchise = ? AND year = ?", (status, games, _now(), franchise, year))
+
+    def mark_failed(self, franchise: str, year: int, error: str) -> None:
+        with self.conn:
+            self.conn.execute("UPDATE seasons SET status = 'failed', error = ?, updated_at = ? "
+                              "WHERE franchise = ? AND year = ?", (error[:500], _now(), franchise, year))
+
+    def summary(self) -> Dict[str, int]:
+        """{status: team-seasons}."""
+        return dict(self.conn.execute("SELECT status, COUNT(*) FROM seasons GROUP BY status ORDER BY status"))
+
+
+class RateLimiter:
+    """Spaces requests at least `interval` seconds apart; back_off() delays the next one further."""
+
+    def __init__(self, interval: float = MIN_INTERVAL, clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        self.interval = interval
+        self.clock = clock
+        self.sleep = sleep
+        self.next_at = 0.0
+
+    def wait(self) -> None:
+        delay = self.next_at - self.clock()
+        if delay > 0:
+            self.sleep(delay)
+        self.next_at = self.clock() + self.interval
+
+    def back_off(self, seconds: float) -> None:
+        self.next_at = max(self.next_at, self.clock() + seconds)
+
+
+def _retry_after(response) -> Optional[float]:
+    try:
+        return float(response.headers.get("Retry-After"))
+    except (TypeError, ValueError):
+        return None
+
+
+def fetch_schedule(code: str, year: int, limiter: RateLimiter, retries: int = MAX_RETRIES) -> bytes:
+    """One season's BBRef schedule page, waiting on the limiter before every request."""
+    url = SCHEDULE_URL.format(code=code, year=year)
+    for attempt in range(retries + 1):
+        limiter.wait()
+        response = requests.get(url, timeout=30)
+        if response.status_code == 429 and attempt < retries:
+            pause = _retry_after(response) or BACKOFF_SECONDS * 2 ** attempt
+            logging.warning(f"Rate limited on {url}; pausing {pause:.0f}s")
+            limiter.back_off(pause)
+            continue
+        response.raise_for_status()
+        return response.content
+    raise requests.exceptions.HTTPError(f"Still rate limited after {retries} retries: {url}")
+
+
+def partition_path(year: int, out_dir: str = OUT_DIR) -> str:
+    return os.path.join(out_dir, f"{year}.parquet")
+
+
+def team_seasons(franchises: Iterable[str], years: Iterable[int]) -> List[Tuple[str, int, str]]:
+    """(franchise, year, bbref_code) for every season each franchise existed."""
+    years = list(years)
+    return [(abbr, year, teams.bbref_code(abbr, year)) for year in years for abbr in franchises
+            if teams.bbref_code(abbr, year)]
+
+
+def season_frame(html: Union[bytes, str], franchise: str, code: str, year: int) -> pd.DataFrame:
+    """A parsed schedule page in the partition format (COLUMNS)."""
+    df = parse_year_data(html, year)
+    if df is None or df.empty:
+        raise ValueError("no games parsed")
+    df = df.assign(franchise=franchise, bbref_code=code, year=year)
+    opp = {c: getattr(teams.franchise_for_code(c, year), "abbr", None) for c in df["opp"].dropna().unique()}
+    df["opp_franchise"] = df["opp"].map(opp)
+    df = df.reindex(columns=list(COLUMNS))
+    for col, dtype in COLUMNS.items():
+        if dtype != "string":
+            df[col] = pd.to_numeric(df[col], errors="coerce")
+    return df.astype(COLUMNS).sort_values("gm", ignore_index=True)
+
+
+def write_season(df: pd.DataFrame, path: str) -> None:
+    """Replace the franchises in df within a season's partition (atomically)."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    if os.path.exists(path):
+        stored = pd.read_parquet(path)
+        df = pd.concat([stored[~stored["franchise"].isin(df["franchise"].unique())], df], ignore_index=True)
+    df = df.sort_values(["franchise", "gm"], ignore_index=True)
+    # Dot-prefixed so a leftover temp file is never read as a partition
+    tmp = os.path.join(os.path.dirname(path), f".{os.path.basename(path)}.tmp")
+    df.to_parquet(tmp, index=False)
+    os.replace(tmp, path)
+
+
+def crawl(years: Iterable[int], franchises: Optional[List[str]] = None, out_dir: str = OUT_DIR,
+          journal_path: Optional[str] = None, interval: float = MIN_INTERVAL,
+          fetch: Optional[Callable[[str, int], bytes]] = None,
+          current_year: Optional[int] = None) -> Dict[str, int]:
+    """Crawl every team-season not done yet; returns the journal summary."""
+    years = list(years)
+    franchises = [t.abbr for t in teams.select(franchises)]
+    current_year = current_year or datetime.now().year
+    limiter = RateLimiter(interval)
+    fetch = fetch or (lambda code, year: fetch_schedule(code, year, limiter))
+
+    journal = CrawlJournal(journal_path or os.path.join(out_dir, os.path.basename(JOURNAL_PATH)))
+    try:
+        added = journal.add_seasons(team_seasons(franchises, years))
+        todo = journal.pending(franchises, years)
+        logging.info(f"{added} new team-season(s) registered, {len(todo)} to crawl "
+                     f"(~{len(todo) * interval / 60:.0f} min at one request per {interval:g}s)")
+        for n, (franchise, year, code) in enumerate(todo, start=1):
+            try:
+                df = season_frame(fetch(code, year), franchise, code, year)
+                write_season(df, partition_path(year, out_dir))
+                journal.mark_done(franchise, year, len(df), "current" if year >= current_year else "done")
+            except (requests.exceptions.RequestException, ValueError) as e:
+                logging.warning(f"{franchise} {year} ({code}) failed: {e}")
+                journal.mark_failed(franchise, year, str(e))
+            if n % 25 == 0:
+                logging.info(f"{n}/{len(todo)} team-seasons crawled")
+        return journal.summary()
+    finally:
+        journal.close()
+
+
+def load_partitions(out_dir: str = OUT_DIR, years: Optional[Iterable[int]] = None,
+                    franchises: Optional[Iterable[str]] = None) -> pd.DataFrame:
+    """The stored games, optionally limited to some seasons and franchises."""
+    wanted = None if years is None else {int(y) for y in years}
+    paths = [] if not os.path.isdir(out_dir) else [
+        os.path.join(out_dir, name) for name in sorted(os.listdir(out_dir))
+        if name.endswith(".parquet") and name[:-len(".parquet")].isdigit()
+        and (wanted is None or int(name[:-len(".parquet")]) in wanted)
+    ]
+    if not paths:
+        return pd.DataFrame(columns=list(COLUMNS)).astype(COLUMNS)
+    filters = None if franchises is None else [("franchise", "in", list(franchises))]
+    return pd.concat([pd.read_parquet(path, filters=filters) for path in paths], ignore_index=True)
+
+
+class FranchiseGames:
+    """Every stored game, one row per team and game, indexed by (franchise, year, gm) and by date.
+
+    wins, losses, win_pct, runs and runs_allowed are season-to-date through
+    the row's game; run_diff is runs - runs_allowed.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        df = df.dropna(subset=["franchise", "year", "gm"]).copy()
+        df["year"] = df["year"].astype(int)
+        df["gm"] = df["gm"].astype(int)
+        df["game_date"] = pd.to_datetime(df["game_date"], errors="coerce")
+        df = df.sort_values(["franchise", "year", "gm"], ignore_index=True)
+
+        result = df["result"].fillna("")
+        season = df.groupby(["franchise", "year"], sort=False)
+        df["wins"] = result.str.startswith("W").astype(int).groupby([df["franchise"], df["year"]]).cumsum()
+        df["losses"] = result.str.startswith("L").astype(int).groupby([df["franchise"], df["year"]]).cumsum()
+        decided = df["wins"] + df["losses"]
+        df["win_pct"] = (df["wins"] / decided.where(decided > 0)).round(3)
+        df["runs"] = season["r"].cumsum().astype("Int64")
+        df["runs_allowed"] = season["ra"].cumsum().astype("Int64")
+        df["run_diff"] = df["runs"] - df["runs_allowed"]
+
+        self.games = df.set_index(["franchise", "year", "gm"], drop=False)
+        self.by_date = df.set_index("game_date", drop=False).sort_index(kind="stable")
+
+    @classmethod
+    def load(cls, out_dir: str = OUT_DIR, years: Optional[Iterable[int]] = None,
+             franchises: Optional[Iterable[str]] = None) -> "FranchiseGames":
+        return cls(load_partitions(out_dir, years, franchises))
+
+    @property
+    def franchises(self) -> list:
+        return self.games.index.get_level_values("franchise").unique().tolist()
+
+    @property
+    def years(self) -> list:
+        return sorted(self.games.index.get_level_values("year").unique().tolist())
+
+    def season(self, franchise: str, year: int) -> pd.DataFrame:
+        """One team-season's games in order (empty when not stored)."""
+        try:
+            return self.games.loc[(franchise, year)].reset_index(drop=True)
+        except KeyError:
+            return self.games.iloc[0:0].reset_index(drop=True)
+
+    def slice(self, franchises: Optional[Iterable[str]] = None, years: Optional[Iterable[int]] = None,
+              games: Optional[Union[int, Tuple[int, int]]] = None) -> pd.DataFrame:
+        """Games of some franchises x seasons x game numbers (one number or an inclusive range)."""
+        if isinstance(games, int):
+            games = (games, games)
+        index = self.games.index
+        mask = np.ones(len(index), dtype=bool)
+        if franchises is not None:
+            mask &= index.get_level_values("franchise").isin(list(franchises))
+        if years is not None:
+            mask &= index.get_level_values("year").isin(list(years))
+        if games is not None:
+            gm = index.get_level_values("gm")
+            mask &= (gm >= games[0]) & (gm <= games[1])
+        return self.games[mask].reset_index(drop=True)
+
+    def on_dates(self, start: str, end: Optional[str] = None) -> pd.DataFrame:
+        """Every team's games between two dates (inclusive), in date order."""
+        return self.by_date.loc[pd.Timestamp(start):pd.Timestamp(end or start)].reset_index(drop=True)
+
+    def record_through(self, gm: int, years: Optional[Iterable[int]] = None) -> pd.DataFrame:
+        """Each team-season's record through its game N (seasons shorter than N are left out)."""
+        columns = ["franchise", "year", "bbref_code", "game_date", "wins", "losses", "win_pct",
+                   "runs", "runs_allowed", "run_diff"]
+        return self.slice(years=years, games=gm)[columns]
+
+    def best_starts(self, n_games: int, top: int = 10, worst: bool = False,
+                    years: Optional[Iterable[int]] = None) -> pd.DataFrame:
+        """The best (or worst) records through game N league-wide, run differential breaking ties."""
+        records = self.record_through(n_games, years)
+        return (records.sort_values(["win_pct", "run_diff"], ascending=worst)
+                .head(top).reset_index(drop=True))
+
+    def season_totals(self, years: Optional[Iterable[int]] = None) -> pd.DataFrame:
+        """One row per team-season: games, final record, runs and home attendance."""
+        games = self.slice(years=years)
+        home = games[games["home_away"] == "home"]
+        totals = games.groupby(["franchise", "year"], sort=False).agg(
+            bbref_code=("bbref_code", "last"),
+            games=("gm", "max"),
+            wins=("wins", "last"),
+            losses=("losses", "last"),
+            win_pct=("win_pct", "last"),
+            runs=("runs", "last"),
+            runs_allowed=("runs_allowed", "last"),
+            run_diff=("run_diff", "last"),
+        )
+        totals["attendance"] = home.groupby(["franchise", "year"])["attendance"].sum()
+        return totals.reset_index()
+
+
+def main():
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(description="Crawl every franchise's game-by-game results into the warehouse")
+    parser.add_argument("--start-year", type=int, default=START_YEAR)
+    parser.add_argument("--end-year", type=int, default=datetime.now().year)
+    parser.add_argument("--teams", nargs="*", help="Franchises to crawl (default: all 30)")
+    parser.add_argument("--interval", type=float, default=MIN_INTERVAL, help="Seconds between requests")
+    parser.add_argument("--best-start", type=int, metavar="N",
+                        help="Print the best records through game N from the stored games instead of crawling")
+    args = parser.parse_args()
+    if args.end_year < args.start_year:
+        parser.error("--end-year is before --start-year")
+    years = range(args.start_year, args.end_year + 1)
+
+    if args.best_start:
+        franchises = [t.abbr for t in teams.select(args.teams)]
+        print(FranchiseGames.load(years=years, franchises=franchises).best_starts(args.best_start).to_string())
+        return
+    summary = crawl(years, args.teams, interval=args.interval)
+    logging.info("Journal: " + ", ".join(f"{status} {count}" for status, count in summary.items()))
+
+
+if __name__ == "__main__":
+    main()
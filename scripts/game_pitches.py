@@ -0,0 +1,146 @@
+"""
+Pitch rows for one team side of a Baseball Savant gamefeed (gf) payload.
+
+Shared by 20 (current season) and the multi-season backfill in
+scripts/pitch_backfill.py so both produce identical rows. Pitches from the
+statsapi live feed (live_game, umpire_scorecards) are converted to the gf
+pitch layout with at_bat_pitches first.
+"""
+
+import re
+from typing import Dict, List, Optional
+
+from scripts import strike_zone
+
+BATTING_SIDES = ("home_batters", "away_batters")
+
+# statsapi pitch call codes -> the pitch_call values Savant reports (and 20 stores)
+CALL_CODES = {
+    "B": "ball",
+    "*B": "blocked_ball",
+    "I": "ball",
+    "P": "pitchout",
+    "C": "called_strike",
+    "S": "swinging_strike",
+    "W": "swinging_strike_blocked",
+    "M": "missed_bunt",
+    "F": "foul",
+    "T": "foul_tip",
+    "L": "foul_bunt",
+    "O": "foul_bunt",
+    "R": "foul_pitchout",
+    "X": "hit_into_play",
+    "D": "hit_into_play",
+    "E": "hit_into_play",
+    "H": "hit_by_pitch",
+}
+
+
+def other_side(team_side: str) -> str:
+    return "away_batters" if team_side == "home_batters" else "home_batters"
+
+
+def pitch_rows(data: Dict, team_side: str, game_pk, game_date: Optional[str] = None,
+               team_role: Optional[str] = None) -> List[Dict]:
+    """One row per pitch seen by the batters on team_side, in game order."""
+    pitches = [pitch for batter_pitches in (data or {}).get(team_side, {}).values() for pitch in batter_pitches]
+    if not pitches:
+        return []
+
+    # Zone distances for every pitch in one pass (None where location/zone data is missing)
+    zone = strike_zone.zone_metrics(
+        [p.get("px") for p in pitches],
+        [p.get("pz") for p in pitches],
+        [p.get("sz_top") for p in pitches],
+        [p.get("sz_bot") for p in pitches],
+    )
+    center_inches = strike_zone.to_nullable_list(zone["dist_from_sz_center_inches"])
+    edge_inches = strike_zone.to_nullable_list(zone["dist_from_sz_edge_inches"])
+    inside_margin = strike_zone.to_nullable_list(zone["inside_margin_inches"])
+    in_zone = zone["pitch_in_zone"].tolist()
+
+    rows = []
+    for i, pitch in enumerate(pitches):
+        rows.append({
+            "game_pk": game_pk,
+            "game_date": game_date,
+            "pitch_id": pitch.get("play_id"),
+            "inning": pitch.get("inning"),
+            "ab_number": pitch.get("ab_number"),
+            "pitch_number": pitch.get("pitch_number"),
+            # Count before the pitch
+            "balls": pitch.get("balls"),
+            "strikes": pitch.get("strikes"),
+            "batter": pitch.get("batter_name"),
+            "pitcher": pitch.get("pitcher_name"),
+            "pitch_name": pitch.get("pitch_name"),
+            "pitch_velocity": pitch.get("start_speed"),
+            "pitch_call": pitch.get("pitch_call"),
+            "pitch_in_zone": in_zone[i],
+            "at_bat_eventual_result": pitch.get("result"),
+            "at_bat_eventual_desc": pitch.get("des"),
+            "dist_from_sz_center_inches": center_inches[i],
+            "dist_from_sz_edge_inches": edge_inches[i],
+            "inside_margin_inches": inside_margin[i],
+            "zone": pitch.get("zone"),
+            "px": pitch.get("px"),
+            "pz": pitch.get("pz"),
+            "sz_bot": pitch.get("sz_bot"),
+            "sz_top": pitch.get("sz_top"),
+            "team_role": team_role or "thrown_to_redsox",
+        })
+    rows.sort(key=lambda p: (p.get('inning', 0), p.get('ab_number', 0), p.get('pitch_number', 0)))
+    return rows
+
+
+def statsapi_call(details: Dict) -> Optional[str]:
+    """A statsapi playEvent's call as a Savant pitch_call value."""
+    call = details.get("call") or {}
+    if call.get("code") in CALL_CODES:
+        return CALL_CODES[call["code"]]
+    description = call.get("description") or details.get("description")
+    return re.sub(r"[^a-z]+", "_", description.lower()).strip("_") if description else None
+
+
+def at_bat_pitches(play: Dict) -> List[Dict]:
+    """The pitches of one statsapi play, as Savant gf pitch dicts (what pitch_rows reads)."""
+    about, matchup, result = play.get("about", {}), play.get("matchup", {}), play.get("result", {})
+    pitches = []
+    # statsapi events carry the count after the pitch; rows hold the count before it
+    balls = strikes = 0
+    for event in play.get("playEvents", []):
+        if not event.get("isPitch"):
+            continue
+        details, data = event.get("details", {}), event.get("pitchData", {})
+        coordinates = data.get("coordinates", {})
+        pitches.append({
+            "play_id": event.get("playId"),
+            "inning": about.get("inning"),
+            "ab_number": about.get("atBatIndex", 0) + 1,
+            "pitch_number": event.get("pitchNumber"),
+            "balls": balls,
+            "strikes": strikes,
+            "batter_name": matchup.get("batter", {}).get("fullName"),
+            "pitcher_name": matchup.get("pitcher", {}).get("fullName"),
+            "pitch_name": details.get("type", {}).get("description"),
+            "start_speed": data.get("startSpeed"),
+            "pitch_call": statsapi_call(details),
+            "result": result.get("event"),
+            "des": result.get("description"),
+            "zone": data.get("zone"),
+            "px": coordinates.get("pX"),
+            "pz": coordinates.get("pZ"),
+            "sz_top": data.get("strikeZoneTop"),
+            "sz_bot": data.get("strikeZoneBottom"),
+        })
+        count = event.get("count") or {}
+        balls, strikes = count.get("balls", balls), count.get("strikes", strikes)
+    return pitches
+
+
+def home_plate_umpire(doc: Dict) -> Optional[Dict]:
+    """{"id", "name"} of the home plate umpire in a statsapi live feed, or None."""
+    for official in doc.get("liveData", {}).get("boxscore", {}).get("officials", []):
+        if str(official.get("officialType", "")).lower() == "home plate":
+            return {"id": official.get("official", {}).get("id"), "name": official.get("official", {}).get("fullName")}
+    return None
@@ -0,0 +1,126 @@
+"""
+Local cache of per-game payloads shared by 01, 02, 20, 21 and 27.
+
+Payloads are keyed by (source, game_pk):
+- "savant": Baseball Savant gf (https://baseballsavant.mlb.com/gf?game_pk=...)
+- "statsapi": statsapi live feed (https://statsapi.mlb.com/api/v1.1/game/{game_pk}/feed/live)
+
+Once a game is Final its payload never changes, so it is stored as
+{game_pk}.final.json.zst and always served from disk. Payloads of games that are
+not final are stored as {game_pk}.live.json.zst and refetched after a short TTL.
+Each game is therefore downloaded at most once per source across all scripts,
+and rebuilding past seasons only reads local files.
+
+Compression is zstd when the zstandard package is installed, gzip otherwise;
+either kind of file is read back regardless.
+"""
+
+import gzip
+import json
+import os
+import time
+from typing import Callable, Dict, Optional
+
+import requests
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+CACHE_DIR = os.path.join("data", "gamefeeds")
+LIVE_TTL_SECONDS = 120
+SOURCE_URLS = {
+    "savant": "https://baseballsavant.mlb.com/gf?game_pk={game_pk}",
+    "statsapi": "https://statsapi.mlb.com/api/v1.1/game/{game_pk}/feed/live",
+}
+EXTENSIONS = (".json.zst", ".json.gz")
+
+
+def is_final(source: str, payload: Dict) -> bool:
+    if source == "savant":
+        return payload.get("game_status_code") == "F"
+    if source == "statsapi":
+        return payload.get("gameData", {}).get("status", {}).get("abstractGameState") == "Final"
+    return False
+
+
+def _encode(payload: Dict) -> bytes:
+    raw = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    if zstandard is not None:
+        return zstandard.ZstdCompressor(level=10).compress(raw)
+    return gzip.compress(raw)
+
+
+def _read(path: str) -> Dict:
+    with open(path, "rb") as f:
+        data = f.read()
+    if path.endswith(".zst"):
+        if zstandard is None:
+            raise RuntimeError(f"{path} is zstd-compressed but zstandard is not installed")
+        data = zstandard.ZstdDecompressor().decompress(data)
+    else:
+        data = gzip.decompress(data)
+    return json.loads(data)
+
+
+def _path(cache_dir: str, source: str, game_pk: int, state: str, extension: Optional[str] = None) -> str:
+    extension = extension or (EXTENSIONS[0] if zstandard is not None else EXTENSIONS[1])
+    return os.path.join(cache_dir, source, f"{int(game_pk)}.{state}{extension}")
+
+
+def _existing(cache_dir: str, source: str, game_pk: int, state: str) -> Optional[str]:
+    for extension in EXTENSIONS:
+        path = _path(cache_dir, source, game_pk, state, extension)
+        if os.path.exists(path) and (extension != ".json.zst" or zstandard is not None):
+            return path
+    return None
+
+
+def cached_path(source: str, game_pk: int, cache_dir: str = CACHE_DIR) -> Optional[str]:
+    """Path of the stored payload for a game (final or live), if any."""
+    return _existing(cache_dir, source, game_pk, "final") or _existing(cache_dir, source, game_pk, "live")
+
+
+def _default_fetch(url: str) -> Dict:
+    response = requests.get(url, timeout=30)
+    response.raise_for_status()
+    return response.json()
+
+
+def get(source: str, game_pk: int, fetch: Optional[Callable[[str], Optional[Dict]]] = None,
+        ttl: float = LIVE_TTL_SECONDS, cache_dir: str = CACHE_DIR) -> Optional[Dict]:
+    """The payload for one game, from the cache when it's final or fresh, else fetched and stored.
+
+    `fetch(url)` defaults to a plain requests GET; errors it raises propagate,
+    and a None result is returned without caching.
+    """
+    final_path = _existing(cache_dir, source, game_pk, "final")
+    if final_path:
+        return _read(final_path)
+    live_path = _existing(cache_dir, source, game_pk, "live")
+    if live_path and time.time() - os.path.getmtime(live_path) < ttl:
+        return _read(live_path)
+
+    payload = (fetch or _default_fetch)(SOURCE_URLS[source].format(game_pk=int(game_pk)))
+    if payload is None:
+        return None
+    put(source, game_pk, payload, cache_dir)
+    return payload
+
+
+def put(source: str, game_pk: int, payload: Dict, cache_dir: str = CACHE_DIR) -> str:
+    """Store a payload (as final or live, from its own status); returns the file path."""
+    state = "final" if is_final(source, payload) else "live"
+    path = _path(cache_dir, source, game_pk, state)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(_encode(payload))
+    os.replace(tmp, path)
+    if state == "final":
+        for extension in EXTENSIONS:
+            stale = _path(cache_dir, source, game_pk, "live", extension)
+            if os.path.exists(stale):
+                os.remove(stale)
+    return path
@@ -0,0 +1,235 @@
+"""
+Year-partitioned team game-log warehouse (1901-present) for 10 and 12.
+
+Each season's Baseball Reference team game log (tgl.cgi) is stored as one
+parquet partition per year, locally under data/{kind}/gamelogs/ and mirrored to
+S3 under the same path. Past seasons are backfilled once and never change. On a
+normal run only the current season's partition is touched: games newer than the
+last stored game are appended, and their cumulative columns continue from the
+last stored row instead of re-running a groupby cumsum over the whole season.
+
+Stat corrections BBRef makes to games already stored are not picked up by the
+incremental path; re-fetch the season (update_season(..., full=True)) for that.
+"""
+
+import logging
+import os
+import time
+from io import BytesIO
+from typing import Dict, List, NamedTuple, Optional
+
+import pandas as pd
+
+from scripts import config
+
+START_YEAR = 1901
+DATA_ROOT = "data"
+S3_PREFIX = "redsox/data"
+TGL_URL = "https://www.baseball-reference.com/teams/tgl.cgi?team={team}&t={table}&year={year}"
+
+
+class GamelogSpec(NamedTuple):
+    kind: str
+    table: str
+    # Per-game counting stats (stored per game, summed into {col}_cum)
+    value_cols: List[str]
+    # Columns BBRef already reports as season-to-date values, stored as-is
+    passthrough_cols: List[str]
+
+
+SPECS: Dict[str, GamelogSpec] = {
+    "batting": GamelogSpec(
+        kind="batting",
+        table="b",
+        value_cols=["pa", "ab", "r", "h", "2b", "3b", "hr", "rbi", "bb", "ibb", "so",
+                    "hbp", "sh", "sf", "roe", "gdp", "sb", "cs"],
+        passthrough_cols=[],
+    ),
+    "pitching": GamelogSpec(
+        kind="pitching",
+        table="p",
+        value_cols=["h", "hr", "er", "so"],
+        passthrough_cols=["era"],
+    ),
+}
+
+
+def tgl_url(spec: GamelogSpec, year: int, team: str = config.TEAM_ID_BBREF) -> str:
+    return TGL_URL.format(team=team, table=spec.table, year=year)
+
+
+def parse_tgl(raw: pd.DataFrame, spec: GamelogSpec, year: int) -> pd.DataFrame:
+    """Typed per-game rows from a tgl.cgi table: gtm, year, game_date, value and passthrough columns."""
+    df = raw.copy()
+    if isinstance(df.columns, pd.MultiIndex):
+        df.columns = df.columns.droplevel(0)
+    df.columns = df.columns.str.lower()
+    # Filter out header/summary rows by ensuring 'gtm' is a numeric value
+    df = df[pd.to_numeric(df["gtm"], errors="coerce").notna()].copy()
+
+    games = pd.DataFrame({
+        "gtm": df["gtm"].astype(int).to_numpy(),
+        "year": year,
+        "game_date": pd.to_datetime(df["date"].astype(str) + f" {year}", format="%b %d %Y", errors="coerce")
+                       .dt.strftime("%Y-%m-%d").to_numpy(),
+    })
+    # Early seasons lack some columns (e.g. ibb, sf); keep them as missing
+    for col in spec.value_cols:
+        values = pd.to_numeric(df[col], errors="coerce") if col in df.columns else pd.Series(pd.NA, index=df.index)
+        games[col] = values.astype("Int64").to_numpy()
+    for col in spec.passthrough_cols:
+        values = pd.to_numeric(df[col], errors="coerce") if col in df.columns else pd.Series(float("nan"), index=df.index)
+        games[col] = values.astype(float).to_numpy()
+    return games.sort_values("gtm").drop_duplicates("gtm", keep="last").reset_index(drop=True)
+
+
+def fetch_season(spec: GamelogSpec, year: int) -> Optional[pd.DataFrame]:
+    """One season's game log from BBRef, or None when there is no table for that year yet."""
+    url = tgl_url(spec, year)
+    try:
+        raw = pd.read_html(url)[0]
+    except (ValueError, IndexError) as e:
+        logging.warning(f"No {spec.kind} game log for {year}: {e}")
+        return None
+    return parse_tgl(raw, spec, year)
+
+
+def with_cumulative(games: pd.DataFrame, spec: GamelogSpec, start: Optional[pd.Series] = None) -> pd.DataFrame:
+    """Add {col}_cum columns, continuing from `start` (the last stored row) when given."""
+    games = games.copy()
+    for col in spec.value_cols:
+        cum = games[col].cumsum()
+        if start is not None and pd.notna(start.get(f"{col}_cum")):
+            cum = cum + int(start[f"{col}_cum"])
+        games[f"{col}_cum"] = cum.astype("Int64")
+    for col in spec.passthrough_cols:
+        games[f"{col}_cum"] = games[col]
+    return games
+
+
+def extend_season(stored: Optional[pd.DataFrame], fresh: pd.DataFrame, spec: GamelogSpec):
+    """Append games in `fresh` newer than the last stored game; returns (season, number of games added).
+
+    If the stored season doesn't line up with the fresh log (a gap or a shorter
+    fresh log), the season is rebuilt from the fresh log.
+    """
+    if stored is None or stored.empty:
+        return with_cumulative(fresh, spec), len(fresh)
+    if fresh.empty:
+        return stored, 0
+    last = stored.iloc[-1]
+    last_gtm = int(last["gtm"])
+    new_games = fresh[fresh["gtm"] > last_gtm]
+    if int(fresh["gtm"].max()) < last_gtm or (not new_games.empty and int(new_games["gtm"].iloc[0]) != last_gtm + 1):
+        logging.warning(f"Stored {spec.kind} log ends at game {last_gtm} but BBRef's doesn't continue from it; rebuilding the season")
+        return with_cumulative(fresh, spec), len(fresh)
+    if new_games.empty:
+        return stored, 0
+    season = pd.concat([stored, with_cumulative(new_games, spec, start=last)], ignore_index=True)
+    return season, len(new_games)
+
+
+def partition_path(spec: GamelogSpec, year: int, root: str = DATA_ROOT) -> str:
+    return os.path.join(root, spec.kind, "gamelogs", f"{spec.kind}_gamelogs_{year}.parquet")
+
+
+def partition_key(spec: GamelogSpec, year: int) -> str:
+    return f"{S3_PREFIX}/{spec.kind}/gamelogs/{spec.kind}_gamelogs_{year}.parquet"
+
+
+def load_partition(spec: GamelogSpec, year: int, root: str = DATA_ROOT, bucket=None) -> Optional[pd.DataFrame]:
+    """A stored season, from the local warehouse or else from S3 (cached locally)."""
+    path = partition_path(spec, year, root)
+    if not os.path.exists(path) and bucket is not None:
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            bucket.download_file(partition_key(spec, year), path)
+        except Exception as e:
+            logging.info(f"No stored {spec.kind} partition for {year} in S3 ({e})")
+            return None
+    if not os.path.exists(path):
+        return None
+    return pd.read_parquet(path)
+
+
+def save_partition(season: pd.DataFrame, spec: GamelogSpec, year: int, root: str = DATA_ROOT, bucket=None) -> None:
+    path = partition_path(spec, year, root)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    season.to_parquet(path, index=False)
+    if bucket is not None:
+        try:
+            buffer = BytesIO()
+            season.to_parquet(buffer, index=False)
+            buffer.seek(0)
+            bucket.put_object(Key=partition_key(spec, year), Body=buffer, ContentType="application/octet-stream")
+        except Exception as e:
+            logging.error(f"Failed to upload {spec.kind} partition for {year} to S3: {e}")
+
+
+def stored_years(spec: GamelogSpec, root: str = DATA_ROOT, bucket=None) -> List[int]:
+    """Seasons present locally and (when a bucket is given) in S3."""
+    years = set()
+    directory = os.path.dirname(partition_path(spec, START_YEAR, root))
+    prefix = f"{spec.kind}_gamelogs_"
+    if os.path.isdir(directory):
+        years.update(int(name[len(prefix):-len(".parquet")]) for name in os.listdir(directory)
+                     if name.startswith(prefix) and name.endswith(".parquet"))
+    if bucket is not None:
+        try:
+            key_prefix = os.path.dirname(partition_key(spec, START_YEAR)) + "/" + prefix
+            years.update(int(obj.key[len(key_prefix):-len(".parquet")])
+                         for obj in bucket.objects.filter(Prefix=key_prefix) if obj.key.endswith(".parquet"))
+        except Exception as e:
+            logging.error(f"Could not list {spec.kind} partitions in S3: {e}")
+    return sorted(years)
+
+
+def update_season(spec: GamelogSpec, year: int, root: str = DATA_ROOT, bucket=None, full: bool = False) -> Optional[pd.DataFrame]:
+    """Fetch a season's log and store the games not yet in its partition; None when BBRef has no table."""
+    fresh = fetch_season(spec, year)
+    if fresh is None or fresh.empty:
+        return None
+    stored = None if full else load_partition(spec, year, root, bucket)
+    season, added = extend_season(stored, fresh, spec)
+    if added:
+        save_partition(season, spec, year, root, bucket)
+    logging.info(f"{spec.kind} {year}: {added} new game(s), {len(season)} stored")
+    return season
+
+
+def backfill(spec: GamelogSpec, start_year: int = START_YEAR, end_year: Optional[int] = None,
+             root: str = DATA_ROOT, bucket=None, delay: float = 3.0) -> List[int]:
+    """Fetch every season not yet stored (resumable); returns the seasons written."""
+    end_year = end_year or pd.Timestamp.now().year
+    have = set(stored_years(spec, root, bucket))
+    written = []
+    for year in range(start_year, end_year + 1):
+        if year in have:
+            continue
+        if update_season(spec, year, root, bucket) is not None:
+            written.append(year)
+        # BBRef rate-limits aggressive crawlers
+        time.sleep(delay)
+    return written
+
+
+def load_history(spec: GamelogSpec, root: str = DATA_ROOT, bucket=None, years: Optional[List[int]] = None) -> pd.DataFrame:
+    """Every stored season as one frame (year descending, games in order)."""
+    years = years if years is not None else stored_years(spec, root, bucket)
+    seasons = [s for s in (load_partition(spec, y, root, bucket) for y in years) if s is not None]
+    if not seasons:
+        return pd.DataFrame()
+    return sort_history(pd.concat(seasons, ignore_index=True))
+
+
+def replace_season(history: Optional[pd.DataFrame], season: pd.DataFrame, year: int) -> pd.DataFrame:
+    """A published history frame with one season's rows swapped for `season`."""
+    if history is None or history.empty:
+        return sort_history(season)
+    history = history[pd.to_numeric(history["year"], errors="coerce") != year]
+    return sort_history(pd.concat([history, season[[c for c in history.columns if c in season.columns]]], ignore_index=True))
+
+
+def sort_history(df: pd.DataFrame) -> pd.DataFrame:
+    df = df.astype({"year": int, "gtm": int})
+    return df.sort_values(["year", "gtm"], ascending=[False, True]).reset_index(drop=True)
@@ -0,0 +1,139 @@
+"""
+Minimal JSON Patch (RFC 6902) for the statsapi live feed's diffPatch endpoint.
+
+Patches are applied in place to a parsed JSON document (dicts and lists).
+Supported ops: add, remove, replace, move, copy, test; paths are JSON Pointers
+(RFC 6901), with "-" for appending to an array.
+"""
+
+import copy
+from typing import Any, Dict, Iterable, List, Tuple
+
+
+class PatchError(ValueError):
+    """A patch operation could not be applied (bad path, failed test, unknown op)."""
+
+
+def parse_pointer(pointer: str) -> List[str]:
+    if pointer == "":
+        return []
+    if not pointer.startswith("/"):
+        raise PatchError(f"Invalid JSON pointer: {pointer!r}")
+    return [token.replace("~1", "/").replace("~0", "~") for token in pointer[1:].split("/")]
+
+
+def _index(container: list, token: str, allow_end: bool = False) -> int:
+    if token == "-" and allow_end:
+        return len(container)
+    if not token.isdigit() or (len(token) > 1 and token.startswith("0")):
+        raise PatchError(f"Invalid array index: {token!r}")
+    index = int(token)
+    if index > len(container) or (index == len(container) and not allow_end):
+        raise PatchError(f"Array index out of range: {index}")
+    return index
+
+
+def _child(container: Any, token: str) -> Any:
+    if isinstance(container, dict):
+        if token not in container:
+            raise PatchError(f"Missing key: {token!r}")
+        return container[token]
+    if isinstance(container, list):
+        return container[_index(container, token)]
+    raise PatchError(f"Cannot descend into {type(container).__name__} with {token!r}")
+
+
+def _parent(doc: Any, pointer: str) -> Tuple[Any, str]:
+    tokens = parse_pointer(pointer)
+    if not tokens:
+        raise PatchError("The document root has no parent")
+    target = doc
+    for token in tokens[:-1]:
+        target = _child(target, token)
+    return target, tokens[-1]
+
+
+def get(doc: Any, pointer: str) -> Any:
+    target = doc
+    for token in parse_pointer(pointer):
+        target = _child(target, token)
+    return target
+
+
+def _add(doc: Any, pointer: str, value: Any) -> Any:
+    if pointer == "":
+        return value
+    parent, token = _parent(doc, pointer)
+    if isinstance(parent, dict):
+        parent[token] = value
+    elif isinstance(parent, list):
+        parent.insert(_index(parent, token, allow_end=True), value)
+    else:
+        raise PatchError(f"Cannot add to {type(parent).__name__} at {pointer!r}")
+    return doc
+
+
+def _remove(doc: Any, pointer: str) -> Any:
+    parent, token = _parent(doc, pointer)
+    if isinstance(parent, dict):
+        if token not in parent:
+            raise PatchError(f"Missing key: {token!r}")
+        return parent.pop(token)
+    if isinstance(parent, list):
+        return parent.pop(_index(parent, token))
+    raise PatchError(f"Cannot remove from {type(parent).__name__} at {pointer!r}")
+
+
+def _replace(doc: Any, pointer: str, value: Any) -> Any:
+    if pointer == "":
+        return value
+    parent, token = _parent(doc, pointer)
+    if isinstance(parent, dict):
+        if token not in parent:
+            raise PatchError(f"Missing key: {token!r}")
+        parent[token] = value
+    elif isinstance(parent, list):
+        parent[_index(parent, token)] = value
+    else:
+        raise PatchError(f"Cannot replace in {type(parent).__name__} at {pointer!r}")
+    return doc
+
+
+def apply_operation(doc: Any, operation: Dict) -> Any:
+    """Apply one operation; returns the document (a new object only when the root is replaced)."""
+    op, path = operation.get("op"), operation.get("path")
+    if path is None:
+        raise PatchError(f"Operation without a path: {operation}")
+    if op == "add":
+        return _add(doc, path, operation["value"])
+    if op == "remove":
+        _remove(doc, path)
+        return doc
+    if op == "replace":
+        return _replace(doc, path, operation["value"])
+    if op == "move":
+        source = operation["from"]
+        if path.startswith(source + "/"):
+            raise PatchError(f"Cannot move {source!r} into its own child {path!r}")
+        return _add(doc, path, _remove(doc, source))
+    if op == "copy":
+        return _add(doc, path, copy.deepcopy(get(doc, operation["from"])))
+    if op == "test":
+        if get(doc, path) != operation.get("value"):
+            raise PatchError(f"Test failed at {path!r}")
+        return doc
+    raise PatchError(f"Unknown op: {op!r}")
+
+
+def apply_patch(doc: Any, operations: Iterable[Dict]) -> Any:
+    """Apply a list of operations in order; returns the patched document.
+
+    The document is modified in place, so on a PatchError it may be partly
+    patched and should be refetched.
+    """
+    for operation in operations:
+        try:
+            doc = apply_operation(doc, operation)
+        except (KeyError, TypeError) as e:
+            raise PatchError(f"Malformed operation {operation}: {e}") from e
+    return doc
@@ -0,0 +1,325 @@
+"""
+League-wide fan-out: build per-team outputs for every club from shared fetches.
+
+The single-team scripts download league-wide payloads (standings, bdfed team
+leaderboards, schedules, attendance) and keep one team's slice. Running them once
+per club would repeat every request 30 times. Here each shared source is fetched
+once per run, partitioned in memory by team id, and the per-team stage only
+formats and writes its slice, so upstream cost stays flat as teams are added.
+
+Shared sources are fetched concurrently, then the per-team stages run on a worker
+pool. Outputs go to data/teams/{abbr}/ (and S3 under redsox/data/teams/{abbr}/
+when an upload function is given). Used by scripts/31_fanout_teams.py.
+"""
+
+import json
+import logging
+import os
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+from io import StringIO
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+import pandas as pd
+import pytz
+import requests
+
+from scripts import teams
+from scripts.teams import Team
+
+HEADERS = {
+    'sec-ch-ua-platform': '"macOS"',
+    'Referer': 'https://www.mlb.com/',
+    'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/136.0.0.0 Safari/537.36',
+    'sec-ch-ua': '"Chromium";v="136", "Google Chrome";v="136", "Not.A/Brand";v="99"',
+    'sec-ch-ua-mobile': '?0',
+}
+STANDINGS_URL = "https://statsapi.mlb.com/api/v1/standings"
+SCHEDULE_URL = "https://statsapi.mlb.com/api/v1/schedule"
+LEADERBOARD_URL = "https://bdfed.stitch.mlbinfra.com/bdfed/stats/team"
+ATTENDANCE_URL = "https://www.baseball-reference.com/leagues/{league}/{season}-misc.shtml"
+
+# Same stats as 03's single-team ranks
+HITTING_STATS = ['runs', 'stolenBases', 'homeRuns', 'battingAverage', 'onBasePlusSlugging', 'sluggingPercentage', 'onBasePercentage']
+PITCHING_STATS = ['strikeouts', 'walks', 'earnedRunAverage', 'walksAndHitsPerInningPitched']
+ASCENDING_STATS = {'earnedRunAverage'}
+NOT_PLAYED_STATES = {"Postponed", "Cancelled"}
+SCHEDULE_WINDOW = 10
+
+OUT_ROOT = os.path.join("data", "teams")
+S3_PREFIX = "redsox/data/teams"
+DEFAULT_WORKERS = 8
+
+
+class SharedSource(NamedTuple):
+    name: str
+    # season -> raw payload (one fetch for the whole league)
+    fetch: Callable[[int], Any]
+    # raw payload -> {team_id: that team's slice}
+    partition: Callable[[Any], Dict[int, Any]]
+
+
+def _get_json(url: str, params: Optional[Dict] = None, timeout: int = 30) -> Dict:
+    response = requests.get(url, params=params, headers=HEADERS, timeout=timeout)
+    response.raise_for_status()
+    return response.json()
+
+
+# --- Standings (statsapi, all 30 teams) ---
+def format_games_back(gb_value):
+    """Formats games back to be an int if a whole number, otherwise a float."""
+    try:
+        gb_float = float(gb_value)
+        if gb_float.is_integer():
+            return int(gb_float)
+        return gb_float
+    except (ValueError, TypeError):
+        # Return original value if conversion fails (e.g., '-')
+        return gb_value
+
+
+def parse_standings(payload: Dict) -> List[Dict[str, Any]]:
+    """Flat standings metrics per team from a statsapi standings payload (the rows 00 publishes)."""
+    rows = []
+    for record_group in payload.get("records", []):
+        for team_record in record_group.get("teamRecords", []):
+            team = team_record.get("team", {})
+            rows.append({
+                "team_id": team.get("id"),
+                "team_name": team.get("name"),
+                "wins": team_record.get("wins"),
+                "losses": team_record.get("losses"),
+                "winning_percentage": team_record.get("winningPercentage"),
+                "division_rank": team_record.get("divisionRank"),
+                "league_rank": team_record.get("leagueRank"),
+                "sport_rank": team_record.get("sportRank"),
+                "games_back": format_games_back(team_record.get("gamesBack", "-")),
+                "division_games_back": format_games_back(team_record.get("divisionGamesBack", "-")),
+                "league_games_back": format_games_back(team_record.get("leagueGamesBack", "-")),
+                "streak_type": team_record.get("streak", {}).get("streakType"),
+                "streak_number": team_record.get("streak", {}).get("streakNumber"),
+                "magic_number": team_record.get("magicNumber"),
+                "elimination_number": team_record.get("eliminationNumber"),
+                "division_name": team.get("division", {}).get("name"),
+                "league_name": team.get("league", {}).get("name"),
+                "games_played": team_record.get("gamesPlayed"),
+                "runs_scored": team_record.get("runsScored"),
+                "runs_against": team_record.get("runsAllowed"),
+                "run_differential": team_record.get("runDifferential"),
+            })
+    return rows
+
+
+def fetch_standings(season: int) -> Dict:
+    return _get_json(STANDINGS_URL, params={"leagueId": "103,104", "season": season,
+                                            "standingsTypes": "regularSeason",
+                                            "hydrate": "team(division,league)"})
+
+
+def partition_standings(payload: Dict) -> Dict[int, Dict]:
+    """{team_id: {"team": its row, "division": its division's rows by rank}}."""
+    rows = parse_standings(payload)
+    divisions = defaultdict(list)
+    for row in rows:
+        divisions[row["division_name"]].append(row)
+    for division in divisions.values():
+        division.sort(key=lambda r: int(r["division_rank"]) if str(r.get("division_rank") or "").isdigit() else 99)
+    return {row["team_id"]: {"team": row, "division": divisions[row["division_name"]]} for row in rows}
+
+
+# --- League ranks (bdfed team leaderboards, one request per stat) ---
+def fetch_leaderboards(season: int) -> Dict[str, List[Dict]]:
+    """{'{group}_{stat}': the 30-team leaderboard} for every ranked stat."""
+    boards = {}
+    for group, stats in (("hitting", HITTING_STATS), ("pitching", PITCHING_STATS)):
+        for stat in stats:
+            params = {"env": "prod", "sportId": 1, "gameType": "R", "group": group,
+                      "order": "asc" if stat in ASCENDING_STATS else "desc", "sortStat": stat,
+                      "stats": "season", "season": season, "limit": 30, "offset": 0}
+            try:
+                boards[f"{group}_{stat}"] = _get_json(LEADERBOARD_URL, params=params).get("stats", [])
+            except (requests.exceptions.RequestException, ValueError) as e:
+                logging.error(f"Request failed for {stat} ({group}): {e}")
+    return boards
+
+
+def partition_leaderboards(boards: Dict[str, List[Dict]]) -> Dict[int, Dict[str, Any]]:
+    """{team_id: {'{group}_{stat}': rank}}; stats a team is missing from read 'Not found', as in 03."""
+    ranks: Dict[int, Dict[str, Any]] = {t.team_id: {} for t in teams.TEAMS}
+    for key, rows in boards.items():
+        for row in rows:
+            team = teams.BY_ID.get(row.get("teamId")) or teams.BY_FULL_NAME.get(row.get("teamName"))
+            if team is not None:
+                ranks[team.team_id][key] = row.get("rank")
+    for team_ranks in ranks.values():
+        for key in boards:
+            team_ranks.setdefault(key, 'Not found')
+    return ranks
+
+
+# --- Schedule (statsapi, whole regular season) ---
+def fetch_schedule(season: int) -> Dict:
+    return _get_json(SCHEDULE_URL, params={"sportId": 1, "season": season, "gameType": "R"})
+
+
+def partition_schedule(payload: Dict) -> Dict[int, List[Dict]]:
+    """{team_id: its games in date order}, each from that team's side of the game."""
+    games: Dict[int, List[Dict]] = defaultdict(list)
+    for day in payload.get("dates", []):
+        for game in day.get("games", []):
+            status = game.get("status", {})
+            if status.get("detailedState") in NOT_PLAYED_STATES:
+                continue
+            sides = game.get("teams", {})
+            for side, other in (("home", "away"), ("away", "home")):
+                us, them = sides.get(side, {}), sides.get(other, {})
+                team_id = us.get("team", {}).get("id")
+                if team_id not in teams.BY_ID:
+                    continue
+                final = status.get("abstractGameState") == "Final" and "isWinner" in us
+                games[team_id].append({
+                    "game_pk": game.get("gamePk"),
+                    "date": game.get("officialDate") or day.get("date"),
+                    "game_date": game.get("gameDate"),
+                    "opp_name": them.get("team", {}).get("name"),
+                    "home_away": side,
+                    "result": ("win" if us.get("isWinner") else "loss") if final else "--",
+                    "score": f"{us.get('score')}-{them.get('score')}" if final else None,
+                })
+    return dict(games)
+
+
+def local_start_time(game_date: Optional[str], timezone: str) -> str:
+    """'2025-06-01T23:10:00Z' -> '7:10 PM' in the team's time zone."""
+    try:
+        start = datetime.strptime(game_date, "%Y-%m-%dT%H:%M:%SZ").replace(tzinfo=pytz.utc)
+        return start.astimezone(pytz.timezone(timezone)).strftime('%-I:%M %p')
+    except (TypeError, ValueError):
+        return '--'
+
+
+def schedule_window(games: List[Dict], team: Team, window: int = SCHEDULE_WINDOW) -> List[Dict]:
+    """The last and next `window` games in 13's format (score for results, local start time otherwise)."""
+    played = [g for g in games if g["result"] != "--"]
+    upcoming = [g for g in games if g["result"] == "--"]
+    rows = []
+    for placement, subset in (("last", played[-window:]), ("next", upcoming[:window])):
+        for g in subset:
+            rows.append({
+                "date": datetime.strptime(g["date"], "%Y-%m-%d").strftime('%b %-d'),
+                "opp_name": g["opp_name"],
+                "home_away": g["home_away"],
+                "result": g["result"],
+                "placement": placement,
+                "game_start": g["score"] if placement == "last" else local_start_time(g["game_date"], team.timezone),
+            })
+    return rows
+
+
+# --- Attendance (Baseball Reference league misc pages) ---
+def fetch_attendance(season: int) -> List[Dict]:
+    rows = []
+    for league in ("AL", "NL"):
+        response = requests.get(ATTENDANCE_URL.format(league=league, season=season), timeout=30)
+        response.raise_for_status()
+        table = pd.read_html(StringIO(response.text))[0][['Tm', 'Attendance', 'Attend/G']]
+        rows.extend(table.assign(league=league).to_dict(orient="records"))
+    return rows
+
+
+def partition_attendance(rows: List[Dict]) -> Dict[int, Dict]:
+    """{team_id: {attendance, attend_game, league, attendance_rank}} (rank by average per game)."""
+    parsed = []
+    for row in rows:
+        team = teams.BY_FULL_NAME.get(str(row.get('Tm')))
+        attend_game = pd.to_numeric(str(row.get('Attend/G')).replace(',', ''), errors='coerce')
+        if team is None or pd.isna(attend_game):
+            continue
+        attendance = pd.to_numeric(str(row.get('Attendance')).replace(',', ''), errors='coerce')
+        parsed.append((team, int(attendance) if not pd.isna(attendance) else None, int(attend_game), row.get('league')))
+    parsed.sort(key=lambda p: p[2], reverse=True)
+    return {
+        team.team_id: {"team": team.full_name, "attendance": attendance, "attend_game": attend_game,
+                       "league": league, "attendance_rank": rank}
+        for rank, (team, attendance, attend_game, league) in enumerate(parsed, start=1)
+    }
+
+
+SOURCES: List[SharedSource] = [
+    SharedSource("standings", fetch_standings, partition_standings),
+    SharedSource("league_ranks", fetch_leaderboards, partition_leaderboards),
+    SharedSource("schedule", fetch_schedule, partition_schedule),
+    SharedSource("attendance", fetch_attendance, partition_attendance),
+]
+
+
+# --- Fan-out ---
+def fetch_shared(season: int, sources: List[SharedSource] = SOURCES,
+                 workers: int = DEFAULT_WORKERS) -> Dict[str, Dict[int, Any]]:
+    """Fetch every shared source once (concurrently) and partition it; failed sources are left out."""
+    def run(source: SharedSource):
+        try:
+            partitions = source.partition(source.fetch(season))
+            logging.info(f"Fetched {source.name}: {len(partitions)} team(s)")
+            return source.name, partitions
+        except Exception as e:
+            logging.error(f"Shared source {source.name} failed: {e}")
+            return source.name, None
+
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(sources)))) as pool:
+        results = list(pool.map(run, sources))
+    return {name: partitions for name, partitions in results if partitions is not None}
+
+
+def team_outputs(team: Team, shared: Dict[str, Dict[int, Any]], season: int) -> Dict[str, Any]:
+    """{filename: payload} for one team from the partitioned shared sources."""
+    outputs = {}
+    if team.team_id in shared.get("standings", {}):
+        outputs[f"standings_{season}.json"] = shared["standings"][team.team_id]
+    if team.team_id in shared.get("league_ranks", {}):
+        outputs[f"league_ranks_{season}.json"] = shared["league_ranks"][team.team_id]
+    if team.team_id in shared.get("schedule", {}):
+        outputs["schedule.json"] = schedule_window(shared["schedule"][team.team_id], team)
+    if team.team_id in shared.get("attendance", {}):
+        outputs[f"attendance_{season}.json"] = shared["attendance"][team.team_id]
+    return outputs
+
+
+def write_team(team: Team, outputs: Dict[str, Any], out_root: str = OUT_ROOT,
+               upload: Optional[Callable[[str, str], None]] = None) -> List[str]:
+    """Write one team's outputs under out_root/{abbr}/ (and upload them); returns the local paths."""
+    team_dir = os.path.join(out_root, team.abbr)
+    os.makedirs(team_dir, exist_ok=True)
+    paths = []
+    for filename, payload in outputs.items():
+        path = os.path.join(team_dir, filename)
+        with open(path, "w") as f:
+            json.dump(payload, f, indent=4)
+        paths.append(path)
+        if upload is not None:
+            try:
+                upload(path, f"{S3_PREFIX}/{team.abbr}/{filename}")
+            except Exception as e:
+                logging.error(f"Failed to upload {path}: {e}")
+    return paths
+
+
+def run(selected: Optional[List[Team]] = None, season: Optional[int] = None, workers: int = DEFAULT_WORKERS,
+        out_root: str = OUT_ROOT, upload: Optional[Callable[[str, str], None]] = None,
+        sources: List[SharedSource] = SOURCES) -> Dict[str, List[str]]:
+    """Fetch the shared sources once, then write every selected team's outputs on a worker pool."""
+    selected = selected or list(teams.TEAMS)
+    season = season or date.today().year
+    shared = fetch_shared(season, sources, workers)
+    if not shared:
+        logging.error("No shared source could be fetched; nothing to write.")
+        return {}
+
+    def stage(team: Team):
+        return team.abbr, write_team(team, team_outputs(team, shared, season), out_root, upload)
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        written = dict(pool.map(stage, selected))
+    logging.info(f"Wrote {sum(len(p) for p in written.values())} file(s) for {len(written)} team(s)")
+    return written
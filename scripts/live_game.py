@@ -0,0 +1,340 @@
+"""
+Live in-game pitch ingestion from statsapi diff patches.
+
+20 and 21 only see a game after it is final. This follows the team's
+in-progress game instead: the statsapi live feed is downloaded once, then kept
+current with
+
+    https://statsapi.mlb.com/api/v1.1/game/{game_pk}/feed/live/diffPatch?startTimecode=...
+
+which returns only the JSON patches since the document's timecode (a few KB per
+poll instead of the multi-MB feed), applied with scripts/json_patch.py. When the
+endpoint answers with a full feed instead, or a patch doesn't apply, the
+document is replaced.
+
+A pitch is taken once its at-bat is complete (so the at-bat result is known) and
+appended, in 20's row format, to
+
+    data/pitches/live/{game_pk}.ndjson
+
+Umpire accuracy for the game is rolled up incrementally from the new rows only
+(umpire_rollups.merge_game) and written to data/summary/umpire_live.json (and
+S3). A restarted follower resumes from the NDJSON file. Once the game is final,
+the feed is stored in the gamefeed cache so 21 doesn't download it again.
+
+    python -m scripts.live_game [--game-pk 746123] [--interval 10] [--local-only]
+"""
+
+import argparse
+import json
+import logging
+import os
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, Iterable, List, Optional
+
+import boto3
+import pandas as pd
+import requests
+
+from scripts import config
+from scripts import game_pitches
+from scripts import gamefeed_cache
+from scripts import json_patch
+from scripts import umpire_rollups
+from scripts import writers
+
+SCHEDULE_URL = "https://statsapi.mlb.com/api/v1/schedule"
+LIVE_FEED_URL = gamefeed_cache.SOURCE_URLS["statsapi"]
+DIFF_PATCH_URL = LIVE_FEED_URL + "/diffPatch"
+POLL_SECONDS = 10
+PREGAME_POLL_SECONDS = 300
+OUT_DIR = os.path.join("data", "pitches", "live")
+SUMMARY_PATH = os.path.join("data", "summary", "umpire_live.json")
+S3_BUCKET = "redsox-data"
+S3_KEY = "redsox/data/summary/umpire_live.json"
+
+# pitch rows' team_role -> umpire_rollups role
+ROLLUP_ROLES = {"thrown_to_redsox": "batting", "thrown_by_redsox": "pitching"}
+
+
+def find_game(team_id: int = config.TEAM_ID, date: Optional[str] = None) -> Optional[Dict]:
+    """Today's (or date's) first game for the team that isn't final: {gamePk, team_side, game_date}."""
+    params = {"sportId": 1, "teamId": team_id, "date": date or datetime.now().strftime("%Y-%m-%d")}
+    response = requests.get(SCHEDULE_URL, params=params, timeout=30)
+    response.raise_for_status()
+    for day in response.json().get("dates", []):
+        for g in day.get("games", []):
+            if g.get("status", {}).get("abstractGameState") == "Final":
+                continue
+            is_home = g.get("teams", {}).get("home", {}).get("team", {}).get("id") == team_id
+            return {
+                "gamePk": g.get("gamePk"),
+                "team_side": "home_batters" if is_home else "away_batters",
+                "game_date": g.get("officialDate") or day.get("date"),
+            }
+    return None
+
+
+def completed_plays(doc: Dict) -> List[Dict]:
+    return [play for play in doc.get("liveData", {}).get("plays", {}).get("allPlays", [])
+            if play.get("about", {}).get("isComplete")]
+
+
+def as_gamefeed(plays: Iterable[Dict]) -> Dict:
+    """Plays in the Savant gf layout: {"home_batters"|"away_batters": {batter_id: [pitch, ...]}}."""
+    data: Dict[str, Dict] = {side: {} for side in game_pitches.BATTING_SIDES}
+    for play in plays:
+        side = "away_batters" if play.get("about", {}).get("halfInning") == "top" else "home_batters"
+        batter = str(play.get("matchup", {}).get("batter", {}).get("id"))
+        data[side].setdefault(batter, []).extend(game_pitches.at_bat_pitches(play))
+    return data
+
+
+class LiveFeed:
+    """One game's statsapi live feed document, kept current with diff patches."""
+
+    def __init__(self, game_pk: int, fetch: Optional[Callable[[str, Optional[Dict]], object]] = None):
+        self.game_pk = int(game_pk)
+        self.doc: Optional[Dict] = None
+        self.bytes_received = 0
+        self._fetch = fetch or self._get
+        self._session = requests.Session()
+
+    def _get(self, url: str, params: Optional[Dict] = None):
+        response = self._session.get(url, params=params, timeout=30)
+        response.raise_for_status()
+        self.bytes_received += len(response.content)
+        return response.json()
+
+    @property
+    def timecode(self) -> Optional[str]:
+        return (self.doc or {}).get("metaData", {}).get("timeStamp")
+
+    @property
+    def state(self) -> Optional[str]:
+        return (self.doc or {}).get("gameData", {}).get("status", {}).get("abstractGameState")
+
+    def refetch(self) -> Dict:
+        self.doc = self._fetch(LIVE_FEED_URL.format(game_pk=self.game_pk), None)
+        return self.doc
+
+    def sync(self) -> Dict:
+        """Bring the document up to date; the full feed is only downloaded when patching isn't possible."""
+        if self.doc is None or not self.timecode:
+            return self.refetch()
+        response = self._fetch(DIFF_PATCH_URL.format(game_pk=self.game_pk), {"startTimecode": self.timecode})
+        if isinstance(response, dict):
+            # Too far behind to diff: the endpoint sends the whole feed
+            self.doc = response
+            return self.doc
+        try:
+            for patch in response or []:
+                self.doc = json_patch.apply_patch(self.doc, patch.get("diff", []))
+        except json_patch.PatchError as e:
+            logging.warning(f"Patch did not apply ({e}); downloading the full feed")
+            return self.refetch()
+        return self.doc
+
+
+class LiveGameFollower:
+    """Appends newly completed pitches of one game and keeps its umpire rollup current."""
+
+    def __init__(self, game_info: Dict, out_dir: str = OUT_DIR, summary_path: str = SUMMARY_PATH,
+                 fetch: Optional[Callable[[str, Optional[Dict]], object]] = None):
+        self.game_info = game_info
+        self.game_pk = int(game_info["gamePk"])
+        self.feed = LiveFeed(self.game_pk, fetch)
+        self.pitches_path = os.path.join(out_dir, f"{self.game_pk}.ndjson")
+        self.summary_path = summary_path
+        self.game: Dict = {"game_date": game_info.get("game_date")}
+        self.done_at_bats = set()
+        self._resume()
+
+    def _resume(self) -> None:
+        """Pick up the rows and rollup of an earlier run on the same game.
+
+        A run killed mid-write leaves an unterminated (or unparsable) last line. It is
+        cut off together with the rows of the at-bat before it, which may be partial as
+        well; those at-bats are written again by the next step.
+        """
+        if not os.path.exists(self.pitches_path):
+            return
+        with open(self.pitches_path, "rb") as f:
+            lines = f.readlines()
+        rows, starts, offset, partial = [], [], 0, False
+        for n, line in enumerate(lines, start=1):
+            if line.strip():
+                try:
+                    row = json.loads(line) if line.endswith(b"\n") else None
+                except ValueError:
+                    if n < len(lines):
+                        raise
+                    row = None
+                if row is None:
+                    partial = True
+                    break
+                rows.append(row)
+                starts.append(offset)
+            offset += len(line)
+        if partial:
+            ab_number = rows[-1]["ab_number"] if rows else None
+            while rows and rows[-1]["ab_number"] == ab_number:
+                rows.pop()
+                offset = starts.pop()
+            with open(self.pitches_path, "r+b") as f:
+                f.truncate(offset)
+            logging.warning(f"Game {self.game_pk}: dropped a partially written at-bat from {self.pitches_path}")
+        if rows:
+            self.done_at_bats = {row["ab_number"] for row in rows}
+            self._roll_up(rows)
+            logging.info(f"Resumed game {self.game_pk}: {len(rows)} pitches in {len(self.done_at_bats)} at-bats")
+
+    def _roll_up(self, rows: List[Dict]) -> None:
+        df = pd.DataFrame(rows)
+        for team_role, role in ROLLUP_ROLES.items():
+            role_rows = df[df["team_role"] == team_role]
+            if role_rows.empty:
+                continue
+            for entry in umpire_rollups.rollup_games(role_rows.copy(), role).values():
+                self.game["game_date"] = entry.pop("game_date")
+                self.game[role] = umpire_rollups.merge_game(self.game.get(role), entry)
+
+    def new_rows(self) -> Dict[int, List[Dict]]:
+        """Pitch rows (both teams' pitchers) of the at-bats completed but not written yet, by at-bat number."""
+        plays = [play for play in completed_plays(self.feed.doc or {})
+                 if play["about"].get("atBatIndex", 0) + 1 not in self.done_at_bats]
+        if not plays:
+            return {}
+        data = as_gamefeed(plays)
+        side = self.game_info["team_side"]
+        game_date = self.game_info.get("game_date")
+        rows = game_pitches.pitch_rows(data, side, self.game_pk, game_date, "thrown_to_redsox")
+        rows += game_pitches.pitch_rows(data, game_pitches.other_side(side), self.game_pk, game_date,
+                                        "thrown_by_redsox")
+        # At-bats without pitch rows are listed too, so they are marked done
+        by_at_bat: Dict[int, List[Dict]] = {play["about"].get("atBatIndex", 0) + 1: [] for play in plays}
+        for row in rows:
+            by_at_bat.setdefault(row["ab_number"], []).append(row)
+        return by_at_bat
+
+    def step(self) -> List[Dict]:
+        """Sync the feed, append the new pitches and update the rollup; returns the new rows."""
+        self.feed.sync()
+        rows = []
+        # One write per at-bat, and an at-bat is done only once its lines are out
+        for ab_number, ab_rows in sorted(self.new_rows().items()):
+            if ab_rows:
+                writers.append_ndjson(ab_rows, self.pitches_path)
+            self.done_at_bats.add(ab_number)
+            rows += ab_rows
+        if rows:
+            self._roll_up(rows)
+        if not self.game.get("home_plate_umpire"):
+            self.game["home_plate_umpire"] = game_pitches.home_plate_umpire(self.feed.doc or {})
+        return rows
+
+    def summary(self) -> Dict:
+        store = {"games": {str(self.game_pk): self.game}}
+        linescore = (self.feed.doc or {}).get("liveData", {}).get("linescore", {})
+        batting = umpire_rollups.season_view(store, "batting")
+        pitching = umpire_rollups.season_view(store, "pitching")
+        return {
+            "game_pk": self.game_pk,
+            "date": self.game.get("game_date"),
+            "state": (self.feed.doc or {}).get("gameData", {}).get("status", {}).get("detailedState"),
+            "inning": " ".join(str(v) for v in (linescore.get("inningState"), linescore.get("currentInning")) if v),
+            "updated_at": datetime.now(timezone.utc).isoformat(),
+            "home_plate_umpire": (self.game.get("home_plate_umpire") or {}).get("name"),
+            "live_summary": {
+                "correct_strikes_pct": batting["correct_pct"],
+                "incorrect_strikes_pct": batting["incorrect_pct"],
+                "total_called_strikes": batting["total"],
+                "bad_calls_count": batting["bad"],
+            },
+            "pitching_live_summary": {
+                "correct_balls_pct": pitching["correct_pct"],
+                "incorrect_balls_pct": pitching["incorrect_pct"],
+                "total_called_balls": pitching["total"],
+                "bad_calls_count": pitching["bad"],
+            },
+            "worst_calls": umpire_rollups.worst_calls(store, "batting"),
+            "pitching_worst_calls": umpire_rollups.worst_calls(store, "pitching"),
+        }
+
+    def write_summary(self, s3_client=None) -> str:
+        writers.write_json(self.summary(), self.summary_path)
+        if s3_client is not None:
+            try:
+                with open(self.summary_path, "rb") as f:
+                    s3_client.put_object(Bucket=S3_BUCKET, Key=S3_KEY, Body=f.read(),
+                                         ContentType="application/json", CacheControl="no-cache")
+            except Exception as e:
+                logging.error(f"Failed to upload {S3_KEY}: {e}")
+        return self.summary_path
+
+    def run(self, interval: float = POLL_SECONDS, s3_client=None) -> None:
+        """Follow the game until it is final."""
+        while True:
+            try:
+                rows = self.step()
+            except (requests.exceptions.RequestException, ValueError) as e:
+                logging.warning(f"Poll failed: {e}")
+                time.sleep(interval)
+                continue
+            if rows:
+                self.write_summary(s3_client)
+                logging.info(f"{len(rows)} new pitch(es); {self.feed.bytes_received / 1024:.0f} KiB received so far")
+            if self.feed.state == "Final":
+                gamefeed_cache.put("statsapi", self.game_pk, self.feed.doc)
+                self.write_summary(s3_client)
+                logging.info(f"Game {self.game_pk} is final")
+                return
+            time.sleep(PREGAME_POLL_SECONDS if self.feed.state == "Preview" else interval)
+
+
+def get_s3_client():
+    if os.getenv('GITHUB_ACTIONS') == 'true':
+        session = boto3.Session(
+            aws_access_key_id=os.environ.get("AWS_ACCESS_KEY_ID"),
+            aws_secret_access_key=os.environ.get("AWS_SECRET_ACCESS_KEY"),
+            region_name="us-west-1"
+        )
+    else:
+        profile_name = os.environ.get("AWS_PERSONAL_PROFILE", "haekeo")
+        session = boto3.Session(profile_name=profile_name, region_name="us-west-1")
+    return session.client("s3")
+
+
+def main():
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(description=f"Follow the {config.TEAM_NAME} game in progress")
+    parser.add_argument("--game-pk", type=int, help="Game to follow (default: today's game)")
+    parser.add_argument("--interval", type=float, default=POLL_SECONDS, help="Seconds between polls")
+    parser.add_argument("--local-only", action="store_true", help="Don't upload the live summary to S3")
+    args = parser.parse_args()
+
+    feed = None
+    if args.game_pk:
+        feed = LiveFeed(args.game_pk)
+        game_data = feed.refetch().get("gameData", {})
+        is_home = game_data.get("teams", {}).get("home", {}).get("id") == config.TEAM_ID
+        game = {
+            "gamePk": args.game_pk,
+            "team_side": "home_batters" if is_home else "away_batters",
+            "game_date": game_data.get("datetime", {}).get("officialDate"),
+        }
+    else:
+        game = find_game()
+    if game is None:
+        logging.info(f"No {config.TEAM_NAME} game left to follow today.")
+        return
+
+    follower = LiveGameFollower(game)
+    if feed is not None:
+        follower.feed = feed
+    follower.run(args.interval, None if args.local_only else get_s3_client())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,241 @@
+"""
+Resumable multi-season pitch backfill.
+
+20 only covers the current season. This enumerates the team's regular-season
+games for a range of seasons (one statsapi schedule request per season), fetches
+each Savant gamefeed through the shared cache with a bounded worker pool, and
+writes one parquet partition per game:
+
+    data/pitches/games/{season}/{game_pk}.parquet
+
+with the pitches thrown to and by the team (team_role column), in 20's row format.
+
+Progress is kept in a SQLite journal next to the partitions. A game is marked
+done only after its partition has been written, and the journal is committed
+per game, so a killed run picks up exactly the games that weren't finished.
+Failed games are retried on the next run.
+
+The fetched feeds stay in the shared data/gamefeeds cache, so after a backfill
+it holds thousands of past-season games: stages must list their games from the
+schedule, never from the cache's contents.
+
+    python -m scripts.pitch_backfill --start-year 2015 --end-year 2024 --workers 8
+"""
+
+import argparse
+import logging
+import os
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
+from typing import Callable, Dict, Iterable, List, Optional
+
+import pandas as pd
+import requests
+
+from scripts import config
+from scripts import game_pitches
+from scripts import gamefeed_cache
+
+# Savant pitch tracking (Statcast) starts in 2015
+MIN_SEASON = 2015
+SCHEDULE_URL = "https://statsapi.mlb.com/api/v1/schedule"
+OUT_DIR = os.path.join("data", "pitches", "games")
+JOURNAL_PATH = os.path.join(OUT_DIR, "backfill_journal.sqlite")
+DEFAULT_WORKERS = 8
+NOT_PLAYED_STATES = {"Postponed", "Cancelled"}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    game_pk INTEGER PRIMARY KEY,
+    season INTEGER NOT NULL,
+    game_date TEXT,
+    team_side TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    pitches INTEGER,
+    error TEXT,
+    updated_at TEXT
+);
+CREATE INDEX IF NOT EXISTS games_season_status ON games (season, status);
+"""
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+class BackfillJournal:
+    """Per-game progress: pending -> done | failed."""
+
+    def __init__(self, path: str = JOURNAL_PATH):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def add_games(self, season: int, games: Iterable[Dict]) -> int:
+        """Register games (already known ones keep their status); returns how many were new."""
+        before = self.conn.total_changes
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO games (game_pk, season, game_date, team_side) VALUES (?, ?, ?, ?)",
+                [(g["gamePk"], season, g.get("game_date"), g["team_side"]) for g in games],
+            )
+        return self.conn.total_changes - before
+
+    def pending(self, seasons: Iterable[int]) -> List[Dict]:
+        """Games in these seasons not done yet (pending or failed), oldest first."""
+        seasons = list(seasons)
+        if not seasons:
+            return []
+        placeholders = ",".join("?" * len(seasons))
+        cursor = self.conn.execute(
+            f"SELECT game_pk, season, game_date, team_side FROM games "
+            f"WHERE season IN ({placeholders}) AND status != 'done' ORDER BY game_date, game_pk",
+            seasons,
+        )
+        return [{"gamePk": pk, "season": season, "game_date": d, "team_side": side} for pk, season, d, side in cursor]
+
+    def mark_done(self, game_pk: int, pitches: int) -> None:
+        with self.conn:
+            self.conn.execute("UPDATE games SET status = 'done', pitches = ?, error = NULL, updated_at = ? "
+                              "WHERE game_pk = ?", (pitches, _now(), game_pk))
+
+    def mark_failed(self, game_pk: int, error: str) -> None:
+        with self.conn:
+            self.conn.execute("UPDATE games SET status = 'failed', error = ?, updated_at = ? WHERE game_pk = ?",
+                              (error[:500], _now(), game_pk))
+
+    def summary(self) -> Dict[int, Dict[str, int]]:
+        """{season: {status: count}}."""
+        out: Dict[int, Dict[str, int]] = {}
+        for season, status, count in self.conn.execute(
+                "SELECT season, status, COUNT(*) FROM games GROUP BY season, status ORDER BY season"):
+            out.setdefault(season, {})[status] = count
+        return out
+
+
+def season_games(season: int, team_id: int = config.TEAM_ID) -> List[Dict]:
+    """The team's completed regular-season games: [{gamePk, team_side, game_date}]."""
+    params = {"sportId": 1, "teamId": team_id, "season": season, "gameType": "R"}
+    response = requests.get(SCHEDULE_URL, params=params, timeout=30)
+    response.raise_for_status()
+    games, seen = [], set()
+    for day in response.json().get("dates", []):
+        for g in day.get("games", []):
+            status = g.get("status", {})
+            if status.get("abstractGameState") != "Final" or status.get("detailedState") in NOT_PLAYED_STATES:
+                continue
+            game_pk = g.get("gamePk")
+            if game_pk in seen:
+                continue
+            seen.add(game_pk)
+            is_home = g.get("teams", {}).get("home", {}).get("team", {}).get("id") == team_id
+            games.append({
+                "gamePk": game_pk,
+                "team_side": "home_batters" if is_home else "away_batters",
+                "game_date": g.get("officialDate") or day.get("date"),
+            })
+    return games
+
+
+def partition_path(season: int, game_pk: int, out_dir: str = OUT_DIR) -> str:
+    return os.path.join(out_dir, str(season), f"{int(game_pk)}.parquet")
+
+
+def game_frame(game_info: Dict, data: Dict) -> pd.DataFrame:
+    """Pitches thrown to and by the team in one game, in 20's row format."""
+    side = game_info["team_side"]
+    rows = game_pitches.pitch_rows(data, side, game_info["gamePk"], game_info.get("game_date"), "thrown_to_redsox")
+    rows += game_pitches.pitch_rows(data, game_pitches.other_side(side), game_info["gamePk"],
+                                    game_info.get("game_date"), "thrown_by_redsox")
+    return pd.DataFrame(rows)
+
+
+def process_game(game_info: Dict, out_dir: str = OUT_DIR,
+                 fetch: Optional[Callable[[int], Dict]] = None) -> int:
+    """Fetch and write one game's partition (atomically); returns the number of pitches."""
+    data = (fetch or (lambda pk: gamefeed_cache.get("savant", pk)))(game_info["gamePk"])
+    if data is None:
+        raise ValueError("empty gamefeed")
+    df = game_frame(game_info, data)
+    if df.empty:
+        # Only final games are enumerated, so no pitches means the feed isn't complete yet; retry next run
+        raise ValueError("no pitches in gamefeed")
+    path = partition_path(game_info["season"], game_info["gamePk"], out_dir)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.tmp"
+    df.to_parquet(tmp, index=False)
+    os.replace(tmp, path)
+    return len(df)
+
+
+def backfill(seasons: Iterable[int], workers: int = DEFAULT_WORKERS, out_dir: str = OUT_DIR,
+             journal_path: Optional[str] = None, team_id: int = config.TEAM_ID,
+             fetch: Optional[Callable[[int], Dict]] = None) -> Dict[int, Dict[str, int]]:
+    """Backfill every game in the seasons not yet done; returns the journal summary."""
+    seasons = list(seasons)
+    journal = BackfillJournal(journal_path or os.path.join(out_dir, os.path.basename(JOURNAL_PATH)))
+    try:
+        for season in seasons:
+            try:
+                added = journal.add_games(season, season_games(season, team_id))
+                logging.info(f"{season}: {added} new game(s) registered")
+            except (requests.exceptions.RequestException, ValueError) as e:
+                logging.error(f"Could not enumerate {season} games; using the journal as is: {e}")
+
+        todo = journal.pending(seasons)
+        logging.info(f"{len(todo)} game(s) to fetch with {workers} worker(s)")
+        # Workers fetch and write partitions; only this thread touches the journal
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            futures = {pool.submit(process_game, game, out_dir, fetch): game for game in todo}
+            for done, future in enumerate(as_completed(futures), start=1):
+                game = futures[future]
+                try:
+                    journal.mark_done(game["gamePk"], future.result())
+                except Exception as e:
+                    logging.warning(f"Game {game['gamePk']} ({game['game_date']}) failed: {e}")
+                    journal.mark_failed(game["gamePk"], str(e))
+                if done % 100 == 0:
+                    logging.info(f"{done}/{len(todo)} games processed")
+        return journal.summary()
+    finally:
+        journal.close()
+
+
+def load_seasons(seasons: Iterable[int], out_dir: str = OUT_DIR) -> pd.DataFrame:
+    """All backfilled pitches for the seasons, in game order."""
+    frames = []
+    for season in seasons:
+        season_dir = os.path.join(out_dir, str(season))
+        if os.path.isdir(season_dir):
+            frames += [pd.read_parquet(os.path.join(season_dir, name))
+                       for name in sorted(os.listdir(season_dir)) if name.endswith(".parquet")]
+    if not frames:
+        return pd.DataFrame()
+    return pd.concat(frames, ignore_index=True).sort_values(
+        ["game_date", "game_pk", "team_role", "inning", "ab_number", "pitch_number"], ignore_index=True)
+
+
+def main():
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(description=f"Backfill {config.TEAM_NAME} pitch data for a range of seasons")
+    parser.add_argument("--start-year", type=int, default=MIN_SEASON)
+    parser.add_argument("--end-year", type=int, default=datetime.now().year)
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="Concurrent gamefeed fetches")
+    args = parser.parse_args()
+    if args.start_year < MIN_SEASON:
+        parser.error(f"Pitch tracking data starts in {MIN_SEASON}")
+    if args.end_year < args.start_year:
+        parser.error("--end-year is before --start-year")
+
+    summary = backfill(range(args.start_year, args.end_year + 1), workers=args.workers)
+    for season, counts in summary.items():
+        logging.info(f"{season}: " + ", ".join(f"{status} {count}" for status, count in sorted(counts.items())))
+
+
+if __name__ == "__main__":
+    main()
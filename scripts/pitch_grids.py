@@ -0,0 +1,166 @@
+"""
+Pitch location heatmap grids.
+
+Pitch locations (px, pz, in feet, catcher's view) are binned into a fixed grid
+covering the dashboard's plot area, per pitcher / batter, pitch type and count
+bucket. A grid is a flat array of NX * NZ counts, cell = iz * NX + ix with iz = 0
+the lowest row, stored sparsely as {"n": total, "i": [cells], "c": [counts]}.
+
+Grids are additive: a new game's grids are simply added to the stored ones,
+and any combination (a pitcher's sliders, all two-strike pitches, ...) is the
+sum of the matching grids. The dashboard and the PNG renderer (22) read these
+small grids instead of every pitch, so payloads and render times don't grow
+with the season's pitch count.
+
+Store layout:
+    {"version", "season", "grid": {...spec}, "games": [game_pk, ...],
+     "pitchers": {name: {pitch_type: {bucket: grid}}},   # pitches thrown by the team
+     "batters":  {name: {pitch_type: {bucket: grid}}},   # pitches thrown to the team
+     "called_strikes": {team_role: grid},
+     "zone": {team_role: {"sz_top_sum", "sz_bot_sum", "n"}}}
+"""
+
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+GRID_VERSION = 1
+X_MIN, X_MAX = -2.5, 2.5
+Z_MIN, Z_MAX = 0.5, 4.5
+CELL_FEET = 0.2
+NX = int(round((X_MAX - X_MIN) / CELL_FEET))
+NZ = int(round((Z_MAX - Z_MIN) / CELL_FEET))
+SPEC = {"x_min": X_MIN, "x_max": X_MAX, "z_min": Z_MIN, "z_max": Z_MAX, "cell_feet": CELL_FEET, "nx": NX, "nz": NZ}
+
+# Count buckets, from the pitcher's side of the count
+COUNT_BUCKETS = ("first_pitch", "ahead", "even", "behind", "two_strikes", "unknown")
+# Store group -> (team_role of its rows, column naming the player)
+GROUPS = {
+    "pitchers": ("thrown_by_redsox", "pitcher"),
+    "batters": ("thrown_to_redsox", "batter"),
+}
+
+
+def new_store(season) -> Dict:
+    return {"version": GRID_VERSION, "season": str(season), "grid": dict(SPEC), "games": [],
+            "pitchers": {}, "batters": {}, "called_strikes": {}, "zone": {}}
+
+
+def is_current(store: Optional[Dict]) -> bool:
+    return bool(store) and store.get("version") == GRID_VERSION and store.get("grid") == SPEC
+
+
+def cell_index(px, pz) -> np.ndarray:
+    """Flat cell of each pitch; -1 for pitches outside the grid or without a location."""
+    px = np.asarray(pd.to_numeric(pd.Series(px), errors="coerce"), dtype=float)
+    pz = np.asarray(pd.to_numeric(pd.Series(pz), errors="coerce"), dtype=float)
+    with np.errstate(invalid="ignore"):
+        ix = np.floor((px - X_MIN) / CELL_FEET)
+        iz = np.floor((pz - Z_MIN) / CELL_FEET)
+        valid = (ix >= 0) & (ix < NX) & (iz >= 0) & (iz < NZ)
+    return np.where(valid, np.nan_to_num(iz) * NX + np.nan_to_num(ix), -1).astype(np.int64)
+
+
+def count_buckets(balls, strikes) -> np.ndarray:
+    b = np.asarray(pd.to_numeric(pd.Series(balls), errors="coerce"), dtype=float)
+    s = np.asarray(pd.to_numeric(pd.Series(strikes), errors="coerce"), dtype=float)
+    with np.errstate(invalid="ignore"):
+        return np.select(
+            [np.isnan(b) | np.isnan(s), (b == 0) & (s == 0), s == 2, s > b, b > s],
+            ["unknown", "first_pitch", "two_strikes", "ahead", "behind"],
+            default="even",
+        )
+
+
+def bin_pitches(df: pd.DataFrame, keys: List[str]) -> Dict[tuple, np.ndarray]:
+    """{key values: counts (NX * NZ)} for the pitches in df, grouped by the key columns, in one pass."""
+    cells = cell_index(df["px"], df["pz"]) if len(df) else np.array([], dtype=np.int64)
+    df = df[cells >= 0]
+    cells = cells[cells >= 0]
+    if df.empty:
+        return {}
+    codes, uniques = pd.MultiIndex.from_frame(df[keys].fillna("Unknown").astype(str)).factorize()
+    counts = np.bincount(codes * (NX * NZ) + cells, minlength=len(uniques) * NX * NZ)
+    counts = counts.reshape(len(uniques), NX * NZ)
+    return {tuple(key): counts[i] for i, key in enumerate(uniques)}
+
+
+def encode(counts: np.ndarray) -> Dict:
+    cells = np.flatnonzero(counts)
+    return {"n": int(counts.sum()), "i": cells.tolist(), "c": counts[cells].tolist()}
+
+
+def decode(grid: Optional[Dict]) -> np.ndarray:
+    counts = np.zeros(NX * NZ, dtype=np.int64)
+    if grid:
+        counts[np.asarray(grid["i"], dtype=np.int64)] = grid["c"]
+    return counts
+
+
+def _add(parent: Dict, key: str, counts: np.ndarray) -> None:
+    parent[key] = encode(decode(parent.get(key)) + counts)
+
+
+def add_pitches(store: Dict, pitches: pd.DataFrame) -> List[int]:
+    """Add the pitches of games not yet in the store; returns those game_pks."""
+    if pitches.empty:
+        return []
+    done = set(store["games"])
+    new = pitches[~pitches["game_pk"].isin(done)].copy()
+    if new.empty:
+        return []
+    # Rows written before 20 recorded the count fall in the "unknown" bucket
+    has_count = {"balls", "strikes"} <= set(new.columns)
+    new["bucket"] = count_buckets(new["balls"], new["strikes"]) if has_count else "unknown"
+
+    for group, (team_role, person) in GROUPS.items():
+        rows = new[new["team_role"] == team_role]
+        for (name, pitch_type, bucket), counts in bin_pitches(rows, [person, "pitch_name", "bucket"]).items():
+            _add(store[group].setdefault(name, {}).setdefault(pitch_type, {}), bucket, counts)
+
+    called = new[new["pitch_call"] == "called_strike"]
+    for (team_role,), counts in bin_pitches(called, ["team_role"]).items():
+        _add(store["called_strikes"], team_role, counts)
+    for team_role, rows in new.groupby("team_role"):
+        top = pd.to_numeric(rows["sz_top"], errors="coerce")
+        bot = pd.to_numeric(rows["sz_bot"], errors="coerce")
+        valid = top.notna() & bot.notna()
+        zone = store["zone"].setdefault(team_role, {"sz_top_sum": 0.0, "sz_bot_sum": 0.0, "n": 0})
+        zone["sz_top_sum"] += float(top[valid].sum())
+        zone["sz_bot_sum"] += float(bot[valid].sum())
+        zone["n"] += int(valid.sum())
+
+    games = sorted(int(pk) for pk in new["game_pk"].dropna().unique())
+    store["games"] = sorted(done | set(games))
+    return games
+
+
+def combine(store: Dict, group: str, names: Optional[Iterable[str]] = None,
+            pitch_types: Optional[Iterable[str]] = None, buckets: Optional[Iterable[str]] = None) -> np.ndarray:
+    """Sum of a group's grids, optionally limited to some players, pitch types and count buckets."""
+    names, pitch_types, buckets = (set(v) if v is not None else None for v in (names, pitch_types, buckets))
+    total = np.zeros(NX * NZ, dtype=np.int64)
+    for name, by_type in store.get(group, {}).items():
+        if names is not None and name not in names:
+            continue
+        for pitch_type, by_bucket in by_type.items():
+            if pitch_types is not None and pitch_type not in pitch_types:
+                continue
+            for bucket, grid in by_bucket.items():
+                if buckets is None or bucket in buckets:
+                    total += decode(grid)
+    return total
+
+
+def as_matrix(counts: np.ndarray) -> np.ndarray:
+    """(NZ, NX) matrix, row 0 = lowest row (use origin="lower" with imshow)."""
+    return counts.reshape(NZ, NX)
+
+
+def average_zone(store: Dict, team_role: str):
+    """(sz_top, sz_bot) averaged over the role's pitches, or None."""
+    zone = store.get("zone", {}).get(team_role)
+    if not zone or not zone["n"]:
+        return None
+    return zone["sz_top_sum"] / zone["n"], zone["sz_bot_sum"] / zone["n"]
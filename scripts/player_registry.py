@@ -0,0 +1,210 @@
+"""
+Player identity registry: MLBAM id <-> Baseball Reference id <-> name variants.
+
+Scripts used to match players by re-normalizing names with regexes and scanning
+allowlists row by row. The registry normalizes every known name variant once and
+keeps hash indexes on the normalized full name, the last name and the BBRef id,
+so a lookup is a dict hit and joins can use MLBAM ids.
+
+It's populated from statsapi (the 40-man roster plus people records with their
+xrefIds) by 19, saved as JSON locally and in S3, and loaded by the other scripts.
+"""
+
+import json
+import logging
+import os
+import re
+import unicodedata
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional
+
+import requests
+
+from scripts import config
+
+LOCAL_PATH = os.path.join("data", "roster", "player_registry.json")
+S3_KEY = "redsox/data/roster/player_registry.json"
+URL = f"https://redsox-data.s3.amazonaws.com/{S3_KEY}"
+STATSAPI = "https://statsapi.mlb.com/api/v1"
+SUFFIXES = {"jr", "sr", "ii", "iii", "iv", "v"}
+# Most names in a transaction or headline are 2-4 words
+MAX_NAME_TOKENS = 4
+
+
+def strip_accents(text: str) -> str:
+    return unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode("ascii")
+
+
+def normalize_name(name: Optional[str]) -> str:
+    """'Hernández, Teoscar*' / 'Teoscar Hernández (10-day IL)' -> 'teoscar hernandez'.
+
+    Flips 'Last, First', drops parenthetical notes and BBRef handedness markers
+    (* # ?), strips accents, turns hyphens and periods into spaces and removes
+    anything else that isn't a letter.
+    """
+    if not name:
+        return ""
+    name = name.split("(")[0].strip().rstrip("*#?").strip()
+    if "," in name:
+        parts = [p.strip() for p in name.split(",")]
+        if len(parts) == 2 and parts[1]:
+            name = f"{parts[1]} {parts[0]}"
+    name = strip_accents(name)
+    name = re.sub(r"[\-\.]+", " ", name)
+    name = re.sub(r"[^a-zA-Z\s]", " ", name)
+    return re.sub(r"\s+", " ", name).strip().lower()
+
+
+def without_suffix(normalized: str) -> str:
+    tokens = normalized.split()
+    while len(tokens) > 2 and tokens[-1] in SUFFIXES:
+        tokens.pop()
+    return " ".join(tokens)
+
+
+def name_variants(*names: Optional[str]) -> List[str]:
+    """Normalized forms of every given name, with and without Jr./Sr./roman numeral suffixes."""
+    variants = []
+    for name in names:
+        normalized = normalize_name(name)
+        for variant in (normalized, without_suffix(normalized)):
+            if variant and variant not in variants:
+                variants.append(variant)
+    return variants
+
+
+class PlayerRegistry:
+    def __init__(self, players: Optional[Iterable[Dict]] = None):
+        self.players: Dict[int, Dict] = {}
+        self.by_name: Dict[str, set] = defaultdict(set)
+        self.by_last: Dict[str, set] = defaultdict(set)
+        self.by_bbref: Dict[str, int] = {}
+        for player in players or []:
+            self.add(**player)
+
+    def __len__(self) -> int:
+        return len(self.players)
+
+    def __contains__(self, mlbam_id) -> bool:
+        return int(mlbam_id) in self.players
+
+    def add(self, mlbam_id, full_name: str, bbref_id: Optional[str] = None, first_name: Optional[str] = None,
+            last_name: Optional[str] = None, use_name: Optional[str] = None, variants: Iterable[str] = ()) -> Dict:
+        """Add or merge a player; new names and ids are added to the existing record."""
+        mlbam_id = int(mlbam_id)
+        record = self.players.setdefault(mlbam_id, {"mlbam_id": mlbam_id, "full_name": full_name, "bbref_id": None,
+                                                    "first_name": None, "last_name": None, "use_name": None,
+                                                    "variants": []})
+        for key, value in (("full_name", full_name), ("bbref_id", bbref_id), ("first_name", first_name),
+                           ("last_name", last_name), ("use_name", use_name)):
+            if value:
+                record[key] = value
+        use_full = f"{use_name} {last_name}" if use_name and last_name else None
+        for variant in name_variants(full_name, use_full, *variants):
+            if variant not in record["variants"]:
+                record["variants"].append(variant)
+            self.by_name[variant].add(mlbam_id)
+            self.by_last[variant.split()[-1]].add(mlbam_id)
+        if record["bbref_id"]:
+            self.by_bbref[record["bbref_id"]] = mlbam_id
+        return record
+
+    def add_people(self, people: Iterable[Dict]) -> int:
+        """Add statsapi people records (hydrated with xrefId for the BBRef id); returns how many were added."""
+        count = 0
+        for person in people:
+            if not person.get("id") or not person.get("fullName"):
+                continue
+            bbref_id = next((x.get("xrefId") for x in person.get("xrefIds", []) if x.get("xrefType") == "bbref"), None)
+            self.add(person["id"], person["fullName"], bbref_id=bbref_id, first_name=person.get("firstName"),
+                     last_name=person.get("lastName"), use_name=person.get("useName"),
+                     variants=[person.get("nameFirstLast"), person.get("boxscoreName")])
+            count += 1
+        return count
+
+    def get(self, mlbam_id) -> Optional[Dict]:
+        return self.players.get(int(mlbam_id)) if mlbam_id is not None else None
+
+    def from_bbref(self, bbref_id: str) -> Optional[int]:
+        return self.by_bbref.get(bbref_id)
+
+    def lookup(self, name: str) -> Optional[int]:
+        """MLBAM id for a name, or None if unknown or ambiguous.
+
+        An exact normalized match wins; otherwise the last name must match exactly
+        and one first name must be a prefix of the other ('teo' / 'teoscar').
+        """
+        normalized = normalize_name(name)
+        for key in (normalized, without_suffix(normalized)):
+            ids = self.by_name.get(key)
+            if ids and len(ids) == 1:
+                return next(iter(ids))
+        tokens = without_suffix(normalized).split()
+        if len(tokens) < 2:
+            return None
+        first, last = " ".join(tokens[:-1]), tokens[-1]
+        matches = set()
+        for mlbam_id in self.by_last.get(last, ()):
+            for variant in self.players[mlbam_id]["variants"]:
+                v_tokens = variant.split()
+                v_first = " ".join(v_tokens[:-1])
+                if v_tokens[-1] == last and (v_first.startswith(first) or first.startswith(v_first)):
+                    matches.add(mlbam_id)
+        return next(iter(matches)) if len(matches) == 1 else None
+
+    def find_in_text(self, text: str) -> List[int]:
+        """Ids of known players named in free text (e.g. a transaction), in order of appearance."""
+        tokens = normalize_name(text).split()
+        found = []
+        i = 0
+        while i < len(tokens):
+            for size in range(min(MAX_NAME_TOKENS, len(tokens) - i), 1, -1):
+                ids = self.by_name.get(" ".join(tokens[i:i + size]))
+                if ids and len(ids) == 1:
+                    mlbam_id = next(iter(ids))
+                    if mlbam_id not in found:
+                        found.append(mlbam_id)
+                    i += size - 1
+                    break
+            i += 1
+        return found
+
+    # --- Persistence ---
+    def to_json(self) -> List[Dict]:
+        return sorted(self.players.values(), key=lambda p: p["mlbam_id"])
+
+    def save(self, path: str = LOCAL_PATH) -> None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_json(), f, indent=2, ensure_ascii=False)
+
+    @classmethod
+    def load(cls, path: str = LOCAL_PATH, url: Optional[str] = URL) -> "PlayerRegistry":
+        """The registry from the local file, else the published copy, else an empty one."""
+        try:
+            if os.path.exists(path):
+                with open(path, encoding="utf-8") as f:
+                    return cls(json.load(f))
+            if url:
+                response = requests.get(url, timeout=20)
+                response.raise_for_status()
+                return cls(response.json())
+        except (OSError, ValueError, requests.exceptions.RequestException) as e:
+            logging.warning(f"Could not load the player registry: {e}")
+        return cls()
+
+
+def fetch_team_people(team_id: int = config.TEAM_ID, roster_type: str = "40Man") -> List[Dict]:
+    """statsapi people records (with xrefIds) for a team's roster, in two requests."""
+    try:
+        response = requests.get(f"{STATSAPI}/teams/{team_id}/roster", params={"rosterType": roster_type}, timeout=20)
+        response.raise_for_status()
+        ids = [str(p["person"]["id"]) for p in response.json().get("roster", []) if p.get("person", {}).get("id")]
+        if not ids:
+            return []
+        response = requests.get(f"{STATSAPI}/people", params={"personIds": ",".join(ids), "hydrate": "xrefId"}, timeout=20)
+        response.raise_for_status()
+        return response.json().get("people", [])
+    except (requests.exceptions.RequestException, ValueError, KeyError) as e:
+        logging.error(f"Could not fetch roster people from statsapi: {e}")
+        return []
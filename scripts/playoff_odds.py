@@ -0,0 +1,204 @@
+"""
+Monte Carlo playoff odds for every MLB club over the real remaining schedule.
+
+Each remaining game is won by the home club with the log5 probability of the two
+clubs' strengths. Strength blends current win% with Pythagorean win% from runs
+scored/allowed, regressed toward .500 early in the season. Seasons are simulated
+as (simulations x games) arrays in chunks; each chunk gets its own RNG stream
+spawned from one SeedSequence, so chunks can run in a process pool and the
+result depends only on the seed and chunk size.
+
+Seeding follows the 12-team format used since 2022. In each league the three
+division winners and the three best other records make the postseason, and the
+two best division winners get a first-round bye. Ties are broken at random.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, NamedTuple, Optional
+
+import numpy as np
+
+SEASON_GAMES = 162
+PYTHAG_EXPONENT = 1.83
+PYTHAG_WEIGHT = 0.5
+# Games of .500 baseball mixed into every club's strength (regression to the mean)
+PRIOR_GAMES = 20
+DIVISION_WINNERS = 3
+WILD_CARDS = 3
+BYES = 2
+DEFAULT_SIMULATIONS = 10000
+DEFAULT_CHUNK = 2000
+
+
+class League(NamedTuple):
+    """Club arrays (index = position in team_ids) plus the remaining schedule as index pairs."""
+    team_ids: np.ndarray
+    wins: np.ndarray
+    losses: np.ndarray
+    strength: np.ndarray
+    league: np.ndarray
+    division: np.ndarray
+    home: np.ndarray
+    away: np.ndarray
+
+
+def team_strength(wins, losses, runs_scored, runs_allowed,
+                  pythag_weight: float = PYTHAG_WEIGHT, prior_games: int = PRIOR_GAMES) -> np.ndarray:
+    """True-talent estimate per club: win% blended with Pythagorean win%, regressed toward .500."""
+    wins, losses = np.asarray(wins, dtype=float), np.asarray(losses, dtype=float)
+    rs = np.asarray(runs_scored, dtype=float) ** PYTHAG_EXPONENT
+    ra = np.asarray(runs_allowed, dtype=float) ** PYTHAG_EXPONENT
+    games = wins + losses
+    with np.errstate(invalid="ignore", divide="ignore"):
+        win_pct = np.where(games > 0, wins / games, 0.5)
+        pythag = np.where(rs + ra > 0, rs / (rs + ra), 0.5)
+    blended = pythag_weight * pythag + (1 - pythag_weight) * win_pct
+    return (blended * games + 0.5 * prior_games) / (games + prior_games)
+
+
+def log5(p_a, p_b) -> np.ndarray:
+    """Probability that a club of strength p_a beats a club of strength p_b."""
+    p_a, p_b = np.asarray(p_a, dtype=float), np.asarray(p_b, dtype=float)
+    return (p_a - p_a * p_b) / (p_a + p_b - 2 * p_a * p_b)
+
+
+def build_league(teams: List[Dict], games: List[Dict]) -> League:
+    """Build simulation arrays from standings rows (00's layout) and remaining games ({home_id, away_id})."""
+    team_ids = np.array([t["team_id"] for t in teams])
+    index = {team_id: i for i, team_id in enumerate(team_ids.tolist())}
+    leagues = sorted({t["league_name"] for t in teams})
+    divisions = sorted({t["division_name"] for t in teams})
+    schedule = [(index[g["home_id"]], index[g["away_id"]]) for g in games
+                if g["home_id"] in index and g["away_id"] in index]
+    home, away = (np.array(side, dtype=np.int64) for side in zip(*schedule)) if schedule else (np.zeros(0, dtype=np.int64),) * 2
+    return League(
+        team_ids=team_ids,
+        wins=np.array([int(t["wins"]) for t in teams]),
+        losses=np.array([int(t["losses"]) for t in teams]),
+        strength=team_strength(
+            [int(t["wins"]) for t in teams], [int(t["losses"]) for t in teams],
+            [t.get("runs_scored") or 0 for t in teams], [t.get("runs_against") or 0 for t in teams],
+        ),
+        league=np.array([leagues.index(t["league_name"]) for t in teams]),
+        division=np.array([divisions.index(t["division_name"]) for t in teams]),
+        home=home,
+        away=away,
+    )
+
+
+def _top_k(keys: np.ndarray, k: int) -> np.ndarray:
+    """Column indices of the k largest keys per row (order within the k is not defined)."""
+    return np.argpartition(-keys, k - 1, axis=1)[:, :k]
+
+
+def simulate_chunk(league: League, simulations: int, seed: np.random.SeedSequence) -> Dict[str, np.ndarray]:
+    """Simulate `simulations` seasons; returns per-club counts of each outcome and the summed final wins."""
+    rng = np.random.default_rng(seed)
+    n_teams = len(league.team_ids)
+    home_win_pct = log5(league.strength[league.home], league.strength[league.away])
+
+    # Remaining games -> extra wins per club via one-hot schedule matrices
+    home_wins = (rng.random((simulations, len(league.home))) < home_win_pct).astype(np.float32)
+    home_onehot = np.zeros((len(league.home), n_teams), dtype=np.float32)
+    away_onehot = np.zeros((len(league.home), n_teams), dtype=np.float32)
+    home_onehot[np.arange(len(league.home)), league.home] = 1
+    away_onehot[np.arange(len(league.home)), league.away] = 1
+    wins = league.wins + home_wins @ home_onehot + (1 - home_wins) @ away_onehot
+
+    # Random tiebreak below one win
+    keys = wins + rng.random(wins.shape) * 0.5
+    rows = np.arange(simulations)[:, None]
+    division_winner = np.zeros((simulations, n_teams), dtype=bool)
+    wild_card = np.zeros_like(division_winner)
+    bye = np.zeros_like(division_winner)
+
+    for division in np.unique(league.division):
+        members = np.flatnonzero(league.division == division)
+        division_winner[np.arange(simulations), members[np.argmax(keys[:, members], axis=1)]] = True
+
+    for lg in np.unique(league.league):
+        members = np.flatnonzero(league.league == lg)
+        league_keys = keys[:, members]
+        winners = division_winner[:, members]
+        # Best division winners get the byes
+        bye_keys = np.where(winners, league_keys, -np.inf)
+        bye[rows, members[_top_k(bye_keys, BYES)]] = True
+        # Best records among the rest are the wild cards
+        wild_keys = np.where(winners, -np.inf, league_keys)
+        wild_card[rows, members[_top_k(wild_keys, WILD_CARDS)]] = True
+
+    return {
+        "division": division_winner.sum(axis=0),
+        "wild_card": wild_card.sum(axis=0),
+        "bye": bye.sum(axis=0),
+        "playoffs": (division_winner | wild_card).sum(axis=0),
+        "wins": wins.sum(axis=0),
+        "simulations": np.array(simulations),
+    }
+
+
+def _run_chunk(args):
+    return simulate_chunk(*args)
+
+
+def simulate(league: League, simulations: int = DEFAULT_SIMULATIONS, seed: Optional[int] = None,
+             chunk: int = DEFAULT_CHUNK, workers: Optional[int] = None):
+    """Run all simulations in chunks (in a process pool when workers > 1).
+
+    Returns (totals, seed entropy). Totals have the same keys as simulate_chunk.
+    """
+    seq = np.random.SeedSequence(seed)
+    sizes = [chunk] * (simulations // chunk) + ([simulations % chunk] if simulations % chunk else [])
+    jobs = [(league, size, child) for size, child in zip(sizes, seq.spawn(len(sizes)))]
+    workers = min(workers or os.cpu_count() or 1, len(jobs))
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_run_chunk, jobs))
+    else:
+        results = [_run_chunk(job) for job in jobs]
+    totals = {key: sum(r[key] for r in results) for key in results[0]}
+    return totals, seq.entropy
+
+
+def magic_numbers(league: League, season_games: int = SEASON_GAMES) -> Dict[str, List[Optional[int]]]:
+    """Division and wild-card magic numbers (leaders) or elimination numbers (everyone else).
+
+    Magic number = games + 1 - own wins - losses of the nearest pursuer. Elimination
+    number = games + 1 - wins of the club to catch - own losses. Both floor at 0.
+    The wild-card race is measured against the last club in (leaders) or that club
+    (chasers), among clubs not leading their division.
+    """
+    order = np.lexsort((league.losses, -league.wins))
+    n_teams = len(league.team_ids)
+    division_magic: List[Optional[int]] = [None] * n_teams
+    division_elim: List[Optional[int]] = [None] * n_teams
+    wild_magic: List[Optional[int]] = [None] * n_teams
+    wild_elim: List[Optional[int]] = [None] * n_teams
+
+    leaders = set()
+    for division in np.unique(league.division):
+        members = [i for i in order if league.division[i] == division]
+        leader, pursuer = members[0], members[1] if len(members) > 1 else None
+        leaders.add(leader)
+        if pursuer is not None:
+            division_magic[leader] = max(0, int(season_games + 1 - league.wins[leader] - league.losses[pursuer]))
+        for i in members[1:]:
+            division_elim[i] = max(0, int(season_games + 1 - league.wins[leader] - league.losses[i]))
+
+    for lg in np.unique(league.league):
+        contenders = [i for i in order if league.league[i] == lg and i not in leaders]
+        if len(contenders) <= WILD_CARDS:
+            continue
+        last_in, first_out = contenders[WILD_CARDS - 1], contenders[WILD_CARDS]
+        for i in contenders[:WILD_CARDS]:
+            wild_magic[i] = max(0, int(season_games + 1 - league.wins[i] - league.losses[first_out]))
+        for i in contenders[WILD_CARDS:]:
+            wild_elim[i] = max(0, int(season_games + 1 - league.wins[last_in] - league.losses[i]))
+
+    return {
+        "division_magic_number": division_magic,
+        "division_elimination_number": division_elim,
+        "wild_card_magic_number": wild_magic,
+        "wild_card_elimination_number": wild_elim,
+    }
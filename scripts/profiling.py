@@ -0,0 +1,186 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+"""
+On-demand deep profiling for any pipeline stage.
+
+Most stages do their work at import time, so the profiler runs the script file
+itself (via runpy) inside cProfile and tracemalloc and writes the results to
+data/profiles/:
+
+- {stage}_{timestamp}.pstats         cProfile stats (open with pstats or snakeviz)
+- {stage}_{timestamp}.txt            top functions by cumulative time
+- {stage}_{timestamp}_alloc.txt      top allocation sites and peak traced memory
+- {stage}_{timestamp}.collapsed      sampled stacks in flamegraph "collapsed" format (--collapsed)
+
+Usage:
+    python -m scripts.profiling scripts/07_create_toplines_summary.py
+    python -m scripts.profiling --collapsed scripts/29_fetch_historical_standings.py -- --test-year 2024
+"""
+
+import argparse
+import cProfile
+import io
+import logging
+import os
+import pstats
+import runpy
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, List, Optional
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+PROFILE_DIR = os.path.join("data", "profiles")
+
+
+class StackSampler:
+    """Samples the stack of one thread at a fixed interval and counts collapsed stacks."""
+
+    def __init__(self, thread_id: int, interval: float = 0.005):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.counts: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}:{code.co_firstlineno}")
+                frame = frame.f_back
+            self.counts[";".join(reversed(stack))] += 1
+
+    def write(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in self.counts.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+def _write_allocations(snapshot: tracemalloc.Snapshot, peak: int, path: str, top: int) -> None:
+    stats = snapshot.statistics("lineno")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(f"Peak traced memory: {peak / 1024 / 1024:.1f} MiB\n")
+        f.write(f"Top {top} allocation sites still alive at exit:\n\n")
+        for stat in stats[:top]:
+            frame = stat.traceback[0]
+            f.write(f"{stat.size / 1024:10.1f} KiB  {stat.count:8d} blocks  {frame.filename}:{frame.lineno}\n")
+
+
+@contextmanager
+def profile_stage(stage: str, output_dir: str = PROFILE_DIR, collapsed: bool = False,
+                  trace_memory: bool = True, top: int = 50):
+    """Profile the enclosed block and write pstats, allocation and stack reports.
+
+    Yields a dict that is filled with the written file paths on exit.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    base = os.path.join(output_dir, f"{stage}_{datetime.now().strftime('%Y%m%d-%H%M%S')}")
+    paths: Dict[str, str] = {}
+
+    sampler = StackSampler(threading.get_ident()) if collapsed else None
+    if trace_memory:
+        tracemalloc.start(25)
+    profiler = cProfile.Profile()
+    if sampler:
+        sampler.start()
+    started = time.perf_counter()
+    profiler.enable()
+    try:
+        yield paths
+    finally:
+        profiler.disable()
+        elapsed = time.perf_counter() - started
+        if sampler:
+            sampler.stop()
+
+        paths["pstats"] = f"{base}.pstats"
+        profiler.dump_stats(paths["pstats"])
+
+        report = io.StringIO()
+        stats = pstats.Stats(profiler, stream=report)
+        stats.sort_stats("cumulative").print_stats(top)
+        paths["report"] = f"{base}.txt"
+        with open(paths["report"], "w", encoding="utf-8") as f:
+            f.write(f"Stage: {stage}\nWall time: {elapsed:.2f}s\n\n")
+            f.write(report.getvalue())
+
+        if trace_memory:
+            snapshot = tracemalloc.take_snapshot()
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            paths["allocations"] = f"{base}_alloc.txt"
+            _write_allocations(snapshot, peak, paths["allocations"], top)
+
+        if sampler:
+            paths["collapsed"] = f"{base}.collapsed"
+            sampler.write(paths["collapsed"])
+
+        logging.info(f"Profiled {stage} in {elapsed:.2f}s. Reports: {', '.join(paths.values())}")
+
+
+def run_script(script_path: str, script_args: Optional[List[str]] = None, **kwargs) -> Dict[str, str]:
+    """Run a pipeline script as __main__ under profile_stage and return the report paths."""
+    stage = os.path.splitext(os.path.basename(script_path))[0]
+    saved_argv = sys.argv
+    sys.argv = [script_path] + list(script_args or [])
+    try:
+        with profile_stage(stage, **kwargs) as paths:
+            try:
+                runpy.run_path(script_path, run_name="__main__")
+            except SystemExit as e:
+                if e.code not in (None, 0):
+                    logging.warning(f"{stage} exited with status {e.code}")
+    finally:
+        sys.argv = saved_argv
+    return paths
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(
+        description="Run a pipeline script under cProfile and tracemalloc",
+        usage="python -m scripts.profiling [options] SCRIPT [-- SCRIPT_ARGS...]",
+    )
+    parser.add_argument("script", help="Path to the script to profile, e.g. scripts/20_fetch_game_pitches.py")
+    parser.add_argument("script_args", nargs=argparse.REMAINDER, help="Arguments passed through to the script")
+    parser.add_argument("--output-dir", default=PROFILE_DIR, help=f"Where to write reports (default: {PROFILE_DIR})")
+    parser.add_argument("--collapsed", action="store_true", help="Also sample stacks and write flamegraph collapsed stacks")
+    parser.add_argument("--no-tracemalloc", action="store_true", help="Skip allocation tracing (much lower overhead)")
+    parser.add_argument("--top", type=int, default=50, help="Number of functions/allocation sites to report (default: 50)")
+    args = parser.parse_args()
+    if args.script_args and args.script_args[0] == "--":
+        args.script_args = args.script_args[1:]
+    return args
+
+
+def main():
+    args = parse_arguments()
+    run_script(
+        args.script,
+        args.script_args,
+        output_dir=args.output_dir,
+        collapsed=args.collapsed,
+        trace_memory=not args.no_tracemalloc,
+        top=args.top,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Vectorized season win projections for 18_generate_projection.py.
+
+Two models project the remaining schedule:
+- "bootstrap": each remaining game is a resample of a past game outcome
+- "pythagorean": each remaining game is won with the Pythagorean win% from runs scored/allowed
+
+Every projection draws a (simulations x remaining games) matrix from a seeded
+numpy Generator, takes one cumulative sum and reads the mean and both CI bounds
+for every game in a single np.quantile call.
+
+The as-of-game history replays the projection after every game already played.
+Only the final win total is needed there, and the sum of n independent win/loss
+draws with win probability p is Binomial(n, p). So the whole history is one
+binomial draw per (game, simulation), which matches the per-game models in
+distribution.
+"""
+
+from typing import Dict, List, Optional
+
+import numpy as np
+
+SEASON_GAMES = 162
+MIN_GAMES = 10
+DEFAULT_SIMULATIONS = 10000
+PYTHAG_EXPONENT = 1.83
+CI_QUANTILES = (0.025, 0.975)
+MODELS = ("bootstrap", "pythagorean")
+
+
+def make_streams(seed: Optional[int] = None, streams: int = 2):
+    """Independent Generators from one SeedSequence; returns (generators, entropy to reproduce the run)."""
+    seq = np.random.SeedSequence(seed)
+    return [np.random.default_rng(child) for child in seq.spawn(streams)], seq.entropy
+
+
+def pythagorean_pct(runs_scored, runs_allowed, exponent: float = PYTHAG_EXPONENT):
+    """Pythagorean win expectation; 0.5 where no runs have been scored or allowed."""
+    rs = np.asarray(runs_scored, dtype=float) ** exponent
+    ra = np.asarray(runs_allowed, dtype=float) ** exponent
+    with np.errstate(invalid="ignore", divide="ignore"):
+        pct = rs / (rs + ra)
+    return np.where(rs + ra > 0, pct, 0.5)
+
+
+def simulate_remaining(model: str, wins: np.ndarray, runs_scored: np.ndarray, runs_allowed: np.ndarray,
+                       remaining: int, simulations: int, rng: np.random.Generator) -> np.ndarray:
+    """Win (1) / loss (0) draws for every remaining game, shape (simulations, remaining)."""
+    if model == "bootstrap":
+        return rng.choice(wins.astype(np.int8), size=(simulations, remaining), replace=True)
+    if model == "pythagorean":
+        pct = pythagorean_pct(runs_scored.sum(), runs_allowed.sum())
+        return (rng.random((simulations, remaining)) < pct).astype(np.int8)
+    raise ValueError(f"Unknown projection model '{model}' (expected one of {', '.join(MODELS)})")
+
+
+def project_remaining(current_wins: int, draws: np.ndarray) -> Dict[str, np.ndarray]:
+    """Mean and CI of projected total wins after each remaining game."""
+    cumulative = current_wins + np.cumsum(draws, axis=1, dtype=np.int16)
+    lower, upper = np.quantile(cumulative, CI_QUANTILES, axis=0)
+    return {"mean": cumulative.mean(axis=0), "lower": lower, "upper": upper}
+
+
+def projection_history(model: str, wins: np.ndarray, runs_scored: np.ndarray, runs_allowed: np.ndarray,
+                       simulations: int, rng: np.random.Generator,
+                       season_games: int = SEASON_GAMES, min_games: int = MIN_GAMES) -> Dict[str, np.ndarray]:
+    """Projected final wins as of every game from min_games on (mean and CI per as-of game)."""
+    games_played = len(wins)
+    as_of = np.arange(min_games, games_played + 1)
+    if len(as_of) == 0:
+        return {"game_number": as_of, "mean": np.array([]), "lower": np.array([]), "upper": np.array([])}
+
+    cumulative_wins = np.cumsum(wins)[as_of - 1]
+    remaining = np.clip(season_games - as_of, 0, None)
+    if model == "bootstrap":
+        pct = cumulative_wins / as_of
+    elif model == "pythagorean":
+        pct = pythagorean_pct(np.cumsum(runs_scored)[as_of - 1], np.cumsum(runs_allowed)[as_of - 1])
+    else:
+        raise ValueError(f"Unknown projection model '{model}' (expected one of {', '.join(MODELS)})")
+
+    final_wins = cumulative_wins[:, None] + rng.binomial(remaining[:, None], pct[:, None], size=(len(as_of), simulations))
+    lower, upper = np.quantile(final_wins, CI_QUANTILES, axis=1)
+    return {"game_number": as_of, "mean": final_wins.mean(axis=1), "lower": lower, "upper": upper}
+
+
+def timeseries_rows(game_numbers, projection: Dict[str, np.ndarray]) -> List[Dict]:
+    """Rows in the dashboard timeseries format (mean to 0.1 win, CI bounds as whole wins)."""
+    return [
+        {
+            "game_number": int(game),
+            "mean_projected_wins": round(float(mean), 1),
+            "lower_ci_wins": int(np.round(lower)),
+            "upper_ci_wins": int(np.round(upper)),
+        }
+        for game, mean, lower, upper in zip(game_numbers, projection["mean"], projection["lower"], projection["upper"])
+    ]
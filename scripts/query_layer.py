@@ -0,0 +1,97 @@
+"""
+Embedded DuckDB query layer over the pipeline's parquet outputs.
+
+Each dataset below is registered as a view over its parquet files, so a stage
+can express a summary as SQL instead of loading a whole file into pandas first.
+DuckDB reads only the columns a query names. It also skips the row groups whose
+min/max statistics rule out its WHERE clause. Memory and load time then follow
+the size of the result, not the dataset, which matters once the pitch partitions
+and the franchise history reach millions of rows.
+
+    with QueryLayer() as q:
+        q.sql("SELECT franchise, year, wins FROM franchise_games WHERE gm = 60 ORDER BY wins DESC LIMIT 10")
+
+Views are created only for datasets with files on disk (listed in `views`).
+Files of one dataset are unioned by column name, so partitions written before a
+column was added still read. duckdb is optional for the stages; callers check
+`available()` and keep their pandas path as the fallback.
+"""
+
+import glob
+import os
+from typing import Dict, List, Optional, Sequence
+
+import pandas as pd
+
+try:
+    import duckdb
+except ImportError:
+    duckdb = None
+
+DATA_ROOT = "data"
+
+# View name -> parquet file or glob, relative to the data root (writer in parentheses)
+DATASETS: Dict[str, str] = {
+    "standings": "standings/redsox_standings_1901_present.parquet",  # (29)
+    "franchise_games": "franchises/games/*.parquet",  # (scripts/franchise_warehouse.py)
+    "pitches": "pitches/redsox_pitches_[0-9]*.parquet",  # thrown to the team (20)
+    "pitches_thrown": "pitches/redsox_pitches_thrown_*.parquet",  # thrown by the team (20)
+    "pitch_games": "pitches/games/*/*.parquet",  # (scripts/pitch_backfill.py)
+    "umpire_calls": "umpires/calls/*/*/*.parquet",  # (scripts/umpire_scorecards.py)
+    "batting_gamelogs": "batting/gamelogs/batting_gamelogs_*.parquet",  # (scripts/gamelog_warehouse.py)
+    "pitching_gamelogs": "pitching/gamelogs/pitching_gamelogs_*.parquet",  # (scripts/gamelog_warehouse.py)
+}
+
+
+def available() -> bool:
+    return duckdb is not None
+
+
+def _quote(path: str) -> str:
+    return "'" + path.replace("'", "''") + "'"
+
+
+class QueryLayer:
+    """An in-memory DuckDB connection with a view per dataset that has files."""
+
+    def __init__(self, root: str = DATA_ROOT, datasets: Optional[Dict[str, str]] = None,
+                 threads: Optional[int] = None):
+        if duckdb is None:
+            raise RuntimeError("duckdb is not installed")
+        self.root = root
+        self.conn = duckdb.connect(":memory:")
+        if threads:
+            self.conn.execute(f"SET threads = {int(threads)}")
+        self.views: Dict[str, str] = {}
+        try:
+            for name, pattern in (DATASETS if datasets is None else datasets).items():
+                self.register(name, pattern)
+        except Exception:
+            self.conn.close()
+            raise
+
+    def register(self, name: str, pattern: str) -> bool:
+        """(Re)create a view over a parquet file or glob; False when nothing matches."""
+        path = os.path.join(self.root, pattern)
+        if not glob.glob(path):
+            return False
+        self.conn.execute(f'CREATE OR REPLACE VIEW "{name}" AS '
+                          f"SELECT * FROM read_parquet({_quote(path)}, union_by_name = true)")
+        self.views[name] = path
+        return True
+
+    def sql(self, query: str, params: Optional[Sequence] = None) -> pd.DataFrame:
+        """Run a query (with ? parameters) and return the result as a DataFrame."""
+        return self.conn.execute(query, list(params or [])).df()
+
+    def columns(self, view: str) -> List[str]:
+        return [row[0] for row in self.conn.execute(f'DESCRIBE "{view}"').fetchall()]
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self) -> "QueryLayer":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
@@ -0,0 +1,338 @@
+"""
+Game-by-game standings history (1901-present) loaded once with typed columns.
+
+The parquet written by 29 stores ``year`` as a string; here it becomes an int and
+the games are indexed by (year, gm), so a season or a single game is an index
+lookup rather than a string-built ``.query`` over the whole history. A dense
+"at game N" table (rows = game number, columns = season) gives every season's
+win%, rank and games back at the same point of the schedule.
+
+parse_year_data parses one BBRef schedule-and-results page; 29 uses it for the
+team's own seasons and scripts/franchise_warehouse.py for every franchise.
+"""
+
+import logging
+from io import StringIO
+from typing import Iterable, Optional
+
+import pandas as pd
+from bs4 import BeautifulSoup
+
+AT_GAME_COLUMNS = ["wins", "losses", "win_pct", "rank", "gb"]
+
+
+class StandingsHistory:
+    def __init__(self, df: pd.DataFrame):
+        df = df.copy()
+        df["year"] = pd.to_numeric(df["year"], errors="coerce").astype("Int64")
+        df["gm"] = pd.to_numeric(df["gm"], errors="coerce").astype("Int64")
+        df["game_date"] = pd.to_datetime(df["game_date"], errors="coerce")
+        df = df.dropna(subset=["year", "gm"]).astype({"year": int, "gm": int})
+        self.games = df.set_index(["year", "gm"], drop=False).sort_index()
+        unique = self.games[~self.games.index.duplicated(keep="first")].reset_index(drop=True)
+        columns = [c for c in AT_GAME_COLUMNS if c in unique.columns]
+        self.at_game = unique.set_index(["gm", "year"])[columns].unstack("year")
+
+    @classmethod
+    def load(cls, url: str) -> "StandingsHistory":
+        return cls(pd.read_parquet(url))
+
+    @property
+    def years(self) -> list:
+        return self.games.index.get_level_values("year").unique().tolist()
+
+    def season(self, year: int, through_gm: Optional[int] = None) -> pd.DataFrame:
+        """One season's games, newest first (by date, then game number for doubleheaders)."""
+        if year not in self.games.index.get_level_values("year"):
+            return self.games.iloc[0:0].reset_index(drop=True)
+        season = self.games.xs(year, level="year").reset_index(drop=True)
+        if through_gm is not None:
+            season = season[season["gm"] <= through_gm]
+        return season.sort_values(["game_date", "gm"], ascending=False).reset_index(drop=True)
+
+    def game(self, year: int, gm: int) -> pd.DataFrame:
+        """The row for one season's game N as a one-row frame (empty when that game doesn't exist)."""
+        try:
+            return self.games.loc[[(year, gm)]].head(1).reset_index(drop=True)
+        except KeyError:
+            return self.games.iloc[0:0].reset_index(drop=True)
+
+    def at(self, gm: int, stat: str, years: Optional[Iterable[int]] = None) -> pd.Series:
+        """A stat at game N for each season (NaN for seasons shorter than N games)."""
+        if gm not in self.at_game.index:
+            return pd.Series(dtype=float)
+        values = self.at_game[stat].loc[gm]
+        if years is not None:
+            values = values.reindex(list(years))
+        return values
+
+    def mean_at(self, gm: int, stat: str, years: Iterable[int]) -> float:
+        return self.at(gm, stat, years).mean()
+
+
+def parse_year_data(html, year):
+    """
+    Parse a Baseball Reference schedule page into game-by-game data.
+    
+    Args:
+        html (bytes or str): Schedule page content
+        year (int): The season the page belongs to
+        
+    Returns:
+        pandas.DataFrame: Processed game data for the year
+    """
+    try:
+        soup = BeautifulSoup(html, 'html.parser')
+        
+        # Find the schedule table
+        tables = pd.read_html(StringIO(str(soup)))
+        if not tables:
+            logging.warning(f"No tables found for year {year}")
+            return None
+            
+        # Get the first table (schedule/scores)
+        src = tables[0]
+        
+        # Filter out header rows and preview games
+        src = src.query("Tm != 'Tm' and Inn != 'Game Preview, and Matchups'").copy()
+        
+        if src.empty:
+            logging.warning(f"No valid game data found for year {year}")
+            return None
+            
+        # Clean up columns - handle variations in column structure across years
+        src = src.dropna(how='all', axis=1)  # Remove completely empty columns
+        
+        # Drop problematic columns that exist in some years
+        columns_to_drop = ['Streak', 'Orig. Scheduled']
+        for col in columns_to_drop:
+            if col in src.columns:
+                src = src.drop(col, axis=1)
+        
+        # Standardize column names based on what's available
+        column_mapping = {}
+        for col in src.columns:
+            if 'Unnamed' in str(col):
+                col_pos = src.columns.get_loc(col)
+                # Column 2 holds the boxscore links; column 4 the "@" of road games
+                if col_pos == 2:
+                    column_mapping[col] = 'boxscore'
+                elif col_pos == 4:
+                    column_mapping[col] = 'home_away'
+                    
+        src = src.rename(columns=column_mapping)
+        
+        # Assign year
+        src = src.assign(year=year)
+        
+        # Standardize column names and handle duplicates
+        new_columns = []
+        seen_columns = set()
+        
+        for col in src.columns:
+            # Standardize the column name
+            std_col = str(col).lower().replace("/", "_").replace("-", "_")
+            
+            # Handle specific cases to avoid duplicates
+            if std_col == 'w_l':
+                if 'result' not in seen_columns:
+                    std_col = 'result'
+                elif 'record' not in seen_columns:
+                    std_col = 'record'
+                else:
+                    std_col = f'w_l_{len([c for c in seen_columns if c.startswith("w_l")])}'
+            
+            # Ensure uniqueness
+            original_std_col = std_col
+            counter = 1
+            while std_col in seen_columns:
+                std_col = f"{original_std_col}_{counter}"
+                counter += 1
+                
+            new_columns.append(std_col)
+            seen_columns.add(std_col)
+            
+        src.columns = new_columns
+        
+        # Map actual columns to standard names dynamically
+        actual_columns = list(src.columns)
+        standard_column_mapping = {}
+        
+        # Create a flexible mapping based on common patterns
+        for i, col in enumerate(actual_columns):
+            if col in ['gm#', 'gm']:
+                standard_column_mapping[col] = 'gm'
+            elif col == 'date':
+                standard_column_mapping[col] = 'date'
+            elif col in ['tm', 'team']:
+                standard_column_mapping[col] = 'tm'
+            elif col in ['home_away'] and 'home_away' not in standard_column_mapping.values():
+                standard_column_mapping[col] = 'home_away'
+            elif col in ['home_away_indicator'] and 'home_away' not in standard_column_mapping.values():
+                standard_column_mapping[col] = 'home_away'
+            elif col in ['opp', 'opponent']:
+                standard_column_mapping[col] = 'opp'
+            elif col in ['result'] or (col.startswith('w_l') and 'result' not in standard_column_mapping.values()):
+                standard_column_mapping[col] = 'result'
+            elif col in ['r', 'runs']:
+                standard_column_mapping[col] = 'r'
+            elif col in ['ra', 'runs_allowed']:
+                standard_column_mapping[col] = 'ra'
+            elif col in ['inn', 'innings']:
+                standard_column_mapping[col] = 'inn'
+            elif col in ['record'] or (col.startswith('w_l') and 'record' not in standard_column_mapping.values()):
+                standard_column_mapping[col] = 'record'
+            elif col == 'rank':
+                standard_column_mapping[col] = 'rank'
+            elif col == 'gb':
+                standard_column_mapping[col] = 'gb'
+            elif col == 'win':
+                standard_column_mapping[col] = 'win'
+            elif col == 'loss':
+                standard_column_mapping[col] = 'loss'
+            elif col == 'save':
+                standard_column_mapping[col] = 'save'
+            elif col == 'time':
+                standard_column_mapping[col] = 'time'
+            elif col in ['d_n', 'day_night']:
+                standard_column_mapping[col] = 'day_night'
+            elif col in ['attendance', 'att']:
+                standard_column_mapping[col] = 'attendance'
+            elif col in ['cli', 'leverage']:
+                standard_column_mapping[col] = 'cli'
+            elif col == 'year':
+                standard_column_mapping[col] = 'year'
+                
+        # Apply the mapping
+        src = src.rename(columns=standard_column_mapping)
+        
+        # Handle duplicate columns by keeping only the first occurrence
+        if src.columns.duplicated().any():
+            # Get unique columns while preserving order
+            seen = set()
+            unique_cols = []
+            for col in src.columns:
+                if col not in seen:
+                    unique_cols.append(col)
+                    seen.add(col)
+                else:
+                    unique_cols.append(f"{col}_dup")
+            src.columns = unique_cols
+            
+        # Ensure we have minimum required columns
+        required_columns = ['gm', 'date', 'year']
+        missing_required = [col for col in required_columns if col not in src.columns]
+        if missing_required:
+            logging.warning(f"Missing required columns for year {year}: {missing_required}")
+            return None
+        
+        # Basic data cleaning
+        if 'gm' in src.columns:
+            src["gm"] = pd.to_numeric(src["gm"], errors='coerce')
+            
+        if 'year' in src.columns:
+            src["year"] = src["year"].astype(str)
+            
+        # Process date if available
+        if 'date' in src.columns:
+            try:
+                # Split date if it contains weekday
+                if src["date"].str.contains(", ").any():
+                    src[["weekday", "date_clean"]] = src["date"].str.split(", ", expand=True)
+                    src["date"] = src["date_clean"]
+                    
+                # Remove game number indicators
+                src["date"] = src["date"].str.replace(r" \(\d+\)", "", regex=True)
+                
+                # Create full date
+                src["game_date"] = pd.to_datetime(
+                    src["date"] + ", " + src["year"], 
+                    format="%b %d, %Y", 
+                    errors='coerce'
+                ).dt.strftime('%Y-%m-%d')
+                
+            except Exception as e:
+                logging.warning(f"Date processing failed for year {year}: {e}")
+                src["game_date"] = None
+                
+        # Clean home/away indicator
+        if 'home_away' in src.columns:
+            src.loc[src['home_away'] == "@", "home_away"] = "away"
+            src.loc[src['home_away'].isna(), "home_away"] = "home"
+            
+        # Process games back if available
+        if 'gb' in src.columns:
+            try:
+                src["gb"] = (
+                    src["gb"].astype(str)
+                    .str.replace("up ", "up", regex=False)
+                    .str.replace("up", "+", regex=False)
+                    .str.replace("Tied", "0", regex=False)
+                )
+                src["gb"] = src["gb"].apply(
+                    lambda x: float(x) if str(x).startswith("+") else -float(x) if str(x) != '0' and str(x) != 'nan' else 0
+                )
+            except Exception as e:
+                logging.warning(f"Games back processing failed for year {year}: {e}")
+                
+        # Convert numeric columns
+        numeric_columns = ["r", "ra", "attendance", "rank"]
+        for col in numeric_columns:
+            if col in src.columns:
+                src[col] = pd.to_numeric(src[col], errors='coerce').fillna(0).astype(int)
+                
+        # Process time if available
+        if 'time' in src.columns:
+            try:
+                src["time"] = src["time"].astype(str) + ":00"
+                src["time_minutes"] = pd.to_timedelta(src["time"], errors='coerce').dt.total_seconds() / 60
+                src["time_minutes"] = src["time_minutes"].fillna(0).astype(int)
+            except Exception as e:
+                logging.warning(f"Time processing failed for year {year}: {e}")
+                
+        # Calculate wins and losses from record if available
+        if 'record' in src.columns:
+            try:
+                record_split = src['record'].str.split('-', expand=True)
+                if len(record_split.columns) >= 2:
+                    src['wins'] = pd.to_numeric(record_split[0], errors='coerce').fillna(0).astype(int)
+                    src['losses'] = pd.to_numeric(record_split[1], errors='coerce').fillna(0).astype(int)
+                    src['win_pct'] = (src['wins'] / src['gm']).round(3)
+            except Exception as e:
+                logging.warning(f"Record processing failed for year {year}: {e}")
+                
+        # Select final columns
+        final_columns = [
+            "gm", "game_date", "home_away", "opp", "result", "r", "ra", 
+            "record", "rank", "gb", "time", "time_minutes", "day_night", 
+            "attendance", "year"
+        ]
+        
+        # Add calculated columns if they exist
+        if 'wins' in src.columns:
+            final_columns.extend(["wins", "losses", "win_pct"])
+            
+        # Only include columns that exist
+        available_columns = [col for col in final_columns if col in src.columns]
+        
+        if not available_columns:
+            logging.warning(f"No available columns found for year {year}")
+            return None
+            
+        try:
+            src_df = src[available_columns].copy()
+        except Exception as e:
+            logging.error(f"Column selection failed for year {year}: {e}")
+            raise
+        
+        # Remove rows with no game number (likely totals or headers)
+        if 'gm' in src_df.columns:
+            src_df = src_df.dropna(subset=['gm'])
+            src_df = src_df[src_df['gm'] > 0]
+        
+        logging.info(f"Successfully processed {len(src_df)} games for year {year}")
+        return src_df
+        
+    except Exception as e:
+        logging.error(f"Error processing data for year {year}: {e}")
+        return None
@@ -0,0 +1,249 @@
+"""
+Versioned, immutable S3 keys for published artifacts, with a manifest.
+
+Scripts upload their outputs to fixed keys (e.g. redsox/data/standings/
+redsox_wins_losses_current.json), which browsers and CDNs have to revalidate on
+every visit. Here each artifact is also published under a content-hashed key
+next to it:
+
+    redsox/data/standings/redsox_wins_losses_current.{hash}.json
+
+with Cache-Control immutable and a one-year max-age, and a small short-TTL
+manifest maps each logical (fixed) key to its current versioned key:
+
+    redsox/data/manifest.json  {"artifacts": {logical_key: {"key", "hash", "bytes", ...}}}
+
+A repeat visitor re-reads only the manifest and then the artifacts whose hash
+changed. Publishing content that is already current is a no-op. When a version
+is replaced, its entry records it under "superseded" with the time it stopped
+being current, and it is deleted once it has been superseded for GC_MAX_AGE_DAYS,
+so pages still holding an older manifest keep working in the meantime. (The upload
+time can't be used for that: an artifact that stayed current for weeks would be
+deleted the moment it was replaced.)
+
+The manifest is written conditionally on the ETag it was loaded with; when another
+run wrote it in between, it's re-read, this run's entries are re-applied and the
+write is retried (same approach as scripts/bot_state.py).
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+
+from botocore.exceptions import ClientError
+
+S3_BUCKET = "redsox-data"
+MANIFEST_KEY = "redsox/data/manifest.json"
+IMMUTABLE_CACHE = "public, max-age=31536000, immutable"
+MANIFEST_CACHE = "public, max-age=60"
+HASH_LENGTH = 16
+GC_MAX_AGE_DAYS = 7
+SAVE_RETRIES = 3
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _conflict(e: ClientError) -> bool:
+    code = e.response.get("Error", {}).get("Code")
+    status = e.response.get("ResponseMetadata", {}).get("HTTPStatusCode")
+    return code in ("PreconditionFailed", "ConditionalRequestConflict") or status in (409, 412)
+
+
+def content_hash(body: bytes) -> str:
+    return hashlib.sha256(body).hexdigest()[:HASH_LENGTH]
+
+
+def _split(logical_key: str) -> Tuple[str, str]:
+    """'a/b/name.json' -> ('a/b/name', '.json'); '.json.gz'-style double extensions stay together."""
+    directory, name = os.path.split(logical_key)
+    stem, dot, ext = name.partition(".")
+    return (f"{directory}/{stem}" if directory else stem), (dot + ext)
+
+
+def versioned_key(logical_key: str, hash_: str) -> str:
+    stem, ext = _split(logical_key)
+    return f"{stem}.{hash_}{ext}"
+
+
+def version_pattern(logical_key: str) -> "re.Pattern":
+    """Matches the versioned keys of one artifact (and nothing else)."""
+    stem, ext = _split(logical_key)
+    return re.compile(rf"{re.escape(stem)}\.[0-9a-f]{{{HASH_LENGTH}}}{re.escape(ext)}")
+
+
+class Manifest:
+    def __init__(self, artifacts: Optional[Dict[str, Dict]] = None, etag: Optional[str] = None,
+                 bucket: str = S3_BUCKET, key: str = MANIFEST_KEY):
+        self.artifacts: Dict[str, Dict] = artifacts or {}
+        self.etag = etag
+        self.bucket = bucket
+        self.key = key
+        # Entries set since load, re-applied onto a newer copy if a conditional write loses
+        self._changes: Dict[str, Dict] = {}
+
+    @classmethod
+    def load(cls, s3_client, bucket: str = S3_BUCKET, key: str = MANIFEST_KEY) -> "Manifest":
+        try:
+            obj = s3_client.get_object(Bucket=bucket, Key=key)
+        except ClientError as e:
+            if e.response["Error"]["Code"] != "NoSuchKey":
+                raise
+            return cls(bucket=bucket, key=key)
+        return cls(json.loads(obj["Body"].read()).get("artifacts", {}), etag=obj["ETag"], bucket=bucket, key=key)
+
+    def get(self, logical_key: str) -> Optional[Dict]:
+        return self.artifacts.get(logical_key)
+
+    def set(self, logical_key: str, entry: Dict) -> None:
+        """Make entry current; the version it replaces moves to entry["superseded"] with the time."""
+        previous = self.artifacts.get(logical_key) or {}
+        superseded = dict(entry.get("superseded", previous.get("superseded", {})))
+        if previous.get("key") and previous["key"] != entry["key"]:
+            superseded[previous["key"]] = _now().isoformat()
+        superseded.pop(entry["key"], None)
+        entry = {k: v for k, v in entry.items() if k != "superseded"}
+        if superseded:
+            entry["superseded"] = superseded
+        self.artifacts[logical_key] = entry
+        self._changes[logical_key] = entry
+
+    def to_json(self) -> Dict:
+        return {"updated_at": _now().isoformat(), "artifacts": dict(sorted(self.artifacts.items()))}
+
+    def save(self, s3_client, retries: int = SAVE_RETRIES) -> bool:
+        """Write the manifest if anything changed, merging with a concurrent writer if needed."""
+        if not self._changes:
+            return True
+        for attempt in range(retries + 1):
+            body = json.dumps(self.to_json(), separators=(",", ":")).encode("utf-8")
+            condition = {"IfMatch": self.etag} if self.etag else {"IfNoneMatch": "*"}
+            try:
+                response = s3_client.put_object(Bucket=self.bucket, Key=self.key, Body=body,
+                                                ContentType="application/json", CacheControl=MANIFEST_CACHE,
+                                                **condition)
+                self.etag = response.get("ETag")
+                self._changes = {}
+                logging.info(f"Saved manifest s3://{self.bucket}/{self.key} ({len(self.artifacts)} artifacts)")
+                return True
+            except ClientError as e:
+                if not _conflict(e) or attempt == retries:
+                    logging.error(f"Failed to save manifest: {e}")
+                    return False
+                logging.info("Manifest changed since it was loaded; merging and retrying")
+                changes = self._changes
+                fresh = Manifest.load(s3_client, self.bucket, self.key)
+                self.artifacts, self.etag = fresh.artifacts, fresh.etag
+                self.artifacts.update(changes)
+                self._changes = changes
+        return False
+
+
+def _entry(key: str, hash_: str, size: int, **extra) -> Dict:
+    return {"key": key, "hash": hash_, "bytes": size, "published_at": _now().isoformat(), **extra}
+
+
+def publish_artifact(s3_client, manifest: Manifest, logical_key: str, body: bytes,
+                     content_type: str = "application/json", content_encoding: Optional[str] = None,
+                     keep_fixed: bool = False) -> str:
+    """Upload body under its content-hashed key (if it isn't current already) and record it; returns that key.
+
+    keep_fixed also writes the logical key itself, for readers that don't use the manifest.
+    """
+    hash_ = content_hash(body)
+    key = versioned_key(logical_key, hash_)
+    current = manifest.get(logical_key)
+    extra = {"ContentEncoding": content_encoding} if content_encoding else {}
+    if not current or current.get("hash") != hash_:
+        s3_client.put_object(Bucket=manifest.bucket, Key=key, Body=body, ContentType=content_type,
+                             CacheControl=IMMUTABLE_CACHE, **extra)
+        manifest.set(logical_key, _entry(key, hash_, len(body)))
+        logging.info(f"Published {logical_key} -> {key}")
+    if keep_fixed:
+        s3_client.put_object(Bucket=manifest.bucket, Key=logical_key, Body=body, ContentType=content_type, **extra)
+    return key
+
+
+def publish_existing(s3_client, manifest: Manifest, logical_key: str) -> Optional[str]:
+    """Version an object already uploaded to its fixed key, with a server-side copy.
+
+    The object's ETag (its MD5 for single-part uploads) identifies the content, so an
+    unchanged file costs one HEAD request and nothing is downloaded. Returns the
+    versioned key, or None if the fixed object doesn't exist.
+    """
+    try:
+        head = s3_client.head_object(Bucket=manifest.bucket, Key=logical_key)
+    except ClientError as e:
+        if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+            logging.warning(f"Not publishing {logical_key}: no object at the fixed key")
+            return None
+        raise
+    etag = head["ETag"].strip('"')
+    current = manifest.get(logical_key)
+    if current and current.get("source_etag") == etag:
+        return current["key"]
+
+    hash_ = re.sub(r"[^0-9a-f]", "", etag.lower())[:HASH_LENGTH].ljust(HASH_LENGTH, "0")
+    key = versioned_key(logical_key, hash_)
+    extra = {"ContentEncoding": head["ContentEncoding"]} if head.get("ContentEncoding") else {}
+    s3_client.copy_object(Bucket=manifest.bucket, Key=key, CopySource={"Bucket": manifest.bucket, "Key": logical_key},
+                          MetadataDirective="REPLACE", ContentType=head.get("ContentType") or "application/json",
+                          CacheControl=IMMUTABLE_CACHE, **extra)
+    manifest.set(logical_key, _entry(key, hash_, head.get("ContentLength", 0), source_etag=etag))
+    logging.info(f"Published {logical_key} -> {key}")
+    return key
+
+
+def collect_garbage(s3_client, manifest: Manifest, max_age_days: float = GC_MAX_AGE_DAYS,
+                    now: Optional[datetime] = None) -> List[str]:
+    """Delete versions of the manifest's artifacts that have been superseded for longer than max_age_days.
+
+    Age counts from each entry's "superseded" time, not the object's upload time. A
+    non-current version with no recorded time (published before versions were tracked,
+    or orphaned by a failed manifest save) is recorded as superseded now and gets the
+    full grace period. The manifest is saved with the updated "superseded" maps.
+    """
+    now = now or _now()
+    cutoff = now - timedelta(days=max_age_days)
+    current = {entry["key"] for entry in manifest.artifacts.values()}
+    patterns: Dict[str, List[Tuple[str, "re.Pattern"]]] = {}
+    for logical_key in manifest.artifacts:
+        directory = logical_key.rsplit("/", 1)[0] + "/" if "/" in logical_key else ""
+        patterns.setdefault(directory, []).append((logical_key, version_pattern(logical_key)))
+
+    stale = []
+    kept: Dict[str, Dict[str, str]] = {logical_key: {} for logical_key in manifest.artifacts}
+    paginator = s3_client.get_paginator("list_objects_v2")
+    for prefix, dir_patterns in patterns.items():
+        for page in paginator.paginate(Bucket=manifest.bucket, Prefix=prefix):
+            for obj in page.get("Contents", []):
+                key = obj["Key"]
+                if key in current:
+                    continue
+                logical_key = next((lk for lk, p in dir_patterns if p.fullmatch(key)), None)
+                if logical_key is None:
+                    continue
+                since = manifest.artifacts[logical_key].get("superseded", {}).get(key, now.isoformat())
+                if datetime.fromisoformat(since) < cutoff:
+                    stale.append(key)
+                else:
+                    kept[logical_key][key] = since
+
+    for start in range(0, len(stale), 1000):
+        batch = stale[start:start + 1000]
+        s3_client.delete_objects(Bucket=manifest.bucket, Delete={"Objects": [{"Key": k} for k in batch], "Quiet": True})
+    if stale:
+        logging.info(f"Deleted {len(stale)} old artifact version(s)")
+
+    # Drop deleted (or already missing) versions and record newly seen ones
+    for logical_key, superseded in kept.items():
+        entry = manifest.artifacts[logical_key]
+        if superseded != entry.get("superseded", {}):
+            manifest.set(logical_key, {**entry, "superseded": superseded})
+    manifest.save(s3_client)
+    return stale
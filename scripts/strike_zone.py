@@ -0,0 +1,94 @@
+"""
+Vectorized strike-zone geometry shared by pitch ingestion (20), the umpire
+summary (21) and the called-strike plot (22).
+
+All inputs are in feet from the center of home plate (px horizontal, pz
+vertical), the same units Baseball Savant reports. Missing values may be passed
+as None or NaN; those pitches get NaN distances and are never in the zone.
+"""
+
+from typing import Dict, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+# Strike zone horizontal half-width (in feet) and baseball radius
+SZ_HALF_WIDTH = 0.708
+BALL_RADIUS_FEET = 1.45 / 12
+
+ZONE_COLUMNS = ["dist_from_sz_center_inches", "dist_from_sz_edge_inches", "inside_margin_inches", "pitch_in_zone"]
+
+ArrayLike = Union[np.ndarray, pd.Series, list, float]
+
+
+def _as_float(values: ArrayLike) -> np.ndarray:
+    """1-D float array with NaN for None; non-numeric values are coerced to NaN."""
+    try:
+        return np.atleast_1d(np.asarray(values, dtype=float))
+    except (TypeError, ValueError):
+        return np.asarray(pd.to_numeric(pd.Series(np.atleast_1d(values)), errors="coerce"), dtype=float)
+
+
+def zone_metrics(px: ArrayLike, pz: ArrayLike, sz_top: ArrayLike, sz_bot: ArrayLike,
+                 half_width: ArrayLike = SZ_HALF_WIDTH, ball_radius: float = BALL_RADIUS_FEET) -> Dict[str, np.ndarray]:
+    """Compute zone distances for many pitches at once.
+
+    Returns arrays for:
+    - dist_from_sz_center_inches: ball center to the closest point of the zone rectangle (0 inside)
+    - dist_from_sz_edge_inches: same, minus the ball radius (negative when the ball touches the zone)
+    - inside_margin_inches: depth of the ball's outer edge inside the nearest zone edge (0 when not inside)
+    - pitch_in_zone: any part of the ball touches the zone
+
+    ``half_width`` may be a scalar or a per-pitch array (e.g. per-batter widths).
+    """
+    px, pz, sz_top, sz_bot = (_as_float(v) for v in (px, pz, sz_top, sz_bot))
+    sz_right = np.broadcast_to(_as_float(half_width), px.shape) if not np.isscalar(half_width) else half_width
+    sz_left = -sz_right
+    valid = ~(np.isnan(px) | np.isnan(pz) | np.isnan(sz_top) | np.isnan(sz_bot))
+
+    with np.errstate(invalid="ignore"):
+        # Distance from ball center to closest point on the zone rectangle
+        closest_x = np.maximum(sz_left, np.minimum(sz_right, px))
+        closest_z = np.maximum(sz_bot, np.minimum(sz_top, pz))
+        center_feet = np.sqrt((px - closest_x) ** 2 + (pz - closest_z) ** 2)
+
+        # Minimal center-to-edge gap; only positive when the center is inside the rectangle
+        min_gap_feet = np.minimum(np.minimum(px - sz_left, sz_right - px), np.minimum(pz - sz_bot, sz_top - pz))
+        inside_margin = np.maximum(0.0, (min_gap_feet - ball_radius) * 12)
+
+        in_zone = valid & (center_feet <= ball_radius)
+
+    center_feet = np.where(valid, center_feet, np.nan)
+    return {
+        "dist_from_sz_center_inches": center_feet * 12,
+        "dist_from_sz_edge_inches": (center_feet - ball_radius) * 12,
+        "inside_margin_inches": np.where(valid, inside_margin, np.nan),
+        "pitch_in_zone": in_zone,
+    }
+
+
+def to_nullable_list(values: np.ndarray) -> list:
+    """Convert a float array to a list of Python floats with None for NaN (JSON-friendly)."""
+    return [None if v != v else v for v in values.tolist()]
+
+
+def annotate(df: pd.DataFrame, overwrite: bool = False, half_width: Optional[ArrayLike] = None) -> pd.DataFrame:
+    """Add or fill the zone columns on a pitch DataFrame with px/pz/sz_top/sz_bot columns.
+
+    Existing values are kept unless ``overwrite`` is set; only missing columns and
+    missing values are computed.
+    """
+    if df.empty or not {"px", "pz", "sz_top", "sz_bot"}.issubset(df.columns):
+        return df
+    metrics = zone_metrics(df["px"], df["pz"], df["sz_top"], df["sz_bot"],
+                           half_width=SZ_HALF_WIDTH if half_width is None else half_width)
+    df = df.copy()
+    for column in ZONE_COLUMNS:
+        computed = pd.Series(metrics[column], index=df.index)
+        if overwrite or column not in df.columns:
+            df[column] = computed
+        elif column == "pitch_in_zone":
+            df[column] = df[column].where(df[column].notna(), computed).astype(bool)
+        else:
+            df[column] = pd.to_numeric(df[column], errors="coerce").fillna(computed)
+    return df
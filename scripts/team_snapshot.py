@@ -0,0 +1,66 @@
+"""
+One statsapi schedule payload for the team covering the recent past and near
+future, indexed by game status and date.
+
+07 fetches it once per run (last N days through the next N days, with linescore,
+venue and probable pitchers). The last-game summary, last-game result and
+next-game helpers all read from it instead of each calling statsapi.
+"""
+
+from collections import defaultdict
+from datetime import date, timedelta
+from typing import Dict, List, Optional
+
+SNAPSHOT_DAYS_BACK = 5
+SNAPSHOT_DAYS_AHEAD = 10
+SNAPSHOT_HYDRATE = "team,linescore,venue,probablePitcher"
+SCHEDULE_URL = "https://statsapi.mlb.com/api/v1/schedule"
+
+
+def snapshot_params(team_id: int, today: date, days_back: int = SNAPSHOT_DAYS_BACK,
+                    days_ahead: int = SNAPSHOT_DAYS_AHEAD) -> Dict[str, str]:
+    return {
+        "sportId": "1",
+        "teamId": str(team_id),
+        "startDate": (today - timedelta(days=days_back)).strftime('%Y-%m-%d'),
+        "endDate": (today + timedelta(days=days_ahead)).strftime('%Y-%m-%d'),
+        "hydrate": SNAPSHOT_HYDRATE,
+    }
+
+
+class TeamGameSnapshot:
+    def __init__(self, payload: Dict, team_id: int, today: date):
+        self.team_id = team_id
+        self.today = today.strftime('%Y-%m-%d')
+        # Games in schedule order (by date, then as listed for doubleheaders)
+        self.games: List[Dict] = []
+        self.by_status: Dict[str, List[Dict]] = defaultdict(list)
+        self.by_date: Dict[str, List[Dict]] = defaultdict(list)
+        for day in payload.get("dates", []):
+            for game in day.get("games", []):
+                game = {**game, "_date": day.get("date", game.get("officialDate", ""))}
+                self.games.append(game)
+                self.by_status[game.get("status", {}).get("abstractGameState")].append(game)
+                self.by_date[game["_date"]].append(game)
+
+    def last_final(self, since: Optional[date] = None) -> Optional[Dict]:
+        """Most recent Final game, optionally no earlier than `since`."""
+        finals = self.by_status.get("Final", [])
+        if not finals:
+            return None
+        game = finals[-1]
+        if since is not None and game["_date"] < since.strftime('%Y-%m-%d'):
+            return None
+        return game
+
+    def next_preview(self) -> Optional[Dict]:
+        """First scheduled (Preview) game from today on."""
+        return next((g for g in self.by_status.get("Preview", []) if g["_date"] >= self.today), None)
+
+    def team_side(self, game: Dict) -> Optional[str]:
+        """'home' or 'away' for the snapshot's team in a game."""
+        teams = game.get("teams", {})
+        for side in ("away", "home"):
+            if teams.get(side, {}).get("team", {}).get("id") == self.team_id:
+                return side
+        return None
@@ -0,0 +1,147 @@
+"""
+The 30 MLB clubs with the identifiers the scripts need: statsapi id and
+abbreviation, Baseball Reference code, names, home time zone and division.
+
+config.py still picks the dashboard's own team; this registry is what the
+league-wide fan-out (scripts/league_fanout.py) iterates over, and what scripts use to
+map between statsapi, BBRef and display names.
+"""
+
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from scripts import config
+
+
+class Team(NamedTuple):
+    team_id: int
+    abbr: str
+    bbref: str
+    name: str
+    city: str
+    full_name: str
+    timezone: str
+    league: str
+    division: str
+
+
+TEAMS: List[Team] = [
+    Team(108, "LAA", "LAA", "Angels", "Los Angeles", "Los Angeles Angels", "America/Los_Angeles", "AL", "AL West"),
+    Team(109, "ARI", "ARI", "D-backs", "Arizona", "Arizona Diamondbacks", "America/Phoenix", "NL", "NL West"),
+    Team(110, "BAL", "BAL", "Orioles", "Baltimore", "Baltimore Orioles", "America/New_York", "AL", "AL East"),
+    Team(111, "BOS", "BOS", "Red Sox", "Boston", "Boston Red Sox", "America/New_York", "AL", "AL East"),
+    Team(112, "CHC", "CHC", "Cubs", "Chicago", "Chicago Cubs", "America/Chicago", "NL", "NL Central"),
+    Team(113, "CIN", "CIN", "Reds", "Cincinnati", "Cincinnati Reds", "America/New_York", "NL", "NL Central"),
+    Team(114, "CLE", "CLE", "Guardians", "Cleveland", "Cleveland Guardians", "America/New_York", "AL", "AL Central"),
+    Team(115, "COL", "COL", "Rockies", "Colorado", "Colorado Rockies", "America/Denver", "NL", "NL West"),
+    Team(116, "DET", "DET", "Tigers", "Detroit", "Detroit Tigers", "America/Detroit", "AL", "AL Central"),
+    Team(117, "HOU", "HOU", "Astros", "Houston", "Houston Astros", "America/Chicago", "AL", "AL West"),
+    Team(118, "KC", "KCR", "Royals", "Kansas City", "Kansas City Royals", "America/Chicago", "AL", "AL Central"),
+    Team(119, "LAD", "LAD", "Dodgers", "Los Angeles", "Los Angeles Dodgers", "America/Los_Angeles", "NL", "NL West"),
+    Team(120, "WSH", "WSN", "Nationals", "Washington", "Washington Nationals", "America/New_York", "NL", "NL East"),
+    Team(121, "NYM", "NYM", "Mets", "New York", "New York Mets", "America/New_York", "NL", "NL East"),
+    Team(133, "ATH", "ATH", "Athletics", "Sacramento", "Athletics", "America/Los_Angeles", "AL", "AL West"),
+    Team(134, "PIT", "PIT", "Pirates", "Pittsburgh", "Pittsburgh Pirates", "America/New_York", "NL", "NL Central"),
+    Team(135, "SD", "SDP", "Padres", "San Diego", "San Diego Padres", "America/Los_Angeles", "NL", "NL West"),
+    Team(136, "SEA", "SEA", "Mariners", "Seattle", "Seattle Mariners", "America/Los_Angeles", "AL", "AL West"),
+    Team(137, "SF", "SFG", "Giants", "San Francisco", "San Francisco Giants", "America/Los_Angeles", "NL", "NL West"),
+    Team(138, "STL", "STL", "Cardinals", "St. Louis", "St. Louis Cardinals", "America/Chicago", "NL", "NL Central"),
+    Team(139, "TB", "TBR", "Rays", "Tampa Bay", "Tampa Bay Rays", "America/New_York", "AL", "AL East"),
+    Team(140, "TEX", "TEX", "Rangers", "Texas", "Texas Rangers", "America/Chicago", "AL", "AL West"),
+    Team(141, "TOR", "TOR", "Blue Jays", "Toronto", "Toronto Blue Jays", "America/Toronto", "AL", "AL East"),
+    Team(142, "MIN", "MIN", "Twins", "Minnesota", "Minnesota Twins", "America/Chicago", "AL", "AL Central"),
+    Team(143, "PHI", "PHI", "Phillies", "Philadelphia", "Philadelphia Phillies", "America/New_York", "NL", "NL East"),
+    Team(144, "ATL", "ATL", "Braves", "Atlanta", "Atlanta Braves", "America/New_York", "NL", "NL East"),
+    Team(145, "CWS", "CHW", "White Sox", "Chicago", "Chicago White Sox", "America/Chicago", "AL", "AL Central"),
+    Team(146, "MIA", "MIA", "Marlins", "Miami", "Miami Marlins", "America/New_York", "NL", "NL East"),
+    Team(147, "NYY", "NYY", "Yankees", "New York", "New York Yankees", "America/New_York", "AL", "AL East"),
+    Team(158, "MIL", "MIL", "Brewers", "Milwaukee", "Milwaukee Brewers", "America/Chicago", "NL", "NL Central"),
+]
+
+BY_ID: Dict[int, Team] = {t.team_id: t for t in TEAMS}
+BY_ABBR: Dict[str, Team] = {t.abbr: t for t in TEAMS}
+BY_BBREF: Dict[str, Team] = {t.bbref: t for t in TEAMS}
+BY_FULL_NAME: Dict[str, Team] = {t.full_name: t for t in TEAMS}
+# Names some sources still use for relocated or renamed clubs
+BY_FULL_NAME.update({
+    "Oakland Athletics": BY_ABBR["ATH"],
+    "Cleveland Indians": BY_ABBR["CLE"],
+})
+
+
+# Each franchise's BBRef codes over time: (first season, last season or None, code).
+# Franchises founded after 1901 start in their first season.
+FRANCHISE_ERAS: Dict[str, List[Tuple[int, Optional[int], str]]] = {
+    "ARI": [(1998, None, "ARI")],
+    "ATH": [(1901, 1954, "PHA"), (1955, 1967, "KCA"), (1968, 2024, "OAK"), (2025, None, "ATH")],
+    "ATL": [(1901, 1952, "BSN"), (1953, 1965, "MLN"), (1966, None, "ATL")],
+    "BAL": [(1901, 1901, "MLA"), (1902, 1953, "SLB"), (1954, None, "BAL")],
+    "BOS": [(1901, None, "BOS")],
+    "CHC": [(1901, None, "CHC")],
+    "CIN": [(1901, None, "CIN")],
+    "CLE": [(1901, None, "CLE")],
+    "COL": [(1993, None, "COL")],
+    "CWS": [(1901, None, "CHW")],
+    "DET": [(1901, None, "DET")],
+    "HOU": [(1962, None, "HOU")],
+    "KC": [(1969, None, "KCR")],
+    "LAA": [(1961, 1964, "LAA"), (1965, 1996, "CAL"), (1997, 2004, "ANA"), (2005, None, "LAA")],
+    "LAD": [(1901, 1957, "BRO"), (1958, None, "LAD")],
+    "MIA": [(1993, 2011, "FLA"), (2012, None, "MIA")],
+    "MIL": [(1969, 1969, "SEP"), (1970, None, "MIL")],
+    "MIN": [(1901, 1960, "WSH"), (1961, None, "MIN")],
+    "NYM": [(1962, None, "NYM")],
+    "NYY": [(1901, 1902, "BLA"), (1903, None, "NYY")],
+    "PHI": [(1901, None, "PHI")],
+    "PIT": [(1901, None, "PIT")],
+    "SD": [(1969, None, "SDP")],
+    "SEA": [(1977, None, "SEA")],
+    "SF": [(1901, 1957, "NYG"), (1958, None, "SFG")],
+    "STL": [(1901, None, "STL")],
+    "TB": [(1998, 2007, "TBD"), (2008, None, "TBR")],
+    "TEX": [(1961, 1971, "WSA"), (1972, None, "TEX")],
+    "TOR": [(1977, None, "TOR")],
+    "WSH": [(1969, 2004, "MON"), (2005, None, "WSN")],
+}
+
+
+def get(key) -> Optional[Team]:
+    """A team by statsapi id, statsapi or BBRef abbreviation, or full name."""
+    if isinstance(key, int) or (isinstance(key, str) and key.isdigit()):
+        return BY_ID.get(int(key))
+    key = str(key).strip()
+    return BY_ABBR.get(key.upper()) or BY_BBREF.get(key.upper()) or BY_FULL_NAME.get(key)
+
+
+def current() -> Team:
+    """The team configured in config.py."""
+    return BY_ID[config.TEAM_ID]
+
+
+def select(keys: Optional[List[str]] = None) -> List[Team]:
+    """Teams for a list of ids/abbreviations/names (all 30 when empty); unknown keys raise ValueError."""
+    if not keys:
+        return list(TEAMS)
+    selected = []
+    for key in keys:
+        team = get(key)
+        if team is None:
+            raise ValueError(f"Unknown team: {key}")
+        if team not in selected:
+            selected.append(team)
+    return selected
+
+
+def bbref_code(abbr: str, year: int) -> Optional[str]:
+    """The franchise's BBRef code in a season (None before it existed)."""
+    for first, last, code in FRANCHISE_ERAS.get(abbr, []):
+        if first <= year and (last is None or year <= last):
+            return code
+    return None
+
+
+def franchise_for_code(code: str, year: int) -> Optional[Team]:
+    """The franchise a season's BBRef code belonged to ("WSH" is the Twins' franchise before 1961)."""
+    for abbr, eras in FRANCHISE_ERAS.items():
+        if bbref_code(abbr, year) == code:
+            return BY_ABBR[abbr]
+    return None
@@ -0,0 +1,129 @@
+"""
+Indexed store for team transactions scraped from mlb.com (used by 19).
+
+Each transaction is keyed by a hash of its date and text, so re-fetched months
+are merged with INSERT OR IGNORE instead of a concat + drop_duplicates over the
+whole archive. The store also records which months are sealed: once a month has
+been fetched at least SEAL_AFTER_DAYS after it ended, later runs stop fetching
+it and only the open months are requested. The "latest N" view is read off the
+date index.
+
+The store is a single SQLite file, so it can be synced to and from S3 as-is.
+"""
+
+import hashlib
+import json
+import sqlite3
+from datetime import date, timedelta
+from typing import Dict, Iterable, List
+
+from dateutil.relativedelta import relativedelta
+
+LOOKBACK_MONTHS = 4
+SEAL_AFTER_DAYS = 7
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS transactions (
+    key TEXT PRIMARY KEY,
+    date TEXT NOT NULL,
+    month TEXT NOT NULL,
+    "transaction" TEXT NOT NULL,
+    players TEXT
+);
+CREATE INDEX IF NOT EXISTS transactions_date ON transactions (date DESC);
+CREATE TABLE IF NOT EXISTS months (
+    month TEXT PRIMARY KEY,
+    fetched_on TEXT NOT NULL,
+    sealed INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+
+def transaction_key(date_str: str, text: str) -> str:
+    """Stable id for a transaction (same date + text -> same key)."""
+    return hashlib.sha1(f"{date_str}|{' '.join(text.split())}".encode("utf-8")).hexdigest()[:20]
+
+
+def month_of(date_str: str) -> str:
+    return date_str[:7]
+
+
+def recent_months(today: date, lookback: int = LOOKBACK_MONTHS) -> List[str]:
+    """'YYYY-MM' for the current month and the lookback - 1 before it, newest first."""
+    return [(today - relativedelta(months=i)).strftime("%Y-%m") for i in range(lookback)]
+
+
+def is_sealable(month: str, fetched_on: date, seal_after_days: int = SEAL_AFTER_DAYS) -> bool:
+    """A month is final once it was fetched seal_after_days after it ended (late postings included)."""
+    year, mon = (int(part) for part in month.split("-"))
+    next_month = date(year, mon, 1) + relativedelta(months=1)
+    return fetched_on >= next_month + timedelta(days=seal_after_days)
+
+
+class TransactionStore:
+    def __init__(self, path: str):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __len__(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM transactions").fetchone()[0]
+
+    def insert(self, rows: Iterable[Dict]) -> int:
+        """Add rows ({date: 'YYYY-MM-DD', transaction, players}); returns how many were new."""
+        records = [
+            (transaction_key(r["date"], r["transaction"]), r["date"], month_of(r["date"]), r["transaction"],
+             json.dumps(r.get("players")) if r.get("players") is not None else None)
+            for r in rows
+        ]
+        before = self.conn.total_changes
+        with self.conn:
+            self.conn.executemany(
+                'INSERT OR IGNORE INTO transactions (key, date, month, "transaction", players) VALUES (?, ?, ?, ?, ?)',
+                records,
+            )
+        return self.conn.total_changes - before
+
+    def _rows(self, sql: str, params=()) -> List[Dict]:
+        cursor = self.conn.execute(sql, params)
+        return [
+            {"date": d, "transaction": text, "players": json.loads(players) if players else None}
+            for d, text, players in cursor
+        ]
+
+    def latest(self, limit: int = 100) -> List[Dict]:
+        """The most recent transactions, newest first."""
+        return self._rows(
+            'SELECT date, "transaction", players FROM transactions ORDER BY date DESC, rowid DESC LIMIT ?', (limit,)
+        )
+
+    def since(self, date_str: str) -> List[Dict]:
+        return self._rows(
+            'SELECT date, "transaction", players FROM transactions WHERE date >= ? ORDER BY date DESC, rowid DESC',
+            (date_str,),
+        )
+
+    def all(self) -> List[Dict]:
+        return self._rows('SELECT date, "transaction", players FROM transactions ORDER BY date DESC, rowid DESC')
+
+    def sealed_months(self) -> set:
+        return {row[0] for row in self.conn.execute("SELECT month FROM months WHERE sealed = 1")}
+
+    def months_to_fetch(self, today: date, lookback: int = LOOKBACK_MONTHS) -> List[str]:
+        """Recent months that are not sealed yet (always includes the current month)."""
+        sealed = self.sealed_months()
+        return [m for m in recent_months(today, lookback) if m not in sealed]
+
+    def mark_fetched(self, month: str, fetched_on: date, seal_after_days: int = SEAL_AFTER_DAYS) -> bool:
+        """Record a successful fetch of a month; returns True if the month is now sealed."""
+        sealed = is_sealable(month, fetched_on, seal_after_days)
+        with self.conn:
+            self.conn.execute(
+                "INSERT INTO months (month, fetched_on, sealed) VALUES (?, ?, ?) "
+                "ON CONFLICT(month) DO UPDATE SET fetched_on = excluded.fetched_on, sealed = excluded.sealed",
+                (month, fetched_on.isoformat(), int(sealed)),
+            )
+        return sealed
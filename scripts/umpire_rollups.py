@@ -0,0 +1,236 @@
+"""
+Per-game umpire accuracy rollups for the pitch files written by 20.
+
+A rollup store holds, for every game_pk, the called-strike/ball counts, bad-call
+counts and the worst-call candidates for each role:
+- "batting": pitches thrown to the team; bad calls are called strikes outside the zone
+- "pitching": pitches thrown by the team; bad calls are balls inside the zone
+
+Only games that are new (or whose pitch count changed) are rolled up again, so a
+daily run costs roughly one game. The season, last-game, worst-of-season, monthly
+and per-umpire views are all derived from the stored per-game entries.
+"""
+
+from collections import Counter
+from typing import Callable, Dict, List, Optional, Set
+
+import pandas as pd
+
+from scripts import strike_zone
+
+ROLLUP_VERSION = 1
+WORST_CALLS = 4
+# Pitching-side candidates closer than this to the edge are borderline, not egregious
+MIN_INSIDE_INCHES = 2.0
+
+ROLES = {
+    "batting": {"pitch_call": "called_strike", "bad_in_zone": False},
+    "pitching": {"pitch_call": "ball", "bad_in_zone": True},
+}
+
+
+def new_store(season) -> Dict:
+    return {"version": ROLLUP_VERSION, "season": str(season), "games": {}}
+
+
+def _py(value):
+    """Numpy scalar -> plain Python value for json.dump; NaN -> None."""
+    if hasattr(value, "item"):
+        value = value.item()
+    if isinstance(value, float) and value != value:
+        return None
+    return value
+
+
+def _call_record(row, distance: float) -> Dict:
+    return {
+        "distance_inches": _py(distance),
+        "batter": _py(row["batter"]),
+        "pitcher": _py(row["pitcher"]),
+        "pitch_type": _py(row["pitch_name"]),
+        "velocity_mph": _py(row["pitch_velocity"]),
+        "date": row["game_date"].strftime('%Y-%m-%d'),
+        "date_formatted": row["game_date"].strftime('%B %-d, %Y'),
+        "video_link": f"https://baseballsavant.mlb.com/sporty-videos?playId={row['pitch_id']}",
+    }
+
+
+def rollup_games(df: pd.DataFrame, role: str) -> Dict[str, Dict]:
+    """Roll up a DataFrame of pitch rows (any number of games) for one role, keyed by game_pk."""
+    spec = ROLES[role]
+    df = strike_zone.annotate(df)
+    df["game_date"] = pd.to_datetime(df["game_date"])
+    df["dist_from_sz_edge_inches"] = pd.to_numeric(df["dist_from_sz_edge_inches"], errors="coerce")
+
+    called = df[df["pitch_call"] == spec["pitch_call"]]
+    bad_calls = called[called["pitch_in_zone"].astype(bool) == spec["bad_in_zone"]]
+
+    bad = bad_calls.copy()
+    if role == "batting":
+        bad = bad.dropna(subset=["dist_from_sz_edge_inches"])
+        bad["rank_inches"] = bad["dist_from_sz_edge_inches"]
+    else:
+        # Depth inside the zone (ball's outer edge to the nearest zone edge); annotate always adds it
+        bad = bad.dropna(subset=["inside_margin_inches"])
+        bad["rank_inches"] = pd.to_numeric(bad["inside_margin_inches"], errors="coerce")
+    ranked = bad[bad["rank_inches"] >= MIN_INSIDE_INCHES] if role == "pitching" else bad
+    worst = ranked.sort_values("rank_inches", ascending=False, kind="stable").groupby("game_pk").head(WORST_CALLS)
+
+    pitch_counts = df.groupby("game_pk").size()
+    called_counts = called.groupby("game_pk").size()
+    bad_counts = bad_calls.groupby("game_pk").size()
+    game_dates = df.groupby("game_pk")["game_date"].max()
+    worst_by_game: Dict = {}
+    for _, row in worst.iterrows():
+        worst_by_game.setdefault(row["game_pk"], []).append(_call_record(row, row["rank_inches"]))
+
+    return {
+        str(_py(game_pk)): {
+            "game_date": game_dates[game_pk].strftime('%Y-%m-%d'),
+            "pitches": int(count),
+            "called": int(called_counts.get(game_pk, 0)),
+            "bad": int(bad_counts.get(game_pk, 0)),
+            "worst": worst_by_game.get(game_pk, []),
+        }
+        for game_pk, count in pitch_counts.items()
+    }
+
+
+def update_rollups(store: Dict, pitches: List[Dict], role: str,
+                   fetch_umpire: Optional[Callable[[int], Optional[Dict]]] = None) -> List[str]:
+    """Bring one role of the store in line with a season pitch list.
+
+    Games that are new or whose pitch count changed are rolled up again; games no
+    longer in the list are dropped. When fetch_umpire is given, it is called for
+    every listed game that has no home plate umpire yet, so a lookup that failed
+    is retried on the next update. Returns the game_pks rolled up.
+    """
+    counts = Counter(str(p.get("game_pk")) for p in pitches)
+    return sync_rollups(store, counts, lambda stale: pd.DataFrame([p for p in pitches if str(p.get("game_pk")) in stale]),
+                        role, fetch_umpire)
+
+
+def sync_rollups(store: Dict, counts: Dict[str, int], load_games: Callable[[Set[str]], pd.DataFrame], role: str,
+                 fetch_umpire: Optional[Callable[[int], Optional[Dict]]] = None) -> List[str]:
+    """update_rollups from per-game pitch counts ({game_pk: pitches}) and a loader for the stale games.
+
+    Lets a caller that can count and select games itself (21, with SQL over the
+    season's parquet) read only the games that need rolling up.
+    """
+    games = store.setdefault("games", {})
+    stale = {
+        pk for pk, count in counts.items()
+        if games.get(pk, {}).get(role, {}).get("pitches") != count
+    }
+    for pk in list(games):
+        if role in games[pk] and pk not in counts:
+            del games[pk][role]
+            if not any(r in games[pk] for r in ROLES):
+                del games[pk]
+
+    if stale:
+        for pk, entry in rollup_games(load_games(stale), role).items():
+            game = games.setdefault(pk, {})
+            game["game_date"] = entry.pop("game_date")
+            game[role] = entry
+
+    if fetch_umpire is not None:
+        for pk in sorted(counts):
+            game = games.get(pk, {})
+            if game and not game.get("home_plate_umpire"):
+                game["home_plate_umpire"] = fetch_umpire(int(pk))
+    return sorted(stale)
+
+
+def merge_game(entry: Optional[Dict], new: Dict) -> Dict:
+    """Add the rollup of more pitches from the same game to a game's entry for one role.
+
+    Lets a game be rolled up incrementally, e.g. at-bat by at-bat while it is live.
+    """
+    if not entry:
+        return new
+    worst = sorted(entry["worst"] + new["worst"], key=lambda c: -c["distance_inches"])[:WORST_CALLS]
+    return {
+        "pitches": entry["pitches"] + new["pitches"],
+        "called": entry["called"] + new["called"],
+        "bad": entry["bad"] + new["bad"],
+        "worst": worst,
+    }
+
+
+def _pcts(total: int, bad: int):
+    correct = total - bad
+    correct_pct = (correct / total * 100) if total > 0 else 0
+    return correct, correct_pct, 100 - correct_pct
+
+
+def _role_games(store: Dict, role: str) -> Dict[str, Dict]:
+    return {pk: game for pk, game in store.get("games", {}).items() if role in game}
+
+
+def season_view(store: Dict, role: str) -> Dict:
+    games = _role_games(store, role)
+    total = sum(g[role]["called"] for g in games.values())
+    bad = sum(g[role]["bad"] for g in games.values())
+    _, correct_pct, incorrect_pct = _pcts(total, bad)
+    return {"total": total, "bad": bad, "correct_pct": correct_pct, "incorrect_pct": incorrect_pct}
+
+
+def last_game_view(store: Dict, role: str) -> Optional[Dict]:
+    """Totals for the most recent game date (both games of a doubleheader), plus its primary game_pk."""
+    games = _role_games(store, role)
+    if not games:
+        return None
+    last_date = max(g["game_date"] for g in games.values())
+    on_date = {pk: g for pk, g in games.items() if g["game_date"] == last_date}
+    total = sum(g[role]["called"] for g in on_date.values())
+    bad = sum(g[role]["bad"] for g in on_date.values())
+    correct, correct_pct, incorrect_pct = _pcts(total, bad)
+    # The game with the most pitch rows that day (lowest game_pk on ties)
+    primary = min(on_date, key=lambda pk: (-on_date[pk][role]["pitches"], int(pk)))
+    return {
+        "date": pd.Timestamp(last_date),
+        "total": total,
+        "bad": bad,
+        "correct": correct,
+        "correct_pct": correct_pct,
+        "incorrect_pct": incorrect_pct,
+        "game_pk": primary,
+        "home_plate_umpire": on_date[primary].get("home_plate_umpire"),
+    }
+
+
+def worst_calls(store: Dict, role: str, limit: int = WORST_CALLS) -> List[Dict]:
+    games = _role_games(store, role)
+    candidates = [
+        call
+        for _, game in sorted(games.items(), key=lambda item: (item[1]["game_date"], int(item[0])))
+        for call in game[role]["worst"]
+    ]
+    return sorted(candidates, key=lambda c: -c["distance_inches"])[:limit]
+
+
+def grouped_view(store: Dict, role: str, key: Callable[[str, Dict], Optional[str]]) -> List[Dict]:
+    """Season totals grouped by key(game_pk, game), e.g. by month or by home plate umpire."""
+    groups: Dict[str, Dict] = {}
+    for pk, game in _role_games(store, role).items():
+        name = key(pk, game)
+        if name is None:
+            continue
+        group = groups.setdefault(name, {"games": 0, "total": 0, "bad": 0})
+        group["games"] += 1
+        group["total"] += game[role]["called"]
+        group["bad"] += game[role]["bad"]
+    rows = []
+    for name, group in sorted(groups.items()):
+        _, correct_pct, incorrect_pct = _pcts(group["total"], group["bad"])
+        rows.append({"key": name, **group, "correct_pct": correct_pct, "incorrect_pct": incorrect_pct})
+    return rows
+
+
+def by_month(store: Dict, role: str) -> List[Dict]:
+    return grouped_view(store, role, lambda pk, game: game["game_date"][:7])
+
+
+def by_umpire(store: Dict, role: str) -> List[Dict]:
+    return grouped_view(store, role, lambda pk, game: (game.get("home_plate_umpire") or {}).get("name"))
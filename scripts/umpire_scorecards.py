@@ -0,0 +1,236 @@
+"""
+League-wide home plate umpire scorecards.
+
+21 and 27 only score the umpire of the team's own games. This scores every
+MLB regular-season game. One schedule request lists the season's final games.
+Each game's statsapi live feed (through the shared gamefeed cache) supplies both
+the home plate umpire and the called pitches, so it's a single download per
+game. The called pitches are stored as one date-partitioned parquet file per game:
+
+    data/umpires/calls/{season}/{date}/{game_pk}.parquet
+
+A game whose file exists is never processed again, so a daily run only fetches
+the new games (in parallel). Zone geometry is computed with the vectorized
+strike_zone engine once per game, and the scorecards are pandas group-bys over
+the season's partitions (300k+ called pitches), not per-pitch Python loops.
+
+Per umpire and season:
+- accuracy: share of called pitches where strike == in zone
+- consistency: standard deviation of per-game accuracy (lower is steadier)
+- favor: net missed calls per team; a missed strike favors the fielding team
+  and a missed ball favors the batting team
+"""
+
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+import requests
+
+from scripts import game_pitches
+from scripts import gamefeed_cache
+from scripts import strike_zone
+from scripts import teams
+
+SCHEDULE_URL = "https://statsapi.mlb.com/api/v1/schedule"
+OUT_DIR = os.path.join("data", "umpires", "calls")
+DEFAULT_WORKERS = 8
+CALLED = ("called_strike", "ball")
+
+
+def season_games(season: int) -> List[Dict]:
+    """Every final regular-season game of the season: [{gamePk, game_date}]."""
+    params = {"sportId": 1, "season": season, "gameType": "R"}
+    response = requests.get(SCHEDULE_URL, params=params, timeout=60)
+    response.raise_for_status()
+    games, seen = [], set()
+    for day in response.json().get("dates", []):
+        for g in day.get("games", []):
+            status = g.get("status", {})
+            if status.get("abstractGameState") != "Final" or status.get("detailedState") in ("Postponed", "Cancelled"):
+                continue
+            if g.get("gamePk") in seen:
+                continue
+            seen.add(g.get("gamePk"))
+            games.append({"gamePk": g.get("gamePk"), "game_date": g.get("officialDate") or day.get("date")})
+    return games
+
+
+def partition_path(season: int, game_date: str, game_pk: int, out_dir: str = OUT_DIR) -> str:
+    return os.path.join(out_dir, str(season), str(game_date), f"{int(game_pk)}.parquet")
+
+
+def _abbr(team_id) -> Optional[str]:
+    team = teams.BY_ID.get(team_id)
+    return team.abbr if team else None
+
+
+def called_pitches(feed: Dict) -> pd.DataFrame:
+    """The called pitches of one game (statsapi live feed), with the umpire, teams and zone columns."""
+    game_data = feed.get("gameData", {})
+    umpire = game_pitches.home_plate_umpire(feed) or {}
+    home = _abbr(game_data.get("teams", {}).get("home", {}).get("id"))
+    away = _abbr(game_data.get("teams", {}).get("away", {}).get("id"))
+
+    rows = []
+    for play in feed.get("liveData", {}).get("plays", {}).get("allPlays", []):
+        top = play.get("about", {}).get("halfInning") == "top"
+        for pitch in game_pitches.at_bat_pitches(play):
+            if pitch["pitch_call"] in CALLED:
+                rows.append((pitch["inning"], pitch["ab_number"], pitch["pitch_number"], pitch["pitch_call"],
+                             away if top else home, home if top else away,
+                             pitch["px"], pitch["pz"], pitch["sz_top"], pitch["sz_bot"]))
+    df = pd.DataFrame(rows, columns=["inning", "ab_number", "pitch_number", "pitch_call", "batting_team",
+                                     "fielding_team", "px", "pz", "sz_top", "sz_bot"])
+    for col in ("px", "pz", "sz_top", "sz_bot"):
+        df[col] = pd.to_numeric(df[col], errors="coerce").astype(float)
+
+    zone = strike_zone.zone_metrics(df["px"], df["pz"], df["sz_top"], df["sz_bot"])
+    df["pitch_in_zone"] = zone["pitch_in_zone"]
+    df["dist_from_sz_edge_inches"] = zone["dist_from_sz_edge_inches"]
+    # Pitches without tracking data can't be scored
+    df = df[~np.isnan(zone["dist_from_sz_center_inches"])]
+    df.insert(0, "game_pk", feed.get("gamePk") or game_data.get("game", {}).get("pk"))
+    df.insert(1, "game_date", game_data.get("datetime", {}).get("officialDate"))
+    df.insert(2, "umpire_id", umpire.get("id"))
+    df.insert(3, "umpire_name", umpire.get("name"))
+    df.insert(4, "home_team", home)
+    df.insert(5, "away_team", away)
+    return df.reset_index(drop=True)
+
+
+def process_game(season: int, game: Dict, out_dir: str = OUT_DIR,
+                 fetch: Optional[Callable[[int], Dict]] = None) -> int:
+    """Write one game's called pitches (atomically); returns how many."""
+    feed = (fetch or (lambda pk: gamefeed_cache.get("statsapi", pk)))(game["gamePk"])
+    if not feed:
+        raise ValueError("empty live feed")
+    if not game_pitches.home_plate_umpire(feed):
+        raise ValueError("no home plate umpire listed yet")
+    df = called_pitches(feed)
+    if df.empty:
+        # An all-null zero-row file would break reading the season directory; retry on the next run
+        raise ValueError("no tracked called pitches yet")
+    path = partition_path(season, game["game_date"], game["gamePk"], out_dir)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # Dot-prefixed so a leftover temp file is never read as a partition
+    tmp = os.path.join(os.path.dirname(path), f".{os.path.basename(path)}.tmp")
+    df.to_parquet(tmp, index=False)
+    os.replace(tmp, path)
+    return len(df)
+
+
+def ingest(season: int, workers: int = DEFAULT_WORKERS, out_dir: str = OUT_DIR,
+           games: Optional[List[Dict]] = None, fetch: Optional[Callable[[int], Dict]] = None) -> Dict[str, int]:
+    """Fetch and partition the season's games that aren't on disk yet; returns counts by outcome."""
+    games = season_games(season) if games is None else games
+    todo = [g for g in games if not os.path.exists(partition_path(season, g["game_date"], g["gamePk"], out_dir))]
+    logging.info(f"{season}: {len(games)} final games, {len(todo)} to fetch with {workers} worker(s)")
+    counts = {"done": 0, "failed": 0, "pitches": 0}
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        futures = {pool.submit(process_game, season, game, out_dir, fetch): game for game in todo}
+        for n, future in enumerate(as_completed(futures), start=1):
+            game = futures[future]
+            try:
+                counts["pitches"] += future.result()
+                counts["done"] += 1
+            except Exception as e:
+                logging.warning(f"Game {game['gamePk']} ({game['game_date']}) skipped: {e}")
+                counts["failed"] += 1
+            if n % 200 == 0:
+                logging.info(f"{n}/{len(todo)} games processed")
+    return counts
+
+
+def load_calls(season: int, out_dir: str = OUT_DIR) -> pd.DataFrame:
+    """All partitioned called pitches of a season."""
+    season_dir = os.path.join(out_dir, str(season))
+    if not os.path.isdir(season_dir) or not any(files for _, _, files in os.walk(season_dir)):
+        return pd.DataFrame()
+    return pd.read_parquet(season_dir)
+
+
+def _score(calls: pd.DataFrame) -> pd.DataFrame:
+    """Adds correct / missed_strike / missed_ball columns."""
+    strike = calls["pitch_call"] == "called_strike"
+    in_zone = calls["pitch_in_zone"].astype(bool)
+    return calls.assign(correct=strike == in_zone, missed_strike=strike & ~in_zone,
+                        missed_ball=~strike & in_zone)
+
+
+def game_scorecards(calls: pd.DataFrame) -> pd.DataFrame:
+    """One row per game: umpire, called pitches, misses and accuracy."""
+    scored = _score(calls)
+    games = scored.groupby("game_pk").agg(
+        game_date=("game_date", "first"),
+        umpire_id=("umpire_id", "first"),
+        umpire_name=("umpire_name", "first"),
+        home_team=("home_team", "first"),
+        away_team=("away_team", "first"),
+        called_pitches=("correct", "size"),
+        correct_calls=("correct", "sum"),
+        missed_strikes=("missed_strike", "sum"),
+        missed_balls=("missed_ball", "sum"),
+    )
+    games["accuracy_pct"] = games["correct_calls"] / games["called_pitches"] * 100
+    return games.reset_index().sort_values(["game_date", "game_pk"], ignore_index=True)
+
+
+def team_favor(calls: pd.DataFrame) -> pd.DataFrame:
+    """Net missed calls in each team's favor, per umpire: columns umpire_id, team, favor."""
+    scored = _score(calls)
+    missed = scored[scored["missed_strike"] | scored["missed_ball"]]
+    favored = np.where(missed["missed_strike"], missed["fielding_team"], missed["batting_team"])
+    hurt = np.where(missed["missed_strike"], missed["batting_team"], missed["fielding_team"])
+    edges = pd.concat([
+        pd.DataFrame({"umpire_id": missed["umpire_id"].to_numpy(), "team": favored, "favor": 1}),
+        pd.DataFrame({"umpire_id": missed["umpire_id"].to_numpy(), "team": hurt, "favor": -1}),
+    ])
+    return edges.groupby(["umpire_id", "team"], as_index=False)["favor"].sum()
+
+
+def umpire_scorecards(calls: pd.DataFrame) -> List[Dict]:
+    """Season scorecard per umpire, most accurate first."""
+    if calls.empty:
+        return []
+    games = game_scorecards(calls)
+    umpires = games.groupby("umpire_id").agg(
+        umpire_name=("umpire_name", "first"),
+        games=("game_pk", "size"),
+        called_pitches=("called_pitches", "sum"),
+        correct_calls=("correct_calls", "sum"),
+        missed_strikes=("missed_strikes", "sum"),
+        missed_balls=("missed_balls", "sum"),
+        consistency_sd=("accuracy_pct", "std"),
+    )
+    umpires["accuracy_pct"] = umpires["correct_calls"] / umpires["called_pitches"] * 100
+
+    favor = team_favor(calls)
+    favor_by_ump: Dict = {}
+    for row in favor[favor["favor"] != 0].itertuples(index=False):
+        favor_by_ump.setdefault(row.umpire_id, {})[row.team] = int(row.favor)
+    # Home favor: net missed calls for the home team across the umpire's games
+    scored = _score(calls)
+    home_sign = np.where(scored["missed_strike"], 1, np.where(scored["missed_ball"], -1, 0))
+    home_sign = np.where(scored["fielding_team"] == scored["home_team"], home_sign, -home_sign)
+    home_favor = pd.Series(home_sign, index=scored["umpire_id"].to_numpy()).groupby(level=0).sum()
+
+    out = []
+    for umpire_id, row in umpires.sort_values("accuracy_pct", ascending=False).iterrows():
+        out.append({
+            "umpire_id": int(umpire_id),
+            "umpire_name": row["umpire_name"],
+            "games": int(row["games"]),
+            "called_pitches": int(row["called_pitches"]),
+            "correct_calls": int(row["correct_calls"]),
+            "missed_strikes": int(row["missed_strikes"]),
+            "missed_balls": int(row["missed_balls"]),
+            "accuracy_pct": round(float(row["accuracy_pct"]), 2),
+            "consistency_sd": None if pd.isna(row["consistency_sd"]) else round(float(row["consistency_sd"]), 2),
+            "home_favor": int(home_favor.get(umpire_id, 0)),
+            "team_favor": dict(sorted(favor_by_ump.get(umpire_id, {}).items(), key=lambda kv: -abs(kv[1]))),
+        })
+    return out
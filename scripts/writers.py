@@ -0,0 +1,188 @@
+"""
+Output writers shared by the scripts.
+
+Tables are written chunk by chunk instead of building the full list of record
+dicts and pretty-printing it, so peak memory stays at one chunk whatever the
+size of the frame:
+
+- write_ndjson: one JSON record per line (append_ndjson for append-only logs)
+- write_parquet / ParquetStreamWriter: parquet written in row groups
+- write_json_array: the legacy JSON array view (compact) for the dashboard
+  files that are still read as a single array
+
+Records are encoded by pandas' C JSON encoder. Python structures (dicts written
+by 18, 21, ...) go through dumps(), which uses orjson when it is installed and
+the standard library otherwise (or when orjson rejects a value, such as an int
+wider than 64 bits). Files are written to a temporary path and moved
+into place, so readers never see a half-written file.
+"""
+
+import json
+import os
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+import pandas as pd
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+CHUNK_ROWS = 50_000
+ROW_GROUP_ROWS = 100_000
+# pandas' encoder defaults to 10 significant digits; keep full float precision
+DOUBLE_PRECISION = 15
+
+
+def _default(value):
+    """JSON fallback for numpy scalars, timestamps and other non-native values."""
+    if hasattr(value, "item"):
+        return value.item()
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    if isinstance(value, set):
+        return sorted(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(obj: Any) -> bytes:
+    """Compact UTF-8 JSON for a Python structure."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, default=_default, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            # orjson rejects what the standard library accepts, e.g. ints wider than 64 bits
+            pass
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), default=_default).encode("utf-8")
+
+
+@contextmanager
+def _atomic(path: str, mode: str = "wb"):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = f"{path}.tmp"
+    try:
+        with open(tmp, mode, **({} if "b" in mode else {"encoding": "utf-8"})) as f:
+            yield f
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def write_json(obj: Any, path: str) -> str:
+    with _atomic(path) as f:
+        f.write(dumps(obj))
+    return path
+
+
+def iter_chunks(df: pd.DataFrame, chunk_rows: int = CHUNK_ROWS) -> Iterator[pd.DataFrame]:
+    for start in range(0, len(df), chunk_rows):
+        yield df.iloc[start:start + chunk_rows]
+
+
+def _records_json(chunk: pd.DataFrame, lines: bool) -> str:
+    return chunk.to_json(orient="records", lines=lines, date_format="iso",
+                         force_ascii=False, double_precision=DOUBLE_PRECISION)
+
+
+def write_ndjson(df: pd.DataFrame, path: str, chunk_rows: int = CHUNK_ROWS) -> str:
+    with _atomic(path, "w") as f:
+        for chunk in iter_chunks(df, chunk_rows):
+            text = _records_json(chunk, lines=True)
+            f.write(text if text.endswith("\n") else text + "\n")
+    return path
+
+
+def append_ndjson(records: Iterable[Dict], path: str) -> int:
+    """Append records to an NDJSON file in a single write (not atomic; for append-only logs); returns how many."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    lines = [dumps(record) + b"\n" for record in records]
+    with open(path, "ab") as f:
+        f.write(b"".join(lines))
+    return len(lines)
+
+
+def write_json_array(df: pd.DataFrame, path: str, chunk_rows: int = CHUNK_ROWS) -> str:
+    """The frame as one compact JSON array of records, encoded a chunk at a time."""
+    with _atomic(path, "w") as f:
+        f.write("[")
+        first = True
+        for chunk in iter_chunks(df, chunk_rows):
+            body = _records_json(chunk, lines=False)[1:-1]
+            if not body:
+                continue
+            if not first:
+                f.write(",")
+            f.write(body)
+            first = False
+        f.write("]")
+    return path
+
+
+class ParquetStreamWriter:
+    """Appends frames to one parquet file as row groups (schema taken from the first frame)."""
+
+    def __init__(self, path: str, row_group_rows: int = ROW_GROUP_ROWS):
+        import pyarrow.parquet as pq
+
+        self._pq = pq
+        self.path = path
+        self.tmp = f"{path}.tmp"
+        self.row_group_rows = row_group_rows
+        self.rows = 0
+        self._writer = None
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+    def write(self, df: pd.DataFrame) -> None:
+        import pyarrow as pa
+
+        if df.empty:
+            return
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        if self._writer is None:
+            self._writer = self._pq.ParquetWriter(self.tmp, table.schema)
+        else:
+            table = table.cast(self._writer.schema)
+        self._writer.write_table(table, row_group_size=self.row_group_rows)
+        self.rows += len(df)
+
+    def close(self) -> Optional[str]:
+        """Finish the file and move it into place; returns None if nothing was written."""
+        if self._writer is None:
+            return None
+        self._writer.close()
+        self._writer = None
+        os.replace(self.tmp, self.path)
+        return self.path
+
+    def __enter__(self) -> "ParquetStreamWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        elif self._writer is not None:
+            self._writer.close()
+            os.remove(self.tmp)
+
+
+def write_parquet(df: pd.DataFrame, path: str, row_group_rows: int = ROW_GROUP_ROWS) -> str:
+    with ParquetStreamWriter(path, row_group_rows) as writer:
+        for chunk in iter_chunks(df, row_group_rows):
+            writer.write(chunk)
+    if writer.rows == 0:
+        df.to_parquet(path, index=False)
+    return path
+
+
+WRITERS = {
+    "json": write_json_array,
+    "ndjson": write_ndjson,
+    "parquet": write_parquet,
+}
+
+
+def write_frame(df: pd.DataFrame, base_path: str, formats: Iterable[str] = ("ndjson", "parquet")) -> Dict[str, str]:
+    """Write the frame to {base_path}.{format} for each format; returns {format: path}."""
+    return {fmt: WRITERS[fmt](df, f"{base_path}.{fmt}") for fmt in formats}